@@ -0,0 +1,132 @@
+# coding: utf-8
+"""
+Benchmark of the ghost-region update with the Cartesian data exchangers:
+
+- BlockingCartDataExchanger     : ndim sequential phases (one per direction);
+- NonBlockingCartDataExchanger  : persistent send/recv pairs with all the
+                                  3^ndim-1 neighbors;
+- NeighborhoodCartDataExchanger : one neighborhood collective
+                                  (MPI_Ineighbor_alltoallw) on a distributed
+                                  graph communicator;
+- SharedMemoryCartDataExchanger : copies through MPI-3 shared memory windows
+                                  with the neighbors on the same node, and
+                                  point-to-point messages otherwise.
+
+Run for example with
+
+    mpirun -n 8 python benchmark_data_exchangers.py --ndim 3 --ncells 64 --degree 3
+
+"""
+import time
+import argparse
+import numpy as np
+from mpi4py import MPI
+
+from psydac.ddm.cart                         import DomainDecomposition, CartDecomposition
+from psydac.ddm.blocking_data_exchanger      import BlockingCartDataExchanger
+from psydac.ddm.nonblocking_data_exchanger   import NonBlockingCartDataExchanger
+from psydac.ddm.neighborhood_data_exchanger  import NeighborhoodCartDataExchanger
+from psydac.ddm.shared_memory_data_exchanger import SharedMemoryCartDataExchanger
+
+#==============================================================================
+def compute_global_starts_ends(domain_decomposition, npts):
+    ndims         = len(npts)
+    global_starts = [None]*ndims
+    global_ends   = [None]*ndims
+
+    for axis in range(ndims):
+        ee = domain_decomposition.global_element_ends[axis]
+
+        global_ends  [axis]     = ee.copy()
+        global_ends  [axis][-1] = npts[axis]-1
+        global_starts[axis]     = np.array([0] + (global_ends[axis][:-1]+1).tolist())
+
+    return global_starts, global_ends
+
+#==============================================================================
+def run_benchmark(ndim, ncells, degree, periodic, ncomps, nrepeat, comm):
+
+    ncells  = [ncells] * ndim
+    pads    = [degree] * ndim
+    periods = [periodic] * ndim
+    npts    = [nc if periodic else nc + degree for nc in ncells]
+
+    D = DomainDecomposition(ncells, periods=periods, comm=comm, shared_memory=True)
+    global_starts, global_ends = compute_global_starts_ends(D, npts)
+    cart = CartDecomposition(D, npts, global_starts, global_ends, pads=pads, shifts=[1]*ndim)
+
+    coeff_shape = (ncomps,) if ncomps > 1 else ()
+    shape       = tuple(cart.shape) + coeff_shape
+    owned       = tuple(slice(p, -p) for p in pads)
+
+    # Reference data: random values in the owned region, updated ghost regions
+    rng = np.random.default_rng(comm.rank)
+    ref = np.zeros(shape)
+    ref[owned] = rng.random(ref[owned].shape)
+    BlockingCartDataExchanger(cart, ref.dtype, coeff_shape=coeff_shape).start_update_ghost_regions(ref, None)
+
+    timings = {}
+    for exchanger_type in [BlockingCartDataExchanger, NonBlockingCartDataExchanger,
+                           NeighborhoodCartDataExchanger, SharedMemoryCartDataExchanger]:
+
+        exchanger = exchanger_type(cart, ref.dtype, coeff_shape=coeff_shape)
+        u = np.zeros(shape)
+        requests = exchanger.prepare_communications(u)
+        u[owned] = ref[owned]
+
+        # Warm-up and check
+        exchanger.start_update_ghost_regions(u, requests)
+        exchanger.end_update_ghost_regions(u, requests)
+        assert np.array_equal(u, ref)
+
+        comm.Barrier()
+        tb = time.perf_counter()
+        for _ in range(nrepeat):
+            exchanger.start_update_ghost_regions(u, requests)
+            exchanger.end_update_ghost_regions(u, requests)
+        te = time.perf_counter()
+
+        timings[exchanger_type.__name__] = comm.allreduce((te - tb) / nrepeat, op=MPI.MAX)
+
+        if requests:
+            for request in requests:
+                request.Free()
+
+        # The shared memory windows are freed collectively on each node
+        if exchanger_type is SharedMemoryCartDataExchanger:
+            exchanger.free()
+
+    return cart, timings
+
+#==============================================================================
+def parse_input_arguments():
+
+    parser = argparse.ArgumentParser(
+        formatter_class = argparse.ArgumentDefaultsHelpFormatter,
+        description     = "Compare the data exchangers used to update the ghost regions."
+    )
+
+    parser.add_argument('--ndim'    , type=int, choices=[2, 3], nargs='+', default=[2, 3], help='Number of dimensions')
+    parser.add_argument('--ncells'  , type=int, default=64 , help='Number of cells along each direction')
+    parser.add_argument('--degree'  , type=int, default=3  , help='Spline degree (size of the ghost regions)')
+    parser.add_argument('--ncomps'  , type=int, default=1  , help='Number of components of each coefficient')
+    parser.add_argument('--nrepeat' , type=int, default=100, help='Number of repetitions of each update')
+    parser.add_argument('--periodic', action='store_true'  , help='Use periodic boundary conditions')
+
+    return parser.parse_args()
+
+#==============================================================================
+if __name__ == '__main__':
+
+    args = parse_input_arguments()
+    comm = MPI.COMM_WORLD
+
+    for ndim in args.ndim:
+        cart, timings = run_benchmark(ndim, args.ncells, args.degree, args.periodic,
+                                      args.ncomps, args.nrepeat, comm)
+        if comm.rank == 0:
+            print()
+            print('ndim = {}, ncells = {}, degree = {}, processes = {}'.format(
+                ndim, args.ncells, args.degree, tuple(cart.nprocs)))
+            for name, t in timings.items():
+                print('  {:32s}: {:.3e} s per update'.format(name, t))
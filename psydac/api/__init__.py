@@ -7,6 +7,8 @@ from psydac.api import essential_bc
 from psydac.api import fem
 from psydac.api import glt
 from psydac.api import grid
+from psydac.api import kernel_cache
+from psydac.api import matrix_free
 from psydac.api import printing
 from psydac.api import settings
 from psydac.api import utilities
@@ -338,6 +338,7 @@ class AST(object):
         trials               = expand_hdiv_hcurl(trials)
         fields               = expand_hdiv_hcurl(fields)
         kwargs['nquads']     = nquads
+        symmetric            = kwargs.pop('symmetric', False)
         atoms_types          = (ScalarFunction, VectorFunction, IndexedVectorFunction)
         nderiv               = 1
         terminal_expr        = terminal_expr.expr
@@ -474,7 +475,7 @@ class AST(object):
             ast = _create_ast_bilinear_form(domain, terminal_expr, atomic_expr_field, tests, d_tests, trials, d_trials,
                                             fields, d_fields, constants, nderiv, dtype, mapping,
                                             d_mapping, is_rational_mapping, mapping_space,  mask, tag, is_parallel,
-                                            num_threads, invert_quad_loop, **kwargs)
+                                            num_threads, invert_quad_loop, symmetric=symmetric, **kwargs)
         elif is_functional:
             ast = _create_ast_functional_form(domain, terminal_expr, atomic_expr_field, fields, d_fields, constants, nderiv,
                                               dtype, mapping, d_mapping, is_rational_mapping, mapping_space,
@@ -582,6 +583,10 @@ def _create_ast_bilinear_form(domain, terminal_expr, atomic_expr_field, tests,
     invert_quad_loop : <bool>
         Invert the quadrature loop if True
 
+    symmetric : <bool>
+        Only assemble the upper half of the band (k1 >= 0) of the matrix,
+        stored in a SymmetricStencilMatrix, if True
+
     Returns
     -------
     node : DefNode
@@ -593,6 +598,7 @@ def _create_ast_bilinear_form(domain, terminal_expr, atomic_expr_field, tests,
 
     dim        = domain.dim
     backend    = kwargs.pop('backend')
+    symmetric  = kwargs.pop('symmetric', False)
     is_pyccel  = backend['name'] == 'pyccel' if backend else False
     add_openmp = is_pyccel and backend['openmp'] and num_threads>1
 
@@ -659,7 +665,7 @@ def _create_ast_bilinear_form(domain, terminal_expr, atomic_expr_field, tests,
     # Define the global and local matrices
     g_coeffs   = {f:[MatrixGlobalBasis(i, i, dtype=dtype) for i in expand([f])] for f in fields} #dtype manage the initialization at 0
     l_mats     = BlockStencilMatrixLocalBasis(trials, tests, terminal_expr, dim, tag, dtype=dtype) #dtype manage the reset at 0
-    g_mats     = BlockStencilMatrixGlobalBasis(trials, tests, pads, m_tests, terminal_expr, l_mats.tag, dtype=dtype) #dtype manage the decorators type in pyccel
+    g_mats     = BlockStencilMatrixGlobalBasis(trials, tests, pads, m_tests, terminal_expr, l_mats.tag, dtype=dtype, symmetric=symmetric) #dtype manage the decorators type in pyccel
     # ...........................................................................................
 
     if nquads is not None:
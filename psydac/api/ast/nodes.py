@@ -1359,7 +1359,7 @@ class BlockStencilMatrixGlobalBasis(BlockLinearOperatorNode):
     """
     used to describe local dof over an element as a block stencil matrix
     """
-    def __new__(cls, trials, tests, pads, multiplicity, expr, tag=None, dtype='real'):
+    def __new__(cls, trials, tests, pads, multiplicity, expr, tag=None, dtype='real', symmetric=False):
 
         if not is_iterable(pads):
             raise TypeError('Expecting an iterable')
@@ -1368,7 +1368,7 @@ class BlockStencilMatrixGlobalBasis(BlockLinearOperatorNode):
         rank = 2 * len(pads)
         tag  = tag or random_string(6)
 
-        obj = Basic.__new__(cls, pads, multiplicity, rank, tag, expr, dtype)
+        obj = Basic.__new__(cls, pads, multiplicity, rank, tag, expr, dtype, symmetric)
         obj._trials = trials
         obj._tests  = tests
         return obj
@@ -1397,6 +1397,10 @@ class BlockStencilMatrixGlobalBasis(BlockLinearOperatorNode):
     def dtype(self):
         return self._args[5]
 
+    @property
+    def symmetric(self):
+        return self._args[6]
+
     @property
     def unique_scalar_space(self):
         types = (H1SpaceType, L2SpaceType, UndefinedSpaceType)
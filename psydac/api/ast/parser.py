@@ -1093,12 +1093,17 @@ class Parser(object):
             multiplicity = lhs.multiplicity
             tests        = expand(lhs._tests)
 
-            tests_2 = lhs._tests
-            lhs     = self._visit_BlockStencilMatrixGlobalBasis(lhs)
-            rhs     = self._visit(expr)
+            tests_2   = lhs._tests
+            symmetric = lhs.symmetric
+            lhs       = self._visit_BlockStencilMatrixGlobalBasis(lhs)
+            rhs       = self._visit(expr)
 
             pads       = self._visit(pads)
             rhs_slices = [Slice(None, None)]*rank
+
+            # Symmetric storage: only the diagonals with k1 >= 0 are stored
+            if symmetric:
+                rhs_slices[dim] = Slice(pads[0], None)
             for k1 in range(lhs.shape[0]):
                 test    = tests[k1]
                 test    = test if test in tests_2 else test.base
@@ -7,7 +7,10 @@
 
 import sys
 import os
+import shutil
 import importlib
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 from mpi4py import MPI
 
@@ -16,8 +19,10 @@ from psydac.api.ast.parser      import parse
 from psydac.api.printing.pycode import pycode
 from psydac.api.settings        import PSYDAC_BACKENDS, PSYDAC_DEFAULT_FOLDER
 from psydac.api.utilities       import mkdir_p, touch_init_file, random_string, write_code
+from psydac.api.utilities       import import_module_from_path
+from psydac.api.kernel_cache    import get_kernel_cache, kernel_cache_enabled
 
-__all__ = ('BasicCodeGen', 'BasicDiscrete')
+__all__ = ('BasicCodeGen', 'BasicDiscrete', 'DeferredCompilation')
 
 #==============================================================================
 # TODO have it as abstract class
@@ -61,10 +66,15 @@ class BasicCodeGen:
         The backend used to accelerate the computing kernels.
         The content of the dictionary can be found in psydac/api/settings.py.
 
+    lazy: bool
+        If True, only create the AST (hence free_args and max_nderiv) in the
+        constructor, and postpone code generation and compilation to the
+        first call to compile().
+
     """
     def __init__(self, expr, *, folder=None, comm=None, root=None, discrete_space=None,
                        kernel_expr=None, nquads=None, is_rational_mapping=None, mapping=None,
-                       mapping_space=None, num_threads=None, backend=None):
+                       mapping_space=None, num_threads=None, backend=None, lazy=False):
 
         # Get default backend from environment, or use 'python'.
         default_backend = PSYDAC_BACKENDS.get(os.environ.get('PSYDAC_BACKEND'))\
@@ -98,8 +108,6 @@ class BasicCodeGen:
                 func_name  = None
                 free_args  = None
 
-            tag        = comm.bcast(tag, root=root )
-            func_name  = comm.bcast(func_name, root=root)
             max_nderiv = comm.bcast(max_nderiv, root=root )
             free_args  = comm.bcast(free_args, root=root)
             #user_functions = comm.bcast( user_functions, root=root )
@@ -117,10 +125,7 @@ class BasicCodeGen:
 
         user_functions = None
         self._expr = expr
-        self._tag = tag
         self._ast = ast
-        self._func_name = func_name
-        self._free_args = free_args
         self._user_functions = user_functions
         self._backend = backend
         self._folder = self._initialize_folder(folder)
@@ -129,8 +134,11 @@ class BasicCodeGen:
         self._max_nderiv = max_nderiv
         self._code = None
         self._func = None
-        self._dependencies_modname = 'dependencies_{}'.format(self.tag)
-        self._dependencies_fname   = '{}.py'.format(self._dependencies_modname)
+        self._cache_key   = None
+        self._cache_entry = None
+        self._dependencies_modname = None
+        self._dependencies_fname   = None
+        self._kernel_cache = get_kernel_cache(self._folder) if kernel_cache_enabled() else None
         # ...
 
         # ... when using user defined functions, there must be passed as
@@ -142,8 +150,54 @@ class BasicCodeGen:
         #             # TODO raise appropriate error message
         #             raise ValueError('can not find {} implementation'.format(f))
 
-        if ast:
-            self._save_code(self._generate_code(), backend=self.backend['name'])
+        self._tag        = tag
+        self._func_name  = func_name
+        self._free_args  = free_args
+        self._lazy       = lazy
+        self._is_compiled = False
+
+        # In lazy mode, code generation and compilation are postponed to the
+        # first call to compile(), which happens when the object is used
+        if not lazy:
+            self.compile()
+
+    def compile(self):
+        """
+        Generate the code and compile it, unless this was already done.
+
+        This is done by the constructor, unless the object was created with
+        `lazy=True`: in that case this method is called on first use. In the
+        parallel case it must be called by all the processes in `self.comm`.
+        """
+        if self._is_compiled:
+            return
+        self._is_compiled = True
+
+        comm = self.comm
+        root = self.root
+        tag  = self._tag
+        func_name = self._func_name
+
+        # ... generate the code, and replace the random tag by a stable one
+        #     derived from the content, in order to look up the kernel cache
+        code = None
+        if self.ast:
+            code = self._generate_code()
+            if self._kernel_cache is not None:
+                tag, func_name, code = self._apply_cache_key(code, tag, func_name)
+
+        if comm is not None and comm.size>1:
+            tag, func_name, self._cache_key, self._cache_entry = comm.bcast(
+                (tag, func_name, self._cache_key, self._cache_entry), root=root)
+
+        self._tag = tag
+        self._func_name = func_name
+        self._dependencies_modname = 'dependencies_{}'.format(self.tag)
+        self._dependencies_fname   = '{}.py'.format(self._dependencies_modname)
+        # ...
+
+        if code and self._cache_entry is None:
+            self._save_code(code, backend=self.backend['name'])
 
         if comm is not None and comm.size>1: comm.Barrier()
         # compile code
@@ -157,6 +211,14 @@ class BasicCodeGen:
     def tag(self):
         return self._tag
 
+    @property
+    def lazy(self):
+        return self._lazy
+
+    @property
+    def is_compiled(self):
+        return self._is_compiled
+
     @property
     def user_functions(self):
         return self._user_functions
@@ -201,6 +263,18 @@ class BasicCodeGen:
     def dependencies_modname(self):
         return self._dependencies_modname
 
+    @property
+    def kernel_cache(self):
+        return self._kernel_cache
+
+    @property
+    def cache_key(self):
+        return self._cache_key
+
+    @property
+    def cache_hit(self):
+        return self._cache_entry is not None
+
     def _create_ast(self, **kwargs):
         raise NotImplementedError('Must be implemented')
 
@@ -244,6 +318,27 @@ class BasicCodeGen:
 
         return python_code
 
+    def _apply_cache_key(self, code, tag, func_name):
+        """
+        Compute the key of the generated code in the kernel cache, replace the
+        random tag by a tag derived from the key, and look up the cache.
+        This method is only called by the process which generates the code.
+        """
+        cache = self._kernel_cache
+        key   = cache.make_key(code, tag, self.backend)
+        new_tag = cache.tag_from_key(key, n=len(tag))
+
+        # The tag is already used by a different entry: do not use the cache
+        if new_tag is None:
+            return tag, func_name, code
+
+        self._cache_key   = key
+        self._cache_entry = cache.lookup(key)
+
+        code      = code.replace(tag, new_tag)
+        func_name = func_name.replace(tag, new_tag)
+        return new_tag, func_name, code
+
     def _save_code(self, code, backend=None):
         # ...
         write_code(self._dependencies_fname, code, folder = self.folder)
@@ -273,17 +368,218 @@ class BasicCodeGen:
 
     def _compile(self):
 
+        # Cache hit: load the compiled module directly
+        if self._cache_entry is not None:
+            package = self._kernel_cache.load(self._cache_entry)
+            if self._func is None:
+                self._func = getattr(package, self._func_name)
+            return
+
+        # Inside a DeferredCompilation context: postpone the Pyccel compilation
+        if self.backend['name'] == 'pyccel' and _deferred_compilations:
+            _deferred_compilations[-1].add(self)
+            return
+
         module_name = self.dependencies_modname
         sys.path.append(self.folder)
         package = importlib.import_module( module_name )
         sys.path.remove(self.folder)
+        pymod_file = package.__file__
 
         if self.backend['name'] == 'pyccel':
             package = self._compile_pyccel(package)
         elif self.backend['name'] == 'pythran':
             package = self._compile_pythran(package)
 
-        self._func = getattr(package, self._func_name)
+        # In lazy mode, a derived class may have already replaced the kernel
+        if self._func is None:
+            self._func = getattr(package, self._func_name)
+
+        # Cache miss: store the new module, only on the process which generated it
+        if self._cache_key is not None and self.ast is not None:
+            self._kernel_cache.store(self._cache_key, tag=self.tag, module=package, files=[pymod_file])
+
+    def _set_compiled_module(self, package):
+        """
+        Set the kernel from a module compiled by a DeferredCompilation context,
+        and store the module in the kernel cache.
+        """
+        # A derived class may have already replaced the kernel
+        # (e.g. by do_nothing, if the process does not own the boundary)
+        if self._func is None:
+            self._func = getattr(package, self._func_name)
+
+        if self._cache_key is not None and self.ast is not None:
+            pymod_file = os.path.join(self.folder, self.dependencies_fname)
+            self._kernel_cache.store(self._cache_key, tag=self.tag, module=package, files=[pymod_file])
+
+#==============================================================================
+_deferred_compilations = []
+
+def _run_pyccel(filename, backend):
+    """
+    Compile a Python module with the Pyccel command line tool, in a separate
+    process. The shared library is created in the folder of the module.
+
+    Returns
+    -------
+    success : bool
+        True if Pyccel terminated without errors.
+
+    output : str
+        The standard output and standard error of the Pyccel process.
+    """
+    command = [shutil.which('pyccel') or 'pyccel', os.path.basename(filename),
+               '--language', 'fortran',
+               '--compiler', backend['compiler'],
+               '--flags={}'.format(backend['flags']),
+               '--output', '.']
+    if backend['openmp']:
+        command.append('--openmp')
+
+    proc = subprocess.run(command, cwd=os.path.dirname(filename), shell=False,
+                          stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+
+    return proc.returncode == 0, proc.stdout
+
+class DeferredCompilation:
+    """
+    Context manager which defers the Pyccel compilation of the kernels
+    generated by all the discrete objects created in its scope. On exit, all
+    the generated modules are compiled concurrently, by a pool of independent
+    Pyccel processes.
+
+    The code generation is not affected, and the kernel cache is looked up as
+    usual: only the modules which are not found in the cache are compiled.
+    In the parallel case the compilation is performed by the root process of
+    the communicator of each discrete object, as with epyccel, and the path to
+    the shared library is broadcast to the other processes.
+
+    The discrete objects cannot be used before exiting the context.
+
+    Parameters
+    ----------
+    max_workers : int, optional
+        Maximum number of concurrent Pyccel processes (default: number of CPUs).
+
+    verbose : bool, optional
+        If True, print the output of the Pyccel processes (default: False).
+
+    Examples
+    --------
+    >>> with DeferredCompilation(max_workers=4):
+    ...     ah = discretize(a, domain_h, [Vh, Vh], backend=PSYDAC_BACKEND_GPYCCEL)
+    ...     lh = discretize(l, domain_h, Vh, backend=PSYDAC_BACKEND_GPYCCEL)
+    >>> A = ah.assemble()
+
+    """
+    def __init__(self, max_workers=None, verbose=False):
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._verbose     = verbose
+        self._pending     = []
+
+    @property
+    def max_workers(self):
+        return self._max_workers
+
+    @property
+    def pending(self):
+        """ The discrete objects which are waiting to be compiled. """
+        return tuple(self._pending)
+
+    def add(self, codegen):
+        assert isinstance(codegen, BasicCodeGen)
+        self._pending.append(codegen)
+
+    def __enter__(self):
+        _deferred_compilations.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _deferred_compilations.remove(self)
+        if exc_type is None:
+            self.compile()
+        else:
+            self._pending = []
+        return False
+
+    #--------------------------------------------------------------------------
+    def compile(self):
+        """
+        Compile all the pending modules concurrently, then load the compiled
+        kernels in all the discrete objects.
+        """
+        from pyccel.epyccel import get_unique_name
+
+        pending, self._pending = self._pending, []
+
+        # Modules to be compiled by this process, without duplicates
+        jobs  = {}
+        locks = []
+        for c in pending:
+            if c.ast is None:
+                continue
+            source = os.path.join(c.folder, c.dependencies_fname)
+            if source in jobs:
+                continue
+
+            folder = os.path.join(os.path.abspath(c.backend['folder']),
+                                  '__epyccel__' + os.environ.get('PYTEST_XDIST_WORKER', ''))
+            module_name, lock = get_unique_name(c.dependencies_modname, folder)
+            locks.append(lock)
+
+            filename = os.path.join(folder, module_name + '.py')
+            shutil.copyfile(source, filename)
+            jobs[source] = (module_name, filename, c.backend)
+
+        # Run Pyccel in separate processes
+        results = {}
+        try:
+            with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+                futures = {source: executor.submit(_run_pyccel, filename, backend)
+                           for source, (module_name, filename, backend) in jobs.items()}
+                for source, future in futures.items():
+                    success, output = future.result()
+                    module_name, filename, backend = jobs[source]
+                    if self._verbose:
+                        print(output)
+                    if success:
+                        results[source] = (True, module_name, os.path.dirname(filename))
+                    else:
+                        results[source] = (False, module_name, output)
+
+            # Share the results with the other processes, and load the kernels
+            errors = []
+            for c in pending:
+                source = os.path.join(c.folder, c.dependencies_fname)
+                result = results.get(source)
+                if c.comm is not None and c.comm.size > 1:
+                    result = c.comm.bcast(result, root=c.root)
+
+                success, module_name, info = result
+                if not success:
+                    errors.append('{}:\n{}'.format(module_name, info))
+                    continue
+
+                path    = self._find_extension(info, module_name)
+                package = import_module_from_path(module_name, path)
+                c._set_compiled_module(package)
+        finally:
+            for lock in locks:
+                lock.release()
+
+        if errors:
+            raise RuntimeError('Pyccel failed to compile {} module(s):\n{}'.format(
+                len(errors), '\n'.join(errors)))
+
+    @staticmethod
+    def _find_extension(folder, module_name):
+        from importlib.machinery import EXTENSION_SUFFIXES
+        for suffix in EXTENSION_SUFFIXES:
+            path = os.path.join(folder, module_name + suffix)
+            if os.path.isfile(path):
+                return path
+        raise ImportError('Could not find the shared library of module {}'.format(module_name))
 
 #==============================================================================
 class BasicDiscrete(BasicCodeGen):
@@ -293,11 +589,12 @@ class BasicDiscrete(BasicCodeGen):
 
     def __init__(self, expr, kernel_expr, *, folder=None, comm=None, root=None, discrete_space=None,
                        nquads=None, is_rational_mapping=None, mapping=None,
-                       mapping_space=None, num_threads=None, backend=None):
+                       mapping_space=None, num_threads=None, backend=None, lazy=False):
 
         BasicCodeGen.__init__(self, expr, folder=folder, comm=comm, root=root, discrete_space=discrete_space,
                        kernel_expr=kernel_expr, nquads=nquads, is_rational_mapping=is_rational_mapping,
-                       mapping=mapping, mapping_space=mapping_space, num_threads=num_threads, backend=backend)
+                       mapping=mapping, mapping_space=mapping_space, num_threads=num_threads, backend=backend,
+                       lazy=lazy)
         # ...
         self._kernel_expr = kernel_expr
         # ...
@@ -334,10 +631,11 @@ class BasicDiscrete(BasicCodeGen):
         mapping        = kwargs.pop('mapping', None)
         num_threads    = kwargs.pop('num_threads', None)
         backend        = kwargs.pop('backend', None)
+        symmetric      = kwargs.pop('symmetric', False)
         is_rational_mapping = kwargs.pop('is_rational_mapping', None)
 
         return AST(expr, kernel_expr, discrete_space, mapping_space=mapping_space,
                    tag=tag, nquads=nquads, mapping=mapping, is_rational_mapping=is_rational_mapping,
-                   backend=backend, num_threads=num_threads)
+                   backend=backend, num_threads=num_threads, symmetric=symmetric)
 
 
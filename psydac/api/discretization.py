@@ -25,10 +25,13 @@ from sympde.topology import H1SpaceType, HcurlSpaceType, HdivSpaceType, L2SpaceT
 
 from gelato.expr import GltExpr as sym_GltExpr
 
+from psydac.api.basic        import DeferredCompilation
 from psydac.api.fem          import DiscreteBilinearForm
 from psydac.api.fem          import DiscreteLinearForm
 from psydac.api.fem          import DiscreteFunctional
 from psydac.api.fem          import DiscreteSumForm
+from psydac.api.fem          import DiscreteIncrementalForm, split_form
+from psydac.api.matrix_free  import DiscreteMatrixFreeBilinearForm
 from psydac.api.feec         import DiscreteDerham
 from psydac.api.glt          import DiscreteGltExpr
 from psydac.api.expr         import DiscreteExpr
@@ -48,7 +51,8 @@ __all__ = (
     'discretize_derham',
     'reduce_space_degrees',
     'discretize_space',
-    'discretize_domain'
+    'discretize_domain',
+    'discretize_many',
 )
 
 #==============================================================================
@@ -531,6 +535,17 @@ def discretize_domain(domain, *, filename=None, ncells=None, periodic=None, comm
 #==============================================================================
 def discretize(a, *args, **kwargs):
 
+    # A bilinear form may be discretized as a matrix-free linear operator
+    matrix_free = kwargs.pop('matrix_free', False)
+    if matrix_free and not isinstance(a, sym_BilinearForm):
+        raise TypeError('matrix_free=True is only available for bilinear forms, given {}'.format(type(a)))
+
+    # A bilinear or linear form may be split into a constant part, assembled
+    # only once, and a part which depends on the free arguments
+    incremental = kwargs.pop('incremental', False)
+    if incremental and not isinstance(a, (sym_BilinearForm, sym_LinearForm)):
+        raise TypeError('incremental=True is only available for bilinear and linear forms, given {}'.format(type(a)))
+
     if isinstance(a, (sym_BasicForm, sym_GltExpr, sym_Expr)):
         domain_h = args[0]
         assert isinstance(domain_h, Geometry)
@@ -561,6 +576,18 @@ def discretize(a, *args, **kwargs):
         kwargs['nquads'] = nquads
     #...
 
+    if incremental:
+        constant, variable = split_form(a)
+        if constant is None or variable is None:
+            return discretize(a, *args, **kwargs)
+
+        kwargs['update_ghost_regions'] = False
+        constant_h = discretize(constant, *args, **kwargs)
+        key = 'matrix' if isinstance(a, sym_BilinearForm) else 'vector'
+        kwargs[key] = DiscreteIncrementalForm._get_operator(constant_h)
+        variable_h = discretize(variable, *args, **kwargs)
+        return DiscreteIncrementalForm(constant_h, variable_h)
+
     if isinstance(a, sym_BasicForm):
         if isinstance(a, (sym_Norm, sym_SemiNorm)):
             kernel_expr = TerminalExpr(a, domain)
@@ -573,6 +600,9 @@ def discretize(a, *args, **kwargs):
 
             kernel_expr = TerminalExpr(a, domain)
 
+        if matrix_free:
+            return DiscreteMatrixFreeBilinearForm(a, kernel_expr, *args, **kwargs)
+
         if len(kernel_expr) > 1:
             return DiscreteSumForm(a, kernel_expr, *args, **kwargs)
 
@@ -609,3 +639,45 @@ def discretize(a, *args, **kwargs):
 
     else:
         raise NotImplementedError('given {}'.format(type(a)))
+
+#==============================================================================
+def discretize_many(*items, max_workers=None, **kwargs):
+    """
+    Discretize several symbolic objects at once, and compile all the generated
+    kernels concurrently (see DeferredCompilation).
+
+    Parameters
+    ----------
+    *items : tuple
+        Each item is a tuple (a, *args), where a and args are passed to
+        discretize(). If the last element of the tuple is a dict, it is used
+        as keyword arguments for this item, which override the common ones.
+
+    max_workers : int, optional
+        Maximum number of concurrent Pyccel processes (default: number of CPUs).
+
+    **kwargs
+        Keyword arguments passed to discretize() for all the items
+        (e.g. backend, nquads).
+
+    Returns
+    -------
+    list
+        The discrete objects, in the same order as the items.
+
+    Examples
+    --------
+    >>> ah, lh = discretize_many((a, domain_h, [Vh, Vh]), (l, domain_h, Vh),
+    ...                          backend=PSYDAC_BACKEND_GPYCCEL)
+    """
+    results = []
+    with DeferredCompilation(max_workers=max_workers):
+        for item in items:
+            item = tuple(item)
+            if item and isinstance(item[-1], dict):
+                item, item_kwargs = item[:-1], {**kwargs, **item[-1]}
+            else:
+                item_kwargs = dict(kwargs)
+            results.append(discretize(*item, **item_kwargs))
+
+    return results
@@ -2,7 +2,7 @@
 from sympde.expr.equation  import EssentialBC
 
 from psydac.linalg.basic   import ComposedLinearOperator
-from psydac.linalg.stencil import StencilVector, StencilMatrix
+from psydac.linalg.stencil import StencilVector, StencilMatrix, SymmetricStencilMatrix
 from psydac.linalg.stencil import StencilInterfaceMatrix
 from psydac.linalg.kron    import KroneckerDenseMatrix
 from psydac.linalg.block   import BlockVector, BlockLinearOperator
@@ -99,6 +99,7 @@ def apply_essential_bc_stencil(a, *, axis, ext, order, identity=False):
     """ This function applies the homogeneous boundary condition to the Stencil objects,
         by setting the boundary degrees of freedom to zero in the StencilVector,
         and the corresponding rows in the StencilMatrix/StencilInterfaceMatrix to zeros.
+        The corresponding columns of a SymmetricStencilMatrix are also set to zero.
         If the identity keyword argument is set to True, the boundary diagonal terms are set to 1.
 
     Parameters
@@ -171,6 +172,18 @@ def apply_essential_bc_stencil(a, *, axis, ext, order, identity=False):
     else:
         pass
 
+    # Only the upper half of the band of a SymmetricStencilMatrix is stored:
+    # the corresponding column is also set to zero, to keep it symmetric
+    if isinstance(a, SymmetricStencilMatrix):
+        ndim = V.ndim
+        b    = order if ext == -1 else V.npts[axis] - 1 - order
+        p    = a.pads[axis]
+        for k in (range(1, p+1) if axis == 0 else range(-p, p+1)):
+            if k != 0 and V.starts[axis] <= b - k <= V.ends[axis]:
+                index = [(b - k if j == axis else slice(None)) for j in range(ndim)] + \
+                        [(k     if j == axis else slice(None)) for j in range(ndim)]
+                a[tuple(index)] = 0.0
+
 #==============================================================================
 def apply_essential_bc_BlockLinearOperator(a, bc, *, identity=False, is_broken=True):
     """
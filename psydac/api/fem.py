@@ -4,13 +4,16 @@
 #         nderiv has not been changed. shall we add nquads too?
 
 import numpy as np
-from sympy import ImmutableDenseMatrix, Matrix
+from sympy import ImmutableDenseMatrix, Matrix, Add
 
 from sympde.expr          import BilinearForm as sym_BilinearForm
 from sympde.expr          import LinearForm as sym_LinearForm
 from sympde.expr          import Functional as sym_Functional
 from sympde.expr          import Norm as sym_Norm
 from sympde.expr          import SemiNorm as sym_SemiNorm
+from sympde.expr          import integral
+from sympde.expr.expr     import IntAdd
+from sympde.core          import Constant
 from sympde.topology      import Boundary, Interface
 from sympde.topology      import VectorFunctionSpace
 from sympde.topology      import ProductSpace
@@ -21,7 +24,8 @@ from psydac.api.basic        import BasicDiscrete
 from psydac.api.basic        import random_string
 from psydac.api.grid         import QuadratureGrid, BasisValues
 from psydac.api.utilities    import flatten
-from psydac.linalg.stencil   import StencilVector, StencilMatrix, StencilInterfaceMatrix
+from psydac.linalg.stencil   import StencilVectorSpace, StencilVector, StencilMatrix, StencilInterfaceMatrix
+from psydac.linalg.stencil   import SymmetricStencilMatrix
 from psydac.linalg.basic     import ComposedLinearOperator
 from psydac.linalg.block     import BlockVectorSpace, BlockVector, BlockLinearOperator
 from psydac.cad.geometry     import Geometry
@@ -38,6 +42,8 @@ __all__ = (
     'construct_test_space_arguments',
     'construct_trial_space_arguments',
     'construct_quad_grids_arguments',
+    'construct_field_arguments',
+    'split_form',
     'reset_arrays',
     'do_nothing',
     'extract_stencil_mats',
@@ -45,6 +51,7 @@ __all__ = (
     'DiscreteFunctional',
     'DiscreteLinearForm',
     'DiscreteSumForm',
+    'DiscreteIncrementalForm',
 )
 
 #==============================================================================
@@ -142,6 +149,93 @@ def construct_quad_grids_arguments(grid, use_weights=True):
     n_elements    = grid.n_elements
     return n_elements, quads, nquads
 
+#==============================================================================
+def split_form(a):
+    """
+    Split a symbolic bilinear or linear form into a constant part, which does
+    not depend on any free field or Constant, and a variable part, which
+    contains all the terms that do.
+
+    Parameters
+    ----------
+    a : sympde.expr.BilinearForm | sympde.expr.LinearForm
+        The symbolic form.
+
+    Returns
+    -------
+    constant : sympde.expr.BilinearForm | sympde.expr.LinearForm | None
+        The part of the form which does not depend on the free arguments,
+        or None if there is no such term.
+
+    variable : sympde.expr.BilinearForm | sympde.expr.LinearForm | None
+        The part of the form which depends on the free arguments, or None if
+        there is no such term.
+    """
+    if not isinstance(a, (sym_BilinearForm, sym_LinearForm)):
+        raise TypeError('> Expecting a symbolic BilinearForm or LinearForm, got {}'.format(type(a)))
+
+    integrals = a.expr.args if isinstance(a.expr, IntAdd) else (a.expr,)
+
+    constant = []
+    variable = []
+    for I in integrals:
+        for t in Add.make_args(I.expr):
+            if t.has(*a.fields, *t.atoms(Constant)):
+                variable.append(integral(I.domain, t))
+            else:
+                constant.append(integral(I.domain, t))
+
+    form_type = type(a)
+    constant  = form_type(a.variables, Add(*constant)) if constant else None
+    variable  = form_type(a.variables, Add(*variable)) if variable else None
+
+    return constant, variable
+
+#==============================================================================
+def construct_field_arguments(space, *, nderiv, nquads, grid, cache):
+    """
+    Construct the basis values, spans, degrees and pads of the space of a free
+    field, which are passed to the assembly kernel together with the field
+    coefficients. Since they only depend on the space, they are stored in the
+    given cache (a dictionary) and computed only once for each space.
+
+    Parameters
+    ----------
+    space : FemSpace
+        The space of the free field.
+
+    nderiv : int
+        The maximum number of derivatives needed for the basis values.
+
+    nquads : list or tuple of int
+        The number of quadrature points along each direction.
+
+    grid : QuadratureGrid
+        The quadrature grid of the form.
+
+    cache : dict
+        The cache of the form, which maps id(space) to the arguments.
+
+    Returns
+    -------
+    basis, spans, degrees, pads : list
+        The arguments of the assembly kernel related to the field space.
+    """
+    key = id(space)
+    if key not in cache:
+        basis_v = BasisValues(
+            space,
+            nderiv = nderiv,
+            nquads = nquads,
+            trial  = True,
+            grid   = grid
+        )
+        bs, d, s, p = construct_test_space_arguments(basis_v)
+        # Keep a reference to the space, so that its id is not reused
+        cache[key] = (space, bs, s, [np.int64(a) for a in d], [np.int64(a) for a in p])
+
+    return cache[key][1:]
+
 def reset_arrays(*args):
     for a in args:
         a[:]= 0.j if a.dtype==complex else 0.
@@ -208,6 +302,16 @@ class DiscreteBilinearForm(BasicDiscrete):
     symbolic_mapping : Sympde.topology.Mapping, optional
         The symbolic mapping which defines the physical domain of the bilinear form.
 
+    lazy : bool, default=False
+        If True, the assembly kernel is generated and compiled at the first
+        call to assemble() rather than in the constructor.
+
+    symmetric_storage : bool, default=False
+        If True and the form is symmetric, only the upper half of the band
+        of the matrix is assembled and stored in a SymmetricStencilMatrix.
+        This is only available for scalar forms on a single patch, whose
+        trial and test spaces are the same; it is ignored otherwise.
+
     See Also
     --------
     DiscreteLinearForm
@@ -218,7 +322,7 @@ class DiscreteBilinearForm(BasicDiscrete):
     def __init__(self, expr, kernel_expr, domain_h, spaces, *, nquads,
                  matrix=None, update_ghost_regions=True, backend=None,
                  linalg_backend=None, assembly_backend=None,
-                 symbolic_mapping=None):
+                 symbolic_mapping=None, lazy=False, symmetric_storage=False):
 
         if not isinstance(expr, sym_BilinearForm):
             raise TypeError('> Expecting a symbolic BilinearForm')
@@ -290,6 +394,7 @@ class DiscreteBilinearForm(BasicDiscrete):
         if vector_space.parallel and vector_space.cart.is_comm_null:
             self._free_args = ()
             self._func      = do_nothing
+            self._is_compiled = True
             self._args      = ()
             self._element_loop_starts = ()
             self._element_loop_ends   = ()
@@ -356,11 +461,28 @@ class DiscreteBilinearForm(BasicDiscrete):
         assembly_backend = backend or assembly_backend
         linalg_backend   = backend or linalg_backend
 
+        # Cache of the kernel arguments related to the spaces of the free fields
+        self._field_args = {}
+
+        # Half-band storage of the matrix of a symmetric form
+        self._symmetric_storage = bool(symmetric_storage) \
+            and len(domain) == 1 \
+            and trial_space is test_space \
+            and isinstance(test_space.vector_space, StencilVectorSpace) \
+            and all(m == 1 for m in vector_space.shifts) \
+            and tuple(vector_space.pads) == tuple(test_space.degree) \
+            and not isinstance(kernel_expr.expr, (ImmutableDenseMatrix, Matrix)) \
+            and expr.is_symmetric
+
+        if isinstance(matrix, SymmetricStencilMatrix) and not self._symmetric_storage:
+            raise ValueError('Cannot assemble this bilinear form into a SymmetricStencilMatrix')
+
         # BasicDiscrete generates the assembly code and sets the following attributes that are used afterwards:
         # self._func, self._free_args, self._max_nderiv and self._backend
         BasicDiscrete.__init__(self, expr, kernel_expr, comm=comm, root=0, discrete_space=discrete_space,
                        nquads=nquads, is_rational_mapping=is_rational_mapping, mapping=symbolic_mapping,
-                       mapping_space=mapping_space, num_threads=self._num_threads, backend=assembly_backend)
+                       mapping_space=mapping_space, num_threads=self._num_threads, backend=assembly_backend,
+                       lazy=lazy)
 
         #... Handle the special case where the current MPI process does not need to do anything
         if isinstance(target, (Boundary, Interface)):
@@ -468,6 +590,10 @@ class DiscreteBilinearForm(BasicDiscrete):
     def args(self):
         return self._args
 
+    def _create_ast(self, **kwargs):
+        # Only the upper half of the band is assembled with symmetric storage
+        return BasicDiscrete._create_ast(self, symmetric=self._symmetric_storage, **kwargs)
+
     def assemble(self, *, reset=True, **kwargs):
         """
         This method assembles the left hand side Matrix by calling the private method `self._func` with proper arguments.
@@ -500,18 +626,12 @@ class DiscreteBilinearForm(BasicDiscrete):
                     assert len(self.grid) == 1
                     if not v.coeffs.ghost_regions_in_sync:
                         v.coeffs.update_ghost_regions()
-                    basis_v = BasisValues(
-                        v.space,
-                        nderiv = self.max_nderiv,
-                        nquads = self.nquads,
-                        trial  = True,
-                        grid   = self.grid[0]
-                    )
-                    bs, d, s, p = construct_test_space_arguments(basis_v)
+                    bs, s, d, p = construct_field_arguments(v.space, nderiv=self.max_nderiv,
+                            nquads=self.nquads, grid=self.grid[0], cache=self._field_args)
                     basis   += bs
                     spans   += s
-                    degrees += [np.int64(a) for a in d]
-                    pads    += [np.int64(a) for a in p]
+                    degrees += d
+                    pads    += p
                     if v.space.is_product:
                         coeffs += (e._data for e in v.coeffs)
                     else:
@@ -529,6 +649,9 @@ class DiscreteBilinearForm(BasicDiscrete):
         if reset:
             reset_arrays(*self.global_matrices)
 
+        if not self._is_compiled:
+            self.compile()
+
         self._func(*args, *self._threads_args)
         if self._matrix and self._update_ghost_regions:
             self._matrix.exchange_assembly_data()
@@ -894,6 +1017,8 @@ class DiscreteBilinearForm(BasicDiscrete):
             else:
                 if self._matrix:
                     global_mats[0, 0] = self._matrix
+                elif self._symmetric_storage:
+                    global_mats[0, 0] = SymmetricStencilMatrix(test_space, pads=tuple(pads))
                 else:
                     global_mats[0, 0] = StencilMatrix(trial_space, test_space, pads=tuple(pads))
 
@@ -1001,6 +1126,10 @@ class DiscreteLinearForm(BasicDiscrete):
     symbolic_mapping : Sympde.topology.Mapping, optional
         The symbolic mapping which defines the physical domain of the linear form.
 
+    lazy : bool, default=False
+        If True, the assembly kernel is generated and compiled at the first
+        call to assemble() rather than in the constructor.
+
     See Also
     --------
     DiscreteBilinearForm
@@ -1010,7 +1139,7 @@ class DiscreteLinearForm(BasicDiscrete):
     """
     def __init__(self, expr, kernel_expr, domain_h, space, *, nquads,
                  vector=None, update_ghost_regions=True, backend=None,
-                 symbolic_mapping=None):
+                 symbolic_mapping=None, lazy=False):
 
         if not isinstance(expr, sym_LinearForm):
             raise TypeError('> Expecting a symbolic LinearForm')
@@ -1062,6 +1191,7 @@ class DiscreteLinearForm(BasicDiscrete):
         if vector_space.parallel and (vector_space.cart.is_comm_null or isinstance(vector_space.cart, InterfaceCartDecomposition)):
             self._free_args = ()
             self._func      = do_nothing
+            self._is_compiled = True
             self._args      = ()
             self._threads_args     = ()
             self._global_matrices  = ()
@@ -1081,11 +1211,15 @@ class DiscreteLinearForm(BasicDiscrete):
         # MPI communicator
         comm = vector_space.cart.comm if vector_space.parallel else None
 
+        # Cache of the kernel arguments related to the spaces of the free fields
+        self._field_args = {}
+
         # BasicDiscrete generates the assembly code and sets the following attributes that are used afterwards:
         # self._func, self._free_args, self._max_nderiv and self._backend
         BasicDiscrete.__init__(self, expr, kernel_expr, comm=comm, root=0, discrete_space=discrete_space,
                               nquads=nquads, is_rational_mapping=is_rational_mapping, mapping=symbolic_mapping,
-                              mapping_space=mapping_space, num_threads=self._num_threads, backend=backend)
+                              mapping_space=mapping_space, num_threads=self._num_threads, backend=backend,
+                              lazy=lazy)
 
         #... Handle the special case where the current MPI process does not need to do anything
         if not isinstance(target, Boundary):
@@ -1191,18 +1325,12 @@ class DiscreteLinearForm(BasicDiscrete):
                 if isinstance(v, FemField):
                     if not v.coeffs.ghost_regions_in_sync:
                         v.coeffs.update_ghost_regions()
-                    basis_v  = BasisValues(
-                        v.space,
-                        nderiv = self.max_nderiv,
-                        nquads = self.nquads,
-                        trial  = True,
-                        grid   = self.grid
-                    )
-                    bs, d, s, p = construct_test_space_arguments(basis_v)
+                    bs, s, d, p = construct_field_arguments(v.space, nderiv=self.max_nderiv,
+                            nquads=self.nquads, grid=self.grid, cache=self._field_args)
                     basis   += bs
                     spans   += s
-                    degrees += [np.int64(a) for a in d]
-                    pads    += [np.int64(a) for a in p]
+                    degrees += d
+                    pads    += p
                     if v.space.is_product:
                         coeffs += (e._data for e in v.coeffs)
                     else:
@@ -1218,6 +1346,9 @@ class DiscreteLinearForm(BasicDiscrete):
         if reset:
             reset_arrays(*self.global_matrices)
 
+        if not self._is_compiled:
+            self.compile()
+
         self._func(*args, *self._threads_args)
         if self._vector and self._update_ghost_regions:
             self._vector.exchange_assembly_data()
@@ -1411,6 +1542,10 @@ class DiscreteFunctional(BasicDiscrete):
     symbolic_mapping : Sympde.topology.Mapping
         The symbolic mapping which defines the physical domain of the functional.
 
+    lazy : bool, default=False
+        If True, the assembly kernel is generated and compiled at the first
+        call to assemble() rather than in the constructor.
+
     See Also
     --------
     DiscreteBilinearForm
@@ -1419,7 +1554,7 @@ class DiscreteFunctional(BasicDiscrete):
 
     """
     def __init__(self, expr, kernel_expr, domain_h, space, *, nquads,
-                 backend=None, symbolic_mapping=None):
+                 backend=None, symbolic_mapping=None, lazy=False):
 
         if not isinstance(expr, sym_Functional):
             raise TypeError('> Expecting a symbolic Functional')
@@ -1468,6 +1603,7 @@ class DiscreteFunctional(BasicDiscrete):
         if vector_space.parallel and vector_space.cart.is_comm_null:
             self._free_args = ()
             self._func      = do_nothing
+            self._is_compiled = True
             self._args      = ()
             self._expr      = expr
             self._comm      = domain_h.comm
@@ -1498,7 +1634,8 @@ class DiscreteFunctional(BasicDiscrete):
         # self._func, self._free_args, self._max_nderiv and self._backend
         BasicDiscrete.__init__(self, expr, kernel_expr, comm=comm, root=0, discrete_space=discrete_space,
                               nquads=nquads, is_rational_mapping=is_rational_mapping, mapping=symbolic_mapping,
-                              mapping_space=mapping_space, num_threads=num_threads, backend=backend)
+                              mapping_space=mapping_space, num_threads=num_threads, backend=backend,
+                              lazy=lazy)
 
         # Build the quadrature grid
         grid       = QuadratureGrid(self.space,  axis=axis, ext=ext, nquads=nquads)
@@ -1645,6 +1782,9 @@ class DiscreteFunctional(BasicDiscrete):
             else:
                 args += (v, )
 
+        if not self._is_compiled:
+            self.compile()
+
         v = self._func(*args)
         if isinstance(self.expr, (sym_Norm, sym_SemiNorm)):
             if not( self.comm is None ):
@@ -1748,3 +1888,133 @@ class DiscreteSumForm(BasicDiscrete):
             M = np.sum(M)
             return M
 
+#==============================================================================
+class DiscreteIncrementalForm:
+    """
+    Discrete bilinear or linear form which is split into a constant part,
+    assembled only once, and a variable part which depends on free fields or
+    Constants and is re-assembled at each call to assemble().
+
+    Both parts share the same matrix (or vector): the contributions of the
+    constant part are stored after the first assembly, and copied back into
+    the operator before the variable part is added to it. This is useful when
+    the same form must be assembled many times with different values of the
+    free arguments (e.g. in a Picard or Newton iteration), and most of the
+    terms do not depend on them.
+
+    Parameters
+    ----------
+    constant_form : DiscreteBilinearForm | DiscreteLinearForm | DiscreteSumForm
+        The discrete constant part of the form.
+
+    variable_form : DiscreteBilinearForm | DiscreteLinearForm | DiscreteSumForm
+        The discrete variable part of the form. It must have been created with
+        the matrix (or vector) of the constant form.
+
+    See Also
+    --------
+    split_form
+    """
+    def __init__(self, constant_form, variable_form):
+
+        operator = self._get_operator(constant_form)
+        assert self._get_operator(variable_form) is operator
+
+        self._constant_form = constant_form
+        self._variable_form = variable_form
+        self._operator      = operator
+
+        # Individual forms, whose assemble methods do not exchange assembly data
+        self._constant_forms = self._get_forms(constant_form)
+        self._variable_forms = self._get_forms(variable_form)
+
+        # Arrays of the global matrices (or vectors), without duplicates
+        arrays = {}
+        for form in self._constant_forms + self._variable_forms:
+            for M in form.global_matrices:
+                arrays.setdefault(id(M), M)
+
+        self._global_arrays = tuple(arrays.values())
+        self._constant_data = None
+
+    #--------------------------------------------------------------------------
+    @staticmethod
+    def _get_forms(form):
+        forms = form.forms if isinstance(form, DiscreteSumForm) else (form,)
+        for f in forms:
+            assert not f._update_ghost_regions
+        return tuple(forms)
+
+    @staticmethod
+    def _get_operator(form):
+        if isinstance(form, DiscreteSumForm):
+            return form._operator
+        elif isinstance(form, DiscreteBilinearForm):
+            return form._matrix
+        elif isinstance(form, DiscreteLinearForm):
+            return form._vector
+        else:
+            raise TypeError('> Expecting a DiscreteBilinearForm, DiscreteLinearForm or DiscreteSumForm')
+
+    #--------------------------------------------------------------------------
+    @property
+    def constant_form(self):
+        return self._constant_form
+
+    @property
+    def variable_form(self):
+        return self._variable_form
+
+    @property
+    def free_args(self):
+        return self._variable_form.free_args
+
+    #--------------------------------------------------------------------------
+    def assemble_constant_part(self):
+        """
+        Assemble the constant part of the form, and store its contributions.
+        This is done automatically at the first call to assemble().
+        """
+        reset_arrays(*self._global_arrays)
+        for form in self._constant_forms:
+            form.assemble(reset=False)
+
+        self._constant_data = tuple(M.copy() for M in self._global_arrays)
+
+    def assemble(self, *, reset=True, **kwargs):
+        """
+        Assemble the form, re-assembling only its variable part.
+
+        Parameters
+        ----------
+        reset : bool, default=True
+            If True, the operator is overwritten; otherwise the form is added
+            to its current values.
+
+        **kwargs : dict
+            The values of the free arguments of the variable part.
+
+        Returns
+        -------
+        StencilMatrix | StencilVector | BlockLinearOperator | BlockVector
+            The assembled operator, shared by the constant and variable forms.
+        """
+        if self._constant_data is None:
+            self.assemble_constant_part()
+            reset = True
+
+        if reset:
+            for M, C in zip(self._global_arrays, self._constant_data):
+                np.copyto(M, C)
+        else:
+            for M, C in zip(self._global_arrays, self._constant_data):
+                M += C
+
+        for form in self._variable_forms:
+            form.assemble(reset=False, **kwargs)
+
+        if self._operator:
+            self._operator.exchange_assembly_data()
+            self._operator.ghost_regions_in_sync = False
+
+        return self._operator
@@ -0,0 +1,320 @@
+# coding: utf-8
+"""
+Persistent, content-addressed cache for the assembly kernels generated by
+`BasicCodeGen`.
+
+Every discrete form generates a Python module whose source code only depends
+on the symbolic expression, the discrete spaces, the number of quadrature
+points and the backend, up to a random tag used in the names of the generated
+functions. Here the tag is removed from the source code, and the remaining
+text is hashed together with the backend dictionary: the resulting key is used
+to retrieve an already-compiled module from a previous run, hence skipping the
+(expensive) compilation step with Pyccel.
+
+The cache is stored on disk as a JSON index in the PSYDAC output folder, and
+its total size is bounded: when the limit is exceeded, the least recently used
+entries are evicted and their files removed.
+
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+
+from filelock import FileLock
+
+from psydac.api.settings  import PSYDAC_KERNEL_CACHE
+from psydac.api.utilities import mkdir_p, import_module_from_path
+
+__all__ = (
+    'KernelCache',
+    'get_kernel_cache',
+    'kernel_cache_enabled',
+)
+
+#==============================================================================
+def kernel_cache_enabled():
+    """
+    Return True if the kernel cache is enabled. The default value in
+    PSYDAC_KERNEL_CACHE['enabled'] can be overridden by setting the
+    environment variable PSYDAC_KERNEL_CACHE to 0 (or 'off') or to 1 (or 'on').
+    """
+    value = os.environ.get('PSYDAC_KERNEL_CACHE')
+    if value is None:
+        return PSYDAC_KERNEL_CACHE['enabled']
+    return value.strip().lower() not in ('0', 'off', 'false', 'no')
+
+#==============================================================================
+def _default_max_size():
+    value = os.environ.get('PSYDAC_KERNEL_CACHE_SIZE')
+    if value is None:
+        return PSYDAC_KERNEL_CACHE['max_size']
+    return int(value)
+
+#==============================================================================
+class KernelCache:
+    """
+    Size-bounded, persistent cache of compiled assembly kernels.
+
+    Parameters
+    ----------
+    folder : str
+        The folder where the JSON index of the cache is stored.
+
+    max_size : int, optional
+        Maximum total size (in bytes) of the files referenced by the cache.
+        If not given, PSYDAC_KERNEL_CACHE['max_size'] is used, unless the
+        environment variable PSYDAC_KERNEL_CACHE_SIZE is set.
+
+    """
+    def __init__(self, folder, *, max_size=None):
+
+        folder = os.path.abspath(folder)
+        mkdir_p(folder)
+
+        self._folder   = folder
+        self._index    = os.path.join(folder, PSYDAC_KERNEL_CACHE['index'])
+        self._lock     = FileLock(self._index + '.lock')
+        self._max_size = _default_max_size() if max_size is None else int(max_size)
+        self._hits     = 0
+        self._misses   = 0
+        self._evicted  = 0
+
+    #--------------------------------------------------------------------------
+    @property
+    def folder(self):
+        return self._folder
+
+    @property
+    def max_size(self):
+        return self._max_size
+
+    #--------------------------------------------------------------------------
+    @staticmethod
+    def make_key(code, tag, backend):
+        """
+        Compute the key of a generated module, i.e. a SHA-256 hash of its
+        source code (where the random tag is replaced by a placeholder) and of
+        the backend dictionary. The versions of Python and Pyccel are hashed
+        as well, because the compiled extensions depend on them.
+
+        Parameters
+        ----------
+        code : str
+            The generated Python code.
+
+        tag : str
+            The random tag that appears in the names of the generated code.
+
+        backend : dict
+            The backend used to accelerate the generated code.
+
+        Returns
+        -------
+        str
+            The hexadecimal digest of the hash.
+        """
+        from pyccel.version import __version__ as pyccel_version
+
+        backend_str = json.dumps({k: backend[k] for k in sorted(backend)}, default=str)
+        h = hashlib.sha256()
+        h.update(code.replace(tag, '{tag}').encode())
+        h.update(backend_str.encode())
+        h.update(sys.implementation.cache_tag.encode())
+        h.update(pyccel_version.encode())
+        return h.hexdigest()
+
+    #--------------------------------------------------------------------------
+    def _read_index(self):
+        if not os.path.isfile(self._index):
+            return {}
+        try:
+            with open(self._index, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_index(self, entries):
+        tmp = self._index + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(entries, f, indent=1)
+        os.replace(tmp, self._index)
+
+    #--------------------------------------------------------------------------
+    def tag_from_key(self, key, n=8):
+        """
+        Derive a tag of length n from the key. If the tag is already used by
+        a different entry of the cache, return None.
+        """
+        tag = key[:n]
+        with self._lock:
+            entries = self._read_index()
+        for k, e in entries.items():
+            if e['tag'] == tag and k != key:
+                return None
+        return tag
+
+    #--------------------------------------------------------------------------
+    def lookup(self, key):
+        """
+        Search the cache for the given key. If an entry is found, and all its
+        files still exist, update its access time and return it; otherwise
+        return None.
+        """
+        with self._lock:
+            entries = self._read_index()
+            entry   = entries.get(key)
+            if entry is not None:
+                if all(os.path.isfile(f) for f in entry['files']):
+                    entry['last_access'] = time.time()
+                    entry['hits'] += 1
+                    self._write_index(entries)
+                else:
+                    entries.pop(key)
+                    self._write_index(entries)
+                    entry = None
+
+        if entry is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+
+        return entry
+
+    #--------------------------------------------------------------------------
+    def store(self, key, *, tag, module, files):
+        """
+        Add a new entry to the cache, then evict the least recently used
+        entries if the maximum size is exceeded.
+
+        Parameters
+        ----------
+        key : str
+            The key returned by make_key().
+
+        tag : str
+            The tag used in the names of the generated code.
+
+        module : module
+            The (compiled) Python module which should be loaded on a hit.
+
+        files : list of str
+            Additional files that belong to this entry (e.g. generated code).
+
+        Returns
+        -------
+        dict
+            The new entry.
+        """
+        path  = os.path.abspath(module.__file__)
+        files = [path, *(os.path.abspath(f) for f in files if os.path.abspath(f) != path)]
+        entry = {
+            'tag'        : tag,
+            'module'     : module.__name__,
+            'path'       : path,
+            'files'      : files,
+            'size'       : sum(os.path.getsize(f) for f in files if os.path.isfile(f)),
+            'created'    : time.time(),
+            'last_access': time.time(),
+            'hits'       : 0,
+        }
+        with self._lock:
+            entries = self._read_index()
+            entries[key] = entry
+            self._evict(entries, keep=key)
+            self._write_index(entries)
+
+        return entry
+
+    #--------------------------------------------------------------------------
+    def _evict(self, entries, keep=None):
+        total = sum(e['size'] for e in entries.values())
+        lru   = sorted(entries, key=lambda k: entries[k]['last_access'])
+        for k in lru:
+            if total <= self._max_size:
+                break
+            if k == keep:
+                continue
+            e = entries.pop(k)
+            total -= e['size']
+            self._evicted += 1
+            for f in e['files']:
+                try:
+                    os.remove(f)
+                except OSError:
+                    pass
+
+    #--------------------------------------------------------------------------
+    @staticmethod
+    def load(entry):
+        """
+        Import the module of a cache entry directly from its file, without
+        going through the code generation and compilation steps.
+        """
+        return import_module_from_path(entry['module'], entry['path'])
+
+    #--------------------------------------------------------------------------
+    def clear(self):
+        """ Remove all the entries from the cache, and delete their files. """
+        with self._lock:
+            entries = self._read_index()
+            for e in entries.values():
+                for f in e['files']:
+                    try:
+                        os.remove(f)
+                    except OSError:
+                        pass
+            self._write_index({})
+
+    #--------------------------------------------------------------------------
+    def stats(self):
+        """
+        Get the statistics of the cache.
+
+        Returns
+        -------
+        dict
+            Number of hits, misses and evictions in the current process,
+            together with the number of entries and the total size (in bytes)
+            of the persistent cache.
+        """
+        with self._lock:
+            entries = self._read_index()
+        return {
+            'hits'    : self._hits,
+            'misses'  : self._misses,
+            'evicted' : self._evicted,
+            'entries' : len(entries),
+            'size'    : sum(e['size'] for e in entries.values()),
+            'max_size': self._max_size,
+        }
+
+    def report(self):
+        """ Return a human-readable summary of the cache statistics. """
+        s = self.stats()
+        calls = s['hits'] + s['misses']
+        rate  = 100 * s['hits'] / calls if calls else 0.
+        lines = [
+            'PSYDAC kernel cache: {}'.format(self._index),
+            '  hits     : {:d} ({:.1f}%)'.format(s['hits'], rate),
+            '  misses   : {:d}'.format(s['misses']),
+            '  evicted  : {:d}'.format(s['evicted']),
+            '  entries  : {:d}'.format(s['entries']),
+            '  size     : {:.2f} MB / {:.2f} MB'.format(s['size'] / 2**20, s['max_size'] / 2**20),
+        ]
+        return '\n'.join(lines)
+
+#==============================================================================
+_kernel_caches = {}
+
+def get_kernel_cache(folder):
+    """
+    Get the KernelCache associated with the given folder, which is created if
+    needed. Only one instance per folder exists in each process, so that the
+    statistics are accumulated over all discrete objects.
+    """
+    folder = os.path.abspath(folder)
+    if folder not in _kernel_caches:
+        _kernel_caches[folder] = KernelCache(folder)
+    return _kernel_caches[folder]
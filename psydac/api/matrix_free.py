@@ -0,0 +1,548 @@
+# coding: utf-8
+"""
+Matrix-free application of discrete bilinear forms.
+
+Instead of assembling the matrix of a bilinear form a(u, v), the operator
+defined here evaluates the product A @ x on the fly, following three steps:
+
+1. The trial function u_h with coefficients x, and all its partial
+   derivatives which appear in the form, are evaluated at the quadrature
+   points of all the local elements;
+
+2. At each quadrature point, these values are multiplied by the coefficients
+   of the form, which are computed once (or when the free fields change);
+
+3. The results are integrated against the partial derivatives of the test
+   functions.
+
+Since the spaces and the quadrature grid have a tensor-product structure,
+steps 1 and 3 are performed by sum factorization, i.e. by successive
+contractions of the local coefficients with the 1D basis values along each
+direction. The memory footprint is that of the coefficients at the
+quadrature points, rather than that of the (2p+1)^d bands of a StencilMatrix.
+
+Only forms defined by a single integral over the interior of a single-patch
+domain are supported. The domain may be mapped, with an analytical mapping or
+a spline (or NURBS) mapping.
+
+"""
+from itertools import product
+from math      import comb
+
+import numpy as np
+from sympy import Symbol, Matrix, ImmutableDenseMatrix, Indexed, lambdify, diff
+
+from sympde.expr                 import BilinearForm as sym_BilinearForm
+from sympde.core                 import Constant
+from sympde.topology             import Mapping
+from sympde.topology.basic       import Boundary, Interface
+from sympde.topology.space       import ScalarFunction, IndexedVectorFunction
+from sympde.topology.derivatives import _logical_partial_derivatives
+from sympde.topology.derivatives import get_atom_logical_derivatives
+from sympde.topology.derivatives import get_index_logical_derivatives
+
+from psydac.api.grid         import QuadratureGrid, BasisValues
+from psydac.cad.geometry     import Geometry
+from psydac.fem.basic        import FemField
+from psydac.fem.vector       import VectorFemSpace
+from psydac.linalg.basic     import LinearOperator, Vector, MatrixFreeLinearOperator
+from psydac.linalg.block     import BlockVector
+from psydac.mapping.discrete import SplineMapping, NurbsMapping
+
+__all__ = ('DiscreteMatrixFreeBilinearForm',)
+
+#==============================================================================
+def _collect_terms(expr, terms):
+    """
+    Collect the maximal sub-expressions of expr which are (derivatives of)
+    scalar functions, components of vector functions, or components of the
+    mapping.
+    """
+    if isinstance(expr, _logical_partial_derivatives):
+        terms.add(expr)
+    elif isinstance(expr, (ScalarFunction, IndexedVectorFunction)):
+        terms.add(expr)
+    elif isinstance(expr, Indexed) and isinstance(expr.base, Mapping):
+        terms.add(expr)
+    else:
+        for arg in expr.args:
+            _collect_terms(arg, terms)
+
+def _split_term(term, ldim):
+    """
+    Return the function, the component index and the multi-index of the
+    partial derivatives of a term.
+    """
+    atom  = get_atom_logical_derivatives(term)
+    index = get_index_logical_derivatives(term)
+    alpha = tuple(index['x{}'.format(k+1)] for k in range(ldim))
+
+    if isinstance(atom, IndexedVectorFunction):
+        return atom.base, atom.indices[0], alpha
+    elif isinstance(atom, Indexed):
+        return atom.base, int(atom.indices[0]), alpha
+    else:
+        return atom, 0, alpha
+
+#==============================================================================
+def _contract(X, B, k, ndim, transpose=False):
+    """
+    Contract the local axis along direction k of the element-wise array X,
+    of shape (n_1, a_1, ..., n_d, a_d), with the 1D array B of shape
+    (n_k, a_k, b_k), or (n_k, b_k, a_k) if transpose is True.
+    """
+    sub_X   = list(range(2*ndim))
+    sub_B   = [2*k, 2*k+1, 2*ndim] if not transpose else [2*k, 2*ndim, 2*k+1]
+    sub_out = sub_X.copy()
+    sub_out[2*k+1] = 2*ndim
+    return np.einsum(X, sub_X, B, sub_B, sub_out)
+
+def _local_indices(space, basis_values, component):
+    """
+    Indices of the local basis functions of each element in the data array
+    of a StencilVector, along each direction.
+    """
+    V = space.spaces[component] if isinstance(space, VectorFemSpace) else space
+    vs = V.vector_space
+    indices = []
+    for sp, p, pad, m in zip(basis_values.spans[component], V.degree, vs.pads, vs.shifts):
+        indices.append((sp - p + m*pad)[:, None] + np.arange(p+1)[None, :])
+    return indices
+
+def _gather(data, indices):
+    """ Local coefficients of all elements, of shape (n_1, p_1+1, ..., n_d, p_d+1). """
+    X = data[np.ix_(*[i.ravel() for i in indices])]
+    return X.reshape([s for i in indices for s in i.shape])
+
+def _scatter_add(data, indices, X):
+    """ Accumulate element-wise contributions X into the data array. """
+    for il in product(*[range(i.shape[1]) for i in indices]):
+        loc = tuple(x for l in il for x in (slice(None), l))
+        data[np.ix_(*[i[:, l] for i, l in zip(indices, il)])] += X[loc]
+
+#==============================================================================
+class DiscreteMatrixFreeBilinearForm(LinearOperator):
+    """
+    Discrete bilinear form applied without assembling its matrix.
+
+    This object is a LinearOperator from the trial vector space to the test
+    vector space: its dot() method evaluates the bilinear form on the fly by
+    sum factorization, hence it can be passed to the iterative solvers in
+    psydac.linalg.solvers. It should be created by calling
+    `discretize(a, domain_h, [Vh, Vh], matrix_free=True)`.
+
+    Parameters
+    ----------
+    expr : sympde.expr.expr.BilinearForm
+        The symbolic bilinear form.
+
+    kernel_expr : sympde.expr.evaluation.KernelExpression
+        The atomic representation of the bilinear form.
+
+    domain_h : Geometry
+        The discretized domain.
+
+    spaces : list of FemSpace
+        The discrete trial and test spaces.
+
+    nquads : list or tuple of int
+        The number of quadrature points along each direction.
+
+    symbolic_mapping : Sympde.topology.Mapping, optional
+        The symbolic mapping which defines the physical domain of the bilinear form.
+
+    **kwargs
+        The other keyword arguments of DiscreteBilinearForm (e.g. backend)
+        are accepted for compatibility, and ignored.
+
+    See Also
+    --------
+    psydac.api.fem.DiscreteBilinearForm
+
+    Notes
+    -----
+    The coefficients of the form are evaluated at the quadrature points once,
+    and again whenever assemble() is called with new free fields or
+    constants. Coefficients which are constant in space are stored as scalars.
+
+    """
+    def __init__(self, expr, kernel_expr, domain_h, spaces, *, nquads,
+                 symbolic_mapping=None, **kwargs):
+
+        if not isinstance(expr, sym_BilinearForm):
+            raise TypeError('> Expecting a symbolic BilinearForm')
+
+        assert isinstance(domain_h, Geometry)
+
+        if isinstance(kernel_expr, (tuple, list)):
+            if len(kernel_expr) == 1:
+                kernel_expr = kernel_expr[0]
+            else:
+                raise NotImplementedError('Matrix-free forms with several integrals are not available')
+
+        if len(domain_h.domain) > 1:
+            raise NotImplementedError('Matrix-free forms are only available on single-patch domains')
+
+        if isinstance(kernel_expr.target, (Boundary, Interface)):
+            raise NotImplementedError('Matrix-free forms are only available for integrals over the domain')
+
+        trial_space, test_space = spaces
+        ldim = test_space.ldim
+
+        self._expr        = expr
+        self._kernel_expr = kernel_expr
+        self._spaces      = (trial_space, test_space)
+        self._ldim        = ldim
+        self._domain      = trial_space.vector_space
+        self._codomain    = test_space.vector_space
+
+        # Discrete mapping, if any
+        mapping = list(domain_h.mappings.values())[0]
+
+        # ... Split the integrand into the sum of c_{ij} * D^alpha(u_i) * D^beta(v_j)
+        integrand = kernel_expr.expr
+        if isinstance(integrand, (Matrix, ImmutableDenseMatrix)):
+            integrand = sum(integrand)
+
+        trials, tests = expr.variables
+        if len(trials) > 1 or len(tests) > 1:
+            raise NotImplementedError('Matrix-free forms on product spaces are not available')
+        trial, test = trials[0], tests[0]
+        terms = set()
+        _collect_terms(integrand, terms)
+
+        trial_terms = {}
+        test_terms  = {}
+        field_terms = {}
+        symbols     = {}
+        for n, term in enumerate(sorted(terms, key=str)):
+            s = Symbol('t_{}'.format(n))
+            symbols[term] = s
+            f, comp, alpha = _split_term(term, ldim)
+            if f == trial:
+                trial_terms[(comp, alpha)] = s
+            elif f == test:
+                test_terms[(comp, alpha)] = s
+            else:
+                field_terms[s] = (f, comp, alpha)
+
+        integrand = integrand.xreplace(symbols)
+
+        free_symbols = {str(a): a for a in integrand.free_symbols}
+        coords    = [free_symbols.get('x{}'.format(k+1), Symbol('x{}'.format(k+1))) for k in range(ldim)]
+        constants = sorted(integrand.atoms(Constant), key=str)
+        fields    = sorted({f for f, _, _ in field_terms.values() if not isinstance(f, Mapping)}, key=str)
+
+        field_syms = list(field_terms)
+        args       = [*coords, *field_syms, *constants]
+
+        coeffs = {}
+        for (i, alpha), su in trial_terms.items():
+            for (j, beta), sv in test_terms.items():
+                c = diff(integrand, su, sv)
+                if c != 0:
+                    coeffs[(i, alpha, j, beta)] = (lambdify(args, c, 'numpy'), c.free_symbols & set(args))
+        # ...
+
+        self._mapping      = mapping
+        self._field_terms  = field_terms
+        self._field_syms   = field_syms
+        self._constants    = constants
+        self._coeff_funcs  = coeffs
+        self._free_args    = tuple(str(a) for a in (*fields, *constants))
+        self._trial_terms  = tuple(trial_terms)
+        self._test_terms   = tuple(test_terms)
+
+        # ... Quadrature grid and basis values
+        alphas = [a for _, a in (*trial_terms, *test_terms)] + [a for _, _, a in field_terms.values()]
+        nderiv = max((max(a) for a in alphas), default=0)
+
+        grid = QuadratureGrid(test_space, nquads=nquads)
+        self._grid   = grid
+        self._nquads = nquads
+        self._nderiv = nderiv
+
+        # Basis values on the quadrature grid, without and with the quadrature weights
+        trial_basis = [BasisValues(trial_space, nderiv=nderiv, nquads=nquads, trial=t, grid=grid) for t in (True, False)]
+        test_basis  = [BasisValues(test_space,  nderiv=nderiv, nquads=nquads, trial=t, grid=grid) for t in (True, False)]
+
+        ntrial = len(trial_space.spaces) if isinstance(trial_space, VectorFemSpace) else 1
+        ntest  = len(test_space.spaces)  if isinstance(test_space,  VectorFemSpace) else 1
+
+        self._trial_indices = [_local_indices(trial_space, trial_basis[0], i) for i in range(ntrial)]
+        self._test_indices  = [_local_indices(test_space,  test_basis[0],  j) for j in range(ntest)]
+        self._trial_basis   = [b.basis for b in trial_basis]
+        self._test_basis    = [b.basis for b in test_basis]
+
+        for i, j in product(range(ntrial), range(ntest)):
+            for k in range(ldim):
+                assert self._trial_indices[i][k].shape[0] == self._test_indices[j][k].shape[0]
+
+        # Shape of the arrays of values at the quadrature points
+        self._qshape = tuple(s for w in grid.weights for s in w.shape)
+
+        self._coeffs = None
+        self._field_basis = {}
+        if not self._free_args:
+            self._coeffs = self._evaluate_coefficients({})
+
+    #--------------------------------------------------------------------------
+    @property
+    def domain(self):
+        return self._domain
+
+    @property
+    def codomain(self):
+        return self._codomain
+
+    @property
+    def dtype(self):
+        return self._codomain.dtype
+
+    @property
+    def expr(self):
+        return self._expr
+
+    @property
+    def kernel_expr(self):
+        return self._kernel_expr
+
+    @property
+    def spaces(self):
+        return self._spaces
+
+    @property
+    def grid(self):
+        return self._grid
+
+    @property
+    def free_args(self):
+        return self._free_args
+
+    @property
+    def coefficients(self):
+        """
+        Dictionary of the coefficients of the form at the quadrature points,
+        with keys (i, alpha, j, beta) corresponding to the product of the
+        derivative D^alpha of the i-th component of the trial function with
+        the derivative D^beta of the j-th component of the test function.
+        """
+        return self._coeffs
+
+    #--------------------------------------------------------------------------
+    def _evaluate_field(self, coeffs, space, comp, alpha):
+        """ Evaluate D^alpha of a component of a field at the quadrature points. """
+        key = id(space)
+        if key not in self._field_basis:
+            basis = BasisValues(space, nderiv=self._nderiv, nquads=self._nquads, trial=True, grid=self._grid)
+            ncomp = len(space.spaces) if isinstance(space, VectorFemSpace) else 1
+            self._field_basis[key] = (basis, [_local_indices(space, basis, i) for i in range(ncomp)])
+
+        basis, indices = self._field_basis[key]
+
+        if isinstance(coeffs, BlockVector):
+            coeffs = coeffs[comp]
+        if not coeffs.ghost_regions_in_sync:
+            coeffs.update_ghost_regions()
+
+        X = _gather(coeffs._data, indices[comp])
+        for k in range(self._ldim):
+            X = _contract(X, basis.basis[comp][k][:, :, alpha[k], :], k, self._ldim)
+        return X
+
+    def _evaluate_mapping(self, comp, alpha, memo):
+        """
+        Evaluate D^alpha of a component of the discrete mapping at the
+        quadrature points. For a NURBS mapping F = N / W, the derivatives are
+        computed recursively from the Leibniz formula applied to N = F * W.
+        """
+        key = (comp, alpha)
+        if key in memo:
+            return memo[key]
+
+        mapping = self._mapping
+        field   = mapping._weights_field if comp == 'w' else mapping._fields[comp]
+
+        if not isinstance(mapping, NurbsMapping):
+            value = self._evaluate_field(field.coeffs, field.space, 0, alpha)
+
+        else:
+            weights = mapping._weights_field.coeffs
+            if not weights.ghost_regions_in_sync:
+                weights.update_ghost_regions()
+
+            W = lambda gamma: self._evaluate_mapping('w', gamma, memo)
+            if comp == 'w':
+                value = self._evaluate_field(weights, field.space, 0, alpha)
+            else:
+                if not field.coeffs.ghost_regions_in_sync:
+                    field.coeffs.update_ghost_regions()
+                weighted = field.coeffs.copy()
+                weighted._data[...] *= weights._data
+                weighted.ghost_regions_in_sync = True
+
+                value = self._evaluate_field(weighted, field.space, 0, alpha)
+                for beta in product(*[range(a+1) for a in alpha]):
+                    if beta != alpha:
+                        binom = np.prod([comb(a, b) for a, b in zip(alpha, beta)])
+                        gamma = tuple(a-b for a, b in zip(alpha, beta))
+                        value = value - binom * self._evaluate_mapping(comp, beta, memo) * W(gamma)
+                value = value / W((0,) * self._ldim)
+
+        memo[key] = value
+        return value
+
+    def _evaluate_coefficients(self, kwargs):
+        """ Evaluate the coefficients of the form at the quadrature points. """
+        ldim  = self._ldim
+        grid  = self._grid
+
+        # Logical coordinates of the quadrature points, ready for broadcasting
+        coords = []
+        for k in range(ldim):
+            shape = [1] * (2*ldim)
+            shape[2*k:2*k+2] = grid.points[k].shape
+            coords.append(grid.points[k].reshape(shape))
+
+        # Values of the free fields and of the mapping at the quadrature points
+        values = []
+        memo   = {}
+        for s in self._field_syms:
+            f, comp, alpha = self._field_terms[s]
+            if isinstance(f, Mapping):
+                if not isinstance(self._mapping, SplineMapping):
+                    raise NotImplementedError('Mapping of type {} is not supported'.format(type(self._mapping)))
+                values.append(self._evaluate_mapping(comp, alpha, memo))
+            else:
+                field = kwargs[str(f)]
+                assert isinstance(field, FemField)
+                values.append(self._evaluate_field(field.coeffs, field.space, comp, alpha))
+
+        constants = [kwargs[str(c)] for c in self._constants]
+        args = [*coords, *values, *constants]
+
+        coeffs = {}
+        for key, (func, deps) in self._coeff_funcs.items():
+            c = func(*args)
+            if deps:
+                c = np.broadcast_to(c, self._qshape)
+            coeffs[key] = c
+
+        return coeffs
+
+    #--------------------------------------------------------------------------
+    def assemble(self, **kwargs):
+        """
+        Set the free fields and constants of the form, if any, and evaluate
+        its coefficients at the quadrature points.
+
+        Returns
+        -------
+        DiscreteMatrixFreeBilinearForm
+            The linear operator itself, for compatibility with the interface
+            of DiscreteBilinearForm.
+        """
+        if self._free_args or self._coeffs is None:
+            missing = [a for a in self._free_args if a not in kwargs]
+            if missing:
+                raise ValueError('Missing free arguments: {}'.format(', '.join(missing)))
+            self._coeffs = self._evaluate_coefficients(kwargs)
+        return self
+
+    #--------------------------------------------------------------------------
+    def _apply(self, v, out, transpose):
+
+        if self._coeffs is None:
+            raise ValueError('The free arguments {} must be set by calling assemble()'.format(self._free_args))
+
+        ldim = self._ldim
+
+        if transpose:
+            src_terms, dst_terms = self._test_terms, self._trial_terms
+            src_indices, dst_indices = self._test_indices, self._trial_indices
+            src_basis, dst_basis = self._test_basis[0], self._trial_basis[1]
+        else:
+            src_terms, dst_terms = self._trial_terms, self._test_terms
+            src_indices, dst_indices = self._trial_indices, self._test_indices
+            src_basis, dst_basis = self._trial_basis[0], self._test_basis[1]
+
+        if not v.ghost_regions_in_sync:
+            v.update_ghost_regions()
+
+        vs   = v.blocks   if isinstance(v, BlockVector)   else (v,)
+        outs = out.blocks if isinstance(out, BlockVector) else (out,)
+
+        # Values of the source terms at the quadrature points, by sum factorization:
+        # the partial contractions are shared by the terms with a common prefix
+        values  = {}
+        partial = {}
+        for i, alpha in src_terms:
+            X = partial.get((i, ()))
+            if X is None:
+                X = partial[(i, ())] = _gather(vs[i]._data, src_indices[i])
+            for k in range(ldim):
+                key = (i, alpha[:k+1])
+                if key not in partial:
+                    partial[key] = _contract(X, src_basis[i][k][:, :, alpha[k], :], k, ldim)
+                X = partial[key]
+            values[(i, alpha)] = X
+
+        # Multiply by the coefficients, and integrate against the destination terms
+        for o in outs:
+            o._data[...] = 0
+        for j, beta in dst_terms:
+            G = 0
+            for (i, alpha, jj, bb), c in self._coeffs.items():
+                src, dst = ((jj, bb), (i, alpha)) if transpose else ((i, alpha), (jj, bb))
+                if dst == (j, beta):
+                    G = G + c * values[src]
+            if isinstance(G, int):
+                continue
+            G = np.broadcast_to(G, self._qshape)
+            for k in range(ldim):
+                G = _contract(G, dst_basis[j][k][:, :, beta[k], :], k, ldim, transpose=True)
+            _scatter_add(outs[j]._data, dst_indices[j], G)
+
+        out.exchange_assembly_data()
+        out.ghost_regions_in_sync = False
+        return out
+
+    def dot(self, v, out=None):
+        assert isinstance(v, Vector)
+        assert v.space == self.domain
+
+        if out is not None:
+            assert isinstance(out, Vector)
+            assert out.space == self.codomain
+        else:
+            out = self.codomain.zeros()
+
+        return self._apply(v, out, transpose=False)
+
+    def _dot_transpose(self, v, out=None):
+        assert isinstance(v, Vector)
+        assert v.space == self.codomain
+
+        if out is not None:
+            assert isinstance(out, Vector)
+            assert out.space == self.domain
+        else:
+            out = self.domain.zeros()
+
+        return self._apply(v, out, transpose=True)
+
+    #--------------------------------------------------------------------------
+    def toarray(self):
+        raise NotImplementedError('toarray() is not defined for DiscreteMatrixFreeBilinearForm.')
+
+    def tosparse(self):
+        raise NotImplementedError('tosparse() is not defined for DiscreteMatrixFreeBilinearForm.')
+
+    def transpose(self, conjugate=False):
+        if conjugate:
+            dot = lambda v, *, out=None: self._dot_transpose(v.conjugate(), out=out).conjugate(out=out)
+        else:
+            dot = lambda v, *, out=None: self._dot_transpose(v, out=out)
+        dot_transpose = lambda v, *, out=None: self.dot(v, out=out)
+        return MatrixFreeLinearOperator(domain=self.codomain, codomain=self.domain,
+                                        dot=dot, dot_transpose=dot_transpose)
@@ -2,12 +2,19 @@
 import platform
 
 
-__all__ = ('PSYDAC_DEFAULT_FOLDER', 'PSYDAC_BACKENDS')
+__all__ = ('PSYDAC_DEFAULT_FOLDER', 'PSYDAC_BACKENDS', 'PSYDAC_KERNEL_CACHE')
 
 #==============================================================================
 
 PSYDAC_DEFAULT_FOLDER = {'name':'__psydac__'}
 
+# ... persistent cache of the generated assembly kernels (see psydac/api/kernel_cache.py)
+#     'enabled'  can be overridden by the environment variable PSYDAC_KERNEL_CACHE
+#     'max_size' (in bytes) can be overridden by PSYDAC_KERNEL_CACHE_SIZE
+PSYDAC_KERNEL_CACHE = {'enabled' : True,
+                       'max_size': 2**30,
+                       'index'   : 'kernel_cache.json'}
+
 # ... defining PSYDAC backends
 PSYDAC_BACKEND_PYTHON = {'name': 'python', 'tag':'python', 'openmp':False}
 
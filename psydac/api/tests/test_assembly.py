@@ -529,6 +529,46 @@ def test_assembly_no_synchr_args(backend):
     assert( abs(inte_lin) < 1.e-12)
     assert( abs(inte_norm) < 1.e-12)
 
+#==============================================================================
+@pytest.mark.parametrize('periodic', [True, False])
+def test_symmetric_storage_BilinearForm(backend, periodic):
+
+    from sympde.calculus import grad, dot
+    from sympde.topology import dx1
+    from psydac.linalg.stencil import StencilMatrix, SymmetricStencilMatrix
+
+    kwargs = {'backend': PSYDAC_BACKENDS[backend]} if backend else {}
+
+    domain = Square()
+    V = ScalarFunctionSpace('V', domain)
+    u, v = [element_of(V, name=n) for n in ('u', 'v')]
+
+    x, y = domain.coordinates
+    a = BilinearForm((u, v), integral(domain, (1 + x*y) * dot(grad(u), grad(v)) + u * v)
+                           + integral(domain.boundary, u * v))
+    b = BilinearForm((u, v), integral(domain, dx1(u) * v))
+
+    domain_h = discretize(domain, ncells=(6, 5), periodic=(periodic, False))
+    Vh = discretize(V, domain_h, degree=(2, 3))
+
+    A = discretize(a, domain_h, [Vh, Vh], **kwargs).assemble()
+    S = discretize(a, domain_h, [Vh, Vh], symmetric_storage=True, **kwargs).assemble()
+    B = discretize(b, domain_h, [Vh, Vh], symmetric_storage=True, **kwargs).assemble()
+
+    assert isinstance(S, SymmetricStencilMatrix)
+    assert type(B) is StencilMatrix
+    assert np.allclose(S.toarray(), A.toarray(), rtol=1e-13, atol=1e-13)
+
+    w = array_to_psydac(np.random.default_rng(0).random(Vh.nbasis), Vh.vector_space)
+    assert np.allclose(S.dot(w).toarray(), A.dot(w).toarray(), rtol=1e-13, atol=1e-13)
+
+    # Essential boundary conditions keep the matrix symmetric
+    from sympde.expr import EssentialBC
+    from psydac.api.essential_bc import apply_essential_bc
+    apply_essential_bc(S, *[EssentialBC(u, 0, e) for e in domain.boundary if e.axis == 1], identity=True)
+    M = S.toarray()
+    assert np.allclose(M, M.T, rtol=1e-13, atol=1e-13)
+
 #==============================================================================
 if __name__ == '__main__':
     test_Norm_complex(None)
@@ -0,0 +1,70 @@
+import pytest
+import numpy as np
+
+from sympde.topology import Square
+from sympde.topology import ScalarFunctionSpace
+from sympde.topology import element_of
+from sympde.expr     import BilinearForm, LinearForm
+from sympde.expr     import integral
+from sympde.calculus import grad, dot
+from sympy           import sin, pi
+
+from psydac.api.discretization import discretize, discretize_many
+from psydac.api.basic          import DeferredCompilation
+from psydac.api.settings       import PSYDAC_BACKEND_PYTHON, PSYDAC_BACKEND_GPYCCEL
+
+#==============================================================================
+def test_discretize_many(tmp_path, monkeypatch):
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('PSYDAC_KERNEL_CACHE', '0')
+
+    domain = Square()
+    x, y   = domain.coordinates
+    V = ScalarFunctionSpace('V', domain)
+    u = element_of(V, name='u')
+    v = element_of(V, name='v')
+
+    a = BilinearForm((u, v), integral(domain, dot(grad(u), grad(v))))
+    m = BilinearForm((u, v), integral(domain, u * v))
+    l = LinearForm(v, integral(domain, sin(pi*x) * sin(pi*y) * v))
+
+    domain_h = discretize(domain, ncells=(4, 4))
+    Vh = discretize(V, domain_h, degree=(2, 2))
+
+    with DeferredCompilation(max_workers=2) as dc:
+        ah = discretize(a, domain_h, [Vh, Vh], backend=PSYDAC_BACKEND_GPYCCEL)
+        assert ah.func is None
+        assert dc.pending == (ah,)
+
+    assert ah.func is not None
+    assert not dc.pending
+
+    mh, lh = discretize_many((m, domain_h, [Vh, Vh]),
+                             (l, domain_h, Vh, {'nquads': 4}),
+                             backend=PSYDAC_BACKEND_GPYCCEL, max_workers=2)
+
+    A = ah.assemble().toarray()
+    M = mh.assemble().toarray()
+    b = lh.assemble().toarray()
+
+    # Compare with the Python backend
+    A_ref = discretize(a, domain_h, [Vh, Vh], backend=PSYDAC_BACKEND_PYTHON).assemble().toarray()
+    M_ref = discretize(m, domain_h, [Vh, Vh], backend=PSYDAC_BACKEND_PYTHON).assemble().toarray()
+    b_ref = discretize(l, domain_h, Vh, nquads=4, backend=PSYDAC_BACKEND_PYTHON).assemble().toarray()
+
+    assert np.allclose(A, A_ref, rtol=1e-13, atol=1e-13)
+    assert np.allclose(M, M_ref, rtol=1e-13, atol=1e-13)
+    assert np.allclose(b, b_ref, rtol=1e-13, atol=1e-13)
+
+#==============================================================================
+# CLEAN UP SYMPY NAMESPACE
+#==============================================================================
+
+def teardown_module():
+    from sympy.core import cache
+    cache.clear_cache()
+
+def teardown_function():
+    from sympy.core import cache
+    cache.clear_cache()
@@ -0,0 +1,151 @@
+import pytest
+import numpy as np
+from mpi4py import MPI
+
+from sympde.topology import Square
+from sympde.topology import ScalarFunctionSpace, VectorFunctionSpace
+from sympde.topology import element_of, elements_of
+from sympde.expr     import BilinearForm, LinearForm, integral
+from sympde.core     import Constant
+from sympde.calculus import grad, dot, div
+from sympy           import sin, pi
+
+from psydac.api.discretization import discretize
+from psydac.api.fem            import DiscreteIncrementalForm, split_form
+from psydac.api.settings       import PSYDAC_BACKEND_PYTHON
+from psydac.fem.basic          import FemField
+
+#==============================================================================
+def random_field(Vh, seed):
+    rng = np.random.default_rng(seed)
+    wh  = FemField(Vh)
+    c   = wh.coeffs
+    idx = tuple(slice(s, e+1) for s, e in zip(c.starts, c.ends))
+    c[idx] = rng.random(tuple(e+1-s for s, e in zip(c.starts, c.ends)))
+    c.update_ghost_regions()
+    return wh
+
+#==============================================================================
+def test_split_form():
+
+    domain = Square()
+    B      = domain.boundary
+    V      = ScalarFunctionSpace('V', domain)
+    u, v   = elements_of(V, names='u, v')
+    w      = element_of(V, name='w')
+    c      = Constant('c')
+
+    a = BilinearForm((u, v), integral(domain, dot(grad(u), grad(v)) + w*u*v + c*u*v) + integral(B, u*v))
+    a0, a1 = split_form(a)
+
+    assert a0.variables == a.variables
+    assert a1.variables == a.variables
+    assert a0.fields == ()
+    assert a1.fields == (w,)
+    assert not a0.expr.atoms(Constant)
+
+    l = LinearForm(v, integral(domain, v))
+    l0, l1 = split_form(l)
+    assert l0 is not None
+    assert l1 is None
+
+#==============================================================================
+@pytest.mark.parametrize('backend', [PSYDAC_BACKEND_PYTHON])
+def test_incremental_bilinear_form(backend):
+
+    domain = Square()
+    x, y   = domain.coordinates
+    V      = ScalarFunctionSpace('V', domain)
+    u, v   = elements_of(V, names='u, v')
+    w      = element_of(V, name='w')
+    c      = Constant('c')
+
+    a = BilinearForm((u, v), integral(domain, (1 + x*y) * dot(grad(u), grad(v)) + c * w**2 * u * v))
+
+    domain_h = discretize(domain, ncells=(5, 4), periodic=(True, False))
+    Vh = discretize(V, domain_h, degree=(2, 3))
+
+    ah  = discretize(a, domain_h, [Vh, Vh], backend=backend, incremental=True)
+    ref = discretize(a, domain_h, [Vh, Vh], backend=backend)
+
+    assert isinstance(ah, DiscreteIncrementalForm)
+    assert set(ah.free_args) == {'w', 'c'}
+
+    for i in range(3):
+        wh = random_field(Vh, seed=i)
+        A  = ah.assemble(w=wh, c=1.0 + i)
+        A_ref = ref.assemble(w=wh, c=1.0 + i)
+        assert np.allclose(A.toarray(), A_ref.toarray(), rtol=1e-13, atol=1e-13)
+
+    # The field arguments are computed only once for each space
+    assert len(ah.variable_form._field_args) == 1
+
+    # The constant part is added again if reset=False
+    A = ah.assemble(reset=False, w=wh, c=3.0).toarray()
+    assert np.allclose(A, 2 * A_ref.toarray(), rtol=1e-13, atol=1e-13)
+
+#==============================================================================
+def test_incremental_vector_forms():
+
+    domain = Square()
+    V      = ScalarFunctionSpace('V', domain)
+    W      = VectorFunctionSpace('W', domain)
+    u, v   = elements_of(W, names='u, v')
+    w      = element_of(V, name='w')
+    q      = element_of(V, name='q')
+    x, y   = domain.coordinates
+
+    a = BilinearForm((u, v), integral(domain, div(u) * div(v) + w * dot(u, v)))
+    l = LinearForm(q, integral(domain, sin(pi*x) * q + w * q))
+
+    domain_h = discretize(domain, ncells=(4, 4))
+    Vh = discretize(V, domain_h, degree=(2, 2))
+    Wh = discretize(W, domain_h, degree=(2, 2))
+
+    kwargs = dict(backend=PSYDAC_BACKEND_PYTHON)
+    ah = discretize(a, domain_h, [Wh, Wh], incremental=True, **kwargs)
+    lh = discretize(l, domain_h, Vh, incremental=True, **kwargs)
+    a_ref = discretize(a, domain_h, [Wh, Wh], **kwargs)
+    l_ref = discretize(l, domain_h, Vh, **kwargs)
+
+    for i in range(2):
+        wh = random_field(Vh, seed=i)
+        assert np.allclose(ah.assemble(w=wh).toarray(), a_ref.assemble(w=wh).toarray(), rtol=1e-13, atol=1e-13)
+        assert np.allclose(lh.assemble(w=wh).toarray(), l_ref.assemble(w=wh).toarray(), rtol=1e-13, atol=1e-13)
+
+#==============================================================================
+@pytest.mark.parallel
+def test_incremental_bilinear_form_parallel():
+
+    domain = Square()
+    x, y   = domain.coordinates
+    V      = ScalarFunctionSpace('V', domain)
+    u, v   = elements_of(V, names='u, v')
+    w      = element_of(V, name='w')
+
+    a = BilinearForm((u, v), integral(domain, (1 + x*y) * dot(grad(u), grad(v)) + w * u * v))
+
+    domain_h = discretize(domain, ncells=(8, 6), periodic=(True, False), comm=MPI.COMM_WORLD)
+    Vh = discretize(V, domain_h, degree=(2, 2))
+
+    ah  = discretize(a, domain_h, [Vh, Vh], backend=PSYDAC_BACKEND_PYTHON, incremental=True)
+    ref = discretize(a, domain_h, [Vh, Vh], backend=PSYDAC_BACKEND_PYTHON)
+
+    for i in range(2):
+        wh = random_field(Vh, seed=i)
+        A  = ah.assemble(w=wh)
+        A_ref = ref.assemble(w=wh)
+        x  = random_field(Vh, seed=10).coeffs
+        assert np.allclose(A.dot(x).toarray(), A_ref.dot(x).toarray(), rtol=1e-13, atol=1e-13)
+
+#==============================================================================
+# CLEAN UP SYMPY NAMESPACE
+#==============================================================================
+
+def teardown_module():
+    from sympy.core import cache
+    cache.clear_cache()
+
+def teardown_function():
+    from sympy.core import cache
+    cache.clear_cache()
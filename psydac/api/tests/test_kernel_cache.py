@@ -0,0 +1,144 @@
+import os
+import types
+
+import pytest
+import numpy as np
+
+from sympde.topology import Square
+from sympde.topology import ScalarFunctionSpace
+from sympde.topology import element_of
+from sympde.expr     import BilinearForm
+from sympde.expr     import integral
+from sympde.calculus import grad, dot
+
+from psydac.api.discretization import discretize
+from psydac.api.settings       import PSYDAC_BACKEND_PYTHON, PSYDAC_BACKEND_GPYCCEL
+from psydac.api.kernel_cache   import KernelCache
+
+#==============================================================================
+def make_module(folder, name, size):
+    """ Create a dummy module file of the given size (in bytes). """
+    path = os.path.join(folder, name + '.py')
+    with open(path, 'w') as f:
+        f.write('#' * (size - 1) + '\n')
+    module = types.ModuleType(name)
+    module.__file__ = path
+    return module
+
+#==============================================================================
+def test_kernel_cache_key():
+
+    code1 = 'def assemble_abcd1234(x_abcd1234):\n    return x_abcd1234\n'
+    code2 = 'def assemble_wxyz9876(x_wxyz9876):\n    return x_wxyz9876\n'
+
+    key1 = KernelCache.make_key(code1, 'abcd1234', PSYDAC_BACKEND_PYTHON)
+    key2 = KernelCache.make_key(code2, 'wxyz9876', PSYDAC_BACKEND_PYTHON)
+    key3 = KernelCache.make_key(code1, 'abcd1234', PSYDAC_BACKEND_GPYCCEL)
+
+    # The key does not depend on the random tag, but it depends on the backend
+    assert key1 == key2
+    assert key1 != key3
+
+    # The key also depends on the backend options
+    backend = dict(PSYDAC_BACKEND_GPYCCEL, openmp=True)
+    key4 = KernelCache.make_key(code1, 'abcd1234', backend)
+    assert key3 != key4
+
+#==============================================================================
+def test_kernel_cache_store_lookup_evict(tmp_path):
+
+    folder = str(tmp_path)
+    cache  = KernelCache(folder, max_size=250)
+
+    assert cache.lookup('a') is None
+
+    mod_a = make_module(folder, 'mod_a', 100)
+    mod_b = make_module(folder, 'mod_b', 100)
+    mod_c = make_module(folder, 'mod_c', 100)
+
+    cache.store('a', tag='a', module=mod_a, files=[])
+    cache.store('b', tag='b', module=mod_b, files=[])
+
+    # Access 'a' so that 'b' becomes the least recently used entry
+    entry = cache.lookup('a')
+    assert entry['module'] == 'mod_a'
+    assert cache.tag_from_key('a', n=1) == 'a'
+    assert cache.tag_from_key('ax', n=1) is None
+
+    cache.store('c', tag='c', module=mod_c, files=[])
+
+    assert cache.lookup('b') is None
+    assert not os.path.exists(mod_b.__file__)
+    assert cache.lookup('a') is not None
+    assert cache.lookup('c') is not None
+
+    # A new KernelCache object on the same folder sees the persistent entries
+    stats = KernelCache(folder, max_size=250).stats()
+    assert stats['entries'] == 2
+    assert stats['size'] == 200
+
+    stats = cache.stats()
+    assert stats['hits'] == 3
+    assert stats['misses'] == 2
+    assert stats['evicted'] == 1
+    assert 'hits' in cache.report()
+
+    # Loading an entry imports the module from its file
+    module = KernelCache.load(cache.lookup('c'))
+    assert module.__file__ == mod_c.__file__
+
+    cache.clear()
+    assert cache.stats()['entries'] == 0
+    assert not os.path.exists(mod_a.__file__)
+
+#==============================================================================
+def test_kernel_cache_discrete_bilinear_form(tmp_path, monkeypatch):
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv('PSYDAC_KERNEL_CACHE', raising=False)
+
+    domain = Square()
+    V = ScalarFunctionSpace('V', domain)
+    u = element_of(V, name='u')
+    v = element_of(V, name='v')
+
+    a = BilinearForm((u, v), integral(domain, dot(grad(u), grad(v))))
+
+    domain_h = discretize(domain, ncells=(4, 4))
+    Vh = discretize(V, domain_h, degree=(2, 2))
+
+    ah1 = discretize(a, domain_h, [Vh, Vh], backend=PSYDAC_BACKEND_PYTHON)
+    ah2 = discretize(a, domain_h, [Vh, Vh], backend=PSYDAC_BACKEND_PYTHON)
+
+    assert not ah1.cache_hit
+    assert ah2.cache_hit
+    assert ah1.tag == ah2.tag
+    assert ah1.cache_key == ah2.cache_key
+
+    A1 = ah1.assemble().toarray()
+    A2 = ah2.assemble().toarray()
+    assert np.array_equal(A1, A2)
+
+    # Different number of quadrature points: different kernel
+    ah3 = discretize(a, domain_h, [Vh, Vh], nquads=(4, 4), backend=PSYDAC_BACKEND_PYTHON)
+    assert not ah3.cache_hit
+    assert ah3.tag != ah1.tag
+
+    # The cache can be disabled through an environment variable
+    monkeypatch.setenv('PSYDAC_KERNEL_CACHE', '0')
+    ah4 = discretize(a, domain_h, [Vh, Vh], backend=PSYDAC_BACKEND_PYTHON)
+    assert ah4.kernel_cache is None
+    assert not ah4.cache_hit
+    assert ah4.tag != ah1.tag
+
+#==============================================================================
+# CLEAN UP SYMPY NAMESPACE
+#==============================================================================
+
+def teardown_module():
+    from sympy.core import cache
+    cache.clear_cache()
+
+def teardown_function():
+    from sympy.core import cache
+    cache.clear_cache()
@@ -0,0 +1,80 @@
+import numpy as np
+
+from sympde.topology import Square
+from sympde.topology import ScalarFunctionSpace
+from sympde.topology import element_of
+from sympde.expr     import BilinearForm, LinearForm, Norm
+from sympde.expr     import integral
+from sympde.calculus import grad, dot
+from sympy           import sin, pi
+
+from psydac.api.discretization import discretize
+from psydac.api.settings       import PSYDAC_BACKEND_PYTHON
+from psydac.fem.basic          import FemField
+
+#==============================================================================
+def test_lazy_compilation(tmp_path, monkeypatch):
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('PSYDAC_KERNEL_CACHE', '0')
+
+    domain = Square()
+    x, y   = domain.coordinates
+    V = ScalarFunctionSpace('V', domain)
+    u = element_of(V, name='u')
+    v = element_of(V, name='v')
+    w = element_of(V, name='w')
+
+    a = BilinearForm((u, v), integral(domain, w * dot(grad(u), grad(v))))
+    l = LinearForm(v, integral(domain, sin(pi*x) * sin(pi*y) * v))
+    n = Norm(u - sin(pi*x) * sin(pi*y), domain, kind='l2')
+
+    domain_h = discretize(domain, ncells=(4, 4))
+    Vh = discretize(V, domain_h, degree=(2, 2))
+
+    kwargs = dict(backend=PSYDAC_BACKEND_PYTHON)
+    ah = discretize(a, domain_h, [Vh, Vh], lazy=True, **kwargs)
+    lh = discretize(l, domain_h, Vh, lazy=True, **kwargs)
+    nh = discretize(n, domain_h, Vh, lazy=True, **kwargs)
+
+    # The free arguments and the number of derivatives are known up front,
+    # but no code has been generated yet
+    for form in (ah, lh, nh):
+        assert form.lazy
+        assert not form.is_compiled
+        assert form.func is None
+    assert ah.free_args == ('w',)
+    assert ah.max_nderiv == 1
+
+    wh = FemField(Vh)
+    wh.coeffs[:] = 1.0
+
+    A = ah.assemble(w=wh).toarray()
+    b = lh.assemble().toarray()
+    assert ah.is_compiled and lh.is_compiled
+    assert not nh.is_compiled
+
+    uh = FemField(Vh)
+    err = nh.assemble(u=uh)
+    assert nh.is_compiled
+
+    # Compare with eager compilation
+    A_ref = discretize(a, domain_h, [Vh, Vh], **kwargs).assemble(w=wh).toarray()
+    b_ref = discretize(l, domain_h, Vh, **kwargs).assemble().toarray()
+    err_ref = discretize(n, domain_h, Vh, **kwargs).assemble(u=uh)
+
+    assert np.allclose(A, A_ref, rtol=1e-14, atol=1e-14)
+    assert np.allclose(b, b_ref, rtol=1e-14, atol=1e-14)
+    assert np.isclose(err, err_ref, rtol=1e-14, atol=1e-14)
+
+#==============================================================================
+# CLEAN UP SYMPY NAMESPACE
+#==============================================================================
+
+def teardown_module():
+    from sympy.core import cache
+    cache.clear_cache()
+
+def teardown_function():
+    from sympy.core import cache
+    cache.clear_cache()
@@ -0,0 +1,183 @@
+import os
+
+import pytest
+import numpy as np
+from mpi4py import MPI
+
+from sympde.topology import Square, Cube, Domain
+from sympde.topology import ScalarFunctionSpace, VectorFunctionSpace
+from sympde.topology import element_of, elements_of
+from sympde.expr     import BilinearForm, integral
+from sympde.core     import Constant
+from sympde.calculus import grad, dot, div
+
+from psydac.api.discretization import discretize
+from psydac.api.matrix_free    import DiscreteMatrixFreeBilinearForm
+from psydac.linalg.basic       import LinearOperator
+from psydac.linalg.block       import BlockVector
+from psydac.linalg.solvers     import inverse
+from psydac.fem.basic          import FemField
+
+# ... get the mesh directory
+try:
+    mesh_dir = os.environ['PSYDAC_MESH_DIR']
+
+except:
+    base_dir = os.path.dirname(os.path.realpath(__file__))
+    base_dir = os.path.join(base_dir, '..', '..', '..')
+    mesh_dir = os.path.join(base_dir, 'mesh')
+# ...
+
+#==============================================================================
+def random_vector(V, seed=0):
+    """ Random vector in V, with ghost regions in sync. """
+    rng = np.random.default_rng(seed)
+    x   = V.zeros()
+    for b in (x.blocks if isinstance(x, BlockVector) else (x,)):
+        idx = tuple(slice(s, e+1) for s, e in zip(b.starts, b.ends))
+        b[idx] = rng.random(tuple(e+1-s for s, e in zip(b.starts, b.ends)))
+    x.update_ghost_regions()
+    return x
+
+def check_matrix_free(a, domain_h, spaces, **kwargs):
+    """ Compare the matrix-free operator with the assembled matrix. """
+    A = discretize(a, domain_h, spaces).assemble(**kwargs)
+    M = discretize(a, domain_h, spaces, matrix_free=True).assemble(**kwargs)
+
+    assert isinstance(M, DiscreteMatrixFreeBilinearForm)
+    assert isinstance(M, LinearOperator)
+    assert M.domain   == A.domain
+    assert M.codomain == A.codomain
+
+    x = random_vector(M.domain, seed=1)
+    y = random_vector(M.codomain, seed=2)
+
+    assert np.allclose(M.dot(x).toarray(), A.dot(x).toarray(), rtol=1e-12, atol=1e-14)
+    assert np.allclose(M.T.dot(y).toarray(), A.T.dot(y).toarray(), rtol=1e-12, atol=1e-14)
+
+    return A, M
+
+#==============================================================================
+def test_matrix_free_2d_scalar():
+
+    domain = Square()
+    x, y   = domain.coordinates
+    V      = ScalarFunctionSpace('V', domain)
+    u, v   = elements_of(V, names='u, v')
+
+    a = BilinearForm((u, v), integral(domain, (1 + x*y) * dot(grad(u), grad(v)) + u*v + u*v.diff(x)))
+
+    domain_h = discretize(domain, ncells=(5, 6), periodic=(False, True))
+    Vh = discretize(V, domain_h, degree=(2, 3))
+
+    check_matrix_free(a, domain_h, [Vh, Vh])
+
+#==============================================================================
+def test_matrix_free_2d_fields():
+
+    domain = Square()
+    V      = ScalarFunctionSpace('V', domain)
+    u, v   = elements_of(V, names='u, v')
+    w      = element_of(V, name='w')
+    c      = Constant('c')
+
+    a = BilinearForm((u, v), integral(domain, c * w * dot(grad(u), grad(v)) + w.diff(domain.coordinates[0]) * u * v))
+
+    domain_h = discretize(domain, ncells=(4, 4))
+    Vh = discretize(V, domain_h, degree=(2, 2))
+
+    wh = FemField(Vh, coeffs=random_vector(Vh.vector_space, seed=3))
+
+    A, M = check_matrix_free(a, domain_h, [Vh, Vh], w=wh, c=2.5)
+    assert set(M.free_args) == {'w', 'c'}
+
+    # The free arguments must be given
+    with pytest.raises(ValueError):
+        M.assemble(w=wh)
+
+#==============================================================================
+def test_matrix_free_2d_vector():
+
+    domain = Square()
+    V      = ScalarFunctionSpace('V', domain)
+    W      = VectorFunctionSpace('W', domain)
+    u, v   = elements_of(W, names='u, v')
+    q      = element_of(V, name='q')
+
+    a = BilinearForm((u, v), integral(domain, div(u) * div(v) + dot(u, v)))
+    b = BilinearForm((u, q), integral(domain, div(u) * q))
+
+    domain_h = discretize(domain, ncells=(4, 5))
+    Vh = discretize(V, domain_h, degree=(2, 2))
+    Wh = discretize(W, domain_h, degree=(2, 2))
+
+    check_matrix_free(a, domain_h, [Wh, Wh])
+    check_matrix_free(b, domain_h, [Wh, Vh])
+
+#==============================================================================
+def test_matrix_free_2d_nurbs_mapping():
+
+    filename = os.path.join(mesh_dir, 'quarter_annulus.h5')
+    domain   = Domain.from_file(filename)
+    V        = ScalarFunctionSpace('V', domain)
+    u, v     = elements_of(V, names='u, v')
+
+    a = BilinearForm((u, v), integral(domain, dot(grad(u), grad(v)) + u*v))
+
+    domain_h = discretize(domain, filename=filename)
+    Vh = discretize(V, domain_h, degree=(2, 2))
+
+    check_matrix_free(a, domain_h, [Vh, Vh])
+
+#==============================================================================
+def test_matrix_free_3d_solve():
+
+    domain = Cube()
+    V      = ScalarFunctionSpace('V', domain)
+    u, v   = elements_of(V, names='u, v')
+
+    a = BilinearForm((u, v), integral(domain, dot(grad(u), grad(v)) + u*v))
+
+    domain_h = discretize(domain, ncells=(4, 3, 5))
+    Vh = discretize(V, domain_h, degree=(2, 2, 3))
+
+    A, M = check_matrix_free(a, domain_h, [Vh, Vh])
+
+    # The matrix-free operator can be used in the Krylov solvers
+    x  = random_vector(Vh.vector_space, seed=4)
+    b  = A.dot(x)
+    x1 = inverse(M, 'cg', tol=1e-12, maxiter=1000).dot(b)
+    assert np.allclose(x1.toarray(), x.toarray(), rtol=1e-8, atol=1e-8)
+
+#==============================================================================
+@pytest.mark.parallel
+def test_matrix_free_2d_parallel():
+
+    domain = Square()
+    x, y   = domain.coordinates
+    V      = ScalarFunctionSpace('V', domain)
+    u, v   = elements_of(V, names='u, v')
+
+    a = BilinearForm((u, v), integral(domain, (1 + x*y) * dot(grad(u), grad(v)) + u*v))
+
+    domain_h = discretize(domain, ncells=(8, 6), periodic=(True, False), comm=MPI.COMM_WORLD)
+    Vh = discretize(V, domain_h, degree=(2, 3))
+
+    A, M = check_matrix_free(a, domain_h, [Vh, Vh])
+
+    x  = random_vector(Vh.vector_space, seed=4)
+    b  = A.dot(x)
+    x1 = inverse(M, 'cg', tol=1e-12, maxiter=1000).dot(b)
+    assert np.allclose(x1.toarray(), x.toarray(), rtol=1e-8, atol=1e-8)
+
+#==============================================================================
+# CLEAN UP SYMPY NAMESPACE
+#==============================================================================
+
+def teardown_module():
+    from sympy.core import cache
+    cache.clear_cache()
+
+def teardown_function():
+    from sympy.core import cache
+    cache.clear_cache()
@@ -0,0 +1,99 @@
+import pytest
+import numpy as np
+from mpi4py import MPI
+
+from sympde.topology import Square
+from sympde.topology import ScalarFunctionSpace, elements_of
+from sympde.expr     import BilinearForm, integral
+from sympde.calculus import grad, dot
+
+from psydac.api.discretization import discretize
+from psydac.api.settings       import PSYDAC_BACKEND_PYTHON
+from psydac.fem.projectors     import knot_insertion_prolongation_operators
+from psydac.linalg.multigrid   import MultigridPreconditioner
+from psydac.linalg.solvers     import inverse
+
+#==============================================================================
+def ones(V):
+    x = V.zeros()
+    x[tuple(slice(s, e+1) for s, e in zip(V.starts, V.ends))] = 1.0
+    return x
+
+#==============================================================================
+def run_multigrid(ncells, degree, nlevels, comm=None):
+
+    domain = Square()
+    V      = ScalarFunctionSpace('V', domain)
+    u, v   = elements_of(V, names='u, v')
+
+    a = BilinearForm((u, v), integral(domain, dot(grad(u), grad(v)) + u*v))
+
+    domain_h = discretize(domain, ncells=ncells, comm=comm)
+    Vh = discretize(V, domain_h, degree=degree)
+
+    # Nested spaces obtained by uniform refinement of the coarse space
+    fine_ncells = [tuple(n * 2**l for n in ncells) for l in range(1, nlevels)]
+    spaces, prolongations = knot_insertion_prolongation_operators(Vh, fine_ncells)
+
+    # Re-discretization of the bilinear form on all levels
+    matrices = []
+    for W in spaces:
+        W.symbolic_space = V
+        domain_l = discretize(domain, ncells=W.ncells, comm=comm)
+        matrices.append(discretize(a, domain_l, [W, W], backend=PSYDAC_BACKEND_PYTHON).assemble())
+
+    A = matrices[-1]
+    b = ones(A.codomain)
+
+    M_galerkin = MultigridPreconditioner(A, prolongations)
+    M_rediscr  = MultigridPreconditioner(A, prolongations, coarse_operators=matrices[:-1])
+
+    # Galerkin coarse operators coincide with the assembled ones
+    for Al, Bl in zip(M_galerkin.operators[:-1], matrices[:-1]):
+        x = ones(Bl.domain)
+        assert np.allclose(Al.dot(x).toarray(), Bl.dot(x).toarray(), rtol=1e-12, atol=1e-12)
+
+    tol   = 1e-10
+    niter = {}
+    for name, pc in [('jacobi'   , A.diagonal(inverse=True)),
+                     ('galerkin' , M_galerkin),
+                     ('rediscr'  , M_rediscr),
+                     ('chebyshev', MultigridPreconditioner(A, prolongations, smoother='chebyshev'))]:
+        solver = inverse(A, 'pcg', pc=pc, tol=tol)
+        x      = solver.dot(b)
+        info   = solver.get_info()
+        assert info['success']
+        assert (A.dot(x) - b).dot(A.dot(x) - b) < tol**2
+        niter[name] = info['niter']
+
+    assert niter['galerkin' ] < niter['jacobi']
+    assert niter['rediscr'  ] < niter['jacobi']
+    assert niter['chebyshev'] < niter['jacobi']
+
+    return niter
+
+#==============================================================================
+def test_multigrid_poisson_2d():
+
+    niter = run_multigrid(ncells=(4, 4), degree=(2, 2), nlevels=3)
+    assert niter['galerkin'] == niter['rediscr']
+
+#==============================================================================
+@pytest.mark.parallel
+def test_multigrid_poisson_2d_parallel():
+
+    niter     = run_multigrid(ncells=(4, 4), degree=(2, 2), nlevels=3, comm=MPI.COMM_WORLD)
+    niter_ser = run_multigrid(ncells=(4, 4), degree=(2, 2), nlevels=3, comm=MPI.COMM_SELF)
+    assert niter == niter_ser
+
+#==============================================================================
+# CLEAN UP SYMPY NAMESPACE
+#==============================================================================
+
+def teardown_module():
+    from sympy.core import cache
+    cache.clear_cache()
+
+def teardown_function():
+    from sympy.core import cache
+    cache.clear_cache()
@@ -7,6 +7,7 @@ import inspect
 import sys
 import os
 import importlib
+import importlib.util
 import string
 import random
 import numpy as np
@@ -59,6 +60,36 @@ def random_string( n ):
     selector = random.SystemRandom()
     return ''.join( selector.choice( chars ) for _ in range( n ) )
 
+#==============================================================================
+def import_module_from_path(name, path):
+    """
+    Import a Python module (or a compiled extension module) directly from its
+    file. If a module with the same name and file is already loaded, return it.
+
+    Parameters
+    ----------
+    name : str
+        The name of the module.
+
+    path : str
+        The path to the module file.
+
+    Returns
+    -------
+    module
+        The imported module.
+    """
+    path   = os.path.abspath(path)
+    module = sys.modules.get(name)
+    if module is not None and os.path.abspath(getattr(module, '__file__', '')) == path:
+        return module
+
+    spec   = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    sys.modules[name] = module
+    return module
+
 #==============================================================================
 def write_code(filename, code, folder=None):
     if not folder:
@@ -75,10 +106,13 @@ def write_code(filename, code, folder=None):
     # add __init__.py for imports
     touch_init_file(folder)
 
-    f = open(filename, 'w')
-    for line in code:
-        f.write(line)
-    f.close()
+    # Write to a temporary file which is then renamed, so that other processes
+    # never import a partially written module with the same name
+    tmpname = '{}.{}.tmp'.format(filename, os.getpid())
+    with open(tmpname, 'w') as f:
+        for line in code:
+            f.write(line)
+    os.replace(tmpname, filename)
 
     return filename
 
@@ -59,8 +59,16 @@ class MultiPatchDomainDecomposition:
 
     num_threads: int
         Number of threads used by one MPI rank.
+
+    shared_memory: bool|None
+        If True, the processes on the same node exchange the ghost regions
+        through MPI-3 shared memory windows (see DomainDecomposition).
+
+    neighborhood: bool|None
+        If True, the ghost regions are exchanged with a single neighborhood
+        collective (see DomainDecomposition).
     """
-    def __init__(self, ncells, periods, comm=None, num_threads=None):
+    def __init__(self, ncells, periods, comm=None, num_threads=None, shared_memory=None, neighborhood=None):
 
         assert len( ncells ) == len( periods )
         if comm is not None:assert isinstance( comm, MPI.Comm )
@@ -106,7 +114,7 @@ class MultiPatchDomainDecomposition:
             else:
                 local_communicators[i] = MPI.COMM_NULL
 
-        domains = [DomainDecomposition(nc, P, comm=subcomm, global_comm=comm, num_threads=num_threads, size=size)\
+        domains = [DomainDecomposition(nc, P, comm=subcomm, global_comm=comm, num_threads=num_threads, size=size, shared_memory=shared_memory, neighborhood=neighborhood)\
                 for nc,P,subcomm, size in zip(ncells, periods, local_communicators, sizes)]
 
 
@@ -197,9 +205,26 @@ class DomainDecomposition:
         True if the dimension is to be used in the domain decomposition (=default for each dimension). 
         If mpi_dims_mask[i]=False, the i-th dimension will not be decomposed.
 
+    shared_memory: bool|None
+        If True, the Cartesian communicator is split into node-local
+        communicators (MPI_COMM_TYPE_SHARED). The ghost regions of the
+        stencil vectors are then copied directly from the neighbors on the
+        same node, through MPI-3 shared memory windows which are released by
+        StencilVectorSpace.free. By default, the value of the environment
+        variable PSYDAC_SHARED_MEMORY is used (disabled if not set).
+
+    neighborhood: bool|None
+        If True, the ghost regions of the stencil vectors are exchanged with
+        all the neighbors at once by a single non-blocking neighborhood
+        collective (MPI_Ineighbor_alltoallw), instead of persistent
+        point-to-point communications. Ignored if shared_memory is True. By
+        default, the value of the environment variable PSYDAC_NEIGHBORHOOD is
+        used (disabled if not set).
+
     """
 
-    def __init__(self, ncells, periods, comm=None, global_comm=None, num_threads=None, size=None, mpi_dims_mask=None):
+    def __init__(self, ncells, periods, comm=None, global_comm=None, num_threads=None, size=None, mpi_dims_mask=None, shared_memory=None,
+                 neighborhood=None):
 
         # Check input arguments
         # TODO: check that arguments are identical across all processes
@@ -214,6 +239,9 @@ class DomainDecomposition:
         self._global_comm  = comm if global_comm is None else global_comm
         self._comm_cart    = comm
         self._num_threads  = num_threads if num_threads else int(os.environ.get('OMP_NUM_THREADS', 1))
+        self._shared_memory = bool(int(os.environ.get('PSYDAC_SHARED_MEMORY', 0))) if shared_memory is None else shared_memory
+        self._comm_shared  = None
+        self._neighborhood = bool(int(os.environ.get('PSYDAC_NEIGHBORHOOD', 0))) if neighborhood is None else neighborhood
 
         # ...
         if comm is None:
@@ -281,6 +309,10 @@ class DomainDecomposition:
             remain_dims     = [i==j for j in range( self._ndims )]
             self._subcomm[i] = self._comm_cart.Sub( remain_dims )
 
+        # Create the communicator of the processes which share memory with this one
+        if self._shared_memory:
+            self._comm_shared = self._comm_cart.Split_type( MPI.COMM_TYPE_SHARED )
+
     #---------------------------------------------------------------------------
     # Global properties (same for each process)
     #---------------------------------------------------------------------------
@@ -343,6 +375,20 @@ class DomainDecomposition:
     @property
     def ranks_in_topo( self ):
         return self._ranks_in_topo
+
+    @property
+    def shared_memory( self ):
+        return self._shared_memory
+
+    @property
+    def neighborhood( self ):
+        return self._neighborhood
+
+    @property
+    def comm_shared( self ):
+        """ Node-local communicator obtained from comm_cart, if shared memory is used (None otherwise)."""
+        return self._comm_shared
+
     #---------------------------------------------------------------------------
     # Local properties
     #---------------------------------------------------------------------------
@@ -396,7 +442,8 @@ class DomainDecomposition:
 
         domain         = DomainDecomposition(self.ncells, self.periods, comm=self.comm,
                                             global_comm=self.global_comm, num_threads=self.num_threads,
-                                            size=self.size)
+                                            size=self.size, shared_memory=self.shared_memory,
+                                            neighborhood=self.neighborhood)
         domain._ncells = tuple ( ncells )
 
         # Store arrays with all the starts and ends along each direction for every process
@@ -468,6 +515,7 @@ class CartDecomposition():
         self._local_comm    = domain_decomposition.comm
         self._global_comm   = domain_decomposition.global_comm
         self._num_threads   = domain_decomposition.num_threads
+        self._comm_shared   = domain_decomposition.comm_shared
         self._starts        = (0,)*self._ndims
         self._ends          = (-1,)*self._ndims
         self._shape         = (0,)*self._ndims
@@ -589,6 +637,16 @@ class CartDecomposition():
     def num_threads( self ):
         return self._num_threads
 
+    @property
+    def comm_shared( self ):
+        """ Node-local communicator, if the ghost regions are exchanged through shared memory (None otherwise)."""
+        return self._comm_shared
+
+    @property
+    def neighborhood( self ):
+        """ True if the ghost regions are exchanged with a single neighborhood collective."""
+        return self._domain_decomposition.neighborhood
+
     @property
     def domain_decomposition( self ):
         return self._domain_decomposition
@@ -940,11 +998,22 @@ class CartDecomposition():
         # Compute unique identifier for messages traveling along 'shift'
         tag = sum( (h%3)*(3**n) for h,n in zip(shift, range(self._ndims)) )
 
+        # Ranks of destination and source in the node-local communicator
+        # (negative if there is no neighbor, or if it is on a different node)
+        if self._comm_shared is None:
+            shared_dest_rank   = MPI.UNDEFINED
+            shared_source_rank = MPI.UNDEFINED
+        else:
+            shared_dest_rank, shared_source_rank = \
+                MPI.Group.Translate_ranks(self._comm_cart.group, [rank_dest, rank_source], self._comm_shared.group)
+
         # Store all information into dictionary
         info = {'rank_dest'         : rank_dest,
                 'rank_source'       : rank_source,
                 'local_dest_rank'   : local_dest_rank,
                 'local_source_rank' : local_source_rank,
+                'shared_dest_rank'  : shared_dest_rank,
+                'shared_source_rank': shared_source_rank,
                 'comm'              : comm,
                 'tag'               : tag,
                 'buf_shape'         : tuple(  buf_shape  ),
@@ -0,0 +1,147 @@
+# coding: utf-8
+
+import numpy as np
+from itertools import product
+from mpi4py import MPI
+
+from .cart import find_mpi_type
+from .nonblocking_data_exchanger import NonBlockingCartDataExchanger
+
+__all__ = ('NeighborhoodCartDataExchanger',)
+
+class NeighborhoodCartDataExchanger(NonBlockingCartDataExchanger):
+    """
+    Type that takes care of updating the ghost regions (padding) of a
+    multi-dimensional array distributed according to the given Cartesian
+    decomposition of a tensor-product grid of coefficients.
+
+    All the messages of the halo exchange (up to 3^ndim-1 neighbors, including
+    the diagonal ones) are sent and received with a single non-blocking
+    neighborhood collective (MPI_Ineighbor_alltoallw) on a distributed graph
+    communicator. The MPI library can hence optimize the whole communication
+    pattern as one operation. The derived datatypes of the send buffers are
+    the same as in the NonBlockingCartDataExchanger, from which the exchange of
+    the assembly data is inherited.
+
+    Since MPI forbids the send and receive buffers of a collective operation
+    to overlap, the ghost regions are received in a separate contiguous
+    buffer, and copied into the array when the update is completed. The
+    receive buffers are taken from a pool owned by the exchanger, which only
+    grows if several updates are in progress at the same time.
+
+    Each coefficient in the decomposed grid may have multiple components,
+    contiguous in memory.
+
+    Parameters
+    ----------
+    cart : psydac.ddm.CartDecomposition
+        Object that contains all information about the Cartesian decomposition
+        of a tensor-product grid of coefficients.
+
+    dtype : [type | str | numpy.dtype | mpi4py.MPI.Datatype]
+        Datatype of single coefficient (if scalar) or of each of its
+        components (if vector).
+
+    coeff_shape : [tuple(int) | list(int)]
+        Shape of a single coefficient, if this is multi-dimensional
+        (optional: by default, we assume scalar coefficients).
+
+    """
+    def __init__( self, cart, dtype, *, coeff_shape=(),  assembly=False, axis=None, shape=None ):
+
+        super().__init__(cart, dtype, coeff_shape=coeff_shape, assembly=assembly, axis=axis, shape=shape)
+
+        # Edges of the communication graph, one per shift with a neighbor.
+        # If two processes are connected by several edges (e.g. periodic
+        # directions with few processes), the k-th message sent by one process
+        # to the other matches the k-th receive posted by the other process,
+        # hence the shifts must be traversed in the same order for the sources
+        # and for the destinations. The message from each source is received
+        # contiguously in the receive buffer, at the given offset (in number
+        # of elements), and it is then copied into the given ghost region.
+        mpi_type     = find_mpi_type( dtype )
+        ncomps       = int(np.prod(coeff_shape))
+        coeff_slices = tuple(slice(None) for _ in coeff_shape)
+        sources      = []
+        destinations = []
+        recv_counts  = []
+        recv_copies  = []
+        send_types   = []
+        offset       = 0
+        for shift in product( [-1,0,1], repeat=cart.ndim ):
+            if all(s == 0 for s in shift):
+                continue
+
+            info = cart.get_shift_info_non_blocking( shift )
+
+            if info['rank_source'] >= 0:
+                buf_shape   = tuple(info['buf_shape'])
+                recv_slices = tuple(slice(s, s+b) for s, b in zip(info['recv_starts'], buf_shape)) + coeff_slices
+                count       = int(np.prod(buf_shape)) * ncomps if self.get_recv_type( shift ) != MPI.DATATYPE_NULL else 0
+                sources.append( info['rank_source'] )
+                recv_counts.append( count )
+                recv_copies.append( (slice(offset, offset+count), recv_slices, buf_shape + tuple(coeff_shape)) )
+                offset += count
+
+            if info['rank_dest'] >= 0:
+                destinations.append( info['rank_dest'] )
+                send_types.append( self.get_send_type( shift ) )
+
+        self._comm_graph = cart.comm_cart.Create_dist_graph_adjacent(sources, destinations, reorder=False)
+
+        # Each subarray datatype of the send buffer spans the whole local
+        # array: count = 1 and displacement = 0 for all neighbors. The
+        # displacements in the receive buffer are given in bytes.
+        extent = mpi_type.Get_extent()[1]
+        self._graph_recv_counts = (recv_counts, [sl.start * extent for sl, _, _ in recv_copies])
+        self._graph_send_counts = ([1] * len(destinations), [0] * len(destinations))
+        self._graph_recv_types  = [mpi_type] * len(sources)
+        self._graph_send_types  = send_types
+        self._recv_copies       = recv_copies
+        self._recv_size         = offset
+
+        # Pool of receive buffers: the idle ones, and the ones used by the
+        # updates in progress (stored by the id of the array)
+        self._idle        = []
+        self._in_progress = {}
+
+    #---------------------------------------------------------------------------
+    # Public interface
+    #---------------------------------------------------------------------------
+    @property
+    def comm_graph( self ):
+        """ Distributed graph communicator connecting each process to its neighbors. """
+        return self._comm_graph
+
+    # ...
+    def prepare_communications( self, u ):
+        """
+        Return the (initially empty) list in which the request handle of the
+        neighborhood collective is stored between start_update_ghost_regions()
+        and end_update_ghost_regions().
+        """
+        return []
+
+    # ...
+    def start_update_ghost_regions( self, array, requests ):
+        if self._idle:
+            recv_buf = self._idle.pop()
+        else:
+            recv_buf = np.empty( self._recv_size, dtype=array.dtype )
+        self._in_progress[id(array)] = recv_buf
+
+        req = self._comm_graph.Ineighbor_alltoallw(
+            [array   , self._graph_send_counts, self._graph_send_types],
+            [recv_buf, self._graph_recv_counts, self._graph_recv_types] )
+        requests.append( req )
+
+    # ...
+    def end_update_ghost_regions( self, array, requests ):
+        MPI.Request.Waitall( requests )
+        requests.clear()
+
+        # Copy the received data into the ghost regions
+        recv_buf = self._in_progress.pop(id(array))
+        for buf_slice, recv_slices, shape in self._recv_copies:
+            array[recv_slices] = recv_buf[buf_slice].reshape(shape)
+        self._idle.append(recv_buf)
@@ -0,0 +1,255 @@
+# coding: utf-8
+
+import numpy as np
+from itertools import product
+from mpi4py import MPI
+
+from .nonblocking_data_exchanger import NonBlockingCartDataExchanger
+
+__all__ = ('SharedMemoryCartDataExchanger',)
+
+class SharedMemoryCartDataExchanger(NonBlockingCartDataExchanger):
+    """
+    Type that takes care of updating the ghost regions (padding) of a
+    multi-dimensional array distributed according to the given Cartesian
+    decomposition of a tensor-product grid of coefficients.
+
+    The ghost regions received from a neighbor on the same node are copied
+    directly from the memory of the neighbor, without any MPI message: each
+    process copies the owned data needed by its node-local neighbors into an
+    MPI-3 shared memory window, created on the node-local communicator of
+    the Cartesian decomposition (cart.comm_shared), and the neighbors copy
+    them into their ghost regions between two window fences. The neighbors
+    on other nodes are reached with persistent point-to-point communications,
+    as in the NonBlockingCartDataExchanger. The exchange of the assembly data
+    is inherited from the NonBlockingCartDataExchanger.
+
+    The arrays are ordinary NumPy arrays. The windows are taken from a pool
+    owned by the exchanger: a new window is allocated only if more updates
+    are in progress at the same time than there are windows in the pool.
+    Since the windows are allocated and freed collectively on each node, the
+    ghost regions must be updated in the same order by all the processes of
+    the node, and the windows must be released explicitly with `free`.
+
+    Each coefficient in the decomposed grid may have multiple components,
+    contiguous in memory.
+
+    Parameters
+    ----------
+    cart : psydac.ddm.CartDecomposition
+        Object that contains all information about the Cartesian decomposition
+        of a tensor-product grid of coefficients. It must have a node-local
+        communicator (see DomainDecomposition).
+
+    dtype : [type | str | numpy.dtype]
+        Datatype of single coefficient (if scalar) or of each of its
+        components (if vector).
+
+    coeff_shape : [tuple(int) | list(int)]
+        Shape of a single coefficient, if this is multi-dimensional
+        (optional: by default, we assume scalar coefficients).
+
+    """
+    def __init__( self, cart, dtype, *, coeff_shape=(),  assembly=False, axis=None, shape=None ):
+
+        assert cart.comm_shared is not None
+
+        super().__init__(cart, dtype, coeff_shape=coeff_shape, assembly=assembly, axis=axis, shape=shape)
+
+        self._dtype       = np.dtype(dtype)
+        self._coeff_shape = tuple(coeff_shape)
+        self._comm_shared = cart.comm_shared
+
+        # Slices of the owned data needed by the neighbors on the same node,
+        # and for the neighbors from which data are received on the same node,
+        # the slices of their windows to be copied into the ghost regions
+        coeff_slices = tuple(slice(None) for _ in coeff_shape)
+        self._local_sends  = []
+        self._local_copies = []
+        for shift in product( [-1,0,1], repeat=cart.ndim ):
+            if all(s == 0 for s in shift):
+                continue
+
+            info = cart.get_shift_info_non_blocking( shift )
+            buf_shape = info['buf_shape']
+
+            if info['shared_dest_rank'] >= 0:
+                send_slices = tuple(slice(s, s+b) for s, b in zip(info['send_starts'], buf_shape)) + coeff_slices
+                self._local_sends.append(send_slices)
+
+            if info['shared_source_rank'] < 0:
+                continue
+
+            # Local size of the source process along each direction
+            coords = cart.comm_cart.Get_coords( info['rank_source'] )
+            sizes  = [ge[c] - gs[c] + 1 for gs, ge, c in zip(cart.global_starts, cart.global_ends, coords)]
+
+            source_shape  = []
+            source_starts = []
+            for n, m, p, h in zip( sizes, cart.shifts, cart.pads, shift ):
+                source_shape .append( n + 2*m*p )
+                source_starts.append( n if h == 1 else m*p )
+
+            recv_slices = tuple(slice(s, s+b) for s, b in zip(info['recv_starts'], buf_shape)) + coeff_slices
+            send_slices = tuple(slice(s, s+b) for s, b in zip(source_starts      , buf_shape)) + coeff_slices
+
+            self._local_copies.append((info['shared_source_rank'], tuple(source_shape) + self._coeff_shape,
+                                       recv_slices, send_slices))
+
+        # Pool of windows: the idle ones, and the ones used by the updates in
+        # progress (stored by the id of the array)
+        self._windows     = []
+        self._idle        = []
+        self._in_progress = {}
+
+    #---------------------------------------------------------------------------
+    # Public interface
+    #---------------------------------------------------------------------------
+    @property
+    def comm_shared( self ):
+        """ Node-local communicator on which the shared memory windows are created. """
+        return self._comm_shared
+
+    # ...
+    @property
+    def nwindows( self ):
+        """ Number of shared memory windows in the pool. """
+        return len(self._windows)
+
+    # ...
+    def prepare_communications( self, u ):
+
+        # Requests' handles for the neighbors on other nodes
+        requests = []
+        cart = self._cart
+        comm = cart.comm_cart
+        for shift in product( [-1,0,1], repeat=cart.ndim ):
+            if all(s==0 for s in shift):
+                continue
+
+            info = cart.get_shift_info_non_blocking( shift )
+
+            recv_typ = self.get_recv_type( shift )
+            if recv_typ != MPI.DATATYPE_NULL and info['shared_source_rank'] < 0:
+                recv_buf = (u, 1, recv_typ)
+                recv_req = comm.Recv_init( recv_buf, info['rank_source'], info['tag'] )
+                requests.append( recv_req )
+
+            send_typ = self.get_send_type( shift )
+            if send_typ != MPI.DATATYPE_NULL and info['shared_dest_rank'] < 0:
+                send_buf = (u, 1, send_typ)
+                send_req = comm.Send_init( send_buf, info['rank_dest'], info['tag'] )
+                requests.append( send_req )
+
+        return tuple(requests)
+
+    # ...
+    def start_update_ghost_regions( self, array, requests ):
+        MPI.Prequest.Startall( requests )
+
+        # Copy the owned data needed by the node-local neighbors into a window
+        window = self._idle.pop() if self._idle else self._allocate_window()
+        self._in_progress[id(array)] = window
+        for send_slices in self._local_sends:
+            window.array[send_slices] = array[send_slices]
+
+        # Wait until the windows of all the processes on the node are
+        # up-to-date, then copy the ghost regions from the node-local neighbors
+        window.win.Fence()
+        for recv_slices, source in window.copies:
+            array[recv_slices] = source
+
+    # ...
+    def end_update_ghost_regions( self, array, requests ):
+
+        # The window may not be reused before all the copies are done
+        window = self._in_progress.pop(id(array))
+        window.win.Fence()
+        self._idle.append(window)
+
+        MPI.Prequest.Waitall( requests )
+
+    # ...
+    def free( self ):
+        """
+        Free all the shared memory windows of the pool. This is a collective
+        operation on the node-local communicator, which may not be called
+        while an update is in progress. The exchanger can still be used
+        afterwards: new windows are then allocated when needed.
+        """
+        assert not self._in_progress
+        for window in self._windows:
+            window.Free()
+        self._windows = []
+        self._idle    = []
+
+    #---------------------------------------------------------------------------
+    # Private methods
+    #---------------------------------------------------------------------------
+    def _allocate_window( self ):
+        """
+        Allocate a new window of the pool, with the local shape of the
+        decomposition (and coeff_shape). This is a collective operation on
+        the node-local communicator.
+        """
+        shape    = tuple(self._cart.shape) + self._coeff_shape
+        itemsize = self._dtype.itemsize
+        win      = MPI.Win.Allocate_shared( int(np.prod(shape)) * itemsize, itemsize, comm=self._comm_shared )
+
+        # Views of the windows of the neighbors which are on the same node
+        copies = []
+        for rank, source_shape, recv_slices, send_slices in self._local_copies:
+            buf, _ = win.Shared_query( rank )
+            source = np.ndarray( source_shape, dtype=self._dtype, buffer=buf )
+            copies.append((recv_slices, source[send_slices]))
+
+        window = SharedMemoryWindow( win, shape, self._dtype, copies )
+        self._windows.append( window )
+        return window
+
+#===============================================================================
+class SharedMemoryWindow:
+    """
+    Handle of an MPI-3 shared memory window, with a view of the local memory
+    as an array, and the views of the windows of the node-local neighbors
+    which are copied into the ghost regions. The views may not be used after
+    the window has been freed.
+
+    Parameters
+    ----------
+    win : mpi4py.MPI.Win
+        Shared memory window.
+
+    shape : tuple of int
+        Shape of the local array.
+
+    dtype : numpy.dtype
+        Datatype of the local array.
+
+    copies : list of tuple
+        Pairs (slices of the ghost region, view of the neighbor's window).
+
+    """
+    def __init__( self, win, shape, dtype, copies ):
+        self._win    = win
+        self._array  = np.ndarray( shape, dtype=dtype, buffer=win.tomemory() )
+        self._copies = copies
+
+    @property
+    def win( self ):
+        return self._win
+
+    @property
+    def array( self ):
+        return self._array
+
+    @property
+    def copies( self ):
+        return self._copies
+
+    def Free( self ):
+        """ Free the window (collective on the node-local communicator). """
+        self._array  = None
+        self._copies = []
+        if not MPI.Is_finalized():
+            self._win.Free()
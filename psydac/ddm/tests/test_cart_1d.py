@@ -2,8 +2,9 @@
 
 import numpy as np
 
-from psydac.ddm.blocking_data_exchanger    import BlockingCartDataExchanger
-from psydac.ddm.nonblocking_data_exchanger import NonBlockingCartDataExchanger
+from psydac.ddm.blocking_data_exchanger     import BlockingCartDataExchanger
+from psydac.ddm.nonblocking_data_exchanger  import NonBlockingCartDataExchanger
+from psydac.ddm.neighborhood_data_exchanger import NeighborhoodCartDataExchanger
 
 #===============================================================================
 # TEST CartDecomposition and CartDataExchanger in 1D
@@ -110,7 +111,7 @@ def run_cart_1d( data_exchanger_type, verbose=False ):
 #===============================================================================
 import pytest
 
-@pytest.mark.parametrize( 'data_exchanger_type', [BlockingCartDataExchanger, NonBlockingCartDataExchanger] )
+@pytest.mark.parametrize( 'data_exchanger_type', [BlockingCartDataExchanger, NonBlockingCartDataExchanger, NeighborhoodCartDataExchanger] )
 @pytest.mark.parallel
 def test_cart_1d( data_exchanger_type ):
 
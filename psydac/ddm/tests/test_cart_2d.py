@@ -1,7 +1,8 @@
 # File test_cart_2d.py
 
-from psydac.ddm.blocking_data_exchanger    import BlockingCartDataExchanger
-from psydac.ddm.nonblocking_data_exchanger import NonBlockingCartDataExchanger
+from psydac.ddm.blocking_data_exchanger     import BlockingCartDataExchanger
+from psydac.ddm.nonblocking_data_exchanger  import NonBlockingCartDataExchanger
+from psydac.ddm.neighborhood_data_exchanger import NeighborhoodCartDataExchanger
 
 #===============================================================================
 # TEST CartDecomposition and CartDataExchanger in 2D
@@ -121,7 +122,7 @@ def run_cart_2d( data_exchanger_type, verbose=False , nprocs=None, reverse_axis=
 #===============================================================================
 import pytest
 
-@pytest.mark.parametrize( 'data_exchanger_type', [BlockingCartDataExchanger, NonBlockingCartDataExchanger] )
+@pytest.mark.parametrize( 'data_exchanger_type', [BlockingCartDataExchanger, NonBlockingCartDataExchanger, NeighborhoodCartDataExchanger] )
 @pytest.mark.parallel
 def test_cart_2d(data_exchanger_type):
 
@@ -129,6 +130,53 @@ def test_cart_2d(data_exchanger_type):
 
     assert namespace['success']
 
+@pytest.mark.parametrize( 'data_exchanger_type', [BlockingCartDataExchanger, NonBlockingCartDataExchanger, NeighborhoodCartDataExchanger] )
+@pytest.mark.parallel
+def test_cart_2d_repeated_neighbors(data_exchanger_type):
+
+    import numpy as np
+    from mpi4py       import MPI
+    from psydac.ddm.cart import DomainDecomposition, CartDecomposition
+
+    # Periodic decomposition with at most two processes along axis 0 and one
+    # along axis 1: the same process is the neighbor along several shifts
+    comm = MPI.COMM_WORLD.Split( MPI.COMM_WORLD.rank // 2 )
+    n1, n2 = 12, 7
+    p1, p2 = 2, 3
+
+    domain_decomposition = DomainDecomposition(ncells=[n1,n2], periods=[True,True], comm=comm,
+                                                mpi_dims_mask=[True,False])
+
+    global_starts = [None]*2
+    global_ends   = [None]*2
+    for axis in range(2):
+        global_ends  [axis] = domain_decomposition.global_element_ends[axis].copy()
+        global_starts[axis] = np.array([0] + (global_ends[axis][:-1]+1).tolist())
+
+    cart = CartDecomposition(domain_decomposition, [n1,n2], global_starts, global_ends, pads=[p1,p2], shifts=[1,1])
+
+    s1,s2 = cart.starts
+    e1,e2 = cart.ends
+    synchronizer = data_exchanger_type( cart, int, coeff_shape=[2] )
+
+    # Two arrays updated at the same time, and updated again after a change
+    u = np.zeros( list( cart.shape ) + [2], dtype=int )
+    v = np.zeros_like( u )
+    requests = [synchronizer.prepare_communications(w) for w in (u, v)]
+    for k in range(2):
+        u[p1:-p1,p2:-p2,:] = [[(i1,i2+k) for i2 in range(s2,e2+1)] for i1 in range(s1,e1+1)]
+        v[p1:-p1,p2:-p2,:] = -u[p1:-p1,p2:-p2,:]
+        for w, request in zip((u, v), requests):
+            synchronizer.start_update_ghost_regions( w, request )
+        for w, request in zip((u, v), requests):
+            synchronizer.end_update_ghost_regions( w, request )
+
+        uex = [[(i1%n1,i2%n2+k) for i2 in range(s2-p2,e2+p2+1)] for i1 in range(s1-p1,e1+p1+1)]
+        assert (u == uex).all()
+        assert (v == -u).all()
+
+    comm.Free()
+
 @pytest.mark.parallel
 def test_cart_2d_reverse_axis_0():
 
@@ -1,13 +1,62 @@
 # coding: utf-8
 
-from .cart                       import CartDecomposition, InterfaceCartDecomposition
-from .blocking_data_exchanger    import BlockingCartDataExchanger
-from .nonblocking_data_exchanger import NonBlockingCartDataExchanger
-from .interface_data_exchanger   import InterfaceCartDataExchanger
+from .cart                         import CartDecomposition, InterfaceCartDecomposition
+from .blocking_data_exchanger      import BlockingCartDataExchanger
+from .nonblocking_data_exchanger   import NonBlockingCartDataExchanger
+from .neighborhood_data_exchanger  import NeighborhoodCartDataExchanger
+from .shared_memory_data_exchanger import SharedMemoryCartDataExchanger
+from .interface_data_exchanger     import InterfaceCartDataExchanger
 
 __all__ = ('get_data_exchanger',)
 
-def get_data_exchanger(cart, dtype, *, coeff_shape=(),  assembly=False, axis=None, shape=None, blocking=True):
+def get_data_exchanger(cart, dtype, *, coeff_shape=(),  assembly=False, axis=None, shape=None, blocking=True, neighborhood=False, shared_memory=False):
+    """
+    Create the object in charge of updating the ghost regions of the arrays
+    distributed according to the given decomposition.
+
+    Parameters
+    ----------
+    cart : CartDecomposition | InterfaceCartDecomposition
+        Decomposition of the tensor-product grid of coefficients.
+
+    dtype : [type | str | numpy.dtype | mpi4py.MPI.Datatype]
+        Datatype of single coefficient (if scalar) or of each of its
+        components (if vector).
+
+    coeff_shape : [tuple(int) | list(int)]
+        Shape of a single coefficient, if this is multi-dimensional.
+
+    assembly : bool
+        If True, the datatypes used to exchange the assembly data are created.
+
+    axis : int | None
+        Axis along which the assembly data are not exchanged.
+
+    shape : tuple(int) | None
+        Shape of the assembly data along `axis`.
+
+    blocking : bool
+        If True (default), the ghost regions are updated in ndim sequential
+        phases (one per direction) by a BlockingCartDataExchanger. Otherwise,
+        all the neighbors (including the diagonal ones) are reached at once.
+
+    neighborhood : bool
+        Only used if blocking is False. If True, the non-blocking exchange uses
+        a single neighborhood collective (NeighborhoodCartDataExchanger),
+        otherwise persistent point-to-point communications
+        (NonBlockingCartDataExchanger, default).
+
+    shared_memory : bool
+        Only used if blocking is False. If True, the ghost regions are copied
+        directly from the neighbors on the same node, through a pool of shared
+        memory windows (SharedMemoryCartDataExchanger). This requires a
+        node-local communicator in cart (cart.comm_shared).
+
+    Returns
+    -------
+    CartDataExchanger | InterfaceCartDataExchanger
+        The data exchanger.
+    """
 
     if isinstance(cart, InterfaceCartDecomposition):
         return InterfaceCartDataExchanger(cart, dtype, coeff_shape=coeff_shape)
@@ -16,9 +65,14 @@ def get_data_exchanger(cart, dtype, *, coeff_shape=(),  assembly=False, axis=Non
         if blocking:
             return BlockingCartDataExchanger(cart, dtype, coeff_shape=coeff_shape, assembly=assembly, axis=axis, shape=shape)
 
+        elif shared_memory:
+            return SharedMemoryCartDataExchanger(cart, dtype, coeff_shape=coeff_shape, assembly=assembly, axis=axis, shape=shape)
+
+        elif neighborhood:
+            return NeighborhoodCartDataExchanger(cart, dtype, coeff_shape=coeff_shape, assembly=assembly, axis=axis, shape=shape)
+
         else:
             return NonBlockingCartDataExchanger(cart, dtype, coeff_shape=coeff_shape, assembly=assembly, axis=axis, shape=shape)
     else:
         raise TypeError('cart can only be of type CartDecomposition or InterfaceCartDecomposition')
-        
 
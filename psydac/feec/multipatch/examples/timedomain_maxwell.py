@@ -43,6 +43,8 @@ from psydac.feec.multipatch.multipatch_domain_utilities import build_multipatch_
 from psydac.feec.multipatch.examples.ppc_test_cases import get_source_and_solution_hcurl, get_div_free_pulse, get_curl_free_pulse, get_Delta_phi_pulse, get_Gaussian_beam
 from psydac.feec.multipatch.utils_conga_2d import DiagGrid, P0_phys, P1_phys, P2_phys, get_Vh_diags_for
 from psydac.feec.multipatch.utilities import time_count  # , export_sol, import_sol
+from psydac.linalg.basic import MatrixFreeLinearOperator
+from psydac.linalg.solvers import estimate_spectral_bounds
 from psydac.linalg.utilities import array_to_psydac
 from psydac.fem.basic import FemField
 from psydac.feec.multipatch.non_matching_operators import construct_hcurl_conforming_projection, construct_h1_conforming_projection
@@ -414,7 +416,7 @@ def solve_td_maxwell_pbm(*,
 
     # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
     # Compute stable time step size based on max CFL and max dt
-    dt = compute_stable_dt(C_m=C_m, dC_m=dC_m, cfl_max=cfl_max, dt_max=dt_max)
+    dt = compute_stable_dt(C_m=C_m, dC_m=dC_m, V1=V1h.vector_space, cfl_max=cfl_max, dt_max=dt_max)
     # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
     # Absorbing dC_m
@@ -1185,7 +1187,7 @@ def solve_td_maxwell_pbm(*,
 
 
 # def compute_stable_dt(cfl_max, dt_max, C_m, dC_m, V1_dim):
-def compute_stable_dt(*, C_m, dC_m, cfl_max, dt_max=None):
+def compute_stable_dt(*, C_m, dC_m, V1, cfl_max, dt_max=None):
     """
     Compute a stable time step size based on the maximum CFL parameter in the
     domain. To this end we estimate the operator norm of
@@ -1209,6 +1211,9 @@ def compute_stable_dt(*, C_m, dC_m, cfl_max, dt_max=None):
     dC_m : scipy.sparse.spmatrix
         Matrix of the dual Curl operator.
 
+    V1 : psydac.linalg.basic.VectorSpace
+        Coefficient space of V1h, on which `dC_m @ C_m` acts.
+
     cfl_max : float
         Maximum Courant parameter in the domain, intended as a stability
         parameter (=1 at the stability limit). Must be `0 < cfl_max < 1`.
@@ -1233,29 +1238,13 @@ def compute_stable_dt(*, C_m, dC_m, cfl_max, dt_max=None):
         print('         WARNING !!!  cfl = {}  '.format(cfl))
         print(' ******  ****** ******  ****** ******  ****** ')
 
-    def vect_norm_2(vv):
-        return np.sqrt(np.dot(vv, vv))
-
-    t_stamp = time_count()
-    vv = np.random.random(C_m.shape[1])
-    norm_vv = vect_norm_2(vv)
-    max_ncfl = 500
-    ncfl = 0
-    spectral_rho = 1
-    conv = False
+    # Power iterations on dC_m @ C_m, which is not symmetric
     CC_m = dC_m @ C_m
+    CC = MatrixFreeLinearOperator(V1, V1, lambda v: array_to_psydac(CC_m.dot(v.toarray()), V1))
 
-    while not (conv or ncfl > max_ncfl):
-
-        vv[:] = (1. / norm_vv) * vv
-        ncfl += 1
-        vv[:] = CC_m.dot(vv)
-
-        norm_vv = vect_norm_2(vv)
-        old_spectral_rho = spectral_rho
-        spectral_rho = vect_norm_2(vv)  # approximation
-        conv = abs((spectral_rho - old_spectral_rho) / spectral_rho) < 0.001
-        print("    ... spectral radius iteration: spectral_rho( dC_m @ C_m ) ~= {}".format(spectral_rho))
+    t_stamp = time_count()
+    _, spectral_rho = estimate_spectral_bounds(CC, method='power', maxiter=500, tol=0.001)
+    print("    ... spectral radius iteration: spectral_rho( dC_m @ C_m ) ~= {}".format(spectral_rho))
     t_stamp = time_count(t_stamp)
 
     norm_op = np.sqrt(spectral_rho)
@@ -4,7 +4,7 @@ from psydac.linalg.kron     import KroneckerDenseMatrix
 from psydac.core.bsplines   import hrefinement_matrix
 from psydac.linalg.stencil  import StencilVectorSpace
 
-__all__ = ('knots_to_insert', 'knot_insertion_projection_operator')
+__all__ = ('knots_to_insert', 'knot_insertion_projection_operator', 'knot_insertion_prolongation_operators')
 
 def knots_to_insert(coarse_grid, fine_grid, tol=1e-14):
     """ Compute the point difference between the fine grid and coarse grid."""
@@ -100,3 +100,49 @@ def knot_insertion_projection_operator(domain, codomain):
             ops.append(np.eye(d.nbasis))
 
     return KroneckerDenseMatrix(domain.vector_space, codomain.vector_space, *ops)
+
+
+def knot_insertion_prolongation_operators(space, ncells):
+    """
+    Build a hierarchy of nested spline spaces by uniform refinement of a
+    coarse space, and the prolongation operators between consecutive levels.
+
+    The finer spaces are created with TensorFemSpace.add_refined_space, so
+    that they share the process grid of the coarse space and their domain
+    decompositions are nested. The prolongation operators are computed by
+    knot insertion, see knot_insertion_projection_operator, and they can be
+    given to psydac.linalg.multigrid.MultigridPreconditioner.
+
+    Parameters
+    ----------
+    space : TensorFemSpace
+        Coarsest space of the hierarchy.
+
+    ncells : list of tuple of int
+        Number of cells along each direction for the finer levels, from the
+        coarsest to the finest. Between two consecutive levels the number
+        of cells along each direction must be kept or doubled.
+
+    Returns
+    -------
+    spaces : list of TensorFemSpace
+        All spaces of the hierarchy, from the coarsest to the finest.
+
+    prolongations : list of KroneckerDenseMatrix
+        Prolongation operators between consecutive levels.
+
+    """
+    assert not any(space.periodic), 'Knot insertion is not implemented for periodic spaces'
+
+    spaces = [space]
+    for nc in ncells:
+        coarse = spaces[-1]
+        assert len(nc) == coarse.ldim
+        assert all(nf in (n, 2*n) for n, nf in zip(coarse.ncells, nc)), \
+               'The number of cells must be kept or doubled between two levels'
+        space.add_refined_space(nc)
+        spaces.append(space.get_refined_space(nc))
+
+    prolongations = [knot_insertion_projection_operator(Vc, Vf) for Vc, Vf in zip(spaces[:-1], spaces[1:])]
+
+    return spaces, prolongations
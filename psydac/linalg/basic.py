@@ -10,6 +10,7 @@ provides the fundamental classes for linear algebra operations.
 from abc import ABC, abstractmethod
 
 import numpy as np
+from mpi4py import MPI
 from scipy.sparse import coo_matrix
 from types import LambdaType 
 from inspect import signature
@@ -92,6 +93,68 @@ class VectorSpace(ABC):
             The vector modified by this function (incremented by a * x).
         """
 
+    @property
+    def reduction_comm(self):
+        """
+        MPI communicator over which the local contributions to the inner
+        product must be summed, or None if no global reduction is needed
+        (default). See Vector.local_dot.
+
+        """
+        return None
+
+    def inner_many(self, xs, ys):
+        """
+        Evaluate the scalar products of the pairs of vectors (xs[i], ys[i]).
+
+        The local contributions to all the scalar products are computed first,
+        and they are summed over the processes with a single global reduction.
+        Hence the latency cost is the same as for one scalar product.
+
+        Parameters
+        ----------
+        xs : list of Vector
+            Vectors of this space (first argument of each scalar product).
+
+        ys : list of Vector
+            Vectors of this space (second argument), as many as in xs.
+
+        Returns
+        -------
+        numpy.ndarray
+            1D array of the scalar products xs[i].dot(ys[i]).
+
+        """
+        assert len(xs) == len(ys)
+        assert all(x.space is self and y.space is self for x, y in zip(xs, ys))
+
+        res  = np.array([x.local_dot(y) for x, y in zip(xs, ys)], dtype=np.result_type(self.dtype, float))
+        comm = self.reduction_comm
+        if comm is not None and res.size > 0:
+            comm.Allreduce(MPI.IN_PLACE, res, op=MPI.SUM)
+        return res
+
+    def dot_many(self, xs, y):
+        """
+        Evaluate the scalar products of the vectors xs[i] with the vector y,
+        with a single global reduction (see inner_many).
+
+        Parameters
+        ----------
+        xs : list of Vector
+            Vectors of this space (first argument of each scalar product).
+
+        y : Vector
+            Vector of this space (second argument of all the scalar products).
+
+        Returns
+        -------
+        numpy.ndarray
+            1D array of the scalar products xs[i].dot(y).
+
+        """
+        return self.inner_many(xs, [y] * len(xs))
+
 #===============================================================================
 class Vector(ABC):
     """
@@ -216,6 +279,85 @@ class Vector(ABC):
         """
         return self.conjugate(out)
 
+    def local_dot(self, v):
+        """
+        Contribution of the local process to the scalar product with the
+        vector v of the same space, without any global communication.
+
+        The scalar product self.dot(v) is obtained by summing the local
+        contributions over the communicator `self.space.reduction_comm`.
+        This allows several scalar products to be reduced together, possibly
+        with a non-blocking reduction. The default implementation is valid
+        for spaces whose reduction_comm is None.
+
+        Parameters
+        ----------
+        v : Vector
+            Vector belonging to the same space as self.
+
+        """
+        return self.dot(v)
+
+    def mul_iadd_norm_sqr(self, a, v):
+        """
+        Compute self += a * v, and return the squared L2 norm of the result.
+
+        Subclasses may perform both operations with a single pass over the
+        data, and a single global reduction.
+
+        Parameters
+        ----------
+        a : scalar
+            Rescaling coefficient, which can be cast to the correct dtype.
+
+        v : Vector
+            Vector belonging to the same space as self.
+
+        Returns
+        -------
+        float
+            Squared L2 norm of self after the update.
+        """
+        res  = self.mul_iadd_local_norm_sqr(a, v)
+        comm = self.space.reduction_comm
+        return res if comm is None else comm.allreduce(res)
+
+    def mul_iadd_local_norm_sqr(self, a, v):
+        """
+        Compute self += a * v, and return the contribution of the local
+        process to the squared L2 norm of the result (see local_dot).
+
+        Parameters
+        ----------
+        a : scalar
+            Rescaling coefficient, which can be cast to the correct dtype.
+
+        v : Vector
+            Vector belonging to the same space as self.
+
+        Returns
+        -------
+        float
+            Local contribution to the squared L2 norm of self after the update.
+        """
+        self.mul_iadd(a, v)
+        return self.local_dot(self).real
+
+    def xpay(self, a, v):
+        """
+        Compute self = v + a * self, where v is another vector of the same space.
+
+        Parameters
+        ----------
+        a : scalar
+            Rescaling coefficient of self, which can be cast to the correct dtype.
+
+        v : Vector
+            Vector belonging to the same space as self.
+        """
+        self *= a
+        self += v
+
 #===============================================================================
 class LinearOperator(ABC):
     """
@@ -6,9 +6,10 @@ import numpy as np
 
 from types import MappingProxyType
 from scipy.sparse import bmat, lil_matrix
+from mpi4py import MPI
 
 from psydac.linalg.basic    import VectorSpace, Vector, LinearOperator
-from psydac.linalg.stencil  import StencilMatrix
+from psydac.linalg.stencil  import StencilVector, StencilMatrix, WideStencilMatrix
 from psydac.ddm.cart        import InterfaceCartDecomposition
 from psydac.ddm.utilities   import get_data_exchanger
 
@@ -56,6 +57,14 @@ class BlockVectorSpace(VectorSpace):
         self._connectivity = connectivity or {}
         self._connectivity_readonly = MappingProxyType(self._connectivity)
 
+        # The inner products of all blocks can be reduced together only if
+        # they use the same communicator
+        comms = [Vi.reduction_comm for Vi in spaces]
+        self._reduction_comm = comms[0] if all(c == comms[0] for c in comms[1:]) else None
+
+        # Index structures of the sparse matrices with this domain (see topetsc.py)
+        self._sparse_structures = {}
+
     #--------------------------------------
     # Abstract interface
     #--------------------------------------
@@ -112,7 +121,7 @@ class BlockVectorSpace(VectorSpace):
         for Vi, xi, yi in zip(self.spaces, x.blocks, y.blocks):
             Vi.axpy(a, xi, yi)
 
-        x._sync = x._sync and y._sync
+        y._sync = x._sync and y._sync
 
     #--------------------------------------
     # Other properties/methods
@@ -126,6 +135,11 @@ class BlockVectorSpace(VectorSpace):
         """ Returns True if the memory is distributed."""
         return self._spaces[0].parallel
 
+    @property
+    def reduction_comm(self):
+        """ MPI communicator over which the local inner products are summed. """
+        return self._reduction_comm
+
     @property
     def starts(self):
         return [s.starts for s in self._spaces]
@@ -186,6 +200,7 @@ class BlockVector(Vector):
 
         self._data_exchangers = {}
         self._interface_buf   = {}
+        self._interface_requests = None
 
         if not V.parallel: return
 
@@ -244,7 +259,45 @@ class BlockVector(Vector):
     def dot(self, v):
         assert isinstance(v, BlockVector)
         assert v._space is self._space
-        return sum(b1.dot(b2) for b1, b2 in zip(self._blocks, v._blocks))
+
+        comm = self._space.reduction_comm
+        if comm is None:
+            return sum(b1.dot(b2) for b1, b2 in zip(self._blocks, v._blocks))
+
+        # Single global reduction for all the blocks
+        res = np.array([self.local_dot(v)], dtype=self.dtype)
+        comm.Allreduce(MPI.IN_PLACE, res, op=MPI.SUM)
+        return res[0]
+
+    #...
+    def local_dot(self, v):
+        assert isinstance(v, BlockVector)
+        assert v._space is self._space
+
+        if self._space.reduction_comm is None:
+            return self.dot(v)
+        return sum(b1.local_dot(b2) for b1, b2 in zip(self._blocks, v._blocks))
+
+    #...
+    def mul_iadd_local_norm_sqr(self, a, v):
+        assert isinstance(v, BlockVector)
+        assert v._space is self._space
+
+        if self._space.reduction_comm is None:
+            self.mul_iadd(a, v)
+            return self.dot(self).real
+
+        res = sum(b1.mul_iadd_local_norm_sqr(a, b2) for b1, b2 in zip(self._blocks, v._blocks))
+        self._sync = self._sync and v._sync
+        return res
+
+    #...
+    def xpay(self, a, v):
+        assert isinstance(v, BlockVector)
+        assert v._space is self._space
+        for b1, b2 in zip(self._blocks, v._blocks):
+            b1.xpay(a, b2)
+        self._sync = self._sync and v._sync
 
     #...
     def copy(self, out=None):
@@ -360,6 +413,38 @@ class BlockVector(Vector):
         # Flag ghost regions as up-to-date
         self._sync = True
 
+    # ...
+    def start_update_ghost_regions(self):
+        """
+        Start the update of the ghost regions of all blocks, and of the
+        interface data, with non-blocking communications. Until
+        end_update_ghost_regions() is called, the entries owned by this process
+        may be read but not modified, and the ghost regions may not be accessed.
+        """
+        self._interface_requests = self.start_update_interface_ghost_regions()
+
+        for vi in self.blocks:
+            if isinstance(vi, (StencilVector, BlockVector)):
+                vi.start_update_ghost_regions()
+            else:
+                vi.update_ghost_regions()
+
+    # ...
+    def end_update_ghost_regions(self):
+        """
+        Complete the update of the ghost regions started by
+        start_update_ghost_regions().
+        """
+        for vi in self.blocks:
+            if isinstance(vi, (StencilVector, BlockVector)):
+                vi.end_update_ghost_regions()
+
+        self.end_update_interface_ghost_regions(self._interface_requests)
+        self._interface_requests = None
+
+        # Flag ghost regions as up-to-date
+        self._sync = True
+
     def start_update_interface_ghost_regions(self):
         self._collect_interface_buf()
         req = {}
@@ -523,6 +608,7 @@ class BlockLinearOperator(LinearOperator):
         self._func           = self._dot
         self._sync           = False
         self._backend        = None
+        self._overlap_tmps   = {}
 
     #--------------------------------------
     # Abstract interface
@@ -650,6 +736,12 @@ class BlockLinearOperator(LinearOperator):
             out = self.codomain.zeros()
 
         if not v.ghost_regions_in_sync:
+            boxes = self._get_overlap_boxes()
+            if boxes:
+                self._overlapped_dot(v, out, boxes)
+                out.ghost_regions_in_sync = False
+                return out
+
             v.update_ghost_regions()
 
         self._func(self._blocks_as_args, v, out, **self._args)
@@ -657,6 +749,58 @@ class BlockLinearOperator(LinearOperator):
         out.ghost_regions_in_sync = False
         return out
 
+    # ...
+    def _get_overlap_boxes(self):
+        """
+        Get the boxes of local rows of all blocks used by the overlapped
+        matrix-vector product (see `StencilMatrix._compute_overlap_boxes`),
+        or None if the halo exchange cannot be overlapped with computations.
+        This requires that all blocks are StencilMatrix objects which can
+        overlap their own products, and that no accelerated backend is used.
+        """
+        if self._backend is not None or not self._blocks:
+            return None
+
+        boxes = {}
+        for key, Lij in self._blocks.items():
+            if not isinstance(Lij, StencilMatrix):
+                return None
+            boxes[key] = Lij._get_overlap_boxes()
+            if not boxes[key]:
+                return None
+
+        return boxes
+
+    # ...
+    def _overlapped_dot(self, v, out, boxes):
+        """
+        Compute the product self @ v while the ghost regions of v are updated.
+        The interior rows of all blocks are computed first, then the boundary
+        rows once the communication is complete. Since the matvec kernels
+        overwrite their output, each block uses its own temporary vector.
+        """
+        n_rows = self._nrows
+        n_cols = self._ncols
+
+        tmps = self._overlap_tmps
+        for key, Lij in self._blocks.items():
+            if key not in tmps or tmps[key].space is not Lij.codomain:
+                tmps[key] = Lij.codomain.zeros()
+
+        v.start_update_ghost_regions()
+        for (i, j), Lij in self._blocks.items():
+            vj = v if n_cols == 1 else v[j]
+            Lij._dot_boxes(vj, tmps[i, j], boxes[i, j][:1])
+
+        v.end_update_ghost_regions()
+        for (i, j), Lij in self._blocks.items():
+            vj = v if n_cols == 1 else v[j]
+            Lij._dot_boxes(vj, tmps[i, j], boxes[i, j][1:])
+            if n_rows == 1:
+                out += tmps[i, j]
+            else:
+                out[i] += tmps[i, j]
+
     #...
     @staticmethod
     def _dot(blocks, v, out, n_rows, n_cols, inc):
@@ -702,6 +846,65 @@ class BlockLinearOperator(LinearOperator):
         out.set_backend(self._backend)
         return out
 
+    # ...
+    def matmat(self, B):
+        """
+        Compute the matrix product C = self @ B explicitly, block by block.
+
+        Each block C_ij = sum_k self_ik @ B_kj is computed as a single
+        StencilMatrix with `StencilMatrix.matmat`, or as a WideStencilMatrix
+        if it does not fit in the ghost regions of its spaces. The blocks
+        which are not of these types are first converted with their
+        `tostencil` (or `tokronstencil`) method, if they have one.
+
+        Parameters
+        ----------
+        B : BlockLinearOperator | StencilMatrix | WideStencilMatrix
+            Right factor of the product, such that B.codomain is self.domain.
+
+        Returns
+        -------
+        BlockLinearOperator | StencilMatrix | WideStencilMatrix
+            Product from B.domain to self.codomain. It is a single block if
+            neither of these spaces is a BlockVectorSpace.
+        """
+        assert isinstance(B, LinearOperator)
+        assert B.codomain is self.domain
+
+        def stencil_blocks(M):
+            if not isinstance(M, BlockLinearOperator):
+                M = {(0, 0): M}
+            else:
+                M = M._blocks
+            blocks = {}
+            for ij, Mij in M.items():
+                if isinstance(Mij, (StencilMatrix, WideStencilMatrix)):
+                    pass
+                elif hasattr(Mij, 'tostencil'):
+                    Mij = Mij.tostencil()
+                elif hasattr(Mij, 'tokronstencil'):
+                    Mij = Mij.tokronstencil().tostencil()
+                else:
+                    raise NotImplementedError("Cannot compute the product with a block of type {}.".format(type(Mij)))
+                blocks[ij] = Mij
+            return blocks
+
+        blocks_A = stencil_blocks(self)
+        blocks_B = stencil_blocks(B)
+
+        products = {}
+        for (i, k), Aik in blocks_A.items():
+            for (l, j), Blj in blocks_B.items():
+                if k == l:
+                    products.setdefault((i, j), []).append((Aik, Blj))
+
+        blocks = {ij: StencilMatrix._matmat_sum(pairs) for ij, pairs in products.items()}
+
+        if not (isinstance(B.domain, BlockVectorSpace) or isinstance(self.codomain, BlockVectorSpace)):
+            return blocks.get((0, 0), StencilMatrix(B.domain, self.codomain, pads=(0,)*B.domain.ndim))
+
+        return BlockLinearOperator(B.domain, self.codomain, blocks=blocks)
+
     #--------------------------------------
     # Overridden properties/methods
     #--------------------------------------
@@ -1023,6 +1226,14 @@ class BlockLinearOperator(LinearOperator):
         mat = mat_topetsc( self )
         return mat
 
+    # ...
+    def update_values(self, M):
+        """ Copy the values into the PETSc matrix M created by topetsc, after
+        the blocks are assembled again. The structure of M is reused.
+        """
+        from psydac.linalg.topetsc import mat_update_values
+        return mat_update_values( self, M )
+
     def compute_interface_matrices_transpose(self):
         blocks = self._blocks.copy()
         blocks_T = {}
@@ -0,0 +1,431 @@
+# coding: utf-8
+"""
+Simplification and compilation of expressions of linear operators.
+
+Sums, scalings, compositions and powers of linear operators (see
+`psydac.linalg.basic`) are evaluated naively: each node of the expression
+tree applies its children one after the other, with its own temporaries.
+The functions of this module rewrite such a tree into an equivalent one
+which is cheaper to apply:
+
+- the stencil and block matrices of a sum are merged into a single matrix;
+- the scalar factors are folded into the matrices when possible;
+- the nested sums and compositions are flattened;
+- the adjacent matrices of a composition can be multiplied explicitly.
+
+A compiled operator additionally shares one pool of temporary vectors
+across the whole tree, so that its application allocates no new vectors.
+
+"""
+
+from psydac.linalg.basic   import (LinearOperator, ZeroOperator, IdentityOperator,
+                                   ScaledLinearOperator, SumLinearOperator,
+                                   ComposedLinearOperator, PowerLinearOperator, Vector)
+from psydac.linalg.stencil import StencilMatrix, SymmetricStencilMatrix, WideStencilMatrix
+from psydac.linalg.block   import BlockLinearOperator
+
+__all__ = (
+    'simplify_operator',
+    'compile_operator',
+    'CompiledLinearOperator'
+)
+
+#===============================================================================
+def simplify_operator(A, collapse=False):
+    """
+    Rewrite an expression of linear operators into an equivalent expression
+    which is cheaper to apply.
+
+    The stencil and block matrices of a sum are merged into a single matrix
+    (their padding is widened if needed), and the scalar factors are folded
+    into the matrices. Nested sums and compositions are flattened, identity
+    factors are removed, and the same operator appearing several times in a
+    sum is applied only once. The input operators are never modified.
+
+    Parameters
+    ----------
+    A : psydac.linalg.basic.LinearOperator
+        Expression to be simplified.
+
+    collapse : bool
+        If True, the adjacent stencil and block matrices of a composition are
+        multiplied explicitly with their `matmat` method (default: False).
+        The products which do not fit in the ghost regions of the spaces are
+        WideStencilMatrix objects, applied at the cost of one product.
+
+    Returns
+    -------
+    psydac.linalg.basic.LinearOperator
+        Simplified expression, with the same domain and codomain as A.
+    """
+    assert isinstance(A, LinearOperator)
+
+    if isinstance(A, ScaledLinearOperator):
+        return _scale(simplify_operator(A.operator, collapse), A.scalar)
+
+    elif isinstance(A, SumLinearOperator):
+        terms = [_split_scalar(simplify_operator(a, collapse)) for a in A.addends]
+        return _sum(A.domain, A.codomain, terms)
+
+    elif isinstance(A, ComposedLinearOperator):
+        factors = [simplify_operator(a, collapse) for a in A.multiplicants]
+        return _compose(A.domain, A.codomain, factors, 1, collapse)
+
+    elif isinstance(A, PowerLinearOperator):
+        return PowerLinearOperator(A.domain, A.codomain, simplify_operator(A.operator, collapse), A.factorial)
+
+    elif isinstance(A, BlockLinearOperator):
+        blocks = {ij: simplify_operator(A[ij], collapse) for ij in A.nonzero_block_indices}
+        if all(blocks[ij] is A[ij] for ij in blocks):
+            return A
+        blocks = {ij: Bij for ij, Bij in blocks.items() if not isinstance(Bij, ZeroOperator)}
+        return BlockLinearOperator(A.domain, A.codomain, blocks=blocks)
+
+    return A
+
+#===============================================================================
+def compile_operator(A, collapse=False):
+    """
+    Simplify an expression of linear operators (see `simplify_operator`) and
+    wrap it in a CompiledLinearOperator, whose application shares one pool of
+    temporary vectors across the whole expression.
+
+    Parameters
+    ----------
+    A : psydac.linalg.basic.LinearOperator
+        Expression to be compiled.
+
+    collapse : bool
+        If True, multiply the adjacent matrices of the compositions
+        explicitly (default: False).
+
+    Returns
+    -------
+    CompiledLinearOperator
+        Compiled operator, with the same domain and codomain as A.
+    """
+    return CompiledLinearOperator(simplify_operator(A, collapse=collapse))
+
+#===============================================================================
+class CompiledLinearOperator(LinearOperator):
+    """
+    Linear operator which applies an expression of linear operators with a
+    pool of temporary vectors shared by all the nodes of the expression.
+
+    The sums, scalings, compositions and powers of the expression are
+    evaluated by the compiled operator itself, which takes the temporary
+    vectors that it needs from its pool and gives them back as soon as
+    possible. The pool is filled at the first application, and reused by the
+    following ones. All the other operators (matrices, solvers, etc.) are
+    applied with their own `dot` method.
+
+    Parameters
+    ----------
+    A : psydac.linalg.basic.LinearOperator
+        Expression to be applied, which is usually simplified first with
+        `simplify_operator`.
+    """
+    def __init__(self, A):
+
+        assert isinstance(A, LinearOperator)
+        if isinstance(A, CompiledLinearOperator):
+            A = A.operator
+
+        self._operator = A
+        self._pool     = {}
+
+    #--------------------------------------
+    # Abstract interface
+    #--------------------------------------
+    @property
+    def domain(self):
+        return self._operator.domain
+
+    @property
+    def codomain(self):
+        return self._operator.codomain
+
+    @property
+    def dtype(self):
+        return self._operator.dtype
+
+    def toarray(self):
+        return self._operator.toarray()
+
+    def tosparse(self):
+        return self._operator.tosparse()
+
+    def transpose(self, conjugate=False):
+        return CompiledLinearOperator(self._operator.transpose(conjugate=conjugate))
+
+    def dot(self, v, out=None):
+        assert isinstance(v, Vector)
+        assert v.space == self.domain
+        if out is not None:
+            assert isinstance(out, Vector)
+            assert out.space == self.codomain
+            assert out is not v
+        else:
+            out = self.codomain.zeros()
+
+        self._apply(self._operator, v, out)
+        return out
+
+    #--------------------------------------
+    # Other properties/methods
+    #--------------------------------------
+    @property
+    def operator(self):
+        """ The expression applied by this operator. """
+        return self._operator
+
+    @property
+    def n_tmp_vectors(self):
+        """ Number of temporary vectors in the pool. """
+        return sum(len(vectors) for _, vectors in self._pool.values())
+
+    # ...
+    def _acquire(self, V):
+        """ Take a temporary vector of the space V from the pool. """
+        _, free = self._pool.setdefault(id(V), (V, []))
+        return free.pop() if free else V.zeros()
+
+    # ...
+    def _release(self, x):
+        """ Give the temporary vector x back to the pool. """
+        self._pool[id(x.space)][1].append(x)
+
+    # ...
+    def _apply(self, A, x, out):
+        """ Compute out = A @ x, with the temporaries of the pool. """
+
+        if isinstance(A, ScaledLinearOperator):
+            self._apply(A.operator, x, out)
+            out *= A.scalar
+
+        elif isinstance(A, SumLinearOperator):
+            addends = A.addends
+            self._apply(addends[0], x, out)
+            for a in addends[1:]:
+                c, a = _split_scalar(a)
+                y = self._acquire(A.codomain)
+                self._apply(a, x, y)
+                out.mul_iadd(c, y)
+                self._release(y)
+
+        elif isinstance(A, ComposedLinearOperator):
+            factors = A.multiplicants
+            y = x
+            for a in factors[:0:-1]:
+                z = self._acquire(a.codomain)
+                self._apply(a, y, z)
+                if y is not x:
+                    self._release(y)
+                y = z
+            self._apply(factors[0], y, out)
+            if y is not x:
+                self._release(y)
+
+        elif isinstance(A, PowerLinearOperator):
+            y = x
+            for _ in range(A.factorial - 1):
+                z = self._acquire(A.codomain)
+                self._apply(A.operator, y, z)
+                if y is not x:
+                    self._release(y)
+                y = z
+            self._apply(A.operator, y, out)
+            if y is not x:
+                self._release(y)
+
+        else:
+            A.dot(x, out=out)
+
+#===============================================================================
+def _split_scalar(A):
+    """ Write A as c * B, where B is not a ScaledLinearOperator. """
+    if isinstance(A, ScaledLinearOperator):
+        return A.scalar, A.operator
+    return 1, A
+
+#-------------------------------------------------------------------------------
+def _is_foldable(A):
+    """ True if a scalar factor can be folded into the data of A. """
+    if isinstance(A, (StencilMatrix, WideStencilMatrix)):
+        return True
+    if isinstance(A, BlockLinearOperator):
+        return all(_is_foldable(A[ij]) for ij in A.nonzero_block_indices)
+    return False
+
+#-------------------------------------------------------------------------------
+def _scale(A, c):
+    """ Simplified expression for c * A. """
+    if isinstance(A, ZeroOperator) or c == 1:
+        return A
+    if c == 0:
+        return ZeroOperator(A.domain, A.codomain)
+    if isinstance(A, ComposedLinearOperator):
+        return _compose(A.domain, A.codomain, list(A.multiplicants), c, False)
+    if _is_foldable(A):
+        return A * c
+    return ScaledLinearOperator(A.domain, A.codomain, c, A)
+
+#-------------------------------------------------------------------------------
+def _sum(domain, codomain, terms):
+    """
+    Simplified expression for the sum of the terms c * A, given as a list
+    of (c, A) pairs where A is already simplified.
+    """
+    # Flatten the nested sums, and drop the zero terms
+    flat = []
+    for c, A in terms:
+        if isinstance(A, SumLinearOperator):
+            flat.extend((c * ci, Ai) for ci, Ai in map(_split_scalar, A.addends))
+        elif not isinstance(A, ZeroOperator) and c != 0:
+            flat.append((c, A))
+
+    # Group the stencil matrices, the block matrices and the repeated operators
+    stencil = []
+    block   = []
+    others  = {}
+    for c, A in flat:
+        if isinstance(A, (StencilMatrix, WideStencilMatrix)):
+            stencil.append((c, A))
+        elif isinstance(A, BlockLinearOperator):
+            block.append((c, A))
+        else:
+            c0, _ = others.get(id(A), (0, A))
+            others[id(A)] = (c0 + c, A)
+
+    addends = []
+    if stencil:
+        addends.extend(_sum_stencil(stencil))
+    if block:
+        addends.append(_sum_block(domain, codomain, block))
+    addends.extend(_scale(A, c) for c, A in others.values())
+    addends = [A for A in addends if not isinstance(A, ZeroOperator)]
+
+    if len(addends) == 0:
+        return ZeroOperator(domain, codomain)
+    return SumLinearOperator(domain, codomain, *addends)
+
+#-------------------------------------------------------------------------------
+def _sum_stencil(terms):
+    """
+    Merge the terms c * A of a sum, where the A are stencil matrices with
+    the same domain and codomain. Return the list of the merged matrices.
+    """
+    # Matrices wider than the ghost regions: merged on the widened spaces
+    if any(isinstance(A, WideStencilMatrix) for _, A in terms):
+        terms = sorted(terms, key=lambda term: not isinstance(term[1], WideStencilMatrix))
+        M = terms[0][1] * terms[0][0]
+        for c, A in terms[1:]:
+            M = M + A * c
+        return [M]
+
+    storage = lambda A: (type(A), A.pads, A._data.dtype)
+    c0, A0  = terms[0]
+
+    # Same storage: sum the data arrays directly
+    if all(storage(A) == storage(A0) for _, A in terms):
+        M = A0 * c0
+        for c, A in terms[1:]:
+            M._data += c * A._data
+        M.ghost_regions_in_sync = False
+        return [M]
+
+    # The diagonals of different paddings are only aligned for shifts equal
+    # to 1, otherwise the matrices with the same storage are merged together
+    V = A0.domain
+    W = A0.codomain
+    if any(m != 1 for m in tuple(V.shifts) + tuple(W.shifts)):
+        groups = {}
+        for c, A in terms:
+            groups.setdefault(storage(A), []).append((c, A))
+        return [M for group in groups.values() for M in _sum_stencil(group)]
+
+    # Different storage: sum the full bands in the widest padding
+    pads = tuple(max(A.pads[d] for _, A in terms) for d in range(V.ndim))
+    M    = StencilMatrix(V, W, pads=pads, backend=A0.backend)
+    for c, A in terms:
+        if isinstance(A, SymmetricStencilMatrix):
+            A = A.tostencil()
+        index = tuple(slice(p-q, p+q+1) for p, q in zip(pads, A.pads))
+        M._data[(slice(None),)*V.ndim + index] += c * A._data
+    return [M]
+
+#-------------------------------------------------------------------------------
+def _sum_block(domain, codomain, terms):
+    """
+    Merge the terms c * A of a sum, where the A are block linear operators
+    with the same domain and codomain. The blocks are merged one by one.
+    """
+    blocks = {}
+    for c, A in terms:
+        for ij in A.nonzero_block_indices:
+            blocks.setdefault(ij, []).append(_split_scalar(_scale(A[ij], c)))
+
+    merged = {}
+    for ij, block_terms in blocks.items():
+        Aij = block_terms[0][1]
+        Mij = _sum(Aij.domain, Aij.codomain, block_terms)
+        if not isinstance(Mij, ZeroOperator):
+            merged[ij] = Mij
+
+    return BlockLinearOperator(domain, codomain, blocks=merged)
+
+#-------------------------------------------------------------------------------
+def _compose(domain, codomain, factors, c, collapse):
+    """
+    Simplified expression for c * A_n @ ... @ A_1, where the factors
+    (A_n, ..., A_1) are already simplified.
+    """
+    # Flatten the nested compositions, and extract the scalar factors
+    flat = []
+    for A in factors:
+        As = A.multiplicants if isinstance(A, ComposedLinearOperator) else (A,)
+        for Ai in As:
+            ci, Ai = _split_scalar(Ai)
+            c *= ci
+            if isinstance(Ai, ZeroOperator):
+                return ZeroOperator(domain, codomain)
+            if not isinstance(Ai, IdentityOperator):
+                flat.append(Ai)
+
+    if c == 0:
+        return ZeroOperator(domain, codomain)
+
+    # Multiply the adjacent matrices explicitly
+    if collapse:
+        collapsed = []
+        for A in flat:
+            if collapsed and _is_collapsible(collapsed[-1]) and _is_collapsible(A):
+                try:
+                    collapsed[-1] = collapsed[-1].matmat(A)
+                    continue
+                except (ValueError, NotImplementedError):
+                    pass
+            collapsed.append(A)
+        flat = collapsed
+
+    # Fold the scalar factor into the first matrix
+    if c != 1:
+        for k, A in enumerate(flat):
+            if _is_foldable(A):
+                flat[k] = A * c
+                c = 1
+                break
+
+    if len(flat) == 0:
+        A = IdentityOperator(domain, codomain)
+    elif len(flat) == 1:
+        A = flat[0]
+    else:
+        A = ComposedLinearOperator(domain, codomain, *flat)
+
+    return A if c == 1 else ScaledLinearOperator(domain, codomain, c, A)
+
+#-------------------------------------------------------------------------------
+def _is_collapsible(A):
+    """ True if A has a `matmat` method for the explicit matrix product. """
+    return isinstance(A, (StencilMatrix, WideStencilMatrix, BlockLinearOperator))
@@ -0,0 +1,509 @@
+# coding: utf-8
+"""
+This module provides iterative eigensolvers for the Hermitian (generalized)
+eigenvalue problem A x = lambda M x, where A and M are LinearOperator objects
+and M is positive definite. The solvers only need matrix-vector products and
+scalar products, which are batched so that each step performs a few global
+reductions only: hence they work with distributed vectors and operators,
+without assembling global matrices.
+
+"""
+import warnings
+import numpy as np
+from math import sqrt
+from scipy.linalg import eigh, LinAlgError
+
+from psydac.linalg.basic     import Vector, LinearOperator, IdentityOperator
+from psydac.linalg.stencil   import StencilMultiVector, StencilMatrix
+from psydac.linalg.solvers   import inverse, _block_dots, _linear_combination
+from psydac.linalg.utilities import _random_vector
+
+__all__ = (
+    'eigsh',
+    'lobpcg'
+)
+
+#===============================================================================
+def _apply(op, X, out):
+    """
+    Apply the linear operator op to all the vectors of the list X. If op is a
+    StencilMatrix, the vectors are packed in a StencilMultiVector and the
+    matrix data is read only once.
+    """
+    if isinstance(op, StencilMatrix) and len(X) > 1 and not op.domain.interfaces:
+        Y = op.dot(StencilMultiVector.from_vectors(X))
+        for j, y in enumerate(out):
+            Y.column(j, out=y)
+    else:
+        for x, y in zip(X, out):
+            op.dot(x, out=y)
+    return out
+
+#-------------------------------------------------------------------------------
+def _combine(S, C):
+    """ New list of vectors S C, i.e. the j-th vector is sum_i C[i, j] S[i]. """
+    V = S[0].space
+    return [_linear_combination(S, C[:, j], V.zeros()) for j in range(C.shape[1])]
+
+#-------------------------------------------------------------------------------
+def _b_orthogonalize(w, Bw, Q, BQ, B):
+    """
+    Orthogonalize the vector w in place against the B-orthonormal vectors Q,
+    with classical Gram-Schmidt and one reorthogonalization, and store B w in
+    Bw (which is w itself if B is None). BQ must contain the vectors B Q.
+    Return the projection coefficients and the B-norm of the result.
+
+    Each pass computes all its scalar products with a single global reduction,
+    and the norm is obtained with the second one.
+    """
+    V = w.space
+    k = len(Q)
+
+    c = V.dot_many(BQ, w) if k > 0 else np.zeros(0, dtype=V.dtype)
+    for q, ci in zip(Q, c):
+        w.mul_iadd(-ci, q)
+    if B is not None:
+        B.dot(w, out=Bw)
+
+    g = V.inner_many(BQ + [w], [w] * k + [Bw])
+    for q, bq, gi in zip(Q, BQ, g[:k]):
+        w.mul_iadd(-gi, q)
+        if B is not None:
+            Bw.mul_iadd(-gi, bq)
+
+    nrm_sqr_old = g[k].real
+    nrm_sqr     = nrm_sqr_old - np.vdot(g[:k], g[:k]).real
+    if nrm_sqr < 1e-2 * nrm_sqr_old:
+        nrm_sqr = w.dot(Bw).real
+
+    return c + g[:k], sqrt(max(nrm_sqr, 0.))
+
+#-------------------------------------------------------------------------------
+def _b_orthonormalize(W, BW, B, rtol=1e-10):
+    """
+    B-orthonormalize the list of vectors W, given BW = B W, with the
+    eigendecomposition of their Gram matrix. Nearly dependent directions are
+    dropped. Return new lists of vectors W' and B W'.
+    """
+    V = W[0].space
+    G = _block_dots([(W, BW)], V)[0]
+    s, U = eigh(0.5 * (G + G.conj().T))
+    keep = s > rtol * max(s.max(), 0)
+    C = U[:, keep] / np.sqrt(s[keep])
+    if C.shape[1] == 0:
+        return [], []
+    return _combine(W, C), (_combine(BW, C) if B is not None else None)
+
+#-------------------------------------------------------------------------------
+def _select(theta, which):
+    """ Indices of the eigenvalues theta, sorted by preference according to which. """
+    if which == 'LM':
+        return np.argsort(-abs(theta), kind='stable')
+    elif which == 'SM':
+        return np.argsort(abs(theta), kind='stable')
+    elif which == 'LA':
+        return np.argsort(-theta, kind='stable')
+    elif which == 'SA':
+        return np.argsort(theta, kind='stable')
+
+#===============================================================================
+def eigsh(A, k=6, M=None, *, sigma=None, which='LM', OPinv=None, Minv=None, v0=None, ncv=None,
+          tol=1e-8, maxiter=100, return_eigenvectors=True, verbose=False):
+    """
+    Find k eigenvalues and eigenvectors of the Hermitian eigenvalue problem
+    A x = lambda M x, with the Krylov-Schur method.
+
+    For Hermitian problems the Krylov-Schur method is equivalent to the
+    thick-restart Lanczos method [1]. A Lanczos basis of dimension ncv is
+    built for the operator OP, which is self-adjoint in the inner product
+    defined by M, and fully reorthogonalized with classical Gram-Schmidt:
+    each step needs two global reductions, however large the basis. When the
+    basis is full, the Ritz pairs are computed, and the best Ritz vectors are
+    kept as the beginning of the next basis. With maxiter=1 this is the
+    Lanczos method without restarts.
+
+    The operator OP depends on the mode:
+
+    - standard mode (M is None): OP = A;
+    - generalized mode: OP = M^{-1} A, where M^{-1} is given by Minv;
+    - shift-invert mode (sigma is given): OP = (A - sigma M)^{-1} M, where
+      (A - sigma M)^{-1} is given by OPinv, and the eigenvalues are found
+      from the eigenvalues 1 / (lambda - sigma) of OP.
+
+    Any InverseLinearOperator (or preconditioned solver, direct solver...)
+    can be passed as Minv or OPinv. If they are not given, they are created
+    with :func:~`solvers.inverse`, using the conjugate gradient method for M
+    and MINRES (GMRES if complex) for A - sigma M.
+
+    Parameters
+    ----------
+    A : psydac.linalg.basic.LinearOperator
+        Hermitian operator.
+
+    k : int
+        Number of eigenvalues and eigenvectors (Default: 6).
+
+    M : psydac.linalg.basic.LinearOperator
+        Hermitian positive definite operator (optional), e.g. a mass matrix.
+
+    sigma : float
+        Shift of the shift-invert mode (optional).
+
+    which : str
+        Which eigenvalues of OP to find: 'LM' (largest magnitude), 'SM'
+        (smallest magnitude), 'LA' (largest algebraic) or 'SA' (smallest
+        algebraic). With the default 'LM', in shift-invert mode the
+        eigenvalues closest to sigma are found.
+
+    OPinv : psydac.linalg.basic.LinearOperator
+        Inverse of A - sigma M, used in shift-invert mode (optional).
+
+    Minv : psydac.linalg.basic.LinearOperator
+        Inverse of M, used in generalized mode (optional).
+
+    v0 : psydac.linalg.basic.Vector
+        Starting vector (optional). If not given, a random vector is used.
+
+    ncv : int
+        Maximum dimension of the Lanczos basis (Default: max(2k+1, 20)).
+
+    tol : float
+        Relative tolerance on the residual of the eigenpairs of OP
+        (Default: 1e-8).
+
+    maxiter : int
+        Maximum number of restarts (Default: 100).
+
+    return_eigenvectors : bool
+        If True, return the eigenvectors as well (Default: True).
+
+    verbose : bool
+        If True, print the number of converged eigenpairs at each restart.
+
+    Returns
+    -------
+    w : numpy.ndarray
+        The k eigenvalues, in ascending order.
+
+    v : list of psydac.linalg.basic.Vector
+        The k eigenvectors, M-orthonormal (only if return_eigenvectors=True).
+
+    References
+    ----------
+    [1] K. Wu and H. Simon, Thick-restart Lanczos method for large symmetric
+        eigenvalue problems, SIAM J. Matrix Anal. Appl. 22 (2000), pp. 602-616.
+
+    """
+    assert isinstance(A, LinearOperator)
+    assert A.domain == A.codomain
+    V = A.domain
+    n = V.dimension
+    assert isinstance(k, int) and 0 < k < n - 1
+    assert isinstance(maxiter, int) and maxiter > 0
+    if which not in ('LM', 'SM', 'LA', 'SA'):
+        raise ValueError(f"Parameter which='{which}' not understood.")
+    if M is not None:
+        assert isinstance(M, LinearOperator)
+        assert M.domain == V and M.codomain == V
+
+    # Spectral transformation
+    if sigma is None:
+        if M is None:
+            OP = A
+        else:
+            if Minv is None:
+                Minv = inverse(M, 'cg', tol=1e-12)
+            OP = Minv @ A
+    else:
+        if OPinv is None:
+            S = A - sigma * (M if M is not None else IdentityOperator(V))
+            OPinv = inverse(S, 'gmres' if V.dtype == complex else 'minres', tol=1e-12)
+        OP = OPinv @ M if M is not None else OPinv
+
+    m = ncv if ncv is not None else max(2 * k + 1, 20)
+    m = min(m, n - 1)
+    assert k < m
+
+    # Lanczos basis Q, and BQ = M Q in generalized and shift-invert modes
+    B  = M
+    Q  = [V.zeros() for _ in range(m + 1)]
+    BQ = Q if B is None else [V.zeros() for _ in range(m + 1)]
+    W  = [V.zeros() for _ in range(m)]
+    H  = np.zeros((m, m), dtype=V.dtype)
+
+    # Starting vector
+    if v0 is None:
+        _random_vector(V).copy(out=Q[0])
+    else:
+        assert isinstance(v0, Vector)
+        assert v0.space == V
+        v0.copy(out=Q[0])
+    _, nrm = _b_orthogonalize(Q[0], BQ[0], [], [], B)
+    Q[0] *= 1 / nrm
+    if B is not None:
+        BQ[0] *= 1 / nrm
+
+    if verbose:
+        print( "Krylov-Schur eigensolver:" )
+        print( "+---------+-------------+")
+        print( "+ Restart | # converged |")
+        print( "+---------+-------------+")
+        template = "| {:7d} | {:11d} |"
+
+    l = 0
+    for it in range(1, maxiter + 1):
+
+        # Expand the basis from l to m vectors
+        for j in range(l, m):
+            OP.dot(Q[j], out=Q[j+1])
+            c, beta = _b_orthogonalize(Q[j+1], BQ[j+1], Q[:j+1], BQ[:j+1], B)
+            H[:j+1, j] = c
+
+            # Invariant subspace: continue with a random orthogonal vector
+            if beta <= 1e-12 * max(np.linalg.norm(c), 1e-300):
+                _random_vector(V, seed=it * m + j + 1).copy(out=Q[j+1])
+                _, nrm = _b_orthogonalize(Q[j+1], BQ[j+1], Q[:j+1], BQ[:j+1], B)
+                Q[j+1] *= 1 / nrm
+                if B is not None:
+                    BQ[j+1] *= 1 / nrm
+                beta = 0.
+            else:
+                Q[j+1] *= 1 / beta
+                if B is not None:
+                    BQ[j+1] *= 1 / beta
+
+        # Rayleigh-Ritz: the projected matrix is Hermitian, and its upper part
+        # is given by the Gram-Schmidt coefficients
+        T = np.triu(H) + np.triu(H, 1).conj().T
+        theta, Y = eigh(T)
+        order = _select(theta, which)
+        theta, Y = theta[order], Y[:, order]
+
+        # Residual norms of the Ritz pairs of OP
+        res  = abs(beta * Y[m-1, :k])
+        conv = res <= tol * np.maximum(abs(theta[:k]), np.finfo(float).eps)
+        nconv = int(conv.sum())
+
+        if verbose:
+            print( template.format(it, nconv) )
+
+        if nconv == k or it == maxiter:
+            break
+
+        # Thick restart: keep the l best Ritz vectors, followed by Q[m]
+        l = (m + k) // 2
+        W[:l] = _combine(Q[:m], Y[:, :l])
+        Q[:l], W[:l] = W[:l], Q[:l]
+        if B is not None:
+            W[:l] = _combine(BQ[:m], Y[:, :l])
+            BQ[:l], W[:l] = W[:l], BQ[:l]
+        Q[l], Q[m] = Q[m], Q[l]
+        if B is not None:
+            BQ[l], BQ[m] = BQ[m], BQ[l]
+        H[:, :] = 0
+        H[:l, :l] = np.diag(theta[:l])
+
+    if verbose:
+        print( "+---------+-------------+")
+
+    if nconv < k:
+        warnings.warn(f'eigsh: only {nconv} of the {k} eigenpairs converged after {maxiter} restarts',
+                      category=RuntimeWarning)
+
+    # Eigenvalues of the original problem, in ascending order
+    theta = theta[:k]
+    w = theta if sigma is None else sigma + 1 / theta
+    order = np.argsort(w)
+    w = w[order]
+
+    if not return_eigenvectors:
+        return w
+
+    v = _combine(Q[:m], Y[:, :k][:, order])
+    return w, v
+
+#===============================================================================
+def lobpcg(A, X, M=None, *, pc=None, largest=False, tol=1e-8, maxiter=100, verbose=False):
+    """
+    Find the smallest (or largest) eigenvalues and eigenvectors of the
+    Hermitian eigenvalue problem A x = lambda M x, with the Locally Optimal
+    Block Preconditioned Conjugate Gradient method (LOBPCG) [1].
+
+    All the eigenpairs are iterated together: at each iteration the new
+    approximations are found by the Rayleigh-Ritz method in the space spanned
+    by the current approximations X, the preconditioned residuals W of the
+    pairs which have not converged yet, and the previous search directions P.
+    All the scalar products of the Rayleigh-Ritz step are computed with a
+    single global reduction. If A (or M) is a StencilMatrix, it is applied to
+    all the vectors of a block at once (see StencilMultiVector).
+
+    Parameters
+    ----------
+    A : psydac.linalg.basic.LinearOperator
+        Hermitian operator.
+
+    X : list of psydac.linalg.basic.Vector | psydac.linalg.stencil.StencilMultiVector
+        Initial approximation of the k eigenvectors. Its size gives the
+        number of eigenpairs, k, which must be smaller than a third of the
+        dimension of the space.
+
+    M : psydac.linalg.basic.LinearOperator
+        Hermitian positive definite operator (optional), e.g. a mass matrix.
+
+    pc : psydac.linalg.basic.LinearOperator
+        Hermitian positive definite preconditioner (optional), which should
+        approximate the inverse of A (or of A - sigma M for a shift sigma
+        close to the wanted eigenvalues).
+
+    largest : bool
+        If True, find the largest eigenvalues instead of the smallest ones
+        (Default: False).
+
+    tol : float
+        Tolerance on the relative residual ||A x - lambda M x|| /
+        (||A x|| + |lambda| ||M x||) of each eigenpair (Default: 1e-8).
+
+    maxiter : int
+        Maximum number of iterations (Default: 100).
+
+    verbose : bool
+        If True, print the largest relative residual at each iteration.
+
+    Returns
+    -------
+    w : numpy.ndarray
+        The k eigenvalues, in ascending order.
+
+    v : list of psydac.linalg.basic.Vector | psydac.linalg.stencil.StencilMultiVector
+        The k eigenvectors, M-orthonormal, with the same type as X.
+
+    References
+    ----------
+    [1] A.V. Knyazev, Toward the optimal preconditioned eigensolver: locally
+        optimal block preconditioned conjugate gradient method, SIAM J. Sci.
+        Comput. 23 (2001), pp. 517-541.
+
+    """
+    assert isinstance(A, LinearOperator)
+    assert A.domain == A.codomain
+    assert isinstance(maxiter, int) and maxiter > 0
+
+    multi = isinstance(X, StencilMultiVector)
+    X = X.to_vectors() if multi else [x.copy() for x in X]
+    k = len(X)
+    V = A.domain
+    assert k > 0 and 3 * k < V.dimension
+    assert all(x.space == V for x in X)
+    if M is not None:
+        assert isinstance(M, LinearOperator)
+        assert M.domain == V and M.codomain == V
+    if pc is not None:
+        assert isinstance(pc, LinearOperator)
+
+    def apply_M(Y):
+        return Y if M is None else _apply(M, Y, [V.zeros() for _ in Y])
+
+    def apply_A(Y):
+        return _apply(A, Y, [V.zeros() for _ in Y])
+
+    def rayleigh_ritz(S, AS, MS):
+        GA, GM = _block_dots([(S, AS), (S, MS)], V)
+        GA = 0.5 * (GA + GA.conj().T)
+        GM = 0.5 * (GM + GM.conj().T)
+        theta, C = eigh(GA, GM)
+        idx = np.arange(len(theta) - k, len(theta))[::-1] if largest else np.arange(k)
+        return theta[idx], C[:, idx]
+
+    # Initial Rayleigh-Ritz step in the space spanned by X
+    MX = apply_M(X)
+    X, MX = _b_orthonormalize(X, MX, M)
+    if M is None:
+        MX = X
+    if len(X) < k:
+        raise ValueError('The initial vectors of LOBPCG must be linearly independent')
+    AX = apply_A(X)
+    theta, C = rayleigh_ritz(X, AX, MX)
+    X, AX = _combine(X, C), _combine(AX, C)
+    MX = X if M is None else _combine(MX, C)
+
+    P = AP = MP = None
+    R = [V.zeros() for _ in range(k)]
+
+    if verbose:
+        print( "LOBPCG eigensolver:" )
+        print( "+---------+----------+-------------------+")
+        print( "+ Iter. # | # active | Max. rel. residual |")
+        print( "+---------+----------+-------------------+")
+        template = "| {:7d} | {:8d} | {:18.2e} |"
+
+    for it in range(1, maxiter + 1):
+
+        # Residuals and their relative norms, with a single reduction
+        for r, ax, mx, t in zip(R, AX, MX, theta):
+            ax.copy(out=r)
+            r.mul_iadd(-t, mx)
+        nrm = np.sqrt(abs(V.inner_many(R + AX + MX, R + AX + MX).real))
+        rel = nrm[:k] / np.maximum(nrm[k:2*k] + abs(theta) * nrm[2*k:], np.finfo(float).tiny)
+        active = np.flatnonzero(rel > tol)
+
+        if verbose:
+            print( template.format(it, len(active), rel.max()) )
+
+        if len(active) == 0:
+            break
+
+        # Preconditioned residuals, M-orthogonal to X and M-orthonormal
+        Wr = [R[i] if pc is None else pc.dot(R[i]) for i in active]
+        if pc is None:
+            Wr = [w.copy() for w in Wr]
+        G  = _block_dots([(MX, Wr)], V)[0]
+        for j, w in enumerate(Wr):
+            for i, x in enumerate(X):
+                w.mul_iadd(-G[i, j], x)
+        Wr, MW = _b_orthonormalize(Wr, apply_M(Wr), M)
+        if M is None:
+            MW = Wr
+        AW = apply_A(Wr)
+
+        # Previous search directions of the active pairs, M-orthonormal
+        if P is not None:
+            Pa, MPa = _b_orthonormalize([P[i] for i in active], [MP[i] for i in active], M)
+            if M is None:
+                MPa = Pa
+            APa = apply_A(Pa)
+        else:
+            Pa = MPa = APa = []
+
+        # Rayleigh-Ritz step in the space spanned by [X, W, P]. If the Gram
+        # matrix is too ill-conditioned, the search directions are dropped.
+        try:
+            theta, C = rayleigh_ritz(X + Wr + Pa, AX + AW + APa, MX + MW + MPa)
+        except LinAlgError:
+            Pa = MPa = APa = []
+            theta, C = rayleigh_ritz(X + Wr, AX + AW, MX + MW)
+
+        # New search directions, and new approximations of the eigenvectors
+        D  = C[k:]
+        P  = _combine(Wr + Pa, D)
+        AP = _combine(AW + APa, D)
+        MP = P if M is None else _combine(MW + MPa, D)
+        X  = _combine(X, C[:k])
+        AX = _combine(AX, C[:k])
+        MX = X if M is None else _combine(MX, C[:k])
+        for Y, DY in ((X, P), (AX, AP)) + (() if M is None else ((MX, MP),)):
+            for y, dy in zip(Y, DY):
+                y += dy
+
+    if verbose:
+        print( "+---------+----------+-------------------+")
+
+    if len(active) > 0:
+        warnings.warn(f'lobpcg: {len(active)} of the {k} eigenpairs did not converge after {maxiter} iterations',
+                      category=RuntimeWarning)
+
+    order = np.argsort(theta)
+    w = theta[order]
+    v = [X[i] for i in order]
+    if multi:
+        v = StencilMultiVector.from_vectors(v)
+    return w, v
@@ -56,3 +56,72 @@ def axpy_3d(alpha: 'T', x: 'T[:,:,:]', y: 'T[:,:,:]'):
         for i2 in range(n2):
             for i3 in range(n3):
                 y[i1, i2, i3] += alpha * x[i1, i2, i3]
+
+#========================================================================================================
+@template(name='T', types=[float, complex])
+def axpy_1d_omp(alpha: 'T', x: 'T[:]', y: 'T[:]', nthreads: 'int64'):
+    """
+    Multi-threaded kernel for computing y = alpha * x + y.
+
+    Parameters
+    ----------
+    alpha : float | complex
+        Scaling coefficient.
+
+    x, y : 1D Numpy arrays of (float | complex) data
+        Data of the vectors.
+
+    nthreads : int
+        Number of OpenMP threads.
+    """
+    n1, = x.shape
+    #$omp parallel for schedule(static) collapse(1) num_threads(nthreads)
+    for i1 in range(n1):
+        y[i1] += alpha * x[i1]
+
+#========================================================================================================
+@template(name='T', types=[float, complex])
+def axpy_2d_omp(alpha: 'T', x: 'T[:,:]', y: 'T[:,:]', nthreads: 'int64'):
+    """
+    Multi-threaded kernel for computing y = alpha * x + y.
+
+    Parameters
+    ----------
+    alpha : float | complex
+        Scaling coefficient.
+
+    x, y : 2D Numpy arrays of (float | complex) data
+        Data of the vectors.
+
+    nthreads : int
+        Number of OpenMP threads.
+    """
+    n1, n2 = x.shape
+    #$omp parallel for schedule(static) collapse(2) num_threads(nthreads)
+    for i1 in range(n1):
+        for i2 in range(n2):
+            y[i1, i2] += alpha * x[i1, i2]
+
+#========================================================================================================
+@template(name='T', types=[float, complex])
+def axpy_3d_omp(alpha: 'T', x: 'T[:,:,:]', y: 'T[:,:,:]', nthreads: 'int64'):
+    """
+    Multi-threaded kernel for computing y = alpha * x + y.
+
+    Parameters
+    ----------
+    alpha : float | complex
+        Scaling coefficient.
+
+    x, y : 3D Numpy arrays of (float | complex) data
+        Data of the vectors.
+
+    nthreads : int
+        Number of OpenMP threads.
+    """
+    n1, n2, n3 = x.shape
+    #$omp parallel for schedule(static) collapse(3) num_threads(nthreads)
+    for i1 in range(n1):
+        for i2 in range(n2):
+            for i3 in range(n3):
+                y[i1, i2, i3] += alpha * x[i1, i2, i3]
@@ -0,0 +1,445 @@
+from pyccel.decorators import template
+
+# Kernels for the incomplete factorizations ILU(0) and IC(0) of a stencil
+# matrix, whose spaces have shifts equal to 1, and for the corresponding
+# triangular solves.
+#
+# The factors are stored in place of the array F, which contains the locally
+# owned rows of the matrix (without ghost regions) and whose diagonals are
+# centered at pads. The rows are ordered lexicographically, hence the entries
+# F[i, p + k] with k < 0 (lexicographically) belong to the unit lower triangular
+# factor L, and the other ones to the upper triangular factor U. The entries
+# which couple to columns outside of the local box must be zero on input.
+#
+# The vectors b and x are given by their data arrays, with ghost regions of
+# size gpads.
+
+#========================================================================================================
+@template(name='T', types=[float, complex])
+def ilu0_1d(F: 'T[:,:]', pads: 'int64[:]'):
+
+    n1 = F.shape[0]
+    p1 = pads[0]
+
+    for i1 in range(n1):
+        for k1 in range(max(-p1, -i1), 0):
+            j1 = i1 + k1
+            l  = F[i1, p1 + k1] / F[j1, p1]
+            F[i1, p1 + k1] = l
+            for q1 in range(1, min(p1, n1 - 1 - j1) + 1):
+                if k1 + q1 <= p1:
+                    F[i1, p1 + k1 + q1] -= l * F[j1, p1 + q1]
+
+#========================================================================================================
+@template(name='T', types=[float, complex])
+def ilu0_2d(F: 'T[:,:,:,:]', pads: 'int64[:]'):
+
+    n1 = F.shape[0]
+    n2 = F.shape[1]
+    p1 = pads[0]
+    p2 = pads[1]
+
+    for i1 in range(n1):
+        for i2 in range(n2):
+            for k1 in range(max(-p1, -i1), 1):
+                for k2 in range(max(-p2, -i2), min(p2, n2 - 1 - i2) + 1):
+                    if k1 == 0 and k2 >= 0:
+                        break
+                    j1 = i1 + k1
+                    j2 = i2 + k2
+                    l  = F[i1, i2, p1 + k1, p2 + k2] / F[j1, j2, p1, p2]
+                    F[i1, i2, p1 + k1, p2 + k2] = l
+                    for q1 in range(0, min(p1, n1 - 1 - j1) + 1):
+                        for q2 in range(max(max(-p2, -p2 - k2), -j2), min(min(p2, p2 - k2), n2 - 1 - j2) + 1):
+                            if q1 == 0 and q2 <= 0:
+                                continue
+                            F[i1, i2, p1 + k1 + q1, p2 + k2 + q2] -= l * F[j1, j2, p1 + q1, p2 + q2]
+
+#========================================================================================================
+@template(name='T', types=[float, complex])
+def ilu0_3d(F: 'T[:,:,:,:,:,:]', pads: 'int64[:]'):
+
+    n1 = F.shape[0]
+    n2 = F.shape[1]
+    n3 = F.shape[2]
+    p1 = pads[0]
+    p2 = pads[1]
+    p3 = pads[2]
+
+    for i1 in range(n1):
+        for i2 in range(n2):
+            for i3 in range(n3):
+                for k1 in range(max(-p1, -i1), 1):
+                    for k2 in range(max(-p2, -i2), min(p2, n2 - 1 - i2) + 1):
+                        if k1 == 0 and k2 > 0:
+                            break
+                        for k3 in range(max(-p3, -i3), min(p3, n3 - 1 - i3) + 1):
+                            if k1 == 0 and k2 == 0 and k3 >= 0:
+                                break
+                            j1 = i1 + k1
+                            j2 = i2 + k2
+                            j3 = i3 + k3
+                            l  = F[i1, i2, i3, p1 + k1, p2 + k2, p3 + k3] / F[j1, j2, j3, p1, p2, p3]
+                            F[i1, i2, i3, p1 + k1, p2 + k2, p3 + k3] = l
+                            for q1 in range(0, min(p1, n1 - 1 - j1) + 1):
+                                for q2 in range(max(max(-p2, -p2 - k2), -j2), min(min(p2, p2 - k2), n2 - 1 - j2) + 1):
+                                    if q1 == 0 and q2 < 0:
+                                        continue
+                                    for q3 in range(max(max(-p3, -p3 - k3), -j3), min(min(p3, p3 - k3), n3 - 1 - j3) + 1):
+                                        if q1 == 0 and q2 == 0 and q3 <= 0:
+                                            continue
+                                        F[i1, i2, i3, p1 + k1 + q1, p2 + k2 + q2, p3 + k3 + q3] -= l * F[j1, j2, j3, p1 + q1, p2 + q2, p3 + q3]
+
+#========================================================================================================
+@template(name='T', types=[float, complex])
+def ic0_1d(F: 'T[:,:]', pads: 'int64[:]'):
+
+    n1 = F.shape[0]
+    p1 = pads[0]
+
+    # Factorization A = L D L^H, with D stored on the main diagonal
+    for i1 in range(n1):
+        for k1 in range(max(-p1, -i1), 0):
+            j1 = i1 + k1
+            s  = F[i1, p1 + k1]
+            for m1 in range(max(-p1, -i1), k1):
+                s -= F[i1, p1 + m1] * F[i1 + m1, p1] * F[j1, p1 + m1 - k1].conjugate()
+            F[i1, p1 + k1] = s / F[j1, p1]
+        d = F[i1, p1]
+        for k1 in range(max(-p1, -i1), 0):
+            d -= F[i1, p1 + k1] * F[i1, p1 + k1].conjugate() * F[i1 + k1, p1]
+        F[i1, p1] = d
+
+    # Upper triangular factor U = D L^H
+    for i1 in range(n1):
+        for q1 in range(1, min(p1, n1 - 1 - i1) + 1):
+            F[i1, p1 + q1] = F[i1, p1] * F[i1 + q1, p1 - q1].conjugate()
+
+#========================================================================================================
+@template(name='T', types=[float, complex])
+def ic0_2d(F: 'T[:,:,:,:]', pads: 'int64[:]'):
+
+    n1 = F.shape[0]
+    n2 = F.shape[1]
+    p1 = pads[0]
+    p2 = pads[1]
+
+    # Factorization A = L D L^H, with D stored on the main diagonal
+    for i1 in range(n1):
+        for i2 in range(n2):
+            for k1 in range(max(-p1, -i1), 1):
+                for k2 in range(max(-p2, -i2), min(p2, n2 - 1 - i2) + 1):
+                    if k1 == 0 and k2 >= 0:
+                        break
+                    j1 = i1 + k1
+                    j2 = i2 + k2
+                    s  = F[i1, i2, p1 + k1, p2 + k2]
+                    for m1 in range(max(max(-p1, k1 - p1), -i1), k1 + 1):
+                        for m2 in range(max(max(-p2, k2 - p2), -i2), min(min(p2, k2 + p2), n2 - 1 - i2) + 1):
+                            if m1 == k1 and m2 >= k2:
+                                break
+                            s -= F[i1, i2, p1 + m1, p2 + m2] * F[i1 + m1, i2 + m2, p1, p2] * F[j1, j2, p1 + m1 - k1, p2 + m2 - k2].conjugate()
+                    F[i1, i2, p1 + k1, p2 + k2] = s / F[j1, j2, p1, p2]
+            d = F[i1, i2, p1, p2]
+            for k1 in range(max(-p1, -i1), 1):
+                for k2 in range(max(-p2, -i2), min(p2, n2 - 1 - i2) + 1):
+                    if k1 == 0 and k2 >= 0:
+                        break
+                    d -= F[i1, i2, p1 + k1, p2 + k2] * F[i1, i2, p1 + k1, p2 + k2].conjugate() * F[i1 + k1, i2 + k2, p1, p2]
+            F[i1, i2, p1, p2] = d
+
+    # Upper triangular factor U = D L^H
+    for i1 in range(n1):
+        for i2 in range(n2):
+            for q1 in range(0, min(p1, n1 - 1 - i1) + 1):
+                for q2 in range(max(-p2, -i2), min(p2, n2 - 1 - i2) + 1):
+                    if q1 == 0 and q2 <= 0:
+                        continue
+                    F[i1, i2, p1 + q1, p2 + q2] = F[i1, i2, p1, p2] * F[i1 + q1, i2 + q2, p1 - q1, p2 - q2].conjugate()
+
+#========================================================================================================
+@template(name='T', types=[float, complex])
+def ic0_3d(F: 'T[:,:,:,:,:,:]', pads: 'int64[:]'):
+
+    n1 = F.shape[0]
+    n2 = F.shape[1]
+    n3 = F.shape[2]
+    p1 = pads[0]
+    p2 = pads[1]
+    p3 = pads[2]
+
+    # Factorization A = L D L^H, with D stored on the main diagonal
+    for i1 in range(n1):
+        for i2 in range(n2):
+            for i3 in range(n3):
+                for k1 in range(max(-p1, -i1), 1):
+                    for k2 in range(max(-p2, -i2), min(p2, n2 - 1 - i2) + 1):
+                        if k1 == 0 and k2 > 0:
+                            break
+                        for k3 in range(max(-p3, -i3), min(p3, n3 - 1 - i3) + 1):
+                            if k1 == 0 and k2 == 0 and k3 >= 0:
+                                break
+                            j1 = i1 + k1
+                            j2 = i2 + k2
+                            j3 = i3 + k3
+                            s  = F[i1, i2, i3, p1 + k1, p2 + k2, p3 + k3]
+                            for m1 in range(max(max(-p1, k1 - p1), -i1), k1 + 1):
+                                for m2 in range(max(max(-p2, k2 - p2), -i2), min(min(p2, k2 + p2), n2 - 1 - i2) + 1):
+                                    if m1 == k1 and m2 > k2:
+                                        break
+                                    for m3 in range(max(max(-p3, k3 - p3), -i3), min(min(p3, k3 + p3), n3 - 1 - i3) + 1):
+                                        if m1 == k1 and m2 == k2 and m3 >= k3:
+                                            break
+                                        s -= (F[i1, i2, i3, p1 + m1, p2 + m2, p3 + m3] * F[i1 + m1, i2 + m2, i3 + m3, p1, p2, p3]
+                                              * F[j1, j2, j3, p1 + m1 - k1, p2 + m2 - k2, p3 + m3 - k3].conjugate())
+                            F[i1, i2, i3, p1 + k1, p2 + k2, p3 + k3] = s / F[j1, j2, j3, p1, p2, p3]
+                d = F[i1, i2, i3, p1, p2, p3]
+                for k1 in range(max(-p1, -i1), 1):
+                    for k2 in range(max(-p2, -i2), min(p2, n2 - 1 - i2) + 1):
+                        if k1 == 0 and k2 > 0:
+                            break
+                        for k3 in range(max(-p3, -i3), min(p3, n3 - 1 - i3) + 1):
+                            if k1 == 0 and k2 == 0 and k3 >= 0:
+                                break
+                            d -= (F[i1, i2, i3, p1 + k1, p2 + k2, p3 + k3] * F[i1, i2, i3, p1 + k1, p2 + k2, p3 + k3].conjugate()
+                                  * F[i1 + k1, i2 + k2, i3 + k3, p1, p2, p3])
+                F[i1, i2, i3, p1, p2, p3] = d
+
+    # Upper triangular factor U = D L^H
+    for i1 in range(n1):
+        for i2 in range(n2):
+            for i3 in range(n3):
+                for q1 in range(0, min(p1, n1 - 1 - i1) + 1):
+                    for q2 in range(max(-p2, -i2), min(p2, n2 - 1 - i2) + 1):
+                        if q1 == 0 and q2 < 0:
+                            continue
+                        for q3 in range(max(-p3, -i3), min(p3, n3 - 1 - i3) + 1):
+                            if q1 == 0 and q2 == 0 and q3 <= 0:
+                                continue
+                            F[i1, i2, i3, p1 + q1, p2 + q2, p3 + q3] = (F[i1, i2, i3, p1, p2, p3]
+                                * F[i1 + q1, i2 + q2, i3 + q3, p1 - q1, p2 - q2, p3 - q3].conjugate())
+
+#========================================================================================================
+@template(name='T', types=[float, complex])
+def ilu0_solve_1d(F: 'T[:,:]', b: 'T[:]', x: 'T[:]', gpads: 'int64[:]', pads: 'int64[:]'):
+
+    n1 = F.shape[0]
+    p1 = pads[0]
+    g1 = gpads[0]
+
+    # Forward substitution L y = b
+    for i1 in range(n1):
+        s = b[g1 + i1]
+        for k1 in range(max(-p1, -i1), 0):
+            s -= F[i1, p1 + k1] * x[g1 + i1 + k1]
+        x[g1 + i1] = s
+
+    # Backward substitution U x = y
+    for i1 in range(n1 - 1, -1, -1):
+        s = x[g1 + i1]
+        for k1 in range(1, min(p1, n1 - 1 - i1) + 1):
+            s -= F[i1, p1 + k1] * x[g1 + i1 + k1]
+        x[g1 + i1] = s / F[i1, p1]
+
+#========================================================================================================
+@template(name='T', types=[float, complex])
+def ilu0_solve_2d(F: 'T[:,:,:,:]', b: 'T[:,:]', x: 'T[:,:]', gpads: 'int64[:]', pads: 'int64[:]'):
+
+    n1 = F.shape[0]
+    n2 = F.shape[1]
+    p1 = pads[0]
+    p2 = pads[1]
+    g1 = gpads[0]
+    g2 = gpads[1]
+
+    # Forward substitution L y = b
+    for i1 in range(n1):
+        for i2 in range(n2):
+            s = b[g1 + i1, g2 + i2]
+            for k1 in range(max(-p1, -i1), 1):
+                for k2 in range(max(-p2, -i2), min(p2, n2 - 1 - i2) + 1):
+                    if k1 == 0 and k2 >= 0:
+                        break
+                    s -= F[i1, i2, p1 + k1, p2 + k2] * x[g1 + i1 + k1, g2 + i2 + k2]
+            x[g1 + i1, g2 + i2] = s
+
+    # Backward substitution U x = y
+    for i1 in range(n1 - 1, -1, -1):
+        for i2 in range(n2 - 1, -1, -1):
+            s = x[g1 + i1, g2 + i2]
+            for k1 in range(0, min(p1, n1 - 1 - i1) + 1):
+                for k2 in range(max(-p2, -i2), min(p2, n2 - 1 - i2) + 1):
+                    if k1 == 0 and k2 <= 0:
+                        continue
+                    s -= F[i1, i2, p1 + k1, p2 + k2] * x[g1 + i1 + k1, g2 + i2 + k2]
+            x[g1 + i1, g2 + i2] = s / F[i1, i2, p1, p2]
+
+#========================================================================================================
+@template(name='T', types=[float, complex])
+def ilu0_solve_3d(F: 'T[:,:,:,:,:,:]', b: 'T[:,:,:]', x: 'T[:,:,:]', gpads: 'int64[:]', pads: 'int64[:]'):
+
+    n1 = F.shape[0]
+    n2 = F.shape[1]
+    n3 = F.shape[2]
+    p1 = pads[0]
+    p2 = pads[1]
+    p3 = pads[2]
+    g1 = gpads[0]
+    g2 = gpads[1]
+    g3 = gpads[2]
+
+    # Forward substitution L y = b
+    for i1 in range(n1):
+        for i2 in range(n2):
+            for i3 in range(n3):
+                s = b[g1 + i1, g2 + i2, g3 + i3]
+                for k1 in range(max(-p1, -i1), 1):
+                    for k2 in range(max(-p2, -i2), min(p2, n2 - 1 - i2) + 1):
+                        if k1 == 0 and k2 > 0:
+                            break
+                        for k3 in range(max(-p3, -i3), min(p3, n3 - 1 - i3) + 1):
+                            if k1 == 0 and k2 == 0 and k3 >= 0:
+                                break
+                            s -= F[i1, i2, i3, p1 + k1, p2 + k2, p3 + k3] * x[g1 + i1 + k1, g2 + i2 + k2, g3 + i3 + k3]
+                x[g1 + i1, g2 + i2, g3 + i3] = s
+
+    # Backward substitution U x = y
+    for i1 in range(n1 - 1, -1, -1):
+        for i2 in range(n2 - 1, -1, -1):
+            for i3 in range(n3 - 1, -1, -1):
+                s = x[g1 + i1, g2 + i2, g3 + i3]
+                for k1 in range(0, min(p1, n1 - 1 - i1) + 1):
+                    for k2 in range(max(-p2, -i2), min(p2, n2 - 1 - i2) + 1):
+                        if k1 == 0 and k2 < 0:
+                            continue
+                        for k3 in range(max(-p3, -i3), min(p3, n3 - 1 - i3) + 1):
+                            if k1 == 0 and k2 == 0 and k3 <= 0:
+                                continue
+                            s -= F[i1, i2, i3, p1 + k1, p2 + k2, p3 + k3] * x[g1 + i1 + k1, g2 + i2 + k2, g3 + i3 + k3]
+                x[g1 + i1, g2 + i2, g3 + i3] = s / F[i1, i2, i3, p1, p2, p3]
+
+#========================================================================================================
+@template(name='T', types=[float, complex])
+def ilu0_solve_transpose_1d(F: 'T[:,:]', b: 'T[:]', x: 'T[:]', gpads: 'int64[:]', pads: 'int64[:]', conjugate: 'bool'):
+
+    n1 = F.shape[0]
+    p1 = pads[0]
+    g1 = gpads[0]
+
+    # Forward substitution U^T y = b
+    for i1 in range(n1):
+        s = b[g1 + i1]
+        for k1 in range(max(-p1, -i1), 0):
+            u = F[i1 + k1, p1 - k1]
+            if conjugate:
+                u = u.conjugate()
+            s -= u * x[g1 + i1 + k1]
+        u = F[i1, p1]
+        if conjugate:
+            u = u.conjugate()
+        x[g1 + i1] = s / u
+
+    # Backward substitution L^T x = y
+    for i1 in range(n1 - 1, -1, -1):
+        s = x[g1 + i1]
+        for k1 in range(1, min(p1, n1 - 1 - i1) + 1):
+            u = F[i1 + k1, p1 - k1]
+            if conjugate:
+                u = u.conjugate()
+            s -= u * x[g1 + i1 + k1]
+        x[g1 + i1] = s
+
+#========================================================================================================
+@template(name='T', types=[float, complex])
+def ilu0_solve_transpose_2d(F: 'T[:,:,:,:]', b: 'T[:,:]', x: 'T[:,:]', gpads: 'int64[:]', pads: 'int64[:]', conjugate: 'bool'):
+
+    n1 = F.shape[0]
+    n2 = F.shape[1]
+    p1 = pads[0]
+    p2 = pads[1]
+    g1 = gpads[0]
+    g2 = gpads[1]
+
+    # Forward substitution U^T y = b
+    for i1 in range(n1):
+        for i2 in range(n2):
+            s = b[g1 + i1, g2 + i2]
+            for k1 in range(max(-p1, -i1), 1):
+                for k2 in range(max(-p2, -i2), min(p2, n2 - 1 - i2) + 1):
+                    if k1 == 0 and k2 >= 0:
+                        break
+                    u = F[i1 + k1, i2 + k2, p1 - k1, p2 - k2]
+                    if conjugate:
+                        u = u.conjugate()
+                    s -= u * x[g1 + i1 + k1, g2 + i2 + k2]
+            u = F[i1, i2, p1, p2]
+            if conjugate:
+                u = u.conjugate()
+            x[g1 + i1, g2 + i2] = s / u
+
+    # Backward substitution L^T x = y
+    for i1 in range(n1 - 1, -1, -1):
+        for i2 in range(n2 - 1, -1, -1):
+            s = x[g1 + i1, g2 + i2]
+            for k1 in range(0, min(p1, n1 - 1 - i1) + 1):
+                for k2 in range(max(-p2, -i2), min(p2, n2 - 1 - i2) + 1):
+                    if k1 == 0 and k2 <= 0:
+                        continue
+                    u = F[i1 + k1, i2 + k2, p1 - k1, p2 - k2]
+                    if conjugate:
+                        u = u.conjugate()
+                    s -= u * x[g1 + i1 + k1, g2 + i2 + k2]
+            x[g1 + i1, g2 + i2] = s
+
+#========================================================================================================
+@template(name='T', types=[float, complex])
+def ilu0_solve_transpose_3d(F: 'T[:,:,:,:,:,:]', b: 'T[:,:,:]', x: 'T[:,:,:]', gpads: 'int64[:]', pads: 'int64[:]', conjugate: 'bool'):
+
+    n1 = F.shape[0]
+    n2 = F.shape[1]
+    n3 = F.shape[2]
+    p1 = pads[0]
+    p2 = pads[1]
+    p3 = pads[2]
+    g1 = gpads[0]
+    g2 = gpads[1]
+    g3 = gpads[2]
+
+    # Forward substitution U^T y = b
+    for i1 in range(n1):
+        for i2 in range(n2):
+            for i3 in range(n3):
+                s = b[g1 + i1, g2 + i2, g3 + i3]
+                for k1 in range(max(-p1, -i1), 1):
+                    for k2 in range(max(-p2, -i2), min(p2, n2 - 1 - i2) + 1):
+                        if k1 == 0 and k2 > 0:
+                            break
+                        for k3 in range(max(-p3, -i3), min(p3, n3 - 1 - i3) + 1):
+                            if k1 == 0 and k2 == 0 and k3 >= 0:
+                                break
+                            u = F[i1 + k1, i2 + k2, i3 + k3, p1 - k1, p2 - k2, p3 - k3]
+                            if conjugate:
+                                u = u.conjugate()
+                            s -= u * x[g1 + i1 + k1, g2 + i2 + k2, g3 + i3 + k3]
+                u = F[i1, i2, i3, p1, p2, p3]
+                if conjugate:
+                    u = u.conjugate()
+                x[g1 + i1, g2 + i2, g3 + i3] = s / u
+
+    # Backward substitution L^T x = y
+    for i1 in range(n1 - 1, -1, -1):
+        for i2 in range(n2 - 1, -1, -1):
+            for i3 in range(n3 - 1, -1, -1):
+                s = x[g1 + i1, g2 + i2, g3 + i3]
+                for k1 in range(0, min(p1, n1 - 1 - i1) + 1):
+                    for k2 in range(max(-p2, -i2), min(p2, n2 - 1 - i2) + 1):
+                        if k1 == 0 and k2 < 0:
+                            continue
+                        for k3 in range(max(-p3, -i3), min(p3, n3 - 1 - i3) + 1):
+                            if k1 == 0 and k2 == 0 and k3 <= 0:
+                                continue
+                            u = F[i1 + k1, i2 + k2, i3 + k3, p1 - k1, p2 - k2, p3 - k3]
+                            if conjugate:
+                                u = u.conjugate()
+                            s -= u * x[g1 + i1 + k1, g2 + i2 + k2, g3 + i3 + k3]
+                x[g1 + i1, g2 + i2, g3 + i3] = s
@@ -0,0 +1,368 @@
+from pyccel.decorators import template
+
+# Fused kernels for the vector updates of the Krylov solvers: each of them
+# performs several operations with a single pass over the data.
+
+#========================================================================================================
+@template(name='T', types=[float, complex])
+def axpy_norm_sqr_1d(alpha: 'T', x: 'T[:]', y: 'T[:]', nghost0: 'int64'):
+    """
+    Kernel for computing y = alpha * x + y, and the squared L2 norm of the
+    result (without ghost regions) during the same pass over the data.
+
+    Parameters
+    ----------
+    alpha : float | complex
+        Scaling coefficient.
+
+    x, y : 1D Numpy arrays of (float | complex) data
+        Data of the vectors.
+
+    nghost0 : int
+        Number of ghost cells of the arrays along the index 0.
+
+    Returns
+    -------
+    res : float
+        Squared L2 norm of the local part of the updated vector y.
+    """
+    n0, = y.shape
+
+    res = 0.
+    for i0 in range(n0):
+        y[i0] += alpha * x[i0]
+        if i0 >= nghost0 and i0 < n0 - nghost0:
+            res += (y[i0].conjugate() * y[i0]).real
+
+    return res
+
+#========================================================================================================
+@template(name='T', types=[float, complex])
+def axpy_norm_sqr_2d(alpha: 'T', x: 'T[:,:]', y: 'T[:,:]', nghost0: 'int64', nghost1: 'int64'):
+    """
+    Kernel for computing y = alpha * x + y, and the squared L2 norm of the
+    result (without ghost regions) during the same pass over the data.
+
+    Parameters
+    ----------
+    alpha : float | complex
+        Scaling coefficient.
+
+    x, y : 2D Numpy arrays of (float | complex) data
+        Data of the vectors.
+
+    nghost0 : int
+        Number of ghost cells of the arrays along the index 0.
+
+    nghost1 : int
+        Number of ghost cells of the arrays along the index 1.
+
+    Returns
+    -------
+    res : float
+        Squared L2 norm of the local part of the updated vector y.
+    """
+    n0, n1 = y.shape
+
+    res = 0.
+    for i0 in range(n0):
+        for i1 in range(n1):
+            y[i0, i1] += alpha * x[i0, i1]
+        if i0 >= nghost0 and i0 < n0 - nghost0:
+            for i1 in range(nghost1, n1 - nghost1):
+                res += (y[i0, i1].conjugate() * y[i0, i1]).real
+
+    return res
+
+#========================================================================================================
+@template(name='T', types=[float, complex])
+def axpy_norm_sqr_3d(alpha: 'T', x: 'T[:,:,:]', y: 'T[:,:,:]', nghost0: 'int64', nghost1: 'int64', nghost2: 'int64'):
+    """
+    Kernel for computing y = alpha * x + y, and the squared L2 norm of the
+    result (without ghost regions) during the same pass over the data.
+
+    Parameters
+    ----------
+    alpha : float | complex
+        Scaling coefficient.
+
+    x, y : 3D Numpy arrays of (float | complex) data
+        Data of the vectors.
+
+    nghost0 : int
+        Number of ghost cells of the arrays along the index 0.
+
+    nghost1 : int
+        Number of ghost cells of the arrays along the index 1.
+
+    nghost2 : int
+        Number of ghost cells of the arrays along the index 2.
+
+    Returns
+    -------
+    res : float
+        Squared L2 norm of the local part of the updated vector y.
+    """
+    n0, n1, n2 = y.shape
+
+    res = 0.
+    for i0 in range(n0):
+        for i1 in range(n1):
+            for i2 in range(n2):
+                y[i0, i1, i2] += alpha * x[i0, i1, i2]
+            if i0 >= nghost0 and i0 < n0 - nghost0 and i1 >= nghost1 and i1 < n1 - nghost1:
+                for i2 in range(nghost2, n2 - nghost2):
+                    res += (y[i0, i1, i2].conjugate() * y[i0, i1, i2]).real
+
+    return res
+
+#========================================================================================================
+@template(name='T', types=[float, complex])
+def axpy_norm_sqr_1d_omp(alpha: 'T', x: 'T[:]', y: 'T[:]', nghost0: 'int64', nthreads: 'int64'):
+    """
+    Multi-threaded kernel for computing y = alpha * x + y, and the squared L2
+    norm of the result (without ghost regions) during the same pass over the data.
+
+    Parameters
+    ----------
+    alpha : float | complex
+        Scaling coefficient.
+
+    x, y : 1D Numpy arrays of (float | complex) data
+        Data of the vectors.
+
+    nghost0 : int
+        Number of ghost cells of the arrays along the index 0.
+
+    nthreads : int
+        Number of OpenMP threads.
+
+    Returns
+    -------
+    res : float
+        Squared L2 norm of the local part of the updated vector y.
+    """
+    n0, = y.shape
+
+    res = 0.
+    #$omp parallel for schedule(static) reduction(+:res) num_threads(nthreads)
+    for i0 in range(n0):
+        y[i0] += alpha * x[i0]
+        if i0 >= nghost0 and i0 < n0 - nghost0:
+            res += (y[i0].conjugate() * y[i0]).real
+
+    return res
+
+#========================================================================================================
+@template(name='T', types=[float, complex])
+def axpy_norm_sqr_2d_omp(alpha: 'T', x: 'T[:,:]', y: 'T[:,:]', nghost0: 'int64', nghost1: 'int64', nthreads: 'int64'):
+    """
+    Multi-threaded kernel for computing y = alpha * x + y, and the squared L2
+    norm of the result (without ghost regions) during the same pass over the data.
+
+    Parameters
+    ----------
+    alpha : float | complex
+        Scaling coefficient.
+
+    x, y : 2D Numpy arrays of (float | complex) data
+        Data of the vectors.
+
+    nghost0 : int
+        Number of ghost cells of the arrays along the index 0.
+
+    nghost1 : int
+        Number of ghost cells of the arrays along the index 1.
+
+    nthreads : int
+        Number of OpenMP threads.
+
+    Returns
+    -------
+    res : float
+        Squared L2 norm of the local part of the updated vector y.
+    """
+    n0, n1 = y.shape
+
+    res = 0.
+    #$omp parallel for schedule(static) private(i1) reduction(+:res) num_threads(nthreads)
+    for i0 in range(n0):
+        for i1 in range(n1):
+            y[i0, i1] += alpha * x[i0, i1]
+        if i0 >= nghost0 and i0 < n0 - nghost0:
+            for i1 in range(nghost1, n1 - nghost1):
+                res += (y[i0, i1].conjugate() * y[i0, i1]).real
+
+    return res
+
+#========================================================================================================
+@template(name='T', types=[float, complex])
+def axpy_norm_sqr_3d_omp(alpha: 'T', x: 'T[:,:,:]', y: 'T[:,:,:]', nghost0: 'int64', nghost1: 'int64', nghost2: 'int64', nthreads: 'int64'):
+    """
+    Multi-threaded kernel for computing y = alpha * x + y, and the squared L2
+    norm of the result (without ghost regions) during the same pass over the data.
+
+    Parameters
+    ----------
+    alpha : float | complex
+        Scaling coefficient.
+
+    x, y : 3D Numpy arrays of (float | complex) data
+        Data of the vectors.
+
+    nghost0 : int
+        Number of ghost cells of the arrays along the index 0.
+
+    nghost1 : int
+        Number of ghost cells of the arrays along the index 1.
+
+    nghost2 : int
+        Number of ghost cells of the arrays along the index 2.
+
+    nthreads : int
+        Number of OpenMP threads.
+
+    Returns
+    -------
+    res : float
+        Squared L2 norm of the local part of the updated vector y.
+    """
+    n0, n1, n2 = y.shape
+
+    res = 0.
+    #$omp parallel for schedule(static) private(i1, i2) reduction(+:res) num_threads(nthreads)
+    for i0 in range(n0):
+        for i1 in range(n1):
+            for i2 in range(n2):
+                y[i0, i1, i2] += alpha * x[i0, i1, i2]
+            if i0 >= nghost0 and i0 < n0 - nghost0 and i1 >= nghost1 and i1 < n1 - nghost1:
+                for i2 in range(nghost2, n2 - nghost2):
+                    res += (y[i0, i1, i2].conjugate() * y[i0, i1, i2]).real
+
+    return res
+
+#========================================================================================================
+@template(name='T', types=[float, complex])
+def xpay_1d(alpha: 'T', x: 'T[:]', y: 'T[:]'):
+    """
+    Kernel for computing y = x + alpha * y.
+
+    Parameters
+    ----------
+    alpha : float | complex
+        Scaling coefficient.
+
+    x, y : 1D Numpy arrays of (float | complex) data
+        Data of the vectors.
+    """
+    n0, = y.shape
+    for i0 in range(n0):
+        y[i0] = x[i0] + alpha * y[i0]
+
+#========================================================================================================
+@template(name='T', types=[float, complex])
+def xpay_2d(alpha: 'T', x: 'T[:,:]', y: 'T[:,:]'):
+    """
+    Kernel for computing y = x + alpha * y.
+
+    Parameters
+    ----------
+    alpha : float | complex
+        Scaling coefficient.
+
+    x, y : 2D Numpy arrays of (float | complex) data
+        Data of the vectors.
+    """
+    n0, n1 = y.shape
+    for i0 in range(n0):
+        for i1 in range(n1):
+            y[i0, i1] = x[i0, i1] + alpha * y[i0, i1]
+
+#========================================================================================================
+@template(name='T', types=[float, complex])
+def xpay_3d(alpha: 'T', x: 'T[:,:,:]', y: 'T[:,:,:]'):
+    """
+    Kernel for computing y = x + alpha * y.
+
+    Parameters
+    ----------
+    alpha : float | complex
+        Scaling coefficient.
+
+    x, y : 3D Numpy arrays of (float | complex) data
+        Data of the vectors.
+    """
+    n0, n1, n2 = y.shape
+    for i0 in range(n0):
+        for i1 in range(n1):
+            for i2 in range(n2):
+                y[i0, i1, i2] = x[i0, i1, i2] + alpha * y[i0, i1, i2]
+
+#========================================================================================================
+@template(name='T', types=[float, complex])
+def xpay_1d_omp(alpha: 'T', x: 'T[:]', y: 'T[:]', nthreads: 'int64'):
+    """
+    Multi-threaded kernel for computing y = x + alpha * y.
+
+    Parameters
+    ----------
+    alpha : float | complex
+        Scaling coefficient.
+
+    x, y : 1D Numpy arrays of (float | complex) data
+        Data of the vectors.
+
+    nthreads : int
+        Number of OpenMP threads.
+    """
+    n0, = y.shape
+    #$omp parallel for schedule(static) collapse(1) num_threads(nthreads)
+    for i0 in range(n0):
+        y[i0] = x[i0] + alpha * y[i0]
+
+#========================================================================================================
+@template(name='T', types=[float, complex])
+def xpay_2d_omp(alpha: 'T', x: 'T[:,:]', y: 'T[:,:]', nthreads: 'int64'):
+    """
+    Multi-threaded kernel for computing y = x + alpha * y.
+
+    Parameters
+    ----------
+    alpha : float | complex
+        Scaling coefficient.
+
+    x, y : 2D Numpy arrays of (float | complex) data
+        Data of the vectors.
+
+    nthreads : int
+        Number of OpenMP threads.
+    """
+    n0, n1 = y.shape
+    #$omp parallel for schedule(static) collapse(2) num_threads(nthreads)
+    for i0 in range(n0):
+        for i1 in range(n1):
+            y[i0, i1] = x[i0, i1] + alpha * y[i0, i1]
+
+#========================================================================================================
+@template(name='T', types=[float, complex])
+def xpay_3d_omp(alpha: 'T', x: 'T[:,:,:]', y: 'T[:,:,:]', nthreads: 'int64'):
+    """
+    Multi-threaded kernel for computing y = x + alpha * y.
+
+    Parameters
+    ----------
+    alpha : float | complex
+        Scaling coefficient.
+
+    x, y : 3D Numpy arrays of (float | complex) data
+        Data of the vectors.
+
+    nthreads : int
+        Number of OpenMP threads.
+    """
+    n0, n1, n2 = y.shape
+    #$omp parallel for schedule(static) collapse(3) num_threads(nthreads)
+    for i0 in range(n0):
+        for i1 in range(n1):
+            for i2 in range(n2):
+                y[i0, i1, i2] = x[i0, i1, i2] + alpha * y[i0, i1, i2]
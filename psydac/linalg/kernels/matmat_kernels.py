@@ -0,0 +1,95 @@
+from pyccel.decorators import template
+
+# Kernels for the product C += A @ B of two stencil matrices, whose spaces all
+# have shifts equal to 1. The entries of a row of A are multiplied with the
+# rows of B (read in its ghost regions if needed, between rows_lo and rows_hi),
+# and the result is added to the diagonals of C. All the matrices are given by their data arrays:
+#
+#   A : rows offset by gpads_a, diagonals centered at pads_a
+#   B : rows offset by gpads_b, diagonals centered at pads_b
+#   C : rows offset by gpads_a, diagonals centered at pads_c >= pads_a + pads_b
+#
+# Only the nrows locally owned rows of C are computed.
+
+#========================================================================================================
+@template(name='T', types=[float, complex])
+def matmat_1d(matA: 'T[:,:]', matB: 'T[:,:]', matC: 'T[:,:]',
+              nrows: 'int64[:]', rows_lo: 'int64[:]', rows_hi: 'int64[:]',
+              gpads_a: 'int64[:]', gpads_b: 'int64[:]', pads_a: 'int64[:]', pads_b: 'int64[:]', pads_c: 'int64[:]'):
+
+    ra1 = gpads_a[0]
+    rb1 = gpads_b[0] - pads_a[0]
+    sc1 = pads_c[0] - pads_a[0] - pads_b[0]
+
+    for i1 in range(nrows[0]):
+        for a1 in range(matA.shape[1]):
+            j1 = rb1 + i1 + a1
+            if j1 < rows_lo[0] or j1 >= rows_hi[0]:
+                continue
+            for b1 in range(matB.shape[1]):
+                matC[ra1 + i1, sc1 + a1 + b1] += matA[ra1 + i1, a1] * matB[j1, b1]
+
+#========================================================================================================
+@template(name='T', types=[float, complex])
+def matmat_2d(matA: 'T[:,:,:,:]', matB: 'T[:,:,:,:]', matC: 'T[:,:,:,:]',
+              nrows: 'int64[:]', rows_lo: 'int64[:]', rows_hi: 'int64[:]',
+              gpads_a: 'int64[:]', gpads_b: 'int64[:]', pads_a: 'int64[:]', pads_b: 'int64[:]', pads_c: 'int64[:]'):
+
+    ra1 = gpads_a[0]
+    ra2 = gpads_a[1]
+    rb1 = gpads_b[0] - pads_a[0]
+    rb2 = gpads_b[1] - pads_a[1]
+    sc1 = pads_c[0] - pads_a[0] - pads_b[0]
+    sc2 = pads_c[1] - pads_a[1] - pads_b[1]
+
+    for i1 in range(nrows[0]):
+        for i2 in range(nrows[1]):
+            for a1 in range(matA.shape[2]):
+                j1 = rb1 + i1 + a1
+                if j1 < rows_lo[0] or j1 >= rows_hi[0]:
+                    continue
+                for a2 in range(matA.shape[3]):
+                    j2 = rb2 + i2 + a2
+                    if j2 < rows_lo[1] or j2 >= rows_hi[1]:
+                        continue
+                    v = matA[ra1 + i1, ra2 + i2, a1, a2]
+                    for b1 in range(matB.shape[2]):
+                        for b2 in range(matB.shape[3]):
+                            matC[ra1 + i1, ra2 + i2, sc1 + a1 + b1, sc2 + a2 + b2] += v * matB[j1, j2, b1, b2]
+
+#========================================================================================================
+@template(name='T', types=[float, complex])
+def matmat_3d(matA: 'T[:,:,:,:,:,:]', matB: 'T[:,:,:,:,:,:]', matC: 'T[:,:,:,:,:,:]',
+              nrows: 'int64[:]', rows_lo: 'int64[:]', rows_hi: 'int64[:]',
+              gpads_a: 'int64[:]', gpads_b: 'int64[:]', pads_a: 'int64[:]', pads_b: 'int64[:]', pads_c: 'int64[:]'):
+
+    ra1 = gpads_a[0]
+    ra2 = gpads_a[1]
+    ra3 = gpads_a[2]
+    rb1 = gpads_b[0] - pads_a[0]
+    rb2 = gpads_b[1] - pads_a[1]
+    rb3 = gpads_b[2] - pads_a[2]
+    sc1 = pads_c[0] - pads_a[0] - pads_b[0]
+    sc2 = pads_c[1] - pads_a[1] - pads_b[1]
+    sc3 = pads_c[2] - pads_a[2] - pads_b[2]
+
+    for i1 in range(nrows[0]):
+        for i2 in range(nrows[1]):
+            for i3 in range(nrows[2]):
+                for a1 in range(matA.shape[3]):
+                    j1 = rb1 + i1 + a1
+                    if j1 < rows_lo[0] or j1 >= rows_hi[0]:
+                        continue
+                    for a2 in range(matA.shape[4]):
+                        j2 = rb2 + i2 + a2
+                        if j2 < rows_lo[1] or j2 >= rows_hi[1]:
+                            continue
+                        for a3 in range(matA.shape[5]):
+                            j3 = rb3 + i3 + a3
+                            if j3 < rows_lo[2] or j3 >= rows_hi[2]:
+                                continue
+                            v = matA[ra1 + i1, ra2 + i2, ra3 + i3, a1, a2, a3]
+                            for b1 in range(matB.shape[3]):
+                                for b2 in range(matB.shape[4]):
+                                    for b3 in range(matB.shape[5]):
+                                        matC[ra1 + i1, ra2 + i2, ra3 + i3, sc1 + a1 + b1, sc2 + a2 + b2, sc3 + a3 + b3] += v * matB[j1, j2, j3, b1, b2, b3]
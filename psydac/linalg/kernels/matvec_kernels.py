@@ -17,7 +17,7 @@ def matvec_1d(mat00:'T[:,:]', x0:'T[:]', out0:'T[:]', starts: 'int64[:]', nrows:
 
     start_impact1 = dstart1 % dshift1
 
-    v00 = mat00[0, 0] - mat00[0, 0] + x0[0] - x0[0]
+    v00 = mat00[0, 0] - mat00[0, 0]
 
     for i1 in range(nrows1):
         v00 *= 0
@@ -63,7 +63,7 @@ def matvec_2d(mat00:'T[:,:,:,:]', x0:'T[:,:]', out0:'T[:,:]', starts:'int64[:]',
     start_impact1 = dstart1 % dshift1
     start_impact2 = dstart2 % dshift2
 
-    v00 = mat00[0, 0, 0, 0] - mat00[0, 0, 0, 0] + x0[0, 0] - x0[0, 0]
+    v00 = mat00[0, 0, 0, 0] - mat00[0, 0, 0, 0]
 
     for i1 in range(nrows1):
         for i2 in range(nrows2):
@@ -138,7 +138,7 @@ def matvec_3d(mat00:'T[:,:,:,:,:,:]', x0:'T[:,:,:]', out0:'T[:,:,:]', starts:'in
     start_impact2 = dstart2 % dshift2
     start_impact3 = dstart3 % dshift3
 
-    v00 = mat00[0, 0, 0, 0, 0, 0] - mat00[0, 0, 0, 0, 0, 0] + x0[0, 0, 0] - x0[0, 0, 0]
+    v00 = mat00[0, 0, 0, 0, 0, 0] - mat00[0, 0, 0, 0, 0, 0]
 
     for i1 in range(nrows1):
         for i2 in range(nrows2):
@@ -206,3 +206,713 @@ def matvec_3d(mat00:'T[:,:,:,:,:,:]', x0:'T[:,:,:]', out0:'T[:,:,:]', starts:'in
                             for k3 in range(ndiags3 - i3 - 1):
                                 v00 += mat00[pxm1 + i1, pxm2 + i2, pxm3 + i3, k1, k2, k3] * x0[x_min1 + k1, x_min2 + k2, x_min3 + k3]
                     out0[pxm1 + i1, pxm2 + i2, pxm3 + i3] = v00
+
+
+@template(name='T', types=[float, complex])
+def matvec_1d_omp(mat00:'T[:,:]', x0:'T[:]', out0:'T[:]', starts: 'int64[:]', nrows: 'int64[:]', nrows_extra: 'int64[:]',
+                  dm:'int64[:]', cm:'int64[:]', pad_imp:'int64[:]', ndiags:'int64[:]', gpads: 'int64[:]', nthreads: 'int64'):
+
+    #$omp parallel default(private) shared(mat00, x0, out0) firstprivate(starts, nrows, nrows_extra, dm, cm, pad_imp, ndiags, gpads) num_threads(nthreads)
+    nrows1   = nrows[0]
+    dstart1  = starts[0]
+    dshift1  = dm[0]
+    cshift1  = cm[0]
+    ndiags1  = ndiags[0]
+    dpads1   = gpads[0]
+    pad_imp1 = pad_imp[0]
+
+    pxm1 = dpads1 * cshift1
+
+    start_impact1 = dstart1 % dshift1
+
+    v00 = mat00[0, 0] - mat00[0, 0]
+
+    #$omp for schedule(static) collapse(1)
+    for i1 in range(nrows1):
+        v00 *= 0
+        x_min1 = pad_imp1 + (i1 + start_impact1) // cshift1 * dshift1
+        for k1 in range(ndiags1):
+            v00 += mat00[pxm1 + i1, k1] * x0[k1 + x_min1]
+        out0[pxm1 + i1] = v00
+
+    if 0 < nrows_extra[0]:
+        pxm1          += nrows1
+        start_impact1 += nrows1
+        #$omp for schedule(static) collapse(1)
+        for i1 in range(nrows_extra[0]):
+            v00 *= 0
+            x_min1 = pad_imp1 + (i1 + start_impact1) // cshift1 * dshift1
+            for k1 in range(ndiags1 - i1 - 1):
+                v00 += mat00[pxm1 + i1, k1] * x0[x_min1 + k1]
+            out0[pxm1 + i1] = v00
+    #$omp end parallel
+
+
+@template(name='T', types=[float, complex])
+def matvec_2d_omp(mat00:'T[:,:,:,:]', x0:'T[:,:]', out0:'T[:,:]', starts:'int64[:]', nrows:'int64[:]', nrows_extra:'int64[:]',
+                  dm:'int64[:]', cm:'int64[:]', pad_imp:'int64[:]', ndiags:'int64[:]', gpads: 'int64[:]', nthreads: 'int64'):
+
+    #$omp parallel default(private) shared(mat00, x0, out0) firstprivate(starts, nrows, nrows_extra, dm, cm, pad_imp, ndiags, gpads) num_threads(nthreads)
+    nrows1   = nrows[0]
+    nrows2   = nrows[1]
+    dstart1  = starts[0]
+    dstart2  = starts[1]
+    dshift1  = dm[0]
+    dshift2  = dm[1]
+    cshift1  = cm[0]
+    cshift2  = cm[1]
+    ndiags1  = ndiags[0]
+    ndiags2  = ndiags[1]
+    dpads1   = gpads[0]
+    dpads2   = gpads[1]
+    pad_imp1 = pad_imp[0]
+    pad_imp2 = pad_imp[1]
+
+    pxm1 = dpads1 * cshift1
+    pxm2 = dpads2 * cshift2
+
+    start_impact1 = dstart1 % dshift1
+    start_impact2 = dstart2 % dshift2
+
+    v00 = mat00[0, 0, 0, 0] - mat00[0, 0, 0, 0]
+
+    #$omp for schedule(static) collapse(2)
+    for i1 in range(nrows1):
+        for i2 in range(nrows2):
+            v00 *= 0
+            x_min1 = pad_imp1 + (i1 + start_impact1) // cshift1 * dshift1
+            x_min2 = pad_imp2 + (i2 + start_impact2) // cshift2 * dshift2
+            for k1 in range(ndiags1):
+                for k2 in range(ndiags2):
+                    v00 += mat00[pxm1 + i1, pxm2 + i2, k1, k2] * x0[k1 + x_min1, k2 + x_min2]
+            out0[pxm1 + i1, pxm2 + i2] = v00
+
+    if 0 < nrows_extra[0]:
+        pxm1          += nrows1
+        start_impact1 += nrows1
+        #$omp for schedule(static) collapse(2)
+        for i1 in range(nrows_extra[0]):
+            for i2 in range(nrows2):
+                v00 *= 0
+                x_min1 = pad_imp1 + (i1 + start_impact1) // cshift1 * dshift1
+                x_min2 = pad_imp2 + (i2 + start_impact2) // cshift2 * dshift2
+                for k1 in range(ndiags1 - i1 - 1):
+                    for k2 in range(ndiags2):
+                        v00 += mat00[pxm1 + i1, pxm2 + i2, k1, k2] * x0[x_min1 + k1, x_min2 + k2]
+                out0[pxm1 + i1,  pxm2 + i2] = v00
+
+    if 0 < nrows_extra[1]:
+        pxm1           = dpads1  * cshift1
+        start_impact1  = dstart1 % dshift1
+        pxm2          += nrows2
+        start_impact2 += nrows2
+        #$omp for schedule(static) collapse(2)
+        for i1 in range(nrows1 + nrows_extra[0]):
+            for i2 in range(nrows_extra[1]):
+                v00 *= 0
+                x_min1 = pad_imp1 + (i1 + start_impact1) // cshift1 * dshift1
+                x_min2 = pad_imp2 + (i2 + start_impact2) // cshift2 * dshift2
+                for k1 in range(ndiags1 - max(0, i1 + 1 - nrows1)):
+                    for k2 in range(ndiags2 - i2 - 1):
+                        v00 += mat00[pxm1 + i1, pxm2 + i2, k1, k2] * x0[x_min1 + k1, x_min2 + k2]
+                out0[pxm1 + i1, pxm2 + i2] = v00
+    #$omp end parallel
+
+
+@template(name='T', types=[float, complex])
+def matvec_3d_omp(mat00:'T[:,:,:,:,:,:]', x0:'T[:,:,:]', out0:'T[:,:,:]', starts:'int64[:]', nrows:'int64[:]', nrows_extra:'int64[:]',
+                  dm:'int64[:]', cm:'int64[:]', pad_imp:'int64[:]', ndiags:'int64[:]', gpads: 'int64[:]', nthreads: 'int64'):
+
+    #$omp parallel default(private) shared(mat00, x0, out0) firstprivate(starts, nrows, nrows_extra, dm, cm, pad_imp, ndiags, gpads) num_threads(nthreads)
+    nrows1   = nrows[0]
+    nrows2   = nrows[1]
+    nrows3   = nrows[2]
+    dstart1  = starts[0]
+    dstart2  = starts[1]
+    dstart3  = starts[2]
+    dshift1  = dm[0]
+    dshift2  = dm[1]
+    dshift3  = dm[2]
+    cshift1  = cm[0]
+    cshift2  = cm[1]
+    cshift3  = cm[2]
+    ndiags1  = ndiags[0]
+    ndiags2  = ndiags[1]
+    ndiags3  = ndiags[2]
+    dpads1   = gpads[0]
+    dpads2   = gpads[1]
+    dpads3   = gpads[2]
+    pad_imp1 = pad_imp[0]
+    pad_imp2 = pad_imp[1]
+    pad_imp3 = pad_imp[2]
+
+    pxm1 = dpads1 * cshift1
+    pxm2 = dpads2 * cshift2
+    pxm3 = dpads3 * cshift3
+
+    start_impact1 = dstart1 % dshift1
+    start_impact2 = dstart2 % dshift2
+    start_impact3 = dstart3 % dshift3
+
+    v00 = mat00[0, 0, 0, 0, 0, 0] - mat00[0, 0, 0, 0, 0, 0]
+
+    #$omp for schedule(static) collapse(3)
+    for i1 in range(nrows1):
+        for i2 in range(nrows2):
+            for i3 in range(nrows3):
+                v00 *= 0
+                x_min1 = pad_imp1 + (i1 + start_impact1) // cshift1 * dshift1
+                x_min2 = pad_imp2 + (i2 + start_impact2) // cshift2 * dshift2
+                x_min3 = pad_imp3 + (i3 + start_impact3) // cshift3 * dshift3
+                for k1 in range(ndiags1):
+                    for k2 in range(ndiags2):
+                        for k3 in range(ndiags3):
+                            v00 += mat00[pxm1 + i1, pxm2 + i2, pxm3 + i3, k1, k2, k3] * x0[k1 + x_min1, k2 + x_min2, k3 + x_min3]
+                out0[pxm1 + i1, pxm2 + i2, pxm3 + i3] = v00
+
+    if 0 < nrows_extra[0]:
+        pxm1 += nrows1
+        start_impact1 += nrows1
+        #$omp for schedule(static) collapse(3)
+        for i1 in range(nrows_extra[0]):
+            for i2 in range(nrows2):
+                for i3 in range(nrows3):
+                    v00 *= 0
+                    x_min1 = pad_imp1 + (i1 + start_impact1) // cshift1 * dshift1
+                    x_min2 = pad_imp2 + (i2 + start_impact2) // cshift2 * dshift2
+                    x_min3 = pad_imp3 + (i3 + start_impact3) // cshift3 * dshift3
+                    for k1 in range(ndiags1 - i1 - 1):
+                        for k2 in range(ndiags2):
+                            for k3 in range(ndiags3):
+                                v00 += mat00[pxm1 + i1, pxm2 + i2, pxm3 + i3, k1, k2, k3] *  x0[x_min1 + k1, x_min2 + k2, x_min3 + k3]
+                    out0[pxm1 + i1,  pxm2 + i2,  pxm3 + i3] = v00
+
+    if 0 < nrows_extra[1]:
+        pxm1           = dpads1  * cshift1
+        start_impact1  = dstart1 % dshift1
+        pxm2          += nrows2
+        start_impact2 += nrows2
+        #$omp for schedule(static) collapse(3)
+        for i1 in range(nrows1 + nrows_extra[0]):
+            for i2 in range(nrows_extra[1]):
+                for i3 in range(nrows3):
+                    v00 *= 0
+                    x_min1 = pad_imp1 + (i1 + start_impact1) // cshift1 * dshift1
+                    x_min2 = pad_imp2 + (i2 + start_impact2) // cshift2 * dshift2
+                    x_min3 = pad_imp3 + (i3 + start_impact3) // cshift3 * dshift3
+                    for k1 in range(ndiags1 - max(0, i1 + 1 - nrows1)):
+                        for k2 in range(ndiags2 - i2 - 1):
+                            for k3 in range(ndiags3):
+                                v00 += mat00[pxm1 + i1, pxm2 + i2, pxm3 + i3, k1, k2, k3] * x0[x_min1 + k1, x_min2 + k2, x_min3 + k3]
+                    out0[pxm1 + i1, pxm2 + i2, pxm3 + i3] = v00
+
+    if 0 < nrows_extra[2]:
+        pxm1           = dpads1  * cshift1
+        pxm2           = dpads2  * cshift2
+        start_impact1  = dstart1 % dshift1
+        start_impact2  = dstart2 % dshift2
+        pxm3          += nrows3
+        start_impact3 += nrows3
+        #$omp for schedule(static) collapse(3)
+        for i1 in range(nrows1 + nrows_extra[0]):
+            for i2 in range(nrows2 + nrows_extra[1]):
+                for i3 in range(nrows_extra[2]):
+                    v00 *= 0
+                    x_min1 = pad_imp1 + (i1 + start_impact1) // cshift1 * dshift1
+                    x_min2 = pad_imp2 + (i2 + start_impact2) // cshift2 * dshift2
+                    x_min3 = pad_imp3 + (i3 + start_impact3) // cshift3 * dshift3
+                    for k1 in range(ndiags1 - max(0, i1 + 1 - nrows1)):
+                        for k2 in range(ndiags2 - max(0, i2 + 1 - nrows2)):
+                            for k3 in range(ndiags3 - i3 - 1):
+                                v00 += mat00[pxm1 + i1, pxm2 + i2, pxm3 + i3, k1, k2, k3] * x0[x_min1 + k1, x_min2 + k2, x_min3 + k3]
+                    out0[pxm1 + i1, pxm2 + i2, pxm3 + i3] = v00
+    #$omp end parallel
+
+
+@template(name='T', types=[float, complex])
+def matvec_1d_multi(mat00:'T[:,:]', x0:'T[:,:]', out0:'T[:,:]', starts: 'int64[:]', nrows: 'int64[:]', nrows_extra: 'int64[:]',
+                  dm:'int64[:]', cm:'int64[:]', pad_imp:'int64[:]', ndiags:'int64[:]', gpads: 'int64[:]'):
+
+    nrows1   = nrows[0]
+    dstart1  = starts[0]
+    dshift1  = dm[0]
+    cshift1  = cm[0]
+    ndiags1  = ndiags[0]
+    dpads1   = gpads[0]
+    pad_imp1 = pad_imp[0]
+
+    pxm1 = dpads1 * cshift1
+
+    start_impact1 = dstart1 % dshift1
+
+    for i1 in range(nrows1):
+        out0[pxm1 + i1, :] = 0.
+        x_min1 = pad_imp1 + (i1 + start_impact1) // cshift1 * dshift1
+        for k1 in range(ndiags1):
+            m00 = mat00[pxm1 + i1, k1]
+            out0[pxm1 + i1, :] += m00 * x0[k1 + x_min1, :]
+
+    if 0 < nrows_extra[0]:
+        pxm1          += nrows1
+        start_impact1 += nrows1
+        for i1 in range(nrows_extra[0]):
+            out0[pxm1 + i1, :] = 0.
+            x_min1 = pad_imp1 + (i1 + start_impact1) // cshift1 * dshift1
+            for k1 in range(ndiags1 - i1 - 1):
+                m00 = mat00[pxm1 + i1, k1]
+                out0[pxm1 + i1, :] += m00 * x0[x_min1 + k1, :]
+
+
+@template(name='T', types=[float, complex])
+def matvec_2d_multi(mat00:'T[:,:,:,:]', x0:'T[:,:,:]', out0:'T[:,:,:]', starts:'int64[:]', nrows:'int64[:]', nrows_extra:'int64[:]',
+                  dm:'int64[:]', cm:'int64[:]', pad_imp:'int64[:]', ndiags:'int64[:]', gpads: 'int64[:]'):
+
+    nrows1   = nrows[0]
+    nrows2   = nrows[1]
+    dstart1  = starts[0]
+    dstart2  = starts[1]
+    dshift1  = dm[0]
+    dshift2  = dm[1]
+    cshift1  = cm[0]
+    cshift2  = cm[1]
+    ndiags1  = ndiags[0]
+    ndiags2  = ndiags[1]
+    dpads1   = gpads[0]
+    dpads2   = gpads[1]
+    pad_imp1 = pad_imp[0]
+    pad_imp2 = pad_imp[1]
+
+    pxm1 = dpads1 * cshift1
+    pxm2 = dpads2 * cshift2
+
+    start_impact1 = dstart1 % dshift1
+    start_impact2 = dstart2 % dshift2
+
+    for i1 in range(nrows1):
+        for i2 in range(nrows2):
+            out0[pxm1 + i1, pxm2 + i2, :] = 0.
+            x_min1 = pad_imp1 + (i1 + start_impact1) // cshift1 * dshift1
+            x_min2 = pad_imp2 + (i2 + start_impact2) // cshift2 * dshift2
+            for k1 in range(ndiags1):
+                for k2 in range(ndiags2):
+                    m00 = mat00[pxm1 + i1, pxm2 + i2, k1, k2]
+                    out0[pxm1 + i1, pxm2 + i2, :] += m00 * x0[k1 + x_min1, k2 + x_min2, :]
+
+    if 0 < nrows_extra[0]:
+        pxm1          += nrows1
+        start_impact1 += nrows1
+        for i1 in range(nrows_extra[0]):
+            for i2 in range(nrows2):
+                out0[pxm1 + i1, pxm2 + i2, :] = 0.
+                x_min1 = pad_imp1 + (i1 + start_impact1) // cshift1 * dshift1
+                x_min2 = pad_imp2 + (i2 + start_impact2) // cshift2 * dshift2
+                for k1 in range(ndiags1 - i1 - 1):
+                    for k2 in range(ndiags2):
+                        m00 = mat00[pxm1 + i1, pxm2 + i2, k1, k2]
+                        out0[pxm1 + i1, pxm2 + i2, :] += m00 * x0[x_min1 + k1, x_min2 + k2, :]
+
+    if 0 < nrows_extra[1]:
+        pxm1           = dpads1  * cshift1
+        start_impact1  = dstart1 % dshift1
+        pxm2          += nrows2
+        start_impact2 += nrows2
+        for i1 in range(nrows1 + nrows_extra[0]):
+            for i2 in range(nrows_extra[1]):
+                out0[pxm1 + i1, pxm2 + i2, :] = 0.
+                x_min1 = pad_imp1 + (i1 + start_impact1) // cshift1 * dshift1
+                x_min2 = pad_imp2 + (i2 + start_impact2) // cshift2 * dshift2
+                for k1 in range(ndiags1 - max(0, i1 + 1 - nrows1)):
+                    for k2 in range(ndiags2 - i2 - 1):
+                        m00 = mat00[pxm1 + i1, pxm2 + i2, k1, k2]
+                        out0[pxm1 + i1, pxm2 + i2, :] += m00 * x0[x_min1 + k1, x_min2 + k2, :]
+
+
+@template(name='T', types=[float, complex])
+def matvec_3d_multi(mat00:'T[:,:,:,:,:,:]', x0:'T[:,:,:,:]', out0:'T[:,:,:,:]', starts:'int64[:]', nrows:'int64[:]', nrows_extra:'int64[:]',
+                  dm:'int64[:]', cm:'int64[:]', pad_imp:'int64[:]', ndiags:'int64[:]', gpads: 'int64[:]'):
+
+    nrows1   = nrows[0]
+    nrows2   = nrows[1]
+    nrows3   = nrows[2]
+    dstart1  = starts[0]
+    dstart2  = starts[1]
+    dstart3  = starts[2]
+    dshift1  = dm[0]
+    dshift2  = dm[1]
+    dshift3  = dm[2]
+    cshift1  = cm[0]
+    cshift2  = cm[1]
+    cshift3  = cm[2]
+    ndiags1  = ndiags[0]
+    ndiags2  = ndiags[1]
+    ndiags3  = ndiags[2]
+    dpads1   = gpads[0]
+    dpads2   = gpads[1]
+    dpads3   = gpads[2]
+    pad_imp1 = pad_imp[0]
+    pad_imp2 = pad_imp[1]
+    pad_imp3 = pad_imp[2]
+
+    pxm1 = dpads1 * cshift1
+    pxm2 = dpads2 * cshift2
+    pxm3 = dpads3 * cshift3
+
+    start_impact1 = dstart1 % dshift1
+    start_impact2 = dstart2 % dshift2
+    start_impact3 = dstart3 % dshift3
+
+    for i1 in range(nrows1):
+        for i2 in range(nrows2):
+            for i3 in range(nrows3):
+                out0[pxm1 + i1, pxm2 + i2, pxm3 + i3, :] = 0.
+                x_min1 = pad_imp1 + (i1 + start_impact1) // cshift1 * dshift1
+                x_min2 = pad_imp2 + (i2 + start_impact2) // cshift2 * dshift2
+                x_min3 = pad_imp3 + (i3 + start_impact3) // cshift3 * dshift3
+                for k1 in range(ndiags1):
+                    for k2 in range(ndiags2):
+                        for k3 in range(ndiags3):
+                            m00 = mat00[pxm1 + i1, pxm2 + i2, pxm3 + i3, k1, k2, k3]
+                            out0[pxm1 + i1, pxm2 + i2, pxm3 + i3, :] += m00 * x0[k1 + x_min1, k2 + x_min2, k3 + x_min3, :]
+
+    if 0 < nrows_extra[0]:
+        pxm1 += nrows1
+        start_impact1 += nrows1
+        for i1 in range(nrows_extra[0]):
+            for i2 in range(nrows2):
+                for i3 in range(nrows3):
+                    out0[pxm1 + i1, pxm2 + i2, pxm3 + i3, :] = 0.
+                    x_min1 = pad_imp1 + (i1 + start_impact1) // cshift1 * dshift1
+                    x_min2 = pad_imp2 + (i2 + start_impact2) // cshift2 * dshift2
+                    x_min3 = pad_imp3 + (i3 + start_impact3) // cshift3 * dshift3
+                    for k1 in range(ndiags1 - i1 - 1):
+                        for k2 in range(ndiags2):
+                            for k3 in range(ndiags3):
+                                m00 = mat00[pxm1 + i1, pxm2 + i2, pxm3 + i3, k1, k2, k3]
+                                out0[pxm1 + i1, pxm2 + i2, pxm3 + i3, :] += m00 * x0[x_min1 + k1, x_min2 + k2, x_min3 + k3, :]
+
+    if 0 < nrows_extra[1]:
+        pxm1           = dpads1  * cshift1
+        start_impact1  = dstart1 % dshift1
+        pxm2          += nrows2
+        start_impact2 += nrows2
+        for i1 in range(nrows1 + nrows_extra[0]):
+            for i2 in range(nrows_extra[1]):
+                for i3 in range(nrows3):
+                    out0[pxm1 + i1, pxm2 + i2, pxm3 + i3, :] = 0.
+                    x_min1 = pad_imp1 + (i1 + start_impact1) // cshift1 * dshift1
+                    x_min2 = pad_imp2 + (i2 + start_impact2) // cshift2 * dshift2
+                    x_min3 = pad_imp3 + (i3 + start_impact3) // cshift3 * dshift3
+                    for k1 in range(ndiags1 - max(0, i1 + 1 - nrows1)):
+                        for k2 in range(ndiags2 - i2 - 1):
+                            for k3 in range(ndiags3):
+                                m00 = mat00[pxm1 + i1, pxm2 + i2, pxm3 + i3, k1, k2, k3]
+                                out0[pxm1 + i1, pxm2 + i2, pxm3 + i3, :] += m00 * x0[x_min1 + k1, x_min2 + k2, x_min3 + k3, :]
+
+    if 0 < nrows_extra[2]:
+        pxm1           = dpads1  * cshift1
+        pxm2           = dpads2  * cshift2
+        start_impact1  = dstart1 % dshift1
+        start_impact2  = dstart2 % dshift2
+        pxm3          += nrows3
+        start_impact3 += nrows3
+        for i1 in range(nrows1 + nrows_extra[0]):
+            for i2 in range(nrows2 + nrows_extra[1]):
+                for i3 in range(nrows_extra[2]):
+                    out0[pxm1 + i1, pxm2 + i2, pxm3 + i3, :] = 0.
+                    x_min1 = pad_imp1 + (i1 + start_impact1) // cshift1 * dshift1
+                    x_min2 = pad_imp2 + (i2 + start_impact2) // cshift2 * dshift2
+                    x_min3 = pad_imp3 + (i3 + start_impact3) // cshift3 * dshift3
+                    for k1 in range(ndiags1 - max(0, i1 + 1 - nrows1)):
+                        for k2 in range(ndiags2 - max(0, i2 + 1 - nrows2)):
+                            for k3 in range(ndiags3 - i3 - 1):
+                                m00 = mat00[pxm1 + i1, pxm2 + i2, pxm3 + i3, k1, k2, k3]
+                                out0[pxm1 + i1, pxm2 + i2, pxm3 + i3, :] += m00 * x0[x_min1 + k1, x_min2 + k2, x_min3 + k3, :]
+
+
+#==============================================================================
+# Mixed precision: matrix coefficients stored in single precision, vectors and
+# accumulation in double precision
+#==============================================================================
+def matvec_1d_mixed(mat00:'float32[:,:]', x0:'float[:]', out0:'float[:]', starts: 'int64[:]', nrows: 'int64[:]', nrows_extra: 'int64[:]',
+                  dm:'int64[:]', cm:'int64[:]', pad_imp:'int64[:]', ndiags:'int64[:]', gpads: 'int64[:]'):
+
+    nrows1   = nrows[0]
+    dstart1  = starts[0]
+    dshift1  = dm[0]
+    cshift1  = cm[0]
+    ndiags1  = ndiags[0]
+    dpads1   = gpads[0]
+    pad_imp1 = pad_imp[0]
+
+    pxm1 = dpads1 * cshift1
+
+    start_impact1 = dstart1 % dshift1
+
+    v00 = 0.0
+
+    for i1 in range(nrows1):
+        v00 = 0.0
+        x_min1 = pad_imp1 + (i1 + start_impact1) // cshift1 * dshift1
+        for k1 in range(ndiags1):
+            v00 += mat00[pxm1 + i1, k1] * x0[k1 + x_min1]
+        out0[pxm1 + i1] = v00
+
+    if 0 < nrows_extra[0]:
+        pxm1          += nrows1
+        start_impact1 += nrows1
+        for i1 in range(nrows_extra[0]):
+            v00 = 0.0
+            x_min1 = pad_imp1 + (i1 + start_impact1) // cshift1 * dshift1
+            for k1 in range(ndiags1 - i1 - 1):
+                v00 += mat00[pxm1 + i1, k1] * x0[x_min1 + k1]
+            out0[pxm1 + i1] = v00
+
+
+
+def matvec_2d_mixed(mat00:'float32[:,:,:,:]', x0:'float[:,:]', out0:'float[:,:]', starts:'int64[:]', nrows:'int64[:]', nrows_extra:'int64[:]',
+                  dm:'int64[:]', cm:'int64[:]', pad_imp:'int64[:]', ndiags:'int64[:]', gpads: 'int64[:]'):
+
+    nrows1   = nrows[0]
+    nrows2   = nrows[1]
+    dstart1  = starts[0]
+    dstart2  = starts[1]
+    dshift1  = dm[0]
+    dshift2  = dm[1]
+    cshift1  = cm[0]
+    cshift2  = cm[1]
+    ndiags1  = ndiags[0]
+    ndiags2  = ndiags[1]
+    dpads1   = gpads[0]
+    dpads2   = gpads[1]
+    pad_imp1 = pad_imp[0]
+    pad_imp2 = pad_imp[1]
+
+    pxm1 = dpads1 * cshift1
+    pxm2 = dpads2 * cshift2
+
+    start_impact1 = dstart1 % dshift1
+    start_impact2 = dstart2 % dshift2
+
+    v00 = 0.0
+
+    for i1 in range(nrows1):
+        for i2 in range(nrows2):
+            v00 = 0.0
+            x_min1 = pad_imp1 + (i1 + start_impact1) // cshift1 * dshift1
+            x_min2 = pad_imp2 + (i2 + start_impact2) // cshift2 * dshift2
+            for k1 in range(ndiags1):
+                for k2 in range(ndiags2):
+                    v00 += mat00[pxm1 + i1, pxm2 + i2, k1, k2] * x0[k1 + x_min1, k2 + x_min2]
+            out0[pxm1 + i1, pxm2 + i2] = v00
+
+    if 0 < nrows_extra[0]:
+        pxm1          += nrows1
+        start_impact1 += nrows1
+        for i1 in range(nrows_extra[0]):
+            for i2 in range(nrows2):
+                v00 = 0.0
+                x_min1 = pad_imp1 + (i1 + start_impact1) // cshift1 * dshift1
+                x_min2 = pad_imp2 + (i2 + start_impact2) // cshift2 * dshift2
+                for k1 in range(ndiags1 - i1 - 1):
+                    for k2 in range(ndiags2):
+                        v00 += mat00[pxm1 + i1, pxm2 + i2, k1, k2] * x0[x_min1 + k1, x_min2 + k2]
+                out0[pxm1 + i1,  pxm2 + i2] = v00
+
+    if 0 < nrows_extra[1]:
+        pxm1           = dpads1  * cshift1
+        start_impact1  = dstart1 % dshift1
+        pxm2          += nrows2
+        start_impact2 += nrows2
+        for i1 in range(nrows1 + nrows_extra[0]):
+            for i2 in range(nrows_extra[1]):
+                v00 = 0.0
+                x_min1 = pad_imp1 + (i1 + start_impact1) // cshift1 * dshift1
+                x_min2 = pad_imp2 + (i2 + start_impact2) // cshift2 * dshift2
+                for k1 in range(ndiags1 - max(0, i1 + 1 - nrows1)):
+                    for k2 in range(ndiags2 - i2 - 1):
+                        v00 += mat00[pxm1 + i1, pxm2 + i2, k1, k2] * x0[x_min1 + k1, x_min2 + k2]
+                out0[pxm1 + i1, pxm2 + i2] = v00
+
+
+def matvec_3d_mixed(mat00:'float32[:,:,:,:,:,:]', x0:'float[:,:,:]', out0:'float[:,:,:]', starts:'int64[:]', nrows:'int64[:]', nrows_extra:'int64[:]',
+                  dm:'int64[:]', cm:'int64[:]', pad_imp:'int64[:]', ndiags:'int64[:]', gpads: 'int64[:]'):
+
+    nrows1   = nrows[0]
+    nrows2   = nrows[1]
+    nrows3   = nrows[2]
+    dstart1  = starts[0]
+    dstart2  = starts[1]
+    dstart3  = starts[2]
+    dshift1  = dm[0]
+    dshift2  = dm[1]
+    dshift3  = dm[2]
+    cshift1  = cm[0]
+    cshift2  = cm[1]
+    cshift3  = cm[2]
+    ndiags1  = ndiags[0]
+    ndiags2  = ndiags[1]
+    ndiags3  = ndiags[2]
+    dpads1   = gpads[0]
+    dpads2   = gpads[1]
+    dpads3   = gpads[2]
+    pad_imp1 = pad_imp[0]
+    pad_imp2 = pad_imp[1]
+    pad_imp3 = pad_imp[2]
+
+    pxm1 = dpads1 * cshift1
+    pxm2 = dpads2 * cshift2
+    pxm3 = dpads3 * cshift3
+
+    start_impact1 = dstart1 % dshift1
+    start_impact2 = dstart2 % dshift2
+    start_impact3 = dstart3 % dshift3
+
+    v00 = 0.0
+
+    for i1 in range(nrows1):
+        for i2 in range(nrows2):
+            for i3 in range(nrows3):
+                v00 = 0.0
+                x_min1 = pad_imp1 + (i1 + start_impact1) // cshift1 * dshift1
+                x_min2 = pad_imp2 + (i2 + start_impact2) // cshift2 * dshift2
+                x_min3 = pad_imp3 + (i3 + start_impact3) // cshift3 * dshift3
+                for k1 in range(ndiags1):
+                    for k2 in range(ndiags2):
+                        for k3 in range(ndiags3):
+                            v00 += mat00[pxm1 + i1, pxm2 + i2, pxm3 + i3, k1, k2, k3] * x0[k1 + x_min1, k2 + x_min2, k3 + x_min3]
+                out0[pxm1 + i1, pxm2 + i2, pxm3 + i3] = v00
+
+    if 0 < nrows_extra[0]:
+        pxm1 += nrows1
+        start_impact1 += nrows1
+        for i1 in range(nrows_extra[0]):
+            for i2 in range(nrows2):
+                for i3 in range(nrows3):
+                    v00 = 0.0
+                    x_min1 = pad_imp1 + (i1 + start_impact1) // cshift1 * dshift1
+                    x_min2 = pad_imp2 + (i2 + start_impact2) // cshift2 * dshift2
+                    x_min3 = pad_imp3 + (i3 + start_impact3) // cshift3 * dshift3
+                    for k1 in range(ndiags1 - i1 - 1):
+                        for k2 in range(ndiags2):
+                            for k3 in range(ndiags3):
+                                v00 += mat00[pxm1 + i1, pxm2 + i2, pxm3 + i3, k1, k2, k3] *  x0[x_min1 + k1, x_min2 + k2, x_min3 + k3]
+                    out0[pxm1 + i1,  pxm2 + i2,  pxm3 + i3] = v00
+
+    if 0 < nrows_extra[1]:
+        pxm1           = dpads1  * cshift1
+        start_impact1  = dstart1 % dshift1
+        pxm2          += nrows2
+        start_impact2 += nrows2
+        for i1 in range(nrows1 + nrows_extra[0]):
+            for i2 in range(nrows_extra[1]):
+                for i3 in range(nrows3):
+                    v00 = 0.0
+                    x_min1 = pad_imp1 + (i1 + start_impact1) // cshift1 * dshift1
+                    x_min2 = pad_imp2 + (i2 + start_impact2) // cshift2 * dshift2
+                    x_min3 = pad_imp3 + (i3 + start_impact3) // cshift3 * dshift3
+                    for k1 in range(ndiags1 - max(0, i1 + 1 - nrows1)):
+                        for k2 in range(ndiags2 - i2 - 1):
+                            for k3 in range(ndiags3):
+                                v00 += mat00[pxm1 + i1, pxm2 + i2, pxm3 + i3, k1, k2, k3] * x0[x_min1 + k1, x_min2 + k2, x_min3 + k3]
+                    out0[pxm1 + i1, pxm2 + i2, pxm3 + i3] = v00
+
+    if 0 < nrows_extra[2]:
+        pxm1           = dpads1  * cshift1
+        pxm2           = dpads2  * cshift2
+        start_impact1  = dstart1 % dshift1
+        start_impact2  = dstart2 % dshift2
+        pxm3          += nrows3
+        start_impact3 += nrows3
+        for i1 in range(nrows1 + nrows_extra[0]):
+            for i2 in range(nrows2 + nrows_extra[1]):
+                for i3 in range(nrows_extra[2]):
+                    v00 = 0.0
+                    x_min1 = pad_imp1 + (i1 + start_impact1) // cshift1 * dshift1
+                    x_min2 = pad_imp2 + (i2 + start_impact2) // cshift2 * dshift2
+                    x_min3 = pad_imp3 + (i3 + start_impact3) // cshift3 * dshift3
+                    for k1 in range(ndiags1 - max(0, i1 + 1 - nrows1)):
+                        for k2 in range(ndiags2 - max(0, i2 + 1 - nrows2)):
+                            for k3 in range(ndiags3 - i3 - 1):
+                                v00 += mat00[pxm1 + i1, pxm2 + i2, pxm3 + i3, k1, k2, k3] * x0[x_min1 + k1, x_min2 + k2, x_min3 + k3]
+                    out0[pxm1 + i1, pxm2 + i2, pxm3 + i3] = v00
+
+
+#==============================================================================
+# Symmetric matrices: only the diagonals with k1 >= 0 are stored, the others
+# are read from the transposed entries in the rows i - k (which must be up to
+# date in the ghost regions of the matrix). Same arguments as matvec_{1,2,3}d,
+# for square matrices with shifts equal to 1 and padding equal to gpads.
+#==============================================================================
+@template(name='T', types=[float, complex])
+def matvec_1d_symmetric(mat00:'T[:,:]', x0:'T[:]', out0:'T[:]', starts: 'int64[:]', nrows: 'int64[:]', nrows_extra: 'int64[:]',
+                  dm:'int64[:]', cm:'int64[:]', pad_imp:'int64[:]', ndiags:'int64[:]', gpads: 'int64[:]'):
+
+    nrows1 = nrows[0] + nrows_extra[0]
+    p1     = (ndiags[0] - 1) // 2
+    r1     = gpads[0]
+
+    v00 = mat00[0, 0] - mat00[0, 0]
+
+    for i1 in range(nrows1):
+        v00 *= 0
+        for k1 in range(p1 + 1):
+            v00 += mat00[r1 + i1, k1] * x0[r1 + i1 + k1]
+        for k1 in range(1, p1 + 1):
+            v00 += mat00[r1 + i1 - k1, k1] * x0[r1 + i1 - k1]
+        out0[r1 + i1] = v00
+
+
+@template(name='T', types=[float, complex])
+def matvec_2d_symmetric(mat00:'T[:,:,:,:]', x0:'T[:,:]', out0:'T[:,:]', starts:'int64[:]', nrows:'int64[:]', nrows_extra:'int64[:]',
+                  dm:'int64[:]', cm:'int64[:]', pad_imp:'int64[:]', ndiags:'int64[:]', gpads: 'int64[:]'):
+
+    nrows1 = nrows[0] + nrows_extra[0]
+    nrows2 = nrows[1] + nrows_extra[1]
+    p1     = (ndiags[0] - 1) // 2
+    p2     = (ndiags[1] - 1) // 2
+    r1     = gpads[0]
+    r2     = gpads[1]
+
+    v00 = mat00[0, 0, 0, 0] - mat00[0, 0, 0, 0]
+
+    for i1 in range(nrows1):
+        for i2 in range(nrows2):
+            v00 *= 0
+            for k1 in range(p1 + 1):
+                for l2 in range(2 * p2 + 1):
+                    v00 += mat00[r1 + i1, r2 + i2, k1, l2] * x0[r1 + i1 + k1, r2 + i2 + l2 - p2]
+            for k1 in range(1, p1 + 1):
+                for l2 in range(2 * p2 + 1):
+                    v00 += mat00[r1 + i1 - k1, r2 + i2 - l2 + p2, k1, l2] * x0[r1 + i1 - k1, r2 + i2 - l2 + p2]
+            out0[r1 + i1, r2 + i2] = v00
+
+
+@template(name='T', types=[float, complex])
+def matvec_3d_symmetric(mat00:'T[:,:,:,:,:,:]', x0:'T[:,:,:]', out0:'T[:,:,:]', starts:'int64[:]', nrows:'int64[:]', nrows_extra:'int64[:]',
+                  dm:'int64[:]', cm:'int64[:]', pad_imp:'int64[:]', ndiags:'int64[:]', gpads: 'int64[:]'):
+
+    nrows1 = nrows[0] + nrows_extra[0]
+    nrows2 = nrows[1] + nrows_extra[1]
+    nrows3 = nrows[2] + nrows_extra[2]
+    p1     = (ndiags[0] - 1) // 2
+    p2     = (ndiags[1] - 1) // 2
+    p3     = (ndiags[2] - 1) // 2
+    r1     = gpads[0]
+    r2     = gpads[1]
+    r3     = gpads[2]
+
+    v00 = mat00[0, 0, 0, 0, 0, 0] - mat00[0, 0, 0, 0, 0, 0]
+
+    for i1 in range(nrows1):
+        for i2 in range(nrows2):
+            for i3 in range(nrows3):
+                v00 *= 0
+                for k1 in range(p1 + 1):
+                    for l2 in range(2 * p2 + 1):
+                        for l3 in range(2 * p3 + 1):
+                            v00 += mat00[r1 + i1, r2 + i2, r3 + i3, k1, l2, l3] * x0[r1 + i1 + k1, r2 + i2 + l2 - p2, r3 + i3 + l3 - p3]
+                for k1 in range(1, p1 + 1):
+                    for l2 in range(2 * p2 + 1):
+                        for l3 in range(2 * p3 + 1):
+                            v00 += mat00[r1 + i1 - k1, r2 + i2 - l2 + p2, r3 + i3 - l3 + p3, k1, l2, l3] * x0[r1 + i1 - k1, r2 + i2 - l2 + p2, r3 + i3 - l3 + p3]
+                out0[r1 + i1, r2 + i2, r3 + i3] = v00
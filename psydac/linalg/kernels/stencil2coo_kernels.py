@@ -9,7 +9,7 @@ from pyccel.decorators import template
 #__all__ = ['stencil2coo_1d_C','stencil2coo_1d_F','stencil2coo_2d_C','stencil2coo_2d_F', 'stencil2coo_3d_C', 'stencil2coo_3d_F']
 
 #========================================================================================================
-@template(name='T', types=[float, complex])
+@template(name='T', types=['float32', float, complex])
 def stencil2coo_1d_C(A:'T[:,:]', data:'T[:]', rows:'int64[:]', cols:'int64[:]', nrl1:'int64', ncl1:'int64',
                      s1:'int64', nr1:'int64', nc1:'int64', dm1:'int64', cm1:'int64', p1:'int64', dp1:'int64'):
     nnz = 0
@@ -28,7 +28,7 @@ def stencil2coo_1d_C(A:'T[:,:]', data:'T[:]', rows:'int64[:]', cols:'int64[:]',
     return nnz
 
 #========================================================================================================
-@template(name='T', types=[float, complex])
+@template(name='T', types=['float32', float, complex])
 def stencil2coo_1d_F(A:'T[:,:]', data:'T[:]', rows:'int64[:]', cols:'int64[:]', nrl1:'int64', ncl1:'int64',
                      s1:'int64', nr1:'int64', nc1:'int64', dm1:'int64', cm1:'int64', p1:'int64', dp1:'int64'):
     nnz = 0
@@ -47,7 +47,7 @@ def stencil2coo_1d_F(A:'T[:,:]', data:'T[:]', rows:'int64[:]', cols:'int64[:]',
     return nnz
 
 #========================================================================================================
-@template(name='T', types=[float, complex])
+@template(name='T', types=['float32', float, complex])
 def stencil2coo_2d_C(A:'T[:,:,:,:]', data:'T[:]', rows:'int64[:]', cols:'int64[:]',
                      nrl1:'int64', nrl2:'int64', ncl1:'int64', ncl2:'int64',
                      s1:'int64', s2:'int64', nr1:'int64', nr2:'int64',
@@ -78,7 +78,7 @@ def stencil2coo_2d_C(A:'T[:,:,:,:]', data:'T[:]', rows:'int64[:]', cols:'int64[:
     return nnz
 
 #========================================================================================================
-@template(name='T', types=[float, complex])
+@template(name='T', types=['float32', float, complex])
 def stencil2coo_2d_F(A:'T[:,:,:,:]', data:'T[:]', rows:'int64[:]', cols:'int64[:]',
                      nrl1:'int64', nrl2:'int64', ncl1:'int64', ncl2:'int64',
                      s1:'int64', s2:'int64', nr1:'int64', nr2:'int64',
@@ -109,7 +109,7 @@ def stencil2coo_2d_F(A:'T[:,:,:,:]', data:'T[:]', rows:'int64[:]', cols:'int64[:
     return nnz
 
 #========================================================================================================
-@template(name='T', types=[float, complex])
+@template(name='T', types=['float32', float, complex])
 def stencil2coo_3d_C(A:'T[:,:,:,:,:,:]', data:'T[:]', rows:'int64[:]', cols:'int64[:]',
                      nrl1:'int64', nrl2:'int64', nrl3:'int64', ncl1:'int64', ncl2:'int64', ncl3:'int64',
                      s1:'int64', s2:'int64', s3:'int64', nr1:'int64', nr2:'int64', nr3:'int64',
@@ -147,7 +147,7 @@ def stencil2coo_3d_C(A:'T[:,:,:,:,:,:]', data:'T[:]', rows:'int64[:]', cols:'int
 
 
 #========================================================================================================
-@template(name='T', types=[float, complex])
+@template(name='T', types=['float32', float, complex])
 def stencil2coo_3d_F(A:'T[:,:,:,:,:,:]', data:'T[:]', rows:'int64[:]', cols:'int64[:]',
                      nrl1:'int64', nrl2:'int64', nrl3:'int64', ncl1:'int64', ncl2:'int64', ncl3:'int64',
                      s1:'int64', s2:'int64', s3:'int64', nr1:'int64', nr2:'int64', nr3:'int64',
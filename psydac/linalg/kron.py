@@ -2,14 +2,17 @@
 from functools import reduce
 
 import numpy as np
+from scipy.linalg import eigh
 from scipy.sparse import kron
 from scipy.sparse import coo_matrix
 
 from psydac.linalg.basic   import LinearOperator, LinearSolver
 from psydac.linalg.stencil import StencilVectorSpace, StencilVector, StencilMatrix
+from psydac.linalg.stencil import StencilMultiVector
 
 __all__ = ('KroneckerStencilMatrix',
            'KroneckerLinearSolver',
+           'KroneckerSumSolver',
            'KroneckerDenseMatrix',
            'kronecker_solve')
 
@@ -76,8 +79,6 @@ class KroneckerStencilMatrix(LinearOperator):
     # ...
     def dot(self, x, out=None):
 
-        dot = np.dot
-
         assert isinstance(x, StencilVector)
         assert x.space is self.domain
 
@@ -288,8 +289,6 @@ class KroneckerDenseMatrix(LinearOperator):
     # ...
     def dot(self, x, out=None):
 
-        dot = np.dot
-
         assert isinstance(x, StencilVector)
         assert x.space is self.domain
 
@@ -310,16 +309,15 @@ class KroneckerDenseMatrix(LinearOperator):
         pads     = self._codomain.pads
         mats     = self.mats
 
-        nrows  = tuple(e-s+1 for s,e in zip(c_starts, c_ends))
-        ncols  = tuple(e-s+1+2*p for s,e,p in zip(d_starts, d_ends, pads))
-        kk     = tuple(slice(s, s+nc) for nc,s in zip(ncols, d_starts))
-        x_data   = x._data.ravel()
-        out_data = out._data
+        # Apply the 1D factors one axis at a time: each local block of the
+        # 1D matrices acts on the local data of x (including ghost regions)
+        y = x._data
+        for axis, (mat, cs, ce, ds, de, p) in enumerate(zip(mats, c_starts, c_ends, d_starts, d_ends, pads)):
+            block = mat[cs+p:ce+p+1, ds:de+2*p+1]
+            y = np.moveaxis(np.tensordot(block, y, axes=([1], [axis])), 0, axis)
 
-        for xx in np.ndindex(*nrows):
-            ii     = tuple(x+p for x,p in zip(xx,pads))
-            i_mats = [mat[i+s, k] for i,s,k,mat in zip(ii, c_starts, kk, mats)]
-            out_data[ii] = np.dot(x_data, np.outer(*i_mats).ravel())
+        idx = tuple(slice(p, p+e-s+1) for s, e, p in zip(c_starts, c_ends, pads))
+        out._data[idx] = y
 
         # IMPORTANT: flag that ghost regions are not up-to-date
         out.ghost_regions_in_sync = False
@@ -549,11 +547,17 @@ class KroneckerLinearSolver(LinearOperator):
         """
         Solves Ax=b where A is a Kronecker product matrix (and represented as such),
         and b is a suitable vector.
+
+        If b is a StencilMultiVector, all its vectors are solved for at the
+        same time, and the result is a StencilMultiVector.
         """
 
         # type checks
         assert rhs.space is self._domain
 
+        if isinstance(rhs, StencilMultiVector):
+            return self._solve_multi(rhs, out=out)
+
         if out is not None:
             assert isinstance( out, StencilVector )
             assert out.space is self._codomain
@@ -569,6 +573,62 @@ class KroneckerLinearSolver(LinearOperator):
         out.update_ghost_regions()
         return out
  
+    def _solve_multi(self, rhs, out=None):
+        """
+        Solves Ax=b for all the vectors of the StencilMultiVector b. If all
+        the solver passes are serial, each one-dimensional solver is called
+        only once for all the right-hand sides; otherwise each vector is
+        solved for separately.
+        """
+        if out is not None:
+            assert isinstance(out, StencilMultiVector)
+            assert out.space is self._codomain
+            assert out.nvecs == rhs.nvecs
+        else:
+            out = StencilMultiVector(self._codomain, rhs.nvecs)
+
+        inslice  = rhs[self._slice]
+        outslice = out[self._slice]
+
+        if self._allserial:
+            self._solve_nd_multi(inslice, outslice)
+        else:
+            for j in range(rhs.nvecs):
+                self._solve_nd(inslice[..., j], outslice[..., j])
+
+        out.update_ghost_regions()
+        return out
+
+    def _solve_nd_multi(self, inslice, outslice):
+        """
+        The internal solve loop for several right-hand sides, which are
+        stored along the last axis of inslice. Only for serial solver passes.
+        """
+        nvecs = inslice.shape[-1]
+        size  = nvecs * self._localsize
+        ndim  = self._ndim
+
+        # The right-hand sides are stored along the first (slowest) axis of the
+        # temporary arrays, so that each pass solves nvecs times more columns
+        temp1 = np.empty((size,), dtype=self._dtype)
+        temp2 = np.empty((size,), dtype=self._dtype)
+        perm  = [0] + [p + 1 for p in self._perm]
+
+        view = temp1.reshape((nvecs, *self._shapes[0]))
+        view[:] = inslice.transpose([ndim, *range(ndim)])
+
+        for i in range(ndim):
+            self._solver_passes[i].solve_pass(temp1, None, nvecs=nvecs)
+
+            if i < ndim - 1:
+                source = temp1.reshape((nvecs, *self._shapes[i]))
+                target = temp2.reshape((nvecs, *self._shapes[i+1]))
+                target[:] = source.transpose(perm)
+                temp1, temp2 = temp2, temp1
+
+        source = temp1.reshape((nvecs, *self._shapes[-1]))
+        outslice[:] = source.transpose([*perm[1:], 0])
+
     def _solve_nd(self, inslice, outslice):
         """
         The internal solve loop. Can handle arbitrary dimensions.
@@ -659,7 +719,7 @@ class KroneckerLinearSolver(LinearOperator):
             """
             return self._datasize
 
-        def solve_pass(self, workmem, tempmem):
+        def solve_pass(self, workmem, tempmem, nvecs=1):
             """
             Solves the data available in workmem, assuming that all data is available locally.
 
@@ -672,10 +732,14 @@ class KroneckerLinearSolver(LinearOperator):
             
             tempmem : ndarray
                 Ignored, it exists for compatibility with the parallel solver.
+
+            nvecs : int
+                Number of multi-dimensional right-hand sides stored one after
+                another in workmem (default 1).
             """
             # reshape necessary memory in column-major
-            view = workmem[:self._datasize]
-            view.shape = (self._numrhs,self._dimrhs)
+            view = workmem[:nvecs*self._datasize]
+            view.shape = (nvecs*self._numrhs,self._dimrhs)
 
             # call solver in in-place mode
             self._solver.solve(view, out=view)
@@ -876,6 +940,217 @@ class KroneckerLinearSolver(LinearOperator):
             # blocked stripes -> parts of stripes
             self._comm.Alltoallv(targetargs, sourceargs)
 
+#==============================================================================
+class KroneckerSumSolver(LinearOperator):
+    """
+    A direct solver for Ax=b, where A is a sum of Kronecker products of the form
+
+        A = sum_i M_1 x ... x M_{i-1} x K_i x M_{i+1} x ... x M_d  +  c M_1 x ... x M_d,
+
+    with x the Kronecker product, M_i hermitian positive definite and K_i
+    hermitian. Typical examples are the stiffness matrices (possibly with a
+    mass term) of tensor-product spaces on Cartesian patches.
+
+    The fast diagonalization method is used: in each direction the
+    generalized eigenvalue problem K_i U_i = M_i U_i L_i is solved once, with
+    the eigenvectors normalized such that U_i^H M_i U_i = I. Then
+
+        A^{-1} = (U_1 x ... x U_d) D^{-1} (U_1 x ... x U_d)^H,
+
+    where D = L_1 x I x ... x I + ... + I x ... x I x L_d + c I is diagonal.
+    The applications of the dense one-dimensional matrices U_i and U_i^H are
+    performed direction by direction by two KroneckerLinearSolver objects,
+    hence they use the same serial and distributed (Alltoallv) passes. For a
+    space with N = n^d degrees of freedom, each solve costs O(N^{1+1/d}).
+
+    On mapped domains the stiffness matrix is no longer a Kronecker sum, but
+    the solver built from the matrices of the logical (or an approximate
+    Cartesian) domain is a good preconditioner for mildly deformed patches.
+
+    Parameters
+    ----------
+    V : StencilVectorSpace
+        The space b will live in.
+
+    W : StencilVectorSpace
+        The space x will live in.
+
+    mass_matrices : list of (ndarray | scipy.sparse.spmatrix | StencilMatrix)
+        The hermitian positive definite one-dimensional matrices M_i.
+
+    stiffness_matrices : list of (ndarray | scipy.sparse.spmatrix | StencilMatrix)
+        The hermitian one-dimensional matrices K_i.
+
+    shift : float
+        The coefficient c of the term c M_1 x ... x M_d (default: 0).
+        The sum of the eigenvalues must not vanish, i.e. A must be invertible.
+    """
+    def __init__(self, V, W, mass_matrices, stiffness_matrices, shift=0.):
+        assert isinstance(V, StencilVectorSpace)
+        assert isinstance(W, StencilVectorSpace)
+        assert V.ndim == len(mass_matrices) == len(stiffness_matrices)
+        assert V.npts == W.npts
+
+        mass_matrices      = [self._to_dense(M) for M in mass_matrices]
+        stiffness_matrices = [self._to_dense(K) for K in stiffness_matrices]
+
+        # One-dimensional generalized eigenvalue problems
+        eigenvalues  = []
+        eigenvectors = []
+        for n, M, K in zip(V.npts, mass_matrices, stiffness_matrices):
+            assert M.shape == K.shape == (n, n)
+            lam, U = eigh(K, M)
+            assert np.dtype(V.dtype).kind == 'c' or not np.iscomplexobj(U)
+            eigenvalues .append(lam)
+            eigenvectors.append(U)
+
+        self._domain   = V
+        self._codomain = W
+        self._mass_matrices      = tuple(mass_matrices)
+        self._stiffness_matrices = tuple(stiffness_matrices)
+        self._shift        = shift
+        self._eigenvalues  = tuple(eigenvalues)
+        self._eigenvectors = tuple(eigenvectors)
+
+        # Transformation to the eigenbasis (U^H) and back (U)
+        forward  = [KroneckerSumSolver.OneDimTransform(U.conj().T) for U in eigenvectors]
+        backward = [KroneckerSumSolver.OneDimTransform(U) for U in eigenvectors]
+        self._forward  = KroneckerLinearSolver(V, V, forward)
+        self._backward = KroneckerLinearSolver(V, W, backward)
+
+        # Inverse of the diagonal D, restricted to the local indices
+        self._slice = self._forward._slice
+        local_eigenvalues = [lam[s] for lam, s in zip(eigenvalues, self._slice)]
+        diagonal = reduce(np.add.outer, local_eigenvalues) + shift
+        self._inverse_diagonal = (1 / diagonal).reshape(self._forward._nlocals)
+        self._work = np.empty(self._inverse_diagonal.shape, dtype=V.dtype)
+
+    class OneDimTransform(LinearSolver):
+        """
+        A one-dimensional 'solver' which applies a dense matrix to several
+        vectors, stored in the rows of a two-dimensional array.
+
+        Parameters
+        ----------
+        matrix : ndarray
+            The square matrix which is applied.
+        """
+        def __init__(self, matrix):
+            self._matrix = matrix
+
+        @property
+        def space(self):
+            return np.ndarray
+
+        def transpose(self):
+            return KroneckerSumSolver.OneDimTransform(self._matrix.T)
+
+        def solve(self, rhs, out=None):
+            if out is None:
+                out = np.empty_like(rhs)
+
+            # Each row v of rhs is replaced by T v, i.e. rhs is multiplied by T^T
+            out[:] = np.dot(rhs, self._matrix.T)
+
+            return out
+
+    @staticmethod
+    def _to_dense(mat):
+        if isinstance(mat, np.ndarray):
+            return mat
+        return mat.toarray()
+
+    @property
+    def domain(self):
+        return self._domain
+
+    @property
+    def codomain(self):
+        return self._codomain
+
+    @property
+    def dtype(self):
+        return None
+
+    @property
+    def eigenvalues(self):
+        """
+        The eigenvalues of the one-dimensional generalized eigenvalue problems.
+        """
+        return self._eigenvalues
+
+    @property
+    def eigenvectors(self):
+        """
+        The M_i-orthonormal eigenvectors of the one-dimensional generalized
+        eigenvalue problems, stored column-wise.
+        """
+        return self._eigenvectors
+
+    def toarray(self):
+        raise NotImplementedError('toarray() is not defined for KroneckerSumSolvers.')
+
+    def tosparse(self):
+        raise NotImplementedError('tosparse() is not defined for KroneckerSumSolvers.')
+
+    def transpose(self, conjugate=False):
+        # The one-dimensional matrices are hermitian, hence A^T = conj(A)
+        if conjugate:
+            mass, stiffness = self._mass_matrices, self._stiffness_matrices
+        else:
+            mass      = [M.conj() for M in self._mass_matrices]
+            stiffness = [K.conj() for K in self._stiffness_matrices]
+        return KroneckerSumSolver(self._codomain, self._domain, mass, stiffness, self._shift)
+
+    def dot(self, v, out=None):
+        return self.solve(v, out=out)
+
+    def solve(self, rhs, out=None):
+        """
+        Solves Ax=b where A is a Kronecker sum, and b is a suitable vector.
+
+        If b is a StencilMultiVector, all its vectors are solved for, and the
+        result is a StencilMultiVector.
+        """
+        assert rhs.space is self._domain
+
+        if isinstance(rhs, StencilMultiVector):
+            if out is not None:
+                assert isinstance(out, StencilMultiVector)
+                assert out.space is self._codomain
+                assert out.nvecs == rhs.nvecs
+            else:
+                out = StencilMultiVector(self._codomain, rhs.nvecs)
+
+            inslice  = rhs[self._slice]
+            outslice = out[self._slice]
+            for j in range(rhs.nvecs):
+                self._solve_nd(inslice[..., j], outslice[..., j])
+
+            out.update_ghost_regions()
+            return out
+
+        if out is not None:
+            assert isinstance(out, StencilVector)
+            assert out.space is self._codomain
+        else:
+            out = StencilVector(self._codomain)
+
+        self._solve_nd(rhs[self._slice], out[self._slice])
+
+        out.update_ghost_regions()
+        return out
+
+    def _solve_nd(self, inslice, outslice):
+        """
+        Transforms to the eigenbasis, scales by the inverse eigenvalues and
+        transforms back. No ghost regions are exchanged.
+        """
+        work = self._work
+        self._forward._solve_nd(inslice, work)
+        work *= self._inverse_diagonal
+        self._backward._solve_nd(work, outslice)
+
 #==============================================================================
 def kronecker_solve(solvers, rhs, out=None):
     """
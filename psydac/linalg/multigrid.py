@@ -0,0 +1,600 @@
+# coding: utf-8
+"""
+This module provides a geometric multigrid preconditioner, which acts on a
+hierarchy of nested vector spaces connected by prolongation operators.
+
+"""
+import numpy as np
+from mpi4py       import MPI
+from scipy.linalg import lu_factor, lu_solve
+
+from psydac.linalg.basic     import Vector, LinearOperator
+from psydac.linalg.stencil   import StencilVectorSpace, StencilVector, StencilMatrix
+from psydac.linalg.solvers   import inverse, estimate_spectral_bounds, Chebyshev
+
+__all__ = (
+    'galerkin_coarse_operator',
+    'JacobiSmoother',
+    'ChebyshevSmoother',
+    'DenseCoarseSolver',
+    'MultigridPreconditioner'
+)
+
+#===============================================================================
+def _probing_stride(n, p, periodic):
+    """
+    Distance between two probed columns along one axis, such that each row
+    of a banded matrix with half-bandwidth p has at most one nonzero entry
+    in any probed column set.
+    """
+    if not periodic:
+        return min(2*p+1, n)
+
+    # The coloring must be compatible with the periodicity
+    for m in range(2*p+1, n+1):
+        if n % m == 0:
+            return m
+
+#-------------------------------------------------------------------------------
+def galerkin_coarse_operator(A, P, R=None):
+    """
+    Compute the Galerkin coarse operator R A P as a StencilMatrix.
+
+    The product is never formed explicitly: the matrix R A P is recovered
+    column-wise by applying the three operators to a few probing vectors,
+    one for each color of a coloring of the coarse grid such that two
+    columns of the same color never share a nonzero row. The number of
+    probing vectors is (2p+1)^d and does not depend on the number of cells.
+    This is exact if the stencil of R A P fits in the pads of the coarse
+    space, which is the case for nested spline spaces of the same degree.
+
+    Parameters
+    ----------
+    A : psydac.linalg.basic.LinearOperator
+        Fine operator, acting on the codomain of P.
+
+    P : psydac.linalg.basic.LinearOperator
+        Prolongation operator, whose domain is a StencilVectorSpace.
+
+    R : psydac.linalg.basic.LinearOperator
+        Restriction operator (optional). If not given, the conjugate
+        transpose of P is used.
+
+    Returns
+    -------
+    Ac : psydac.linalg.stencil.StencilMatrix
+        Coarse operator acting on P.domain.
+
+    """
+    assert isinstance(A, LinearOperator)
+    assert isinstance(P, LinearOperator)
+    assert A.domain is P.codomain
+    assert A.codomain is P.codomain
+
+    if R is None:
+        R = P.transpose(conjugate=True)
+    else:
+        assert isinstance(R, LinearOperator)
+        assert R.domain is A.codomain
+        assert R.codomain is P.domain
+
+    V = P.domain
+    if not isinstance(V, StencilVectorSpace):
+        raise NotImplementedError('Galerkin coarse operators are only implemented on StencilVectorSpace')
+
+    assert all(m == 1 for m in V.shifts)
+
+    Ac = StencilMatrix(V, V)
+    data = Ac._data
+    ndim = V.ndim
+
+    strides = [_probing_stride(n, p, per) for n, p, per in zip(V.npts, V.pads, V.periods)]
+    if any(m is None or (per and m < 2*p+1) for m, p, per in zip(strides, V.pads, V.periods)):
+        raise NotImplementedError('Periodic coarse space is too small for the stencil width')
+
+    # Global indices of the local rows, and position of the rows in the data
+    rows_global = [np.arange(s, e+1) for s, e in zip(V.starts, V.ends)]
+    rows_data   = [i - s + p for i, s, p in zip(rows_global, V.starts, V.pads)]
+
+    e = StencilVector(V)
+    local_e = e._data[tuple(slice(p, -p) for p in V.pads)]
+
+    for color in np.ndindex(*strides):
+
+        # Probing vector: 1 on all the columns of the current color
+        masks = [(i % m) == c for i, m, c in zip(rows_global, strides, color)]
+        local_e[...] = 0
+        local_e[np.ix_(*masks)] = 1
+        e.ghost_regions_in_sync = False
+
+        y = R.dot(A.dot(P.dot(e)))
+
+        # Each row i meets at most one column j = i + k of the current color
+        rows  = []
+        diags = []
+        for axis, (i, r, m, c, n, p, per) in enumerate(zip(rows_global, rows_data, strides, color,
+                                                           V.npts, V.pads, V.periods)):
+            k0 = (c - i) % m
+            k  = np.where(k0 <= p, k0, k0 - m)
+            j  = i + k
+            valid = (abs(k) <= p) if per else ((abs(k) <= p) & (j >= 0) & (j < n))
+            # In a non-periodic space with n < 2p+1 the other shift may be the valid one
+            if not per:
+                k_alt = np.where(k0 <= p, k0 - m, k0)
+                j_alt = i + k_alt
+                use_alt = ~valid & (abs(k_alt) <= p) & (j_alt >= 0) & (j_alt < n)
+                k = np.where(use_alt, k_alt, k)
+                valid = valid | use_alt
+
+            shape = [1] * ndim
+            shape[axis] = -1
+            rows .append(r[valid].reshape(shape))
+            diags.append((k[valid] + p).reshape(shape))
+
+        data[(*rows, *diags)] = y._data[tuple(rows)]
+
+    return Ac
+
+#===============================================================================
+class JacobiSmoother:
+    """
+    Damped Jacobi smoother x <- x + omega D^{-1} (b - A x), where D is the
+    main diagonal of A.
+
+    Parameters
+    ----------
+    A : psydac.linalg.basic.LinearOperator
+        Operator of the linear system, which must provide the method
+        `diagonal` (e.g. StencilMatrix or BlockLinearOperator).
+
+    omega : float
+        Damping factor (Default: 2/3).
+
+    """
+    def __init__(self, A, *, omega=2/3):
+
+        assert hasattr(A, 'diagonal')
+        assert 0 < omega <= 1
+
+        self._A     = A
+        self._Dinv  = A.diagonal(inverse=True)
+        self._omega = omega
+        self._r     = A.codomain.zeros()
+        self._s     = A.domain.zeros()
+
+    @property
+    def operator(self):
+        return self._A
+
+    def smooth(self, b, x, nsweeps=1):
+        """
+        Apply nsweeps smoothing iterations to the approximate solution x of
+        A x = b. The vector x is updated in place and returned.
+        """
+        A, Dinv, omega = self._A, self._Dinv, self._omega
+        r, s = self._r, self._s
+
+        for _ in range(nsweeps):
+            A.dot(x, out=r)
+            r *= -1
+            r += b
+            Dinv.dot(r, out=s)
+            x.mul_iadd(omega, s)
+
+        return x
+
+#===============================================================================
+class ChebyshevSmoother:
+    """
+    Chebyshev polynomial smoother for the Jacobi-preconditioned operator
+    D^{-1} A, targeting the upper part [lower * lmax, upper * lmax] of its
+    spectrum.
+
+    The largest eigenvalue lmax of D^{-1} A is estimated with a few steps of
+    the Lanczos method, and each sweep is a fixed number of iterations of the
+    Chebyshev solver, which does not need any global reduction. The smoother
+    requires A to be symmetric and positive definite, and it is a symmetric
+    operator itself.
+
+    Parameters
+    ----------
+    A : psydac.linalg.basic.LinearOperator
+        Operator of the linear system, which must provide the method
+        `diagonal` (e.g. StencilMatrix or BlockLinearOperator).
+
+    degree : int
+        Degree of the Chebyshev polynomial, i.e. number of applications of A
+        per sweep (Default: 2).
+
+    lower : float
+        Lower end of the target interval, relative to lmax (Default: 0.1).
+
+    upper : float
+        Upper end of the target interval, relative to lmax (Default: 1.1).
+
+    estimator_steps : int
+        Number of Lanczos steps used to estimate lmax (Default: 10).
+
+    """
+    def __init__(self, A, *, degree=2, lower=0.1, upper=1.1, estimator_steps=10):
+
+        assert hasattr(A, 'diagonal')
+        assert degree >= 1
+        assert 0 < lower < upper
+
+        Dinv = A.diagonal(inverse=True)
+        lmax = estimate_spectral_bounds(A, Dinv, maxiter=estimator_steps)[1]
+
+        self._A      = A
+        self._lmax   = lmax
+        self._solver = Chebyshev(A, pc=Dinv, tol=None, maxiter=degree,
+                                 lmax=lmax, eig_ratio=upper/lower, safety=upper)
+
+    @property
+    def operator(self):
+        return self._A
+
+    @property
+    def lmax(self):
+        """ Estimate of the largest eigenvalue of D^{-1} A. """
+        return self._lmax
+
+    def smooth(self, b, x, nsweeps=1):
+        """
+        Apply nsweeps smoothing iterations to the approximate solution x of
+        A x = b. The vector x is updated in place and returned.
+        """
+        solver = self._solver
+        solver.set_options(x0=x)
+        for _ in range(nsweeps):
+            solver.solve(b, out=x)
+
+        return x
+
+#===============================================================================
+class DenseCoarseSolver(LinearOperator):
+    """
+    Direct solver for a small StencilMatrix, based on the LU factorization
+    of the corresponding dense matrix.
+
+    The global matrix is gathered on all processes and factorized once.
+    Each application gathers the right-hand side, solves the dense system
+    redundantly, and keeps the local part of the solution. This is meant
+    for the coarsest level of a multigrid hierarchy.
+
+    Parameters
+    ----------
+    A : psydac.linalg.stencil.StencilMatrix
+        Square matrix to be inverted.
+
+    """
+    def __init__(self, A):
+
+        assert isinstance(A, StencilMatrix)
+        assert A.domain is A.codomain
+
+        V = A.domain
+        comm = V.reduction_comm
+
+        a = A.toarray()
+        if comm is not None:
+            comm.Allreduce(MPI.IN_PLACE, a, op=MPI.SUM)
+
+        self._A    = A
+        self._comm = comm
+        self._lu   = lu_factor(a)
+        self._idx  = tuple(slice(s, e+1) for s, e in zip(V.starts, V.ends))
+
+    @property
+    def domain(self):
+        return self._A.domain
+
+    @property
+    def codomain(self):
+        return self._A.codomain
+
+    @property
+    def dtype(self):
+        return self._A.dtype
+
+    def tosparse(self):
+        raise NotImplementedError('tosparse() is not defined for DenseCoarseSolver.')
+
+    def toarray(self):
+        raise NotImplementedError('toarray() is not defined for DenseCoarseSolver.')
+
+    def transpose(self, conjugate=False):
+        raise NotImplementedError('transpose() is not defined for DenseCoarseSolver.')
+
+    def dot(self, b, out=None):
+
+        assert isinstance(b, StencilVector)
+        assert b.space is self.domain
+
+        if out is not None:
+            assert isinstance(out, StencilVector)
+            assert out.space is self.codomain
+        else:
+            out = self.codomain.zeros()
+
+        b_glob = b.toarray()
+        if self._comm is not None:
+            self._comm.Allreduce(MPI.IN_PLACE, b_glob, op=MPI.SUM)
+
+        x_glob = lu_solve(self._lu, b_glob).reshape(self.codomain.npts)
+
+        out[self._idx] = x_glob[self._idx]
+        out.ghost_regions_in_sync = False
+
+        return out
+
+#===============================================================================
+class MultigridPreconditioner(LinearOperator):
+    """
+    Geometric multigrid preconditioner.
+
+    One application of this operator performs one multigrid cycle with a
+    zero initial guess on a hierarchy of nested vector spaces V_0 (coarsest),
+    V_1, ..., V_L (finest), connected by prolongation operators
+    P_l : V_l -> V_{l+1}. The restriction operators default to the conjugate
+    transposes of the prolongations, and the coarse operators are either
+    Galerkin products R A P or given by the user (e.g. by re-discretization
+    on the coarse spaces).
+
+    With the same number of pre- and post-smoothing sweeps of a symmetric
+    smoother, and a symmetric positive-definite operator A, the
+    preconditioner is symmetric and positive-definite, hence it can be
+    used as `pc` in PConjugateGradient as well as in
+    PBiConjugateGradientStabilized.
+
+    For spline spaces the prolongations are provided by knot insertion, see
+    psydac.fem.projectors.knot_insertion_prolongation_operators.
+
+    Parameters
+    ----------
+    A : psydac.linalg.basic.LinearOperator
+        Operator on the finest level.
+
+    prolongations : list of psydac.linalg.basic.LinearOperator
+        Prolongation operators [P_0, ..., P_{L-1}], from the coarsest level
+        to the finest. The codomain of P_{L-1} must be the domain of A.
+
+    restrictions : list of psydac.linalg.basic.LinearOperator
+        Restriction operators [R_0, ..., R_{L-1}], with R_l : V_{l+1} -> V_l
+        (optional). By default R_l is the conjugate transpose of P_l.
+
+    coarse_operators : str | list of psydac.linalg.basic.LinearOperator
+        Either 'galerkin' (default), to compute the coarse operators as the
+        Galerkin products R_l A_{l+1} P_l, or the list [A_0, ..., A_{L-1}] of
+        operators on the coarse levels.
+
+    smoother : str | callable
+        Either 'jacobi' (default), 'chebyshev', or a callable which takes the
+        operator of one level and returns an object with a method
+        smooth(b, x, nsweeps).
+
+    presmoothing : int
+        Number of smoothing sweeps before the coarse-grid correction
+        (Default: 1).
+
+    postsmoothing : int
+        Number of smoothing sweeps after the coarse-grid correction
+        (Default: 1).
+
+    cycle : str
+        Type of multigrid cycle, either 'V' (default) or 'W'.
+
+    coarse_solver : psydac.linalg.basic.LinearOperator
+        Solver for the coarsest level (optional). By default, this is a
+        DenseCoarseSolver if A_0 is a StencilMatrix, and a Jacobi-
+        preconditioned conjugate gradient otherwise.
+
+    **smoother_kwargs
+        Keyword arguments passed to the smoother, e.g. `omega` for the
+        Jacobi smoother or `degree` for the Chebyshev smoother.
+
+    """
+    _smoothers = {
+        'jacobi'   : JacobiSmoother,
+        'chebyshev': ChebyshevSmoother,
+    }
+
+    def __init__(self, A, prolongations, *, restrictions=None, coarse_operators='galerkin',
+                 smoother='jacobi', presmoothing=1, postsmoothing=1, cycle='V',
+                 coarse_solver=None, **smoother_kwargs):
+
+        assert isinstance(A, LinearOperator)
+        assert A.domain is A.codomain
+        assert len(prolongations) >= 1
+        assert presmoothing >= 0 and postsmoothing >= 0
+        assert cycle in ('V', 'W')
+
+        prolongations = list(prolongations)
+        nlevels = len(prolongations) + 1
+
+        for P in prolongations:
+            assert isinstance(P, LinearOperator)
+        for Pc, Pf in zip(prolongations[:-1], prolongations[1:]):
+            assert Pc.codomain is Pf.domain
+        assert prolongations[-1].codomain is A.domain
+
+        if restrictions is None:
+            restrictions = [P.transpose(conjugate=True) for P in prolongations]
+        else:
+            restrictions = list(restrictions)
+            assert len(restrictions) == nlevels - 1
+            for R, P in zip(restrictions, prolongations):
+                assert isinstance(R, LinearOperator)
+                assert R.domain is P.codomain
+                assert R.codomain is P.domain
+
+        # Operators on all levels, from the coarsest to the finest
+        operators = [None] * nlevels
+        operators[-1] = A
+        if isinstance(coarse_operators, str):
+            if coarse_operators != 'galerkin':
+                raise ValueError("Coarse operators must be 'galerkin' or a list of operators, got {}".format(coarse_operators))
+            for l in range(nlevels-2, -1, -1):
+                operators[l] = galerkin_coarse_operator(operators[l+1], prolongations[l], restrictions[l])
+        else:
+            coarse_operators = list(coarse_operators)
+            assert len(coarse_operators) == nlevels - 1
+            for l, (Al, P) in enumerate(zip(coarse_operators, prolongations)):
+                assert isinstance(Al, LinearOperator)
+                assert Al.domain is P.domain
+                assert Al.codomain is P.domain
+                operators[l] = Al
+
+        # Smoothers on all levels but the coarsest
+        if isinstance(smoother, str):
+            try:
+                smoother = self._smoothers[smoother]
+            except KeyError:
+                raise ValueError("Smoother must be one of {}, got {}".format(list(self._smoothers), smoother))
+        smoothers = [None] + [smoother(Al, **smoother_kwargs) for Al in operators[1:]]
+
+        # Solver on the coarsest level
+        A0 = operators[0]
+        if coarse_solver is None:
+            if isinstance(A0, StencilMatrix):
+                coarse_solver = DenseCoarseSolver(A0)
+            else:
+                coarse_solver = inverse(A0, 'pcg', pc=A0.diagonal(inverse=True), tol=1e-13, maxiter=10000)
+        else:
+            assert isinstance(coarse_solver, LinearOperator)
+            assert coarse_solver.domain is A0.codomain
+            assert coarse_solver.codomain is A0.domain
+
+        self._A             = A
+        self._prolongations = prolongations
+        self._restrictions  = restrictions
+        self._operators     = operators
+        self._smoothers_l   = smoothers
+        self._coarse_solver = coarse_solver
+        self._nu            = (presmoothing, postsmoothing)
+        self._gamma         = 1 if cycle == 'V' else 2
+
+        # Work vectors on all levels: right-hand side, solution and residual
+        self._b = [Al.codomain.zeros() for Al in operators]
+        self._x = [Al.domain.zeros() for Al in operators]
+        self._r = [Al.codomain.zeros() for Al in operators]
+
+    #--------------------------------------
+    # Abstract interface
+    #--------------------------------------
+    @property
+    def domain(self):
+        return self._A.codomain
+
+    @property
+    def codomain(self):
+        return self._A.domain
+
+    @property
+    def dtype(self):
+        return self._A.dtype
+
+    def tosparse(self):
+        raise NotImplementedError('tosparse() is not defined for MultigridPreconditioner.')
+
+    def toarray(self):
+        raise NotImplementedError('toarray() is not defined for MultigridPreconditioner.')
+
+    def transpose(self, conjugate=False):
+        raise NotImplementedError('transpose() is not defined for MultigridPreconditioner.')
+
+    def dot(self, b, out=None):
+        """
+        Apply one multigrid cycle to the right-hand side b, starting from a
+        zero initial guess.
+
+        Parameters
+        ----------
+        b : psydac.linalg.basic.Vector
+            Right-hand side, element of the codomain of A.
+
+        out : psydac.linalg.basic.Vector
+            Output vector, element of the domain of A (optional).
+
+        Returns
+        -------
+        out : psydac.linalg.basic.Vector
+            Approximate solution of A x = b.
+
+        """
+        assert isinstance(b, Vector)
+        assert b.space is self.domain
+
+        if out is not None:
+            assert isinstance(out, Vector)
+            assert out.space is self.codomain
+        else:
+            out = self.codomain.zeros()
+
+        out *= 0
+        self._cycle(self.nlevels - 1, b, out)
+
+        return out
+
+    #--------------------------------------
+    # Other properties/methods
+    #--------------------------------------
+    @property
+    def nlevels(self):
+        """ Number of levels, including the finest one. """
+        return len(self._operators)
+
+    @property
+    def operators(self):
+        """ Operators on all levels, from the coarsest to the finest. """
+        return tuple(self._operators)
+
+    @property
+    def prolongations(self):
+        return tuple(self._prolongations)
+
+    @property
+    def restrictions(self):
+        return tuple(self._restrictions)
+
+    @property
+    def smoothers(self):
+        """ Smoothers on all levels but the coarsest, from the coarsest to the finest. """
+        return tuple(self._smoothers_l[1:])
+
+    @property
+    def coarse_solver(self):
+        return self._coarse_solver
+
+    def _cycle(self, l, b, x):
+        """ Multigrid cycle on level l, which updates x in place. """
+
+        if l == 0:
+            self._coarse_solver.dot(b, out=x)
+            return
+
+        A = self._operators[l]
+        S = self._smoothers_l[l]
+        P = self._prolongations[l-1]
+        R = self._restrictions[l-1]
+        r = self._r[l]
+        bc = self._b[l-1]
+        xc = self._x[l-1]
+        nu_pre, nu_post = self._nu
+
+        S.smooth(b, x, nu_pre)
+
+        # Restrict the residual to the coarse level
+        A.dot(x, out=r)
+        r *= -1
+        r += b
+        R.dot(r, out=bc)
+
+        # Coarse-grid correction
+        xc *= 0
+        for _ in range(self._gamma):
+            self._cycle(l-1, bc, xc)
+        P.dot(xc, out=r)
+        x += r
+
+        S.smooth(b, x, nu_post)
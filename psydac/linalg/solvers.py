@@ -5,22 +5,33 @@ This module provides iterative solvers and preconditioners.
 """
 import numpy as np
 from math import sqrt
+from mpi4py import MPI
+from scipy.linalg import eig, solve_triangular
 
 from psydac.utilities.utils  import is_real
-from psydac.linalg.utilities import _sym_ortho
+from psydac.linalg.utilities import _sym_ortho, _random_vector
 from psydac.linalg.basic     import (Vector, LinearOperator,
         InverseLinearOperator, IdentityOperator, ScaledLinearOperator)
 
 __all__ = (
     'inverse',
+    'estimate_spectral_bounds',
     'ConjugateGradient',
     'PConjugateGradient',
+    'PipelinedConjugateGradient',
     'BiConjugateGradient',
     'BiConjugateGradientStabilized',
     'PBiConjugateGradientStabilized',
     'MinimumResidual',
     'LSMR',
-    'GMRES'
+    'GMRES',
+    'CAConjugateGradient',
+    'CAGMRES',
+    'Chebyshev',
+    'DeflatedConjugateGradient',
+    'GCRODR',
+    'IterativeRefinement',
+    'LocalBlockPreconditioner'
 )
 
 #===============================================================================
@@ -28,9 +39,12 @@ def inverse(A, solver, **kwargs):
     """
     A function to create objects of all InverseLinearOperator subclasses.
 
-    These are, as of June 06, 2023:
-    ConjugateGradient, PConjugateGradient, BiConjugateGradient,
-    BiConjugateGradientStabilized, MinimumResidual, LSMR, GMRES.
+    These are:
+    ConjugateGradient, PConjugateGradient, PipelinedConjugateGradient,
+    BiConjugateGradient, BiConjugateGradientStabilized,
+    PBiConjugateGradientStabilized, MinimumResidual, LSMR, GMRES,
+    CAConjugateGradient, CAGMRES, Chebyshev, DeflatedConjugateGradient,
+    GCRODR, IterativeRefinement.
 
     The kwargs given must be compatible with the chosen solver subclass.
     
@@ -42,8 +56,9 @@ def inverse(A, solver, **kwargs):
         function (e.g. a matrix-vector product A*p).
 
     solver : str
-        Preferred iterative solver. Options are: 'cg', 'pcg', 'bicg',
-        'bicgstab', 'pbicgstab', 'minres', 'lsmr', 'gmres'.
+        Preferred iterative solver. Options are: 'cg', 'pcg', 'pipelined_cg',
+        'bicg', 'bicgstab', 'pbicgstab', 'minres', 'lsmr', 'gmres', 'ca_cg',
+        'ca_gmres', 'chebyshev', 'dcg', 'gcrodr', 'ir'.
 
     Returns
     -------
@@ -58,12 +73,19 @@ def inverse(A, solver, **kwargs):
     solvers_dict = {
         'cg'       : ConjugateGradient,
         'pcg'      : PConjugateGradient,
+        'pipelined_cg': PipelinedConjugateGradient,
         'bicg'     : BiConjugateGradient,
         'bicgstab' : BiConjugateGradientStabilized,
         'pbicgstab': PBiConjugateGradientStabilized,
         'minres'   : MinimumResidual,
         'lsmr'     : LSMR,
         'gmres'    : GMRES,
+        'ca_cg'    : CAConjugateGradient,
+        'ca_gmres' : CAGMRES,
+        'chebyshev': Chebyshev,
+        'dcg'      : DeflatedConjugateGradient,
+        'gcrodr'   : GCRODR,
+        'ir'       : IterativeRefinement,
     }
 
     # Check solver input
@@ -212,11 +234,11 @@ class ConjugateGradient(InverseLinearOperator):
             l   = am / v.dot(p)
 
             x.mul_iadd(l, p)  # this is x += l*p
-            r.mul_iadd(-l, v) # this is r -= l*v
 
-            am1 = r.dot(r).real
-            p  *= (am1/am)
-            p  += r
+            # r -= l*v, and am1 = r.dot(r), with a single pass over the data
+            am1 = r.mul_iadd_norm_sqr(-l, v)
+
+            p.xpay(am1/am, r) # this is p = r + (am1/am)*p
             am  = am1
             if verbose:
                 print(template.format(m, sqrt(am)))
@@ -377,9 +399,9 @@ class PConjugateGradient(InverseLinearOperator):
             l  = am / v.dot(p)
 
             x.mul_iadd(l, p) # this is x += l*p
-            r.mul_iadd(-l, v) # this is r -= l*v
 
-            nrmr_sqr = r.dot(r).real
+            # r -= l*v, and nrmr_sqr = r.dot(r), with a single pass over the data
+            nrmr_sqr = r.mul_iadd_norm_sqr(-l, v)
             pc.dot(r, out=s)
 
             am1 = s.dot(r)
@@ -407,6 +429,266 @@ class PConjugateGradient(InverseLinearOperator):
     def dot(self, b, out=None):
         return self.solve(b, out=out)
 
+#===============================================================================
+class PipelinedConjugateGradient(InverseLinearOperator):
+    """
+    Pipelined (preconditioned) Conjugate Gradient.
+
+    A LinearOperator subclass. Objects of this class are meant to be created using :func:~`solvers.inverse`.
+    The .dot (and also the .solve) function are based on the pipelined
+    conjugate gradient method [1], which is mathematically equivalent to
+    the (preconditioned) conjugate gradient method. The inner products of each
+    iteration are computed with a single global reduction, which is
+    non-blocking and overlapped with the application of the preconditioner
+    and with the matrix-vector product. This hides the latency of the
+    reduction on large numbers of processes, at the price of four (six with a
+    preconditioner) additional vector updates per iteration.
+
+    Parameters
+    ----------
+    A : psydac.linalg.basic.LinearOperator
+        Left-hand-side matrix A of the linear system. This should be hermitian
+        and positive definite.
+
+    pc: psydac.linalg.basic.LinearOperator
+        Preconditioner which should approximate the inverse of A (optional).
+        Like A, the preconditioner should be hermitian and positive definite.
+
+    x0 : psydac.linalg.basic.Vector
+        First guess of solution for iterative solver (optional).
+
+    tol : float
+        Absolute tolerance for L2-norm of residual r = A x - b. (Default: 1e-6)
+
+    maxiter: int
+        Maximum number of iterations. (Default: 1000)
+
+    verbose : bool
+        If True, the L2-norm of the residual r is printed at each iteration.
+        (Default: False)
+
+    recycle : bool
+        If True, a copy of the output is stored in x0 to speed up consecutive
+        calculations of slightly altered linear systems. (Default: False)
+
+    replacement_period : int
+        Number of iterations after which the recursive residual is replaced
+        by the true residual b - A x. (Default: 50)
+
+    Notes
+    -----
+    The residual is updated by a recurrence relation, hence its L2-norm may
+    drift away from the norm of the true residual b - A x. Every
+    `replacement_period` iterations, the residual and the other vectors
+    updated by recurrence relations are replaced by their true values, while
+    the search direction and the scalar recurrences are kept unchanged.
+    Whenever the recursive residual satisfies the stopping criterion but the
+    true residual does not (false convergence), the iteration is restarted
+    from the true residual, with the search direction reset to the
+    preconditioned residual. The solver stops only if the true residual
+    satisfies the criterion.
+
+    References
+    ----------
+    [1] P. Ghysels and W. Vanroose, Hiding global synchronization latency in
+        the preconditioned Conjugate Gradient algorithm, Parallel Computing 40
+        (2014), pp. 224-238.
+
+    """
+    def __init__(self, A, *, pc=None, x0=None, tol=1e-6, maxiter=1000, verbose=False, recycle=False,
+                 replacement_period=50):
+
+        assert replacement_period >= 1
+
+        self._options = {"x0":x0, "pc":pc, "tol":tol, "maxiter":maxiter, "verbose":verbose, "recycle":recycle,
+                         "replacement_period":replacement_period}
+
+        super().__init__(A, **self._options)
+
+        if pc is not None:
+            assert isinstance(pc, LinearOperator)
+
+        keys = ("r", "w", "n", "z", "s", "p") + (() if pc is None else ("u", "m", "q"))
+        self._tmps = {key: self.domain.zeros() for key in keys}
+
+        # Buffers for the local and global values of the inner products
+        self._local_dots  = np.zeros(3, dtype=self.domain.dtype)
+        self._global_dots = np.zeros(3, dtype=self.domain.dtype)
+        self._info = None
+
+    def solve(self, b, out=None):
+        """
+        Pipelined conjugate gradient algorithm for solving linear system Ax=b.
+        Only working if A is an hermitian and positive-definite linear operator.
+        Info can be accessed using get_info(), see :func:~`basic.InverseLinearOperator.get_info`.
+
+        Parameters
+        ----------
+        b : psydac.linalg.basic.Vector
+            Right-hand-side vector of linear system.
+
+        out : psydac.linalg.basic.Vector | NoneType
+            The output vector, or None (optional).
+
+        Returns
+        -------
+        x : psydac.linalg.basic.Vector
+            Numerical solution of the linear system. To check the convergence of the solver,
+            use the method InverseLinearOperator.get_info().
+
+        """
+
+        A = self._A
+        domain = self._domain
+        codomain = self._codomain
+        options = self._options
+        x0 = options["x0"]
+        pc = options["pc"]
+        tol = options["tol"]
+        maxiter = options["maxiter"]
+        verbose = options["verbose"]
+        recycle = options["recycle"]
+        period = options["replacement_period"]
+
+        assert isinstance(b, Vector)
+        assert b.space is domain
+
+        # First guess of solution
+        if out is not None:
+            assert isinstance(out, Vector)
+            assert out.space is codomain
+
+        x = x0.copy(out=out)
+
+        # Extract local storage. Without preconditioner u = r, m = w and q = s
+        tmps = self._tmps
+        r, w, n, z, s, p = [tmps[key] for key in ("r", "w", "n", "z", "s", "p")]
+        if pc is None:
+            u, m, q = r, w, s
+        else:
+            u, m, q = [tmps[key] for key in ("u", "m", "q")]
+
+        comm        = domain.reduction_comm
+        local_dots  = self._local_dots
+        global_dots = self._global_dots
+
+        # First values
+        p *= 0
+        self._replace_residual(b, x)
+
+        tol_sqr = tol**2
+
+        if verbose:
+            print( "Pipelined CG solver:" )
+            print( "+---------+---------------------+")
+            print( "+ Iter. # | L2-norm of residual |")
+            print( "+---------+---------------------+")
+            template = "| {:7d} | {:19.2e} |"
+
+        # Iterate to convergence. The flag 'replaced' is True if r is the true residual
+        replaced  = True
+        gamma_old = None
+        for k in range(1, maxiter+1):
+
+            # Start the reduction of all inner products of this iteration
+            local_dots[0] = u.local_dot(r)
+            local_dots[1] = u.local_dot(w)
+            local_dots[2] = local_dots[0] if pc is None else r.local_dot(r)
+            if comm is None:
+                global_dots[:] = local_dots
+            else:
+                request = comm.Iallreduce(local_dots, global_dots, op=MPI.SUM)
+
+            # Overlap the reduction with the preconditioner and the matrix-vector product
+            if pc is not None:
+                pc.dot(w, out=m)
+            A.dot(m, out=n)
+
+            if comm is not None:
+                request.Wait()
+
+            gamma, delta, nrmr_sqr = global_dots[0], global_dots[1], global_dots[2].real
+
+            if verbose:
+                print(template.format(k, sqrt(nrmr_sqr)))
+
+            if nrmr_sqr < tol_sqr:
+                if replaced or k == maxiter:
+                    break
+                # The true residual has not converged: restart from it
+                self._replace_residual(b, x)
+                replaced  = True
+                gamma_old = None
+                continue
+
+            if k == maxiter:
+                break
+
+            if gamma_old is None:
+                beta  = 0.0
+                alpha = gamma / delta
+            else:
+                beta  = gamma / gamma_old
+                alpha = gamma / (delta - beta * gamma / alpha_old)
+
+            z.xpay(beta, n) # this is z = n + beta*z
+            if pc is not None:
+                q.xpay(beta, m) # this is q = m + beta*q
+            s.xpay(beta, w) # this is s = w + beta*s
+            p.xpay(beta, u) # this is p = u + beta*p
+
+            x.mul_iadd( alpha, p) # this is x += alpha*p
+            r.mul_iadd(-alpha, s) # this is r -= alpha*s
+            if pc is not None:
+                u.mul_iadd(-alpha, q) # this is u -= alpha*q
+            w.mul_iadd(-alpha, z) # this is w -= alpha*z
+
+            gamma_old = gamma
+            alpha_old = alpha
+
+            # Periodically replace the recursive vectors by their true values
+            replaced = k % period == 0
+            if replaced:
+                self._replace_residual(b, x)
+
+        if verbose:
+            print( "+---------+---------------------+")
+
+        # Convergence information
+        self._info = {'niter': k, 'success': nrmr_sqr < tol_sqr, 'res_norm': sqrt(nrmr_sqr) }
+
+        if recycle:
+            x.copy(out=self._options["x0"])
+
+        return x
+
+    def _replace_residual(self, b, x):
+        """
+        Replace the vectors updated by recurrence relations with their true
+        values: the residual r = b - A x, u = M r and w = A u, as well as
+        s = A p, q = M s and z = A q, where p is the current search direction.
+        """
+        A    = self._A
+        pc   = self._options["pc"]
+        tmps = self._tmps
+        r, w, z, s, p = [tmps[key] for key in ("r", "w", "z", "s", "p")]
+        u, q = (r, s) if pc is None else (tmps["u"], tmps["q"])
+
+        A.dot(x, out=w)
+        b.copy(out=r)
+        r -= w
+        if pc is not None:
+            pc.dot(r, out=u)
+        A.dot(u, out=w)
+
+        A.dot(p, out=s)
+        if pc is not None:
+            pc.dot(s, out=q)
+        A.dot(q, out=z)
+
+    def dot(self, b, out=None):
+        return self.solve(b, out=out)
+
 #===============================================================================
 class BiConjugateGradient(InverseLinearOperator):
     """
@@ -1823,6 +2105,7 @@ class GMRES(InverseLinearOperator):
         # Iterate to convergence
         for k in range(maxiter):
             if am < tol:
+                niter = k + 1
                 break
 
             # run Arnoldi
@@ -1833,11 +2116,14 @@ class GMRES(InverseLinearOperator):
 
             # update the residual vector
             beta.append(- sn[k] * beta[k])
-            beta[k] *= cn[k]
+            beta[k] *= cn[k].conjugate()
 
             am = abs(beta[k+1])
             if verbose:
                 print( template.format( k+2, am ) )
+        else:
+            # All the iterations were performed
+            k = niter = maxiter
 
         if verbose:
             print( "+---------+---------------------+")        
@@ -1848,7 +2134,7 @@ class GMRES(InverseLinearOperator):
             x.mul_iadd(y[i], self._Q[i])
 
         # Convergence information
-        self._info = {'niter': k+1, 'success': am < tol, 'res_norm': am }
+        self._info = {'niter': niter, 'success': am < tol, 'res_norm': am }
         
         if recycle:
             x.copy(out=self._options["x0"])
@@ -1872,12 +2158,10 @@ class GMRES(InverseLinearOperator):
         h = self._H[:k+2, k]
         self._A.dot( self._Q[k] , out=p) # Krylov vector
 
-        for i in range(k + 1): # Modified Gram-Schmidt, keeping Hessenberg matrix
-            h[i] = p.dot(self._Q[i])
-            p.mul_iadd(-h[i], self._Q[i])
-        
-        h[k+1] = sqrt(p.dot(p).real)
-        p /= h[k+1] # Normalize vector
+        # Classical Gram-Schmidt with reorthogonalization, keeping Hessenberg matrix
+        h[k+1] = _cgs2(self._Q[:k+1], p, h)
+        if h[k+1] != 0:
+            p /= h[k+1] # Normalize vector
 
         if len(self._Q) > k + 1:
             p.copy(out=self._Q[k+1])
@@ -1885,26 +2169,2269 @@ class GMRES(InverseLinearOperator):
             self._Q.append(p.copy())
 
     def apply_givens_rotation(self, k, sn, cn):
-        # Apply Givens rotation to last column of H
+        # Apply Givens rotation to last column of H. The rotations
+        # [[conj(c), conj(s)], [-s, c]] are unitary in the complex case
         h = self._H[:k+2, k]
 
         for i in range(k):
             h_i_prev = h[i]
 
-            h[i] *= cn[i]
-            h[i] += sn[i] * h[i+1]
+            h[i] *= cn[i].conjugate()
+            h[i] += sn[i].conjugate() * h[i+1]
 
             h[i+1] *= cn[i]
             h[i+1] -= sn[i] * h_i_prev
         
-        mod = (h[k]**2 + h[k+1]**2)**0.5
+        mod = sqrt(abs(h[k])**2 + abs(h[k+1])**2)
         cn.append( h[k] / mod )
         sn.append( h[k+1] / mod )
 
-        h[k] *= cn[k]
-        h[k] += sn[k] * h[k+1]
+        h[k] = mod
         h[k+1] = 0. # becomes triangular
 
     def dot(self, b, out=None):
         return self.solve(b, out=out)
 
+#===============================================================================
+def _block_dots(pairs, V):
+    """
+    Compute the matrices of inner products U^H V of the pairs of lists of
+    vectors (U, W) of the space V, with a single global reduction.
+    """
+    xs = [u for U, W in pairs for u in U for w in W]
+    ys = [w for U, W in pairs for u in U for w in W]
+    glob = V.inner_many(xs, ys)
+
+    out = []
+    k = 0
+    for U, W in pairs:
+        n = len(U) * len(W)
+        out.append(glob[k:k+n].reshape(len(U), len(W)))
+        k += n
+    return out
+
+#===============================================================================
+def _cgs2(Q, p, h):
+    """
+    Orthogonalize the vector p against the orthonormal vectors Q in place,
+    with classical Gram-Schmidt and one reorthogonalization (CGS2). Store
+    the projection coefficients Q^H p in h[:len(Q)], and return the norm of
+    the orthogonalized vector.
+
+    Each pass computes all its inner products with a single global reduction.
+    The norm is obtained with the second reduction, by Pythagoras' theorem,
+    and it is only recomputed if cancellation makes it inaccurate.
+    """
+    V = p.space
+    k = len(Q)
+
+    c = V.dot_many(Q, p)
+    for qi, ci in zip(Q, c):
+        p.mul_iadd(-ci, qi)
+
+    g = V.dot_many(Q + [p], p)
+    for qi, gi in zip(Q, g[:k]):
+        p.mul_iadd(-gi, qi)
+    h[:k] = c + g[:k]
+
+    nrm_sqr_old = g[k].real
+    nrm_sqr     = nrm_sqr_old - np.vdot(g[:k], g[:k]).real
+    if nrm_sqr < 1e-2 * nrm_sqr_old:
+        nrm_sqr = p.dot(p).real
+
+    return sqrt(max(nrm_sqr, 0.))
+
+#===============================================================================
+def _lanczos_matrix(alphas, betas):
+    """
+    Symmetric tridiagonal Lanczos matrix associated with the coefficients
+    alphas and betas of the (preconditioned) conjugate gradient method.
+    Its eigenvalues are the Ritz values of the preconditioned operator.
+    """
+    n = len(alphas)
+    T = np.zeros((n, n))
+    for i in range(n):
+        T[i, i] = 1 / alphas[i] + (betas[i-1] / alphas[i-1] if i > 0 else 0)
+        if i < n - 1:
+            T[i, i+1] = T[i+1, i] = sqrt(betas[i]) / alphas[i]
+    return T
+
+#===============================================================================
+def _leja_order(theta, real):
+    """
+    Sort the shifts theta in Leja order, i.e. such that each shift maximizes
+    the product of its distances to the previous ones. If real is True the
+    complex shifts are kept in conjugate pairs, the one with positive
+    imaginary part coming first.
+    """
+    theta = np.asarray(theta, dtype=complex)
+    if real:
+        scale = max(np.abs(theta).max(initial=0), np.finfo(float).tiny)
+        theta = np.where(abs(theta.imag) <= 1e-12 * scale, theta.real, theta)
+        theta = theta[theta.imag >= 0]
+
+    candidates = list(theta)
+    ordered    = []
+    while candidates:
+        if not ordered:
+            i = int(np.argmax(np.abs(candidates)))
+        else:
+            with np.errstate(divide='ignore'):
+                d = [np.sum(np.log(np.abs(c - np.array(ordered)))) for c in candidates]
+            i = int(np.argmax(d))
+        t = candidates.pop(i)
+        ordered.append(t)
+        if real and t.imag > 0:
+            ordered.append(t.conjugate())
+
+    return np.array(ordered, dtype=complex)
+
+#===============================================================================
+def _basis_matrix(s, basis, theta, real):
+    """
+    Change-of-basis matrix T of shape (s+1, s) of an s-step Krylov basis,
+    such that A V[:, :s] = V T for the basis vectors V = [v_0, ..., v_s],
+    which are built with the recurrence
+
+        v_{j+1} = (A v_j - sum_{i <= j} T[i, j] v_i) / T[j+1, j].
+
+    The basis is defined by its type ('monomial', 'newton' or 'chebyshev')
+    and by the estimates theta of the eigenvalues of A (Leja ordered for the
+    Newton basis). Its vectors are scaled by the largest modulus of theta.
+    For real problems the complex shifts of the Newton basis are applied in
+    conjugate pairs, in real arithmetic (modified Newton basis).
+    """
+    T = np.zeros((s + 1, s), dtype=float if real else complex)
+
+    theta = np.asarray(theta, dtype=complex)
+    sigma = np.abs(theta).max(initial=0)
+    if sigma == 0:
+        sigma = 1.0
+
+    if basis == 'monomial':
+        for j in range(s):
+            T[j + 1, j] = sigma
+
+    elif basis == 'chebyshev':
+        a, b = theta.real.min(initial=0), theta.real.max(initial=0)
+        c = (a + b) / 2
+        h = (b - a) / 2 if b > a else sigma
+        T[0, 0] = c
+        T[1, 0] = h
+        for j in range(1, s):
+            T[j - 1, j] = h / 2
+            T[j    , j] = c
+            T[j + 1, j] = h / 2
+
+    elif basis == 'newton':
+        if len(theta) == 0:
+            theta = np.zeros(1, dtype=complex)
+        j = 0
+        k = 0
+        while j < s:
+            t = theta[k % len(theta)]
+            pair = real and t.imag > 0
+            k += 2 if pair else 1
+            if pair and j + 1 < s:
+                a, b = t.real, t.imag
+                T[j    , j    ] = a
+                T[j + 1, j    ] = sigma
+                T[j    , j + 1] = -b * b / sigma
+                T[j + 1, j + 1] = a
+                T[j + 2, j + 1] = sigma
+                j += 2
+            else:
+                T[j    , j] = t.real if real else t
+                T[j + 1, j] = sigma
+                j += 1
+
+    else:
+        raise ValueError(f"Krylov basis '{basis}' not understood.")
+
+    return T
+
+def _partial_cholesky(G, tol):
+    """
+    Cholesky factorization G = R^H R of the leading block of the Hermitian
+    matrix G, of the largest size k such that the squared pivots are larger
+    than tol. Return R (of shape (k, k)) and k.
+    """
+    n = G.shape[0]
+    R = np.zeros((n, n), dtype=G.dtype)
+    for i in range(n):
+        d = G[i, i].real - np.sum(abs(R[:i, i])**2)
+        if not d > tol[i]:
+            return R[:i, :i], i
+        R[i, i] = sqrt(d)
+        R[i, i+1:] = (G[i, i+1:] - R[:i, i].conj() @ R[:i, i+1:]) / R[i, i]
+    return R, n
+
+def _basis_step(T, j, V, w, out):
+    """ Compute out = (w - sum_{i <= j} T[i, j] V[i]) / T[j+1, j]. """
+    w.copy(out=out)
+    for i in range(j + 1):
+        if T[i, j] != 0:
+            out.mul_iadd(-T[i, j], V[i])
+    out *= 1 / T[j + 1, j]
+    return out
+
+#===============================================================================
+class CAConjugateGradient(InverseLinearOperator):
+    """
+    Communication-avoiding (s-step) preconditioned Conjugate Gradient (CA-CG).
+
+    A LinearOperator subclass. Objects of this class are meant to be created using :func:~`solvers.inverse`.
+    The .dot (and also the .solve) function are based on the s-step
+    conjugate gradient method [1], which is mathematically equivalent to s
+    iterations of the (preconditioned) conjugate gradient method. Each outer
+    iteration builds a basis Z of the Krylov space of dimension s of the
+    preconditioned operator with s matrix-vector products, and computes all
+    the inner products that it needs with a single block reduction. The
+    search directions P are made A-conjugate to the previous block by
+
+        P = Z + P_old B,    B = -(P_old^H A P_old)^{-1} (A P_old)^H Z,
+
+    and the solution is updated with x += P a, where a solves a small linear
+    system of size s. Hence the number of global synchronizations is divided
+    by s, which pays off when the latency of the reductions dominates.
+
+    The monomial basis [z, M A z, ...] quickly becomes ill-conditioned, hence
+    Newton or Chebyshev polynomials are used instead [2]. Their shifts are
+    estimates of the eigenvalues of the preconditioned operator M A: if they
+    are not given, the first solve starts with s standard iterations of PCG,
+    and the Ritz values are computed from the resulting Lanczos matrix. These
+    estimates are reused by the following solves.
+
+    Parameters
+    ----------
+    A : psydac.linalg.basic.LinearOperator
+        Left-hand-side matrix A of the linear system. This should be hermitian
+        and positive definite.
+
+    pc: psydac.linalg.basic.LinearOperator
+        Preconditioner which should approximate the inverse of A (optional).
+        Like A, the preconditioner should be hermitian and positive definite.
+
+    x0 : psydac.linalg.basic.Vector
+        First guess of solution for iterative solver (optional).
+
+    tol : float
+        Absolute tolerance for L2-norm of residual r = A x - b. (Default: 1e-6)
+
+    maxiter: int
+        Maximum number of iterations. (Default: 1000)
+
+    verbose : bool
+        If True, the L2-norm of the residual r is printed at each outer
+        iteration. (Default: False)
+
+    recycle : bool
+        If True, a copy of the output is stored in x0 to speed up consecutive
+        calculations of slightly altered linear systems. (Default: False)
+
+    s : int
+        Number of iterations per outer iteration, i.e. dimension of the
+        Krylov basis built between two reductions. (Default: 4)
+
+    basis : str
+        Polynomial basis of the Krylov space: 'monomial', 'newton' or
+        'chebyshev'. (Default: 'newton')
+
+    shifts : array_like
+        Estimates of the eigenvalues of the preconditioned operator, used as
+        shifts of the Newton basis or to define the interval of the Chebyshev
+        basis (optional).
+
+    Notes
+    -----
+    The residual is updated by a recurrence relation. When it satisfies the
+    stopping criterion it is replaced by the true residual b - A x, and the
+    solver stops only if the true residual satisfies the criterion. The
+    iterations are counted by blocks of s.
+
+    References
+    ----------
+    [1] A.T. Chronopoulos and C.W. Gear, s-step iterative methods for
+        symmetric linear systems, J. Comput. Appl. Math. 25 (1989), pp. 153-168.
+
+    [2] E. Carson, Communication-avoiding Krylov subspace methods in theory
+        and practice, PhD thesis, UC Berkeley (2015).
+
+    """
+    def __init__(self, A, *, pc=None, x0=None, tol=1e-6, maxiter=1000, verbose=False, recycle=False,
+                 s=4, basis='newton', shifts=None):
+
+        assert isinstance(s, int) and s >= 1
+        if basis not in ('monomial', 'newton', 'chebyshev'):
+            raise ValueError(f"Krylov basis '{basis}' not understood.")
+
+        self._options = {"x0":x0, "pc":pc, "tol":tol, "maxiter":maxiter, "verbose":verbose, "recycle":recycle,
+                         "s":s, "basis":basis, "shifts":shifts}
+
+        super().__init__(A, **self._options)
+
+        if pc is not None:
+            assert isinstance(pc, LinearOperator)
+
+        V = self.domain
+        self._tmps = {key: V.zeros() for key in ("r", "w") + (() if pc is None else ("z",))}
+        self._Z  = [V.zeros() for _ in range(s)]
+        self._AZ = [V.zeros() for _ in range(s)]
+        self._P  = [V.zeros() for _ in range(s)]
+        self._AP = [V.zeros() for _ in range(s)]
+
+        # Eigenvalue estimates of the preconditioned operator
+        self._ritz = None
+        self._info = None
+
+    def solve(self, b, out=None):
+        """
+        Communication-avoiding conjugate gradient algorithm for solving linear system Ax=b.
+        Only working if A is an hermitian and positive-definite linear operator.
+        Info can be accessed using get_info(), see :func:~`basic.InverseLinearOperator.get_info`.
+
+        Parameters
+        ----------
+        b : psydac.linalg.basic.Vector
+            Right-hand-side vector of linear system.
+
+        out : psydac.linalg.basic.Vector | NoneType
+            The output vector, or None (optional).
+
+        Returns
+        -------
+        x : psydac.linalg.basic.Vector
+            Numerical solution of the linear system. To check the convergence of the solver,
+            use the method InverseLinearOperator.get_info().
+
+        """
+
+        A = self._A
+        domain = self._domain
+        codomain = self._codomain
+        options = self._options
+        x0 = options["x0"]
+        pc = options["pc"]
+        tol = options["tol"]
+        maxiter = options["maxiter"]
+        verbose = options["verbose"]
+        recycle = options["recycle"]
+        s = options["s"]
+
+        assert isinstance(b, Vector)
+        assert b.space is domain
+
+        # First guess of solution
+        if out is not None:
+            assert isinstance(out, Vector)
+            assert out.space is codomain
+
+        x = x0.copy(out=out)
+
+        # Extract local storage. Without preconditioner z = r
+        r = self._tmps["r"]
+        w = self._tmps["w"]
+        z = r if pc is None else self._tmps["z"]
+        Z, AZ, P, AP = self._Z, self._AZ, self._P, self._AP
+
+        tol_sqr = tol**2
+
+        # First values
+        A.dot(x, out=w)
+        b.copy(out=r)
+        r -= w
+        if pc is not None:
+            pc.dot(r, out=z)
+
+        if verbose:
+            print( "CA-CG solver:" )
+            print( "+---------+---------------------+")
+            print( "+ Iter. # | L2-norm of residual |")
+            print( "+---------+---------------------+")
+            template = "| {:7d} | {:19.2e} |"
+
+        # Estimate the spectrum of the preconditioned operator with standard PCG iterations
+        k = 0
+        if options["shifts"] is not None:
+            theta = np.asarray(options["shifts"])
+        elif self._ritz is not None:
+            theta = self._ritz
+        else:
+            theta, k = self._estimate_spectrum(x, r, z, P[0], AP[0], min(s, maxiter))
+            self._ritz = theta
+
+        real = domain.dtype != complex
+        T = _basis_matrix(s, options["basis"], _leja_order(theta, real), real)
+
+        # Iterate to convergence
+        restart = True
+        replaced = False
+        while True:
+
+            # Krylov basis Z of the preconditioned operator, and A Z
+            z.copy(out=Z[0])
+            for j in range(s):
+                A.dot(Z[j], out=AZ[j])
+                if j < s - 1:
+                    _basis_step(T, j, Z, AZ[j] if pc is None else pc.dot(AZ[j], out=w), out=Z[j+1])
+
+            # Single reduction of all the inner products of the outer iteration
+            pairs = [(Z, AZ), (Z, [r]), ([r], [r])] + ([] if restart else [(AP, Z)])
+            G = _block_dots(pairs, domain)
+            ZAZ, Zr, nrmr_sqr = G[0], G[1][:, 0], G[2][0, 0].real
+
+            if verbose:
+                print(template.format(k, sqrt(nrmr_sqr)))
+
+            if nrmr_sqr < tol_sqr and (replaced or k >= maxiter):
+                break
+
+            if nrmr_sqr < tol_sqr:
+                # Replace the recursive residual by the true one, and restart
+                A.dot(x, out=w)
+                b.copy(out=r)
+                r -= w
+                if pc is not None:
+                    pc.dot(r, out=z)
+                restart = True
+                replaced = True
+                continue
+
+            if k >= maxiter:
+                break
+
+            # Search directions P = Z + P_old B, A-conjugate to P_old
+            if restart:
+                W = ZAZ
+            else:
+                APZ = G[3]
+                B = -np.linalg.lstsq(W_old, APZ, rcond=None)[0]
+                W = ZAZ + APZ.conj().T @ B
+                for i in range(s):
+                    for j in range(s):
+                        Z [i].mul_iadd(B[j, i], P [j])
+                        AZ[i].mul_iadd(B[j, i], AP[j])
+
+            a = np.linalg.lstsq(W, Zr, rcond=None)[0]
+            for i in range(s):
+                x.mul_iadd( a[i], Z [i])
+                r.mul_iadd(-a[i], AZ[i])
+            if pc is not None:
+                pc.dot(r, out=z)
+
+            P, Z = Z, P
+            AP, AZ = AZ, AP
+            W_old = W
+            restart = False
+            replaced = False
+            k += s
+
+        self._Z, self._AZ, self._P, self._AP = Z, AZ, P, AP
+
+        if verbose:
+            print( "+---------+---------------------+")
+
+        # Convergence information
+        self._info = {'niter': k, 'success': nrmr_sqr < tol_sqr, 'res_norm': sqrt(nrmr_sqr) }
+
+        if recycle:
+            x.copy(out=self._options["x0"])
+
+        return x
+
+    def _estimate_spectrum(self, x, r, z, p, q, m):
+        """
+        Perform m iterations of PCG (updating x, r and z in place), and
+        return the eigenvalues of the corresponding Lanczos matrix together
+        with the number of iterations performed.
+        """
+        A  = self._A
+        pc = self._options["pc"]
+
+        alphas = []
+        betas  = []
+        z.copy(out=p)
+        rz = r.dot(z).real
+        for k in range(m):
+            if rz == 0:
+                break
+            A.dot(p, out=q)
+            alpha = rz / p.dot(q).real
+            x.mul_iadd( alpha, p)
+            r.mul_iadd(-alpha, q)
+            if pc is not None:
+                pc.dot(r, out=z)
+            rz_new = r.dot(z).real
+            beta = rz_new / rz
+            p.xpay(beta, z) # this is p = z + beta*p
+            alphas.append(alpha)
+            betas .append(beta)
+            rz = rz_new
+
+        return np.linalg.eigvalsh(_lanczos_matrix(alphas, betas)), len(alphas)
+
+    def dot(self, b, out=None):
+        return self.solve(b, out=out)
+
+#===============================================================================
+class CAGMRES(InverseLinearOperator):
+    """
+    Communication-avoiding (s-step) Generalized Minimal Residual (CA-GMRES).
+
+    A LinearOperator subclass. Objects of this class are meant to be created using :func:~`solvers.inverse`.
+    The .dot (and also the .solve) function are based on the s-step GMRES
+    algorithm [1], with optional right preconditioning. Instead of one
+    Arnoldi step per iteration, which needs one reduction per vector of the
+    basis, each outer iteration builds s new vectors of the Krylov space with
+    s matrix-vector products, and orthonormalizes them against the previous
+    ones (block classical Gram-Schmidt) and among themselves (Cholesky QR)
+    with a single block reduction. The Hessenberg matrix of the Arnoldi
+    relation is then recovered from the change-of-basis matrix of the block.
+
+    The monomial basis quickly becomes ill-conditioned, hence Newton or
+    Chebyshev polynomials are used instead. Their shifts are estimates of the
+    eigenvalues of the (preconditioned) operator: if they are not given, the
+    first solve starts with s standard Arnoldi iterations, whose Ritz values
+    are used for this solve and the following ones.
+
+    Parameters
+    ----------
+    A : psydac.linalg.basic.LinearOperator
+        Left-hand-side matrix A of linear system; individual entries A[i,j]
+        can't be accessed, but A has 'shape' attribute and provides 'dot(p)'
+        function (i.e. matrix-vector product A*p).
+
+    pc: psydac.linalg.basic.LinearOperator
+        Right preconditioner which should approximate the inverse of A (optional).
+
+    x0 : psydac.linalg.basic.Vector
+        First guess of solution for iterative solver (optional).
+
+    tol : float
+        Absolute tolerance for L2-norm of residual r = A*x - b. (Default: 1e-6)
+
+    maxiter: int
+        Maximum number of iterations. (Default: 100)
+
+    verbose : bool
+        If True, L2-norm of residual r is printed at each outer iteration.
+        (Default: False)
+
+    recycle : bool
+        Stores a copy of the output in x0 to speed up consecutive calculations of slightly altered linear systems
+
+    s : int
+        Number of Krylov vectors built between two reductions. (Default: 4)
+
+    restart : int
+        Maximum dimension of the Krylov space before the method is restarted
+        (default: maxiter, i.e. no restart).
+
+    basis : str
+        Polynomial basis of the Krylov space: 'monomial', 'newton' or
+        'chebyshev'. (Default: 'newton')
+
+    shifts : array_like
+        Estimates of the eigenvalues of the preconditioned operator, used as
+        shifts of the Newton basis or to define the interval of the Chebyshev
+        basis (optional).
+
+    Notes
+    -----
+    Since the new vectors are orthogonalized with a single reduction, the
+    orthogonality of the basis is less accurate than with the modified
+    Gram-Schmidt process of GMRES. If the Cholesky factorization of a block
+    breaks down, only its leading well-conditioned vectors are kept.
+
+    References
+    ----------
+    [1] M. Hoemmen, Communication-avoiding Krylov subspace methods, PhD thesis,
+        UC Berkeley (2010).
+
+    """
+    def __init__(self, A, *, pc=None, x0=None, tol=1e-6, maxiter=100, verbose=False, recycle=False,
+                 s=4, restart=None, basis='newton', shifts=None):
+
+        assert isinstance(s, int) and s >= 1
+        if restart is None:
+            restart = maxiter
+        assert isinstance(restart, int) and restart >= s
+        if basis not in ('monomial', 'newton', 'chebyshev'):
+            raise ValueError(f"Krylov basis '{basis}' not understood.")
+
+        self._options = {"x0":x0, "pc":pc, "tol":tol, "maxiter":maxiter, "verbose":verbose, "recycle":recycle,
+                         "s":s, "restart":restart, "basis":basis, "shifts":shifts}
+
+        super().__init__(A, **self._options)
+
+        if pc is not None:
+            assert isinstance(pc, LinearOperator)
+
+        self._tmps = {key: self.domain.zeros() for key in ("r", "w") + (() if pc is None else ("u",))}
+
+        # Orthonormal basis of the Krylov space (allocated when needed) and Hessenberg matrix
+        self._Q = []
+        self._H = np.zeros((restart + s + 1, restart + s), dtype=A.domain.dtype)
+
+        # Eigenvalue estimates of the preconditioned operator
+        self._ritz = None
+        self._info = None
+
+    def solve(self, b, out=None):
+        """
+        Communication-avoiding GMRES algorithm for solving linear system Ax=b.
+        Info can be accessed using get_info(), see :func:~`basic.InverseLinearOperator.get_info`.
+
+        Parameters
+        ----------
+        b : psydac.linalg.basic.Vector
+            Right-hand-side vector of linear system.
+
+        out : psydac.linalg.basic.Vector | NoneType
+            The output vector, or None (optional).
+
+        Returns
+        -------
+        x : psydac.linalg.basic.Vector
+            Numerical solution of the linear system. To check the convergence of the solver,
+            use the method InverseLinearOperator.get_info().
+
+        """
+
+        A = self._A
+        domain = self._domain
+        codomain = self._codomain
+        options = self._options
+        x0 = options["x0"]
+        pc = options["pc"]
+        tol = options["tol"]
+        maxiter = options["maxiter"]
+        verbose = options["verbose"]
+        recycle = options["recycle"]
+        s = options["s"]
+        restart = options["restart"]
+
+        assert isinstance(b, Vector)
+        assert b.space is domain
+
+        # First guess of solution
+        if out is not None:
+            assert isinstance(out, Vector)
+            assert out.space is codomain
+
+        x = x0.copy(out=out)
+
+        r = self._tmps["r"]
+        w = self._tmps["w"]
+        Q = self._Q
+        H = self._H
+
+        real = domain.dtype != complex
+
+        if verbose:
+            print( "CA-GMRES solver:" )
+            print( "+---------+---------------------+")
+            print( "+ Iter. # | L2-norm of residual |")
+            print( "+---------+---------------------+")
+            template = "| {:7d} | {:19.2e} |"
+
+        k = 0
+        while True:
+
+            # Residual and first vector of the basis
+            A.dot(x, out=w)
+            b.copy(out=r)
+            r -= w
+            am = sqrt(r.dot(r).real)
+
+            if verbose:
+                print(template.format(k, am))
+
+            if am < tol or k >= maxiter:
+                break
+
+            self._get_basis_vector(0)
+            r.copy(out=Q[0])
+            Q[0] *= 1 / am
+            H[:, :] = 0
+            m = 0
+
+            # Eigenvalue estimates from standard Arnoldi iterations
+            if options["shifts"] is not None:
+                theta = np.asarray(options["shifts"])
+            elif self._ritz is not None:
+                theta = self._ritz
+            else:
+                m = self._arnoldi(0, min(s, maxiter - k))
+                theta = np.linalg.eigvals(H[:m, :m])
+                self._ritz = theta
+
+            T = _basis_matrix(s, options["basis"], _leja_order(theta, real), real)
+
+            # Outer iterations of the cycle
+            while True:
+                y, res = self._least_squares(m, am)
+                if m > 0 and verbose:
+                    print(template.format(k + m, res))
+                # Restart when the basis spans the whole space: the residual
+                # estimate is then limited by the loss of orthogonality
+                if res < tol or k + m >= maxiter or m + s > restart or m >= domain.dimension \
+                        or (m > 0 and H[m, m-1] == 0):
+                    break
+                n = self._block(m, min(s, maxiter - k - m), T)
+                if n == 0:
+                    # The block broke down: perform a standard Arnoldi step instead
+                    n = self._arnoldi(m, m + 1) - m
+                m += n
+
+            # Update the solution x += M Q y
+            u = w if pc is None else self._tmps["u"]
+            _linear_combination(Q[:m], y, out=u)
+            if pc is not None:
+                pc.dot(u, out=w)
+            x += w
+            k += m
+
+        if verbose:
+            print( "+---------+---------------------+")
+
+        # Convergence information
+        self._info = {'niter': k, 'success': am < tol, 'res_norm': am }
+
+        if recycle:
+            x.copy(out=self._options["x0"])
+
+        return x
+
+    def _get_basis_vector(self, i):
+        """ Return the i-th vector of the basis, allocating it if needed. """
+        while len(self._Q) <= i:
+            self._Q.append(self.domain.zeros())
+        return self._Q[i]
+
+    def _apply(self, v, out):
+        """ Apply the right-preconditioned operator A M to v. """
+        pc = self._options["pc"]
+        if pc is None:
+            return self._A.dot(v, out=out)
+        u = self._tmps["u"]
+        pc.dot(v, out=u)
+        return self._A.dot(u, out=out)
+
+    def _arnoldi(self, m0, m):
+        """
+        Perform standard Arnoldi iterations with classical Gram-Schmidt and
+        reorthogonalization, to extend the orthonormal basis Q[:m0+1] to
+        Q[:m+1]. Return m, or the dimension of the invariant Krylov space if
+        it is smaller.
+        """
+        Q = self._Q
+        H = self._H
+        for k in range(m0, m):
+            p = self._get_basis_vector(k + 1)
+            self._apply(Q[k], out=p)
+            H[k+1, k] = _cgs2(Q[:k+1], p, H[:, k])
+            if H[k+1, k] == 0:
+                return k + 1
+            p *= 1 / H[k+1, k]
+        return m
+
+    def _block(self, m, n, T):
+        """
+        Extend the orthonormal basis Q[:m+1] with (at most) n new vectors
+        built from Q[m] with the change-of-basis matrix T, using a single
+        block reduction, and compute the new columns of the Hessenberg matrix.
+        Return the number of vectors which were added.
+        """
+        Q = self._Q
+        H = self._H
+
+        # New vectors V = [v_1, ..., v_n], with v_0 = Q[m]
+        w = self._tmps["w"]
+        for j in range(n):
+            self._apply(Q[m + j], out=w)
+            _basis_step(T, j, Q[m:], w, out=self._get_basis_vector(m + j + 1))
+        V = Q[m+1:m+n+1]
+
+        # Block classical Gram-Schmidt and Cholesky QR with one reduction
+        C, G = _block_dots([(Q[:m+1], V), (V, V)], self.domain)
+        nrm_sqr = G.diagonal().real.copy()
+        R, k = _partial_cholesky(G - C.conj().T @ C, 1e-6 * nrm_sqr)
+        for i in range(n):
+            for j in range(m + 1):
+                V[i].mul_iadd(-C[j, i], Q[j])
+
+        # If the new vectors are nearly dependent on the previous ones, the
+        # projection is repeated with a second reduction (reorthogonalization)
+        if k < n:
+            C2, G = _block_dots([(Q[:m+1], V), (V, V)], self.domain)
+            C += C2
+            R, k = _partial_cholesky(G - C2.conj().T @ C2, 1e-14 * nrm_sqr)
+            for i in range(k):
+                for j in range(m + 1):
+                    V[i].mul_iadd(-C2[j, i], Q[j])
+
+        n = k
+        if n == 0:
+            return 0
+        C = C[:, :n]
+
+        for i in range(n):
+            for j in range(i):
+                V[i].mul_iadd(-R[j, i], V[j])
+            V[i] *= 1 / R[i, i]
+
+        # Hessenberg matrix: A [v_0, ..., v_{n-1}] = [Q, V] S T, with [v_0, ..., v_n] = [Q, V] S
+        S = np.zeros((m + n + 1, n + 1), dtype=H.dtype)
+        S[m, 0] = 1
+        S[:m+1, 1:] = C
+        S[m+1:, 1:] = R
+        M = S @ T[:n+1, :n]
+        M[:m+1] -= H[:m+1, :m] @ S[:m, :n]
+        H[:m+n+1, m:m+n] = solve_triangular(S[m:m+n, :n].T, M.T, lower=True).T
+
+        return n
+
+    def _least_squares(self, m, beta):
+        """ Solve the least-squares problem of GMRES, and return its solution and residual norm. """
+        if m == 0:
+            return np.zeros(0), beta
+        H = self._H[:m+1, :m]
+        e = np.zeros(m + 1, dtype=H.dtype)
+        e[0] = beta
+        y = np.linalg.lstsq(H, e, rcond=None)[0]
+        return y, np.linalg.norm(e - H @ y)
+
+    def dot(self, b, out=None):
+        return self.solve(b, out=out)
+
+#===============================================================================
+def estimate_spectral_bounds(A, pc=None, *, x0=None, method='lanczos', maxiter=10, tol=None):
+    """
+    Estimate the extreme eigenvalues of the operator A, or of the
+    preconditioned operator M A if a preconditioner M is given, with a few
+    iterations of the Lanczos method or of the power method.
+
+    With method='lanczos', A must be hermitian and M must be hermitian and
+    positive definite, so that M A is self-adjoint in the inner product
+    defined by M^{-1}. The Lanczos process is carried out through the
+    recurrences of the preconditioned conjugate gradient method, and the
+    bounds are the extreme eigenvalues (Ritz values) of the tridiagonal
+    Lanczos matrix. They lie inside the spectrum of M A and converge quickly
+    to its extreme eigenvalues: lmax is slightly underestimated, and lmin is
+    overestimated.
+
+    With method='power', only the spectral radius of M A is estimated, as the
+    ratio of the norms of two consecutive iterates of the power method. No
+    symmetry is required, but the convergence is slower.
+
+    Parameters
+    ----------
+    A : psydac.linalg.basic.LinearOperator
+        Square linear operator.
+
+    pc : psydac.linalg.basic.LinearOperator
+        Preconditioner M (optional).
+
+    x0 : psydac.linalg.basic.Vector
+        Starting vector (optional). If not given, a random vector is used.
+
+    method : str
+        Either 'lanczos' or 'power'. (Default: 'lanczos')
+
+    maxiter : int
+        Maximum number of iterations, i.e. of products with A. (Default: 10)
+
+    tol : float
+        Relative tolerance (optional): the iterations stop when the relative
+        change of the estimates between two iterations is smaller than tol.
+
+    Returns
+    -------
+    lmin : float | None
+        Estimate of the smallest eigenvalue of M A, or None if
+        method='power'.
+
+    lmax : float
+        Estimate of the largest eigenvalue of M A, or of its spectral radius
+        if method='power'.
+
+    """
+    assert isinstance(A, LinearOperator)
+    assert A.domain == A.codomain
+    assert isinstance(maxiter, int) and maxiter > 0
+    if pc is not None:
+        assert isinstance(pc, LinearOperator)
+    if method not in ('lanczos', 'power'):
+        raise ValueError(f"Estimation method '{method}' not understood.")
+
+    V = A.domain
+    if x0 is None:
+        r = _random_vector(V)
+    else:
+        assert isinstance(x0, Vector)
+        assert x0.space == V
+        r = x0.copy()
+
+    q = V.zeros()
+
+    if method == 'power':
+        nrm = sqrt(r.dot(r).real)
+        if nrm == 0:
+            raise ValueError('The starting vector of the power method must not vanish')
+        lmax = None
+        for k in range(maxiter):
+            r *= 1 / nrm
+            A.dot(r, out=q)
+            if pc is not None:
+                pc.dot(q, out=r)
+            else:
+                q.copy(out=r)
+            nrm = sqrt(r.dot(r).real)
+            lmax_old, lmax = lmax, nrm
+            if nrm == 0:
+                break
+            if tol is not None and lmax_old is not None and abs(lmax - lmax_old) <= tol * lmax:
+                break
+        return None, lmax
+
+    # Lanczos process through the PCG recurrences, with the starting vector
+    # as initial residual (the solution itself is not needed)
+    z = r if pc is None else V.zeros()
+    if pc is not None:
+        pc.dot(r, out=z)
+    p  = z.copy()
+    rz = r.dot(z).real
+
+    alphas = []
+    betas  = []
+    bounds = None
+    for k in range(maxiter):
+        if rz <= 0:
+            break
+        A.dot(p, out=q)
+        pq = p.dot(q).real
+        if pq <= 0:
+            break
+        alpha = rz / pq
+        r.mul_iadd(-alpha, q)
+        if pc is not None:
+            pc.dot(r, out=z)
+        rz_new = r.dot(z).real
+        beta = rz_new / rz
+        p.xpay(beta, z) # this is p = z + beta*p
+        alphas.append(alpha)
+        betas .append(beta)
+        rz = rz_new
+
+        theta = np.linalg.eigvalsh(_lanczos_matrix(alphas, betas))
+        bounds_old, bounds = bounds, (theta[0], theta[-1])
+        if tol is not None and bounds_old is not None and \
+                all(abs(l - l_old) <= tol * abs(l) for l, l_old in zip(bounds, bounds_old)):
+            break
+
+    if bounds is None:
+        raise ValueError('The Lanczos method requires a hermitian positive (semi-)definite operator and a starting vector outside of its kernel')
+
+    return bounds
+
+#===============================================================================
+class Chebyshev(InverseLinearOperator):
+    """
+    Preconditioned Chebyshev semi-iterative method.
+
+    A LinearOperator subclass. Objects of this class are meant to be created using :func:~`solvers.inverse`.
+    The .dot (and also the .solve) function are based on the Chebyshev
+    iteration [1], whose residual polynomial of degree k is the scaled
+    Chebyshev polynomial with the smallest maximum on an interval [a, b]
+    which contains the spectrum of the preconditioned operator M A.
+
+    Unlike Krylov methods the iteration needs no inner products: every step
+    only performs one product with A, one with M and a few vector updates.
+    If tol is None, no norm is computed either and exactly maxiter
+    iterations are performed without any global reduction. This makes the
+    method a reduction-free solver for well-conditioned systems (e.g. mass
+    matrices), and a smoother for multilevel methods when the interval
+    [a, b] only covers the upper part of the spectrum.
+
+    The interval is [a, b] = [lmin, safety * lmax]. The bounds lmin and lmax
+    which are not given are estimated once at construction, with a few steps
+    of the Lanczos method (see :func:~`solvers.estimate_spectral_bounds`).
+    Since the Ritz values lie inside the spectrum, the upper bound is
+    enlarged by the factor safety: eigenvalues larger than b make the
+    iteration diverge, while eigenvalues in (0, a) only slow it down. If
+    eig_ratio is given, the interval is [b / eig_ratio, b] and lmin is not
+    needed.
+
+    Parameters
+    ----------
+    A : psydac.linalg.basic.LinearOperator
+        Left-hand-side matrix A of the linear system. This should be hermitian
+        and positive definite.
+
+    pc: psydac.linalg.basic.LinearOperator
+        Preconditioner which should approximate the inverse of A (optional).
+        Like A, the preconditioner should be hermitian and positive definite.
+
+    x0 : psydac.linalg.basic.Vector
+        First guess of solution for iterative solver (optional).
+
+    tol : float | None
+        Absolute tolerance for L2-norm of residual r = A x - b. If None, the
+        residual norm is never computed and maxiter iterations are performed.
+        (Default: 1e-6)
+
+    maxiter: int
+        Maximum number of iterations. (Default: 1000)
+
+    verbose : bool
+        If True, the L2-norm of the residual r is printed at each iteration.
+        (Default: False)
+
+    recycle : bool
+        If True, a copy of the output is stored in x0 to speed up consecutive
+        calculations of slightly altered linear systems. (Default: False)
+
+    lmin : float
+        Lower bound of the spectrum of M A (optional).
+
+    lmax : float
+        Upper bound of the spectrum of M A (optional).
+
+    eig_ratio : float
+        If given, ratio b / a of the ends of the interval (optional).
+
+    safety : float
+        Factor applied to lmax to obtain the upper end b of the interval.
+        (Default: 1.1)
+
+    estimator_steps : int
+        Number of Lanczos steps used to estimate the missing bounds.
+        (Default: 10)
+
+    References
+    ----------
+    [1] Y. Saad, Iterative methods for sparse linear systems, 2nd edition,
+        SIAM (2003), Section 12.3.
+
+    """
+    def __init__(self, A, *, pc=None, x0=None, tol=1e-6, maxiter=1000, verbose=False, recycle=False,
+                 lmin=None, lmax=None, eig_ratio=None, safety=1.1, estimator_steps=10):
+
+        assert safety >= 1
+        assert eig_ratio is None or eig_ratio > 1
+
+        self._options = {"x0":x0, "pc":pc, "tol":tol, "maxiter":maxiter, "verbose":verbose, "recycle":recycle,
+                         "lmin":lmin, "lmax":lmax, "eig_ratio":eig_ratio, "safety":safety,
+                         "estimator_steps":estimator_steps}
+
+        super().__init__(A, **self._options)
+
+        if pc is not None:
+            assert isinstance(pc, LinearOperator)
+
+        # Estimate the missing bounds, which are stored for the transpose
+        if lmax is None or (lmin is None and eig_ratio is None):
+            lmin_est, lmax_est = estimate_spectral_bounds(A, pc, maxiter=estimator_steps)
+            if lmin is None:
+                self._options["lmin"] = lmin_est
+            if lmax is None:
+                self._options["lmax"] = lmax_est
+
+        b = safety * self._options["lmax"]
+        a = b / eig_ratio if eig_ratio is not None else self._options["lmin"]
+        if not 0 < a < b:
+            raise ValueError(f"The Chebyshev iteration requires an interval 0 < a < b, got [{a}, {b}]")
+        self._interval = (a, b)
+
+        V = self.domain
+        self._tmps = {key: V.zeros() for key in ("r", "d", "w") + (() if pc is None else ("z",))}
+        self._info = None
+
+    def _check_options(self, **kwargs):
+        # A tolerance None disables the computation of the residual norm
+        if kwargs.get('tol', 0) is None:
+            kwargs = {key: value for key, value in kwargs.items() if key != 'tol'}
+        super()._check_options(**kwargs)
+
+    @property
+    def interval(self):
+        """ Interval [a, b] targeted by the Chebyshev polynomials. """
+        return self._interval
+
+    def solve(self, b, out=None):
+        """
+        Chebyshev iteration for solving the linear system Ax=b.
+        Only working if the spectrum of the preconditioned operator is
+        contained in the interval [a, b], with a > 0.
+        Info can be accessed using get_info(), see :func:~`basic.InverseLinearOperator.get_info`.
+
+        Parameters
+        ----------
+        b : psydac.linalg.basic.Vector
+            Right-hand-side vector of linear system.
+
+        out : psydac.linalg.basic.Vector | NoneType
+            The output vector, or None (optional).
+
+        Returns
+        -------
+        x : psydac.linalg.basic.Vector
+            Numerical solution of the linear system. To check the convergence of the solver,
+            use the method InverseLinearOperator.get_info().
+
+        """
+
+        A = self._A
+        domain = self._domain
+        codomain = self._codomain
+        options = self._options
+        x0 = options["x0"]
+        pc = options["pc"]
+        tol = options["tol"]
+        maxiter = options["maxiter"]
+        verbose = options["verbose"]
+        recycle = options["recycle"]
+
+        assert isinstance(b, Vector)
+        assert b.space is domain
+
+        # First guess of solution
+        if out is not None:
+            assert isinstance(out, Vector)
+            assert out.space is codomain
+
+        x = x0.copy(out=out)
+
+        # Extract local storage. Without preconditioner z = r
+        r = self._tmps["r"]
+        d = self._tmps["d"]
+        w = self._tmps["w"]
+        z = r if pc is None else self._tmps["z"]
+
+        # The residual norm is only computed if needed
+        norm = tol is not None or verbose
+        nrmr_sqr = None
+
+        # Center and half-width of the interval
+        lo, hi = self._interval
+        theta = 0.5 * (hi + lo)
+        delta = 0.5 * (hi - lo)
+        sigma = theta / delta
+        rho   = 1 / sigma
+
+        # First values
+        A.dot(x, out=w)
+        b.copy(out=r)
+        r -= w
+        if norm:
+            nrmr_sqr = r.dot(r).real
+        if pc is not None:
+            pc.dot(r, out=z)
+        z.copy(out=d)
+        d *= 1 / theta
+
+        if verbose:
+            print( "Chebyshev solver:" )
+            print( "+---------+---------------------+")
+            print( "+ Iter. # | L2-norm of residual |")
+            print( "+---------+---------------------+")
+            template = "| {:7d} | {:19.2e} |"
+            print( template.format(0, sqrt(nrmr_sqr)))
+
+        # Iterate to convergence
+        for k in range(1, maxiter+1):
+
+            if tol is not None and nrmr_sqr < tol**2:
+                k -= 1
+                break
+
+            x += d
+            A.dot(d, out=w)
+            if norm:
+                # r -= w, and nrmr_sqr = r.dot(r), with a single pass over the data
+                nrmr_sqr = r.mul_iadd_norm_sqr(-1, w)
+            else:
+                r -= w
+
+            if verbose:
+                print( template.format(k, sqrt(nrmr_sqr)))
+
+            if k == maxiter:
+                break
+
+            # d = rho_new * (rho * d + 2/delta * M r)
+            if pc is not None:
+                pc.dot(r, out=z)
+            rho_new = 1 / (2 * sigma - rho)
+            d *= rho_new * rho
+            d.mul_iadd(2 * rho_new / delta, z)
+            rho = rho_new
+
+        if verbose:
+            print( "+---------+---------------------+")
+
+        # Convergence information
+        self._info = {'niter': k,
+                      'success': tol is None or nrmr_sqr < tol**2,
+                      'res_norm': None if nrmr_sqr is None else sqrt(nrmr_sqr)}
+
+        if recycle:
+            x.copy(out=self._options["x0"])
+
+        return x
+
+    def dot(self, b, out=None):
+        return self.solve(b, out=out)
+
+#===============================================================================
+def _linear_combination(vectors, coeffs, out):
+    """ Compute out = sum_i coeffs[i] * vectors[i]. """
+    out *= 0
+    for v, c in zip(vectors, coeffs):
+        out.mul_iadd(c, v)
+    return out
+
+#===============================================================================
+def _orthonormalize(Z, AZ, tol=1e-10):
+    """
+    Orthonormalize the vectors Z with classical Gram-Schmidt and one
+    reorthogonalization (see _cgs2), and apply the same transformation to the
+    vectors AZ = A Z. Nearly dependent vectors are dropped. New vectors are
+    returned, Z and AZ are not modified.
+    """
+    Q  = []
+    AQ = []
+    if not Z:
+        return Q, AQ
+
+    V    = Z[0].space
+    nrm0 = np.sqrt(V.inner_many(Z, Z).real)
+    h    = np.zeros(len(Z), dtype=V.dtype)
+    for z, az, n0 in zip(Z, AZ, nrm0):
+        q  = z.copy()
+        aq = az.copy()
+        nrm = _cgs2(Q, q, h)
+        for hi, aqi in zip(h, AQ):
+            aq.mul_iadd(-hi, aqi)
+        if nrm > tol * n0:
+            q  *= 1 / nrm
+            aq *= 1 / nrm
+            Q .append(q)
+            AQ.append(aq)
+    return Q, AQ
+
+#===============================================================================
+class DeflatedConjugateGradient(InverseLinearOperator):
+    """
+    Deflated (preconditioned) Conjugate Gradient with subspace recycling.
+
+    A LinearOperator subclass. Objects of this class are meant to be created using :func:~`solvers.inverse`.
+    The .dot (and also the .solve) function are based on the deflated
+    conjugate gradient method [1], which solves the linear system A x = b,
+    where A is a Hermitian and positive-definite matrix, in the A-orthogonal
+    complement of a small deflation subspace W.
+
+    The deflation subspace is recycled between consecutive calls to solve:
+    at the end of each solve, it is replaced by the Ritz vectors associated
+    with the smallest Ritz values of A in the space spanned by W and by the
+    search directions of the current solve. In the spirit of eigCG [2], the
+    search directions are stored in a window of `nstore` vectors, which is
+    compressed to `nrecycle` Ritz vectors whenever it is full. Over a sequence of
+    solves with the same operator, W converges towards the eigenvectors
+    associated with the smallest eigenvalues of A, and the number of
+    iterations decreases. If the operator A is modified, the recycled space
+    should be discarded with `clear_recycled_space`.
+
+    Parameters
+    ----------
+    A : psydac.linalg.basic.LinearOperator
+        Left-hand-side matrix A of the linear system. This should be Hermitian
+        and positive definite.
+
+    pc: psydac.linalg.basic.LinearOperator
+        Preconditioner which should approximate the inverse of A (optional).
+        Like A, the preconditioner should be Hermitian and positive definite.
+
+    x0 : psydac.linalg.basic.Vector
+        First guess of solution for iterative solver (optional).
+
+    tol : float
+        Absolute tolerance for L2-norm of residual r = A x - b. (Default: 1e-6)
+
+    maxiter: int
+        Maximum number of iterations. (Default: 1000)
+
+    verbose : bool
+        If True, the L2-norm of the residual r is printed at each iteration.
+        (Default: False)
+
+    recycle : bool
+        If True, a copy of the output is stored in x0 to speed up consecutive
+        calculations of slightly altered linear systems. (Default: False)
+
+    nrecycle : int
+        Dimension of the recycled deflation subspace. (Default: 8)
+
+    nstore : int
+        Number of search directions which are stored before being compressed
+        into Ritz vectors. (Default: 2 * nrecycle)
+
+    References
+    ----------
+    [1] Y. Saad, M. Yeung, J. Erhel and F. Guyomarc'h, "A deflated version of
+        the conjugate gradient algorithm", SIAM J. Sci. Comput., 21:1909–1926, 2000.
+
+    [2] A. Stathopoulos and K. Orginos, "Computing and deflating eigenvalues
+        while solving multiple right-hand side linear systems", SIAM J. Sci.
+        Comput., 32:439–462, 2010.
+
+    """
+    def __init__(self, A, *, pc=None, x0=None, tol=1e-6, maxiter=1000, verbose=False, recycle=False,
+                 nrecycle=8, nstore=None):
+
+        if nstore is None:
+            nstore = 2 * nrecycle
+
+        assert isinstance(nrecycle, int) and nrecycle >= 0
+        assert isinstance(nstore, int) and nstore >= 0
+
+        self._options = {"x0":x0, "pc":pc, "tol":tol, "maxiter":maxiter, "verbose":verbose, "recycle":recycle,
+                         "nrecycle":nrecycle, "nstore":nstore}
+
+        super().__init__(A, **self._options)
+
+        if pc is None:
+            self._options['pc'] = IdentityOperator(self.domain)
+        else:
+            assert isinstance(pc, LinearOperator)
+
+        self._tmps = {key: self.domain.zeros() for key in ("v", "r", "p", "z")}
+        self._info = None
+
+        # Deflation subspace W, its image A W, and the matrix E = W^H A W
+        self._W  = []
+        self._AW = []
+        self._E  = None
+
+        # Storage of the search directions p and of A p
+        self._P  = []
+        self._AP = []
+
+    @property
+    def recycled_space(self):
+        """ Basis of the current deflation subspace. """
+        return tuple(self._W)
+
+    def clear_recycled_space(self):
+        """ Discard the deflation subspace, e.g. if the operator A was modified. """
+        self._W  = []
+        self._AW = []
+        self._E  = None
+
+    def _deflation_coefficients(self, V, z):
+        """ Solve E mu = V^H z, where V is either W or A W. """
+        return np.linalg.solve(self._E, self.domain.dot_many(V, z))
+
+    def _rayleigh_ritz(self, Z, AZ):
+        """
+        Rayleigh-Ritz procedure for A in span(Z): return the Ritz vectors
+        associated with the `nrecycle` smallest Ritz values, and their images.
+        """
+        Q, AQ = _orthonormalize(Z, AZ)
+        if len(Q) == 0:
+            return [], []
+
+        G = _block_dots([(Q, AQ)], self.domain)[0]
+        G = 0.5 * (G + G.conj().T)
+
+        _, Y = np.linalg.eigh(G)
+        k = min(self._options["nrecycle"], len(Q))
+
+        W  = [_linear_combination(Q , Y[:, i], self.codomain.zeros()) for i in range(k)]
+        AW = [_linear_combination(AQ, Y[:, i], self.domain.zeros())   for i in range(k)]
+
+        return W, AW
+
+    def solve(self, b, out=None):
+        """
+        Deflated preconditioned conjugate gradient algorithm for solving the
+        Hermitian positive-definite linear system Ax=b, with the deflation
+        subspace recycled from the previous calls.
+        Info can be accessed using get_info(), see :func:~`basic.InverseLinearOperator.get_info`.
+
+        Parameters
+        ----------
+        b : psydac.linalg.basic.Vector
+            Right-hand-side vector of linear system.
+
+        out : psydac.linalg.basic.Vector | NoneType
+            The output vector, or None (optional).
+
+        Returns
+        -------
+        x : psydac.linalg.basic.Vector
+            Numerical solution of the linear system. To check the convergence of the solver,
+            use the method InverseLinearOperator.get_info().
+
+        """
+        A = self._A
+        domain = self._domain
+        codomain = self._codomain
+        options = self._options
+        x0 = options["x0"]
+        pc = options["pc"]
+        tol = options["tol"]
+        maxiter = options["maxiter"]
+        verbose = options["verbose"]
+        recycle = options["recycle"]
+        nrecycle = options["nrecycle"]
+        nstore = options["nstore"] if nrecycle > 0 else 0
+
+        assert isinstance(b, Vector)
+        assert b.space is domain
+
+        # First guess of solution
+        if out is not None:
+            assert isinstance(out, Vector)
+            assert out.space is codomain
+
+        x = x0.copy(out=out)
+
+        # Extract local storage
+        v = self._tmps["v"]
+        r = self._tmps["r"]
+        p = self._tmps["p"]
+        z = self._tmps["z"]
+        W, AW = self._W, self._AW
+
+        # First values
+        A.dot(x, out=v)
+        b.copy(out=r)
+        r -= v
+
+        # Initial guess such that the residual is orthogonal to W
+        if W:
+            mu = self._deflation_coefficients(W, r)
+            for mi, wi, awi in zip(mu, W, AW):
+                x.mul_iadd( mi, wi)
+                r.mul_iadd(-mi, awi)
+
+        nrmr_sqr = r.dot(r).real
+        pc.dot(r, out=z)
+        am = z.dot(r)
+        z.copy(out=p)
+        if W:
+            mu = self._deflation_coefficients(AW, z)
+            for mi, wi in zip(mu, W):
+                p.mul_iadd(-mi, wi)
+
+        tol_sqr = tol**2
+
+        if verbose:
+            print( "Deflated CG solver:" )
+            print( "+---------+---------------------+")
+            print( "+ Iter. # | L2-norm of residual |")
+            print( "+---------+---------------------+")
+            template = "| {:7d} | {:19.2e} |"
+            print(template.format(1, sqrt(nrmr_sqr)))
+
+        # Ritz vectors of A computed during this solve, starting from W
+        Wr, AWr = W, AW
+
+        # Iterate to convergence
+        nstored = 0
+        for k in range(1, maxiter+1):
+
+            if nrmr_sqr < tol_sqr:
+                k -= 1
+                break
+
+            A.dot(p, out=v)
+
+            # Store the search directions for the update of W, and compress
+            # them into Ritz vectors when the storage is full
+            if nstore > 0:
+                if len(self._P) <= nstored:
+                    self._P .append(p.copy())
+                    self._AP.append(v.copy())
+                else:
+                    p.copy(out=self._P [nstored])
+                    v.copy(out=self._AP[nstored])
+                nstored += 1
+                if nstored == nstore:
+                    Wr, AWr = self._rayleigh_ritz(Wr + self._P, AWr + self._AP)
+                    nstored = 0
+
+            l = am / v.dot(p)
+            x.mul_iadd(l, p) # this is x += l*p
+            r.mul_iadd(-l, v) # this is r -= l*v
+            pc.dot(r, out=z)
+
+            # Norm of the residual, z^H r and (A W)^H z with a single reduction
+            dots = domain.inner_many([r, z] + AW, [r, r] + [z] * len(AW))
+            nrmr_sqr = dots[0].real
+            am1 = dots[1]
+            p  *= (am1/am)
+            p  += z
+            if W:
+                mu = np.linalg.solve(self._E, dots[2:])
+                for mi, wi in zip(mu, W):
+                    p.mul_iadd(-mi, wi)
+            am  = am1
+
+            if verbose:
+                print(template.format(k+1, sqrt(nrmr_sqr)))
+
+        if verbose:
+            print( "+---------+---------------------+")
+
+        # Convergence information
+        self._info = {'niter': k, 'success': nrmr_sqr < tol_sqr, 'res_norm': sqrt(nrmr_sqr) }
+
+        # Update the deflation subspace
+        if nstore > 0 and k > 0:
+            Wr, AWr = self._rayleigh_ritz(Wr + self._P[:nstored], AWr + self._AP[:nstored])
+            self._W  = Wr
+            self._AW = AWr
+            self._E  = _block_dots([(Wr, AWr)], domain)[0]
+
+        if recycle:
+            x.copy(out=self._options["x0"])
+
+        return x
+
+    def dot(self, b, out=None):
+        return self.solve(b, out=out)
+
+#===============================================================================
+class GCRODR(InverseLinearOperator):
+    """
+    Generalized Conjugate Residual with inner Orthogonalization and Deflated
+    Restarting (GCRO-DR).
+
+    A LinearOperator subclass. Objects of this class are meant to be created using :func:~`solvers.inverse`.
+    The .dot (and also the .solve) function are based on the GCRO-DR method [1]
+    for solving the linear system A x = b with a general square matrix A.
+
+    This is a restarted GMRES method which keeps a recycled subspace U of
+    dimension `nrecycle`, together with C = A U where the columns of C are
+    orthonormal. Each cycle minimizes the residual over U plus a Krylov
+    subspace of (I - C C^H) A. At the end of each cycle the recycled
+    subspace is replaced by the harmonic Ritz vectors of A associated with
+    the harmonic Ritz values of smallest magnitude, and it is kept between
+    consecutive calls to solve. If the operator A is modified, the recycled
+    space should be discarded with `clear_recycled_space`.
+
+    Parameters
+    ----------
+    A : psydac.linalg.basic.LinearOperator
+        Left-hand-side matrix A of linear system; individual entries A[i,j]
+        can't be accessed, but A has 'shape' attribute and provides 'dot(p)'
+        function (i.e. matrix-vector product A*p).
+
+    x0 : psydac.linalg.basic.Vector
+        First guess of solution for iterative solver (optional).
+
+    tol : float
+        Absolute tolerance for L2-norm of residual r = A*x - b.
+
+    maxiter: int
+        Maximum number of iterations (over all cycles).
+
+    verbose : bool
+        If True, L2-norm of residual r is printed at each cycle.
+
+    recycle : bool
+        Stores a copy of the output in x0 to speed up consecutive calculations of slightly altered linear systems
+
+    restart : int
+        Dimension of the search space of each cycle, including the recycled
+        subspace. (Default: 30)
+
+    nrecycle : int
+        Dimension of the recycled subspace, smaller than `restart`. (Default: 10)
+
+    References
+    ----------
+    [1] M.L. Parks, E. de Sturler, G. Mackey, D.D. Johnson and S. Maiti,
+        "Recycling Krylov subspaces for sequences of linear systems",
+        SIAM J. Sci. Comput., 28:1651–1674, 2006.
+
+    """
+    def __init__(self, A, *, x0=None, tol=1e-6, maxiter=100, verbose=False, recycle=False,
+                 restart=30, nrecycle=10):
+
+        assert isinstance(restart, int)
+        assert isinstance(nrecycle, int)
+        assert 0 <= nrecycle < restart
+
+        self._options = {"x0":x0, "tol":tol, "maxiter":maxiter, "verbose":verbose, "recycle":recycle,
+                         "restart":restart, "nrecycle":nrecycle}
+
+        super().__init__(A, **self._options)
+
+        self._tmps = {key: self.domain.zeros() for key in ("r", "w")}
+        self._info = None
+
+        # Recycled subspace U, and orthonormal basis C = A U of its image
+        self._U = []
+        self._C = []
+
+        # Arnoldi basis
+        self._V = []
+
+    @property
+    def recycled_space(self):
+        """ Basis of the current recycled subspace. """
+        return tuple(self._U)
+
+    def clear_recycled_space(self):
+        """ Discard the recycled subspace, e.g. if the operator A was modified. """
+        self._U = []
+        self._C = []
+
+    def _update_recycled_space(self, Hbar, B, nv):
+        """
+        Replace the recycled subspace by harmonic Ritz vectors of A in
+        span(U, V_0, ..., V_{m-1}), with m = Hbar.shape[1] Arnoldi vectors.
+        Here nv is the number of available Arnoldi vectors (m+1, or m after a
+        breakdown) and (I - C C^H) A V_m = V_nv Hbar.
+        """
+        U, C, V = self._U, self._C, self._V
+        k = len(U)
+        m = Hbar.shape[1]
+        dtype = self._A.domain.dtype
+
+        # A [U, V_m] = [C, V_nv] G
+        G = np.zeros((k + nv, k + m), dtype=dtype)
+        G[:k, :k] = np.eye(k)
+        G[:k, k:] = B
+        G[k:, k:] = Hbar[:nv]
+
+        # [C, V_nv]^H [U, V_m]
+        WZ = np.zeros((k + nv, k + m), dtype=dtype)
+        WZ[:k, :k], WZ[k:, :k] = _block_dots([(C, U), (V[:nv], U)], self.domain)
+        WZ[k:, k:] = np.eye(nv, m)
+
+        # Harmonic Ritz vectors: G^H G y = theta G^H WZ y, smallest |theta| first
+        GH = G.conj().T
+        theta, Y = eig(GH @ G, GH @ WZ)
+        order = [i for i in np.argsort(abs(theta)) if np.isfinite(theta[i])]
+        nrec = min(self._options["nrecycle"], k + m)
+
+        columns = []
+        for i in order:
+            y = Y[:, i]
+            if np.isrealobj(G):
+                # For real matrices, use the real and imaginary parts of one
+                # eigenvector in each complex conjugate pair
+                if theta[i].imag < 0:
+                    continue
+                columns.append(y.real)
+                if np.any(abs(y.imag) > 1e-14 * abs(y).max()):
+                    columns.append(y.imag)
+            else:
+                columns.append(y)
+            if len(columns) >= nrec:
+                break
+        if not columns:
+            return
+        P = np.array(columns[:nrec]).T
+
+        # Orthonormalize the image of the new basis, and drop dependent vectors
+        Qg, R = np.linalg.qr(G @ P)
+        keep = abs(np.diag(R)) > 1e-12 * abs(np.diag(R)).max()
+        if not all(keep):
+            P = P[:, keep]
+            Qg, R = np.linalg.qr(G @ P)
+
+        Pu = solve_triangular(R.T, P.T, lower=True).T # this is P R^{-1}
+
+        Z = U + V[:m]
+        W = C + V[:nv]
+        self._U = [_linear_combination(Z, Pu[:, i], self.codomain.zeros()) for i in range(Pu.shape[1])]
+        self._C = [_linear_combination(W, Qg[:, i], self.domain.zeros())   for i in range(Qg.shape[1])]
+
+    def solve(self, b, out=None):
+        """
+        GCRO-DR algorithm for solving linear system Ax=b, with the recycled
+        subspace inherited from the previous calls.
+        Info can be accessed using get_info(), see :func:~`basic.InverseLinearOperator.get_info`.
+
+        Parameters
+        ----------
+        b : psydac.linalg.basic.Vector
+            Right-hand-side vector of linear system Ax = b.
+
+        out : psydac.linalg.basic.Vector | NoneType
+            The output vector, or None (optional).
+
+        Returns
+        -------
+        x : psydac.linalg.basic.Vector
+            Numerical solution of the linear system. To check the convergence of the solver,
+            use the method InverseLinearOperator.get_info().
+
+        """
+        A = self._A
+        domain = self._domain
+        codomain = self._codomain
+        options = self._options
+        x0 = options["x0"]
+        tol = options["tol"]
+        maxiter = options["maxiter"]
+        verbose = options["verbose"]
+        recycle = options["recycle"]
+        restart = options["restart"]
+        dtype = A.domain.dtype
+
+        assert isinstance(b, Vector)
+        assert b.space is domain
+
+        # First guess of solution
+        if out is not None:
+            assert isinstance(out, Vector)
+            assert out.space is codomain
+
+        x = x0.copy(out=out)
+
+        # Extract local storage
+        r = self._tmps["r"]
+        w = self._tmps["w"]
+        V = self._V
+        while len(V) < restart + 1:
+            V.append(self.domain.zeros())
+
+        # First values
+        A.dot(x, out=r)
+        r *= -1
+        r += b
+        am = sqrt(r.dot(r).real)
+
+        if verbose:
+            print( "GCRO-DR solver:" )
+            print( "+---------+---------------------+")
+            print( "+ Iter. # | L2-norm of residual |")
+            print( "+---------+---------------------+")
+            template = "| {:7d} | {:19.2e} |"
+            print( template.format( 0, am ) )
+
+        niter = 0
+        while True:
+            U, C = self._U, self._C
+            k = len(C)
+
+            # Minimize the residual over the recycled subspace: x += U C^H r.
+            # The projection r -= C C^H r is applied twice (CGS2), so that r
+            # is orthogonal to C to working precision, as required by the
+            # classical Gram-Schmidt process in the Arnoldi iterations
+            if k > 0:
+                y  = np.zeros(k, dtype=dtype)
+                am = _cgs2(C, r, y)
+                for yi, ui in zip(y, U):
+                    x.mul_iadd(yi, ui)
+
+            if am < tol or niter >= maxiter:
+                break
+
+            # Arnoldi process for (I - C C^H) A, starting from r which is orthogonal to C
+            m = min(restart - k, maxiter - niter)
+            H = np.zeros((m + 1, m), dtype=dtype)
+            B = np.zeros((k, m), dtype=dtype)
+            g = np.zeros(m + 1, dtype=dtype)
+            g[0] = am
+            r.copy(out=V[0])
+            V[0] *= 1 / am
+
+            # Projection coefficients on [C, V_0, ..., V_j], which are orthonormal
+            h = np.zeros(k + m, dtype=dtype)
+
+            breakdown = False
+            for j in range(m):
+                A.dot(V[j], out=w)
+
+                # Classical Gram-Schmidt with reorthogonalization
+                H[j+1, j] = _cgs2(C + V[:j+1], w, h)
+                B[:, j]    = h[:k]
+                H[:j+1, j] = h[k:k+j+1]
+                niter += 1
+
+                y = np.linalg.lstsq(H[:j+2, :j+1], g[:j+2], rcond=None)[0]
+                res = np.linalg.norm(g[:j+2] - H[:j+2, :j+1] @ y)
+
+                breakdown = abs(H[j+1, j]) <= 1e-14 * np.linalg.norm(H[:j+2, j])
+                if not breakdown:
+                    w.copy(out=V[j+1])
+                    V[j+1] *= 1 / H[j+1, j]
+
+                if res < tol or breakdown:
+                    break
+
+            m = j + 1
+
+            # Update solution: x += V_m y - U B y
+            for yi, vi in zip(y, V[:m]):
+                x.mul_iadd(yi, vi)
+            for zi, ui in zip(B[:, :m] @ y, U):
+                x.mul_iadd(-zi, ui)
+
+            # Compute the true residual
+            A.dot(x, out=r)
+            r *= -1
+            r += b
+            am = sqrt(r.dot(r).real)
+
+            if verbose:
+                print( template.format( niter, am ) )
+
+            # Update the recycled subspace
+            if options["nrecycle"] > 0:
+                self._update_recycled_space(H[:m+1, :m], B[:, :m], m if breakdown else m + 1)
+
+        if verbose:
+            print( "+---------+---------------------+")
+
+        # Convergence information
+        self._info = {'niter': niter, 'success': am < tol, 'res_norm': am }
+
+        if recycle:
+            x.copy(out=self._options["x0"])
+
+        return x
+
+    def dot(self, b, out=None):
+        return self.solve(b, out=out)
+
+#===============================================================================
+class IterativeRefinement(InverseLinearOperator):
+    """
+    Iterative Refinement (IR) with an inner approximate solver.
+
+    A LinearOperator subclass. Objects of this class are meant to be created using :func:~`solvers.inverse`.
+    The .dot (and also the .solve) function are based on the classical
+    iterative refinement [1] for solving the linear system A x = b: at each
+    iteration the residual r = b - A x is computed with the operator A, the
+    correction equation A d = r is solved approximately by the inner solver,
+    and x is updated with x += d.
+
+    The typical use is mixed precision: A is a float64 operator, and the inner
+    solver is a Krylov method applied to a copy of A whose coefficients are
+    stored in float32 (see StencilMatrix.astype). The inner matrix-vector
+    products hence read half the data, while the outer residual is computed
+    in double precision, and the final accuracy is the one of A as long as the
+    low-precision operator is a good enough approximation of A.
+
+    The right-hand side of each correction equation is normalized, hence the
+    (absolute) tolerance of the inner solver is the relative reduction of the
+    residual required at each outer iteration.
+
+    Parameters
+    ----------
+    A : psydac.linalg.basic.LinearOperator
+        Left-hand-side matrix A of linear system; individual entries A[i,j]
+        can't be accessed, but A has 'shape' attribute and provides 'dot(p)'
+        function (i.e. matrix-vector product A*p).
+
+    inner : psydac.linalg.basic.LinearOperator
+        Approximate inverse of A used for the correction equation, e.g.
+        inverse(A.astype(np.float32), 'cg', tol=1e-4).
+
+    x0 : psydac.linalg.basic.Vector
+        First guess of solution for iterative solver (optional).
+
+    tol : float
+        Absolute tolerance for L2-norm of residual r = A*x - b.
+
+    maxiter: int
+        Maximum number of outer iterations.
+
+    verbose : bool
+        If True, L2-norm of residual r is printed at each outer iteration.
+
+    recycle : bool
+        Stores a copy of the output in x0 to speed up consecutive calculations of slightly altered linear systems
+
+    References
+    ----------
+    [1] N.J. Higham, "Accuracy and Stability of Numerical Algorithms",
+        2nd ed., SIAM, 2002, chapter 12.
+
+    """
+    def __init__(self, A, *, inner, x0=None, tol=1e-6, maxiter=100, verbose=False, recycle=False):
+
+        assert isinstance(inner, LinearOperator)
+        assert inner.domain is A.codomain
+        assert inner.codomain is A.domain
+
+        self._options = {"x0":x0, "inner":inner, "tol":tol, "maxiter":maxiter, "verbose":verbose, "recycle":recycle}
+
+        super().__init__(A, **self._options)
+
+        self._tmps = {key: self.domain.zeros() for key in ("r", "d")}
+        self._info = None
+
+    def transpose(self, conjugate=False):
+        At = self.linop.transpose(conjugate=conjugate)
+        options = self._options.copy()
+        options["inner"] = options["inner"].transpose(conjugate=conjugate)
+        return IterativeRefinement(At, **options)
+
+    def solve(self, b, out=None):
+        """
+        Iterative refinement for solving linear system Ax=b, where the
+        correction equations are solved by the inner solver.
+        Info can be accessed using get_info(), see :func:~`basic.InverseLinearOperator.get_info`.
+        The number of inner iterations summed over all outer iterations is
+        stored under the key 'niter_inner', if the inner solver provides it.
+
+        Parameters
+        ----------
+        b : psydac.linalg.basic.Vector
+            Right-hand-side vector of linear system Ax = b.
+
+        out : psydac.linalg.basic.Vector | NoneType
+            The output vector, or None (optional).
+
+        Returns
+        -------
+        x : psydac.linalg.basic.Vector
+            Numerical solution of the linear system. To check the convergence of the solver,
+            use the method InverseLinearOperator.get_info().
+
+        """
+        A = self._A
+        domain = self._domain
+        codomain = self._codomain
+        options = self._options
+        x0 = options["x0"]
+        inner = options["inner"]
+        tol = options["tol"]
+        maxiter = options["maxiter"]
+        verbose = options["verbose"]
+        recycle = options["recycle"]
+
+        assert isinstance(b, Vector)
+        assert b.space is domain
+
+        # First guess of solution
+        if out is not None:
+            assert isinstance(out, Vector)
+            assert out.space is codomain
+
+        x = x0.copy(out=out)
+
+        # Extract local storage
+        r = self._tmps["r"]
+        d = self._tmps["d"]
+
+        # First residual
+        A.dot(x, out=r)
+        r *= -1
+        r += b
+        am = sqrt(r.dot(r).real)
+
+        if verbose:
+            print( "Iterative refinement:" )
+            print( "+---------+---------------------+")
+            print( "+ Iter. # | L2-norm of residual |")
+            print( "+---------+---------------------+")
+            template = "| {:7d} | {:19.2e} |"
+            print(template.format(0, am))
+
+        niter = 0
+        niter_inner = 0
+        while am >= tol and niter < maxiter:
+            niter += 1
+
+            # Approximate solution of the correction equation A d = r / |r|
+            r *= 1 / am
+            inner.dot(r, out=d)
+            x.mul_iadd(am, d)
+
+            if isinstance(inner, InverseLinearOperator) and inner.get_info():
+                niter_inner += inner.get_info()['niter']
+
+            # Residual in full precision
+            A.dot(x, out=r)
+            r *= -1
+            r += b
+            am = sqrt(r.dot(r).real)
+
+            if verbose:
+                print(template.format(niter, am))
+
+        if verbose:
+            print( "+---------+---------------------+")
+
+        # Convergence information
+        self._info = {'niter': niter, 'success': am < tol, 'res_norm': am, 'niter_inner': niter_inner}
+
+        if recycle:
+            x.copy(out=self._options["x0"])
+
+        return x
+
+    def dot(self, b, out=None):
+        return self.solve(b, out=out)
+
+#===============================================================================
+class LocalBlockPreconditioner(LinearOperator):
+    """
+    Block-Jacobi or restricted additive Schwarz preconditioner, built from
+    the local diagonal blocks of a distributed matrix.
+
+    Each process extracts the block of the matrix which couples the degrees
+    of freedom that it owns, and factorizes it once with a sparse (complete
+    or incomplete) LU decomposition. The application of the preconditioner
+    solves these local problems independently, without any communication.
+    For a symmetric positive definite matrix this block-Jacobi preconditioner
+    is also symmetric positive definite, and hence suited to PConjugateGradient.
+
+    With overlap, the local blocks are extended by a few layers of degrees of
+    freedom of the neighboring processes, whose rows are read in the ghost
+    regions of the matrix. The right-hand side is then read in the ghost
+    regions as well, but only the owned part of the local solutions is kept
+    (restricted additive Schwarz [1]). This preconditioner is not symmetric,
+    and should be used with non-symmetric solvers such as
+    PBiConjugateGradientStabilized.
+
+    Parameters
+    ----------
+    A : psydac.linalg.stencil.StencilMatrix | psydac.linalg.block.BlockLinearOperator
+        Square matrix, whose blocks are stencil matrices (or can be converted
+        with their `tostencil` method) between spaces with shifts equal to 1.
+
+    solver : str
+        Factorization of the local blocks: 'lu' for a complete sparse LU
+        decomposition, 'ilu' for an incomplete one (default: 'lu').
+
+    overlap : int | tuple of int
+        Number of layers of degrees of freedom added to the local blocks on
+        each side of the process boundaries, along each direction. It cannot
+        be larger than the padding of the spaces (default: 0).
+
+    ilu_options : dict
+        Keyword arguments of scipy.sparse.linalg.spilu, e.g. drop_tol and
+        fill_factor (optional, only used with solver='ilu').
+
+    References
+    ----------
+    [1] X.-C. Cai and M. Sarkis, "A restricted additive Schwarz preconditioner
+        for general sparse linear systems", SIAM J. Sci. Comput. 21 (1999).
+
+    """
+    def __init__(self, A, *, solver='lu', overlap=0, ilu_options=None):
+
+        from scipy.sparse          import coo_matrix
+        from scipy.sparse.linalg   import splu, spilu
+        from psydac.linalg.stencil import StencilVectorSpace, StencilMatrix, SymmetricStencilMatrix
+        from psydac.linalg.block   import BlockLinearOperator
+
+        assert isinstance(A, LinearOperator)
+        assert A.domain is A.codomain
+
+        if solver not in ('lu', 'ilu'):
+            raise ValueError("The local solver must be 'lu' or 'ilu', not {!r}.".format(solver))
+
+        V = A.domain
+        if isinstance(A, StencilMatrix):
+            spaces = (V,)
+            blocks = {(0, 0): A}
+        elif isinstance(A, BlockLinearOperator):
+            spaces = V.spaces
+            blocks = {ij: A[ij] for ij in A.nonzero_block_indices}
+        else:
+            raise NotImplementedError("Cannot extract the local blocks of a {}.".format(type(A)))
+
+        if not all(isinstance(Vi, StencilVectorSpace) for Vi in spaces):
+            raise NotImplementedError("The local blocks can only be extracted for stencil vector spaces.")
+        if any(m != 1 for Vi in spaces for m in Vi.shifts):
+            raise NotImplementedError("The local blocks can only be extracted for spaces with shifts equal to 1.")
+
+        ndim    = spaces[0].ndim
+        overlap = tuple(overlap) if np.iterable(overlap) else (overlap,) * ndim
+        if any(o < 0 or o > p for Vi in spaces for o, p in zip(overlap, Vi.pads)):
+            raise ValueError("The overlap {} cannot be larger than the padding of the spaces.".format(overlap))
+
+        # Local box of each space, in the index coordinates of its data array
+        boxes   = [self._local_box(Vi, overlap) for Vi in spaces]
+        sizes   = [int(np.prod([hi - lo for lo, hi in zip(*box)])) for box in boxes]
+        offsets = np.cumsum([0] + sizes)
+
+        rows = []
+        cols = []
+        data = []
+        for (i, j), Mij in blocks.items():
+            if isinstance(Mij, SymmetricStencilMatrix):
+                Mij = Mij.tostencil()
+            elif not isinstance(Mij, StencilMatrix):
+                if not hasattr(Mij, 'tostencil'):
+                    raise NotImplementedError("Cannot extract the local block of a {}.".format(type(Mij)))
+                Mij = Mij.tostencil()
+
+            # The rows in the overlap are stored in the ghost regions
+            if any(overlap):
+                Mij.update_ghost_regions()
+
+            r, c, d = self._local_entries(Mij, boxes[i], boxes[j])
+            rows.append(r + offsets[i])
+            cols.append(c + offsets[j])
+            data.append(d)
+
+        n = offsets[-1]
+        A_loc = coo_matrix((np.concatenate(data), (np.concatenate(rows), np.concatenate(cols))),
+                           shape=(n, n), dtype=V.dtype).tocsc()
+
+        if solver == 'lu':
+            self._factors = splu(A_loc)
+        else:
+            self._factors = spilu(A_loc, **(ilu_options or {}))
+
+        self._A       = A
+        self._single  = isinstance(A, StencilMatrix)
+        self._spaces  = spaces
+        self._boxes   = boxes
+        self._offsets = offsets
+        self._overlap = overlap
+        self._solver  = solver
+        self._trans   = 'N'
+
+    #--------------------------------------
+    # Abstract interface
+    #--------------------------------------
+    @property
+    def domain(self):
+        return self._A.domain
+
+    @property
+    def codomain(self):
+        return self._A.codomain
+
+    @property
+    def dtype(self):
+        return None
+
+    def toarray(self):
+        raise NotImplementedError('toarray() is not defined for LocalBlockPreconditioner.')
+
+    def tosparse(self):
+        raise NotImplementedError('tosparse() is not defined for LocalBlockPreconditioner.')
+
+    def transpose(self, conjugate=False):
+        if any(self._overlap):
+            raise NotImplementedError('The transpose of a restricted additive Schwarz preconditioner is not available.')
+
+        trans = 'H' if conjugate else 'T'
+        if self._trans not in ('N', trans):
+            raise NotImplementedError('Cannot combine a transpose and a Hermitian transpose.')
+
+        # The transpose shares the factorization of the local blocks
+        obj = LocalBlockPreconditioner.__new__(LocalBlockPreconditioner)
+        obj.__dict__.update(self.__dict__)
+        obj._A     = self._A.transpose(conjugate=conjugate)
+        obj._trans = trans if self._trans == 'N' else 'N'
+        return obj
+
+    def dot(self, v, out=None):
+        """
+        Apply the preconditioner to the vector v, i.e. solve the local
+        problems with the owned part of v (and its ghost regions if there is
+        some overlap) as right-hand side.
+        """
+        assert isinstance(v, Vector)
+        assert v.space is self.domain
+        if out is not None:
+            assert isinstance(out, Vector)
+            assert out.space is self.codomain
+            assert out is not v
+        else:
+            out = self.codomain.zeros()
+
+        vs   = (v,)   if self._single else v.blocks
+        outs = (out,) if self._single else out.blocks
+
+        if any(self._overlap):
+            v.update_ghost_regions()
+
+        b = np.concatenate([vi._data[self._box_slices(box)].ravel() for vi, box in zip(vs, self._boxes)])
+        x = self._factors.solve(b, trans=self._trans)
+
+        # Only the owned part of the local solution is kept
+        for xi, (lo, hi), Vi, start, stop in zip(outs, self._boxes, self._spaces, self._offsets[:-1], self._offsets[1:]):
+            local = x[start:stop].reshape([h - l for l, h in zip(lo, hi)])
+            owned = [(gp, gp + e - s + 1) for gp, s, e in zip(Vi.pads, Vi.starts, Vi.ends)]
+            xi._data[...] = 0
+            xi._data[tuple(slice(a, b) for a, b in owned)] = local[tuple(slice(a - l, b - l) for (a, b), l in zip(owned, lo))]
+
+        out.ghost_regions_in_sync = False
+        return out
+
+    #--------------------------------------
+    # Private methods
+    #--------------------------------------
+    @staticmethod
+    def _local_box(V, overlap):
+        """
+        Lower and upper bounds of the local box of the space V in the index
+        coordinates of its data array: the owned degrees of freedom, extended
+        by the overlap on the sides which are shared with other processes.
+        """
+        lo = []
+        hi = []
+        for d in range(V.ndim):
+            s, e, n, gp = V.starts[d], V.ends[d], V.npts[d], V.pads[d]
+            o = overlap[d] if V.parallel and V.cart.nprocs[d] > 1 else 0
+            lo.append(gp - (o if V.periods[d] or s > 0 else 0))
+            hi.append(gp + e - s + 1 + (o if V.periods[d] or e < n - 1 else 0))
+        return tuple(lo), tuple(hi)
+
+    @staticmethod
+    def _box_slices(box):
+        return tuple(slice(l, h) for l, h in zip(*box))
+
+    @staticmethod
+    def _local_entries(M, box_i, box_j):
+        """
+        Entries of the StencilMatrix M whose row and column belong to the
+        local boxes box_i (codomain) and box_j (domain), in COO format with
+        the row-major indices of the boxes.
+        """
+        V   = M.domain
+        W   = M.codomain
+        nd  = M._ndim
+        lo_i, hi_i = box_i
+        lo_j, hi_j = box_j
+
+        data = M._data[LocalBlockPreconditioner._box_slices(box_i)]
+
+        rows  = 0
+        cols  = 0
+        valid = True
+        for d in range(nd):
+            n_i = hi_i[d] - lo_i[d]
+            n_j = hi_j[d] - lo_j[d]
+
+            shape_r = [1] * (2 * nd); shape_r[d] = n_i
+            shape_k = [1] * (2 * nd); shape_k[nd + d] = data.shape[nd + d]
+            r = np.arange(n_i).reshape(shape_r)
+            k = (np.arange(data.shape[nd + d]) - M.pads[d]).reshape(shape_k)
+
+            # Column index in box_j of the entry (r, k)
+            c = r + lo_i[d] - W.pads[d] + V.pads[d] + k - lo_j[d]
+
+            # A direction which is not split between processes is periodic
+            # within the box, otherwise the couplings outside the box are ignored
+            if V.periods[d] and not (V.parallel and V.cart.nprocs[d] > 1):
+                c = c % n_j
+            else:
+                valid = valid & (c >= 0) & (c < n_j)
+
+            rows = rows * n_i + r
+            cols = cols * n_j + c
+
+        mask = np.broadcast_to(valid, data.shape) & (data != 0)
+        rows = np.broadcast_to(rows, data.shape)[mask]
+        cols = np.broadcast_to(cols, data.shape)[mask]
+
+        return rows, cols, data[mask]
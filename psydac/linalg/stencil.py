@@ -8,7 +8,7 @@ import warnings
 import numpy as np
 
 from types        import MappingProxyType
-from scipy.sparse import coo_matrix, diags as sp_diags
+from scipy.sparse import coo_matrix, csr_matrix, issparse, diags as sp_diags
 from mpi4py       import MPI
 
 from psydac.linalg.basic  import VectorSpace, Vector, LinearOperator
@@ -17,9 +17,24 @@ from psydac.ddm.utilities import get_data_exchanger
 from psydac.api.settings  import PSYDAC_BACKENDS
 
 from .kernels.axpy_kernels        import axpy_1d, axpy_2d, axpy_3d
+from .kernels.axpy_kernels        import axpy_1d_omp, axpy_2d_omp, axpy_3d_omp
 from .kernels.inner_kernels       import inner_1d, inner_2d, inner_3d
+from .kernels.inner_kernels       import inner_1d_omp, inner_2d_omp, inner_3d_omp
 from .kernels.matvec_kernels      import matvec_1d, matvec_2d, matvec_3d
+from .kernels.matvec_kernels      import matvec_1d_omp, matvec_2d_omp, matvec_3d_omp
+from .kernels.matvec_kernels      import matvec_1d_multi, matvec_2d_multi, matvec_3d_multi
+from .kernels.matvec_kernels      import matvec_1d_mixed, matvec_2d_mixed, matvec_3d_mixed
+from .kernels.matvec_kernels      import matvec_1d_symmetric, matvec_2d_symmetric, matvec_3d_symmetric
+from .kernels.matmat_kernels      import matmat_1d, matmat_2d, matmat_3d
+from .kernels.ilu_kernels         import ilu0_1d, ilu0_2d, ilu0_3d, ic0_1d, ic0_2d, ic0_3d
+from .kernels.ilu_kernels         import ilu0_solve_1d, ilu0_solve_2d, ilu0_solve_3d
+from .kernels.ilu_kernels         import ilu0_solve_transpose_1d, ilu0_solve_transpose_2d, ilu0_solve_transpose_3d
+from .kernels.krylov_kernels      import axpy_norm_sqr_1d, axpy_norm_sqr_2d, axpy_norm_sqr_3d
+from .kernels.krylov_kernels      import axpy_norm_sqr_1d_omp, axpy_norm_sqr_2d_omp, axpy_norm_sqr_3d_omp
+from .kernels.krylov_kernels      import xpay_1d, xpay_2d, xpay_3d
+from .kernels.krylov_kernels      import xpay_1d_omp, xpay_2d_omp, xpay_3d_omp
 from .kernels.transpose_kernels   import transpose_1d, transpose_2d, transpose_3d
+from .kernels.transpose_kernels   import transpose_1d_omp, transpose_2d_omp, transpose_3d_omp
 from .kernels.transpose_kernels   import interface_transpose_1d, interface_transpose_2d, interface_transpose_3d
 from .kernels.stencil2coo_kernels import stencil2coo_1d_F, stencil2coo_2d_F, stencil2coo_3d_F
 from .kernels.stencil2coo_kernels import stencil2coo_1d_C, stencil2coo_2d_C, stencil2coo_3d_C
@@ -28,17 +43,41 @@ from .kernels.stencil2coo_kernels import stencil2coo_1d_C, stencil2coo_2d_C, ste
 __all__ = (
     'StencilVectorSpace',
     'StencilVector',
+    'StencilMultiVector',
     'StencilMatrix',
+    'SymmetricStencilMatrix',
+    'WideStencilMatrix',
+    'StencilCopyOperator',
+    'StencilILU0',
+    'StencilIC0',
     'StencilInterfaceMatrix'
 )
 
 #===============================================================================
-# Dictionary used to select correct kernel functions based on dimensionality
+# Dictionary used to select correct kernel functions based on dimensionality.
+# The kernels with suffix '_omp' are multi-threaded with OpenMP (if compiled
+# with the '--openmp' flag), and take the number of threads as last argument.
 kernels = {
     'axpy'  : (None,   axpy_1d,   axpy_2d,   axpy_3d),
     'inner' : (None,  inner_1d,  inner_2d,  inner_3d),
     'matvec': (None, matvec_1d, matvec_2d, matvec_3d),
     'transpose': (None, transpose_1d, transpose_2d, transpose_3d),
+    'axpy_omp'  : (None,   axpy_1d_omp,   axpy_2d_omp,   axpy_3d_omp),
+    'inner_omp' : (None,  inner_1d_omp,  inner_2d_omp,  inner_3d_omp),
+    'matvec_omp': (None, matvec_1d_omp, matvec_2d_omp, matvec_3d_omp),
+    'transpose_omp': (None, transpose_1d_omp, transpose_2d_omp, transpose_3d_omp),
+    'matvec_multi' : (None, matvec_1d_multi, matvec_2d_multi, matvec_3d_multi),
+    'matvec_mixed' : (None, matvec_1d_mixed, matvec_2d_mixed, matvec_3d_mixed),
+    'matvec_symmetric': (None, matvec_1d_symmetric, matvec_2d_symmetric, matvec_3d_symmetric),
+    'matmat'          : (None, matmat_1d, matmat_2d, matmat_3d),
+    'ilu0'            : (None, ilu0_1d, ilu0_2d, ilu0_3d),
+    'ic0'             : (None, ic0_1d, ic0_2d, ic0_3d),
+    'ilu0_solve'      : (None, ilu0_solve_1d, ilu0_solve_2d, ilu0_solve_3d),
+    'ilu0_solve_transpose': (None, ilu0_solve_transpose_1d, ilu0_solve_transpose_2d, ilu0_solve_transpose_3d),
+    'axpy_norm_sqr': (None, axpy_norm_sqr_1d, axpy_norm_sqr_2d, axpy_norm_sqr_3d),
+    'xpay'         : (None, xpay_1d, xpay_2d, xpay_3d),
+    'axpy_norm_sqr_omp': (None, axpy_norm_sqr_1d_omp, axpy_norm_sqr_2d_omp, axpy_norm_sqr_3d_omp),
+    'xpay_omp'         : (None, xpay_1d_omp, xpay_2d_omp, xpay_3d_omp),
     'interface_transpose': (None, interface_transpose_1d, interface_transpose_2d, interface_transpose_3d),
     'stencil2coo': {'F': (None, stencil2coo_1d_F, stencil2coo_2d_F, stencil2coo_3d_F),
                     'C': (None, stencil2coo_1d_C, stencil2coo_2d_C, stencil2coo_3d_C)}
@@ -146,29 +185,64 @@ class StencilVectorSpace(VectorSpace):
         self._interfaces_readonly = MappingProxyType(self._interfaces)
 
         # Parallel attributes
+        self._shared_memory = False
+        self._neighborhood  = False
         if cart.is_parallel and not cart.is_comm_null:
             self._mpi_type = find_mpi_type(dtype)
             if isinstance(cart, InterfaceCartDecomposition):
                 # TODO : Check if this line really change the ._shape
                 self._shape = cart.get_interface_communication_infos(cart.axis)['gbuf_recv_shape'][0]
             else:
-                self._synchronizer = get_data_exchanger(cart, dtype , assembly=True, blocking=False)
+                self._shared_memory = cart.comm_shared is not None
+                self._neighborhood  = cart.neighborhood and not self._shared_memory
+                self._synchronizer  = get_data_exchanger(cart, dtype , assembly=True, blocking=False,
+                                                         neighborhood=self._neighborhood,
+                                                         shared_memory=self._shared_memory)
+
+        # Data exchangers for the multi-vectors, stored by number of vectors
+        self._multi_synchronizers = {}
+
+        # Index structures of the sparse matrices with this domain, which only
+        # depend on the codomain, the pads and the ordering (see StencilMatrix)
+        self._sparse_structures = {}
+
+        # Spaces with the same decomposition and wider ghost regions, stored
+        # by padding, and the copies between self and these spaces (see widened)
+        self._widened_spaces = {}
+        self._extensions     = {}
+        self._restrictions   = {}
+
+        # Number of threads used by the multi-threaded kernels
+        self._num_threads  = cart.num_threads
+        self._threads_args = ()
+        threaded = self._num_threads > 1 and self._ndim in [1, 2, 3]
+        if threaded:
+            self._threads_args = (np.int64(self._num_threads),)
 
         # Select kernel for AXPY operation
         if self._ndim in [1, 2, 3]:
-            self._axpy_func = kernels['axpy'][self._ndim]
+            self._axpy_func = kernels['axpy_omp' if threaded else 'axpy'][self._ndim]
         else:
             self._axpy_func = self._axpy_python
             self._axpy_work = self.zeros()  # work array
 
         # Select kernel for inner product
         if self._ndim in [1, 2, 3]:
-            self._inner_func = kernels['inner'][self._ndim]
+            self._inner_func = kernels['inner_omp' if threaded else 'inner'][self._ndim]
         else:
             self._inner_func = self._inner_python
 
+        # Select fused kernels for the Krylov solvers
+        if self._ndim in [1, 2, 3]:
+            self._axpy_norm_sqr_func = kernels['axpy_norm_sqr_omp' if threaded else 'axpy_norm_sqr'][self._ndim]
+            self._xpay_func          = kernels['xpay_omp' if threaded else 'xpay'][self._ndim]
+        else:
+            self._axpy_norm_sqr_func = self._axpy_norm_sqr_python
+            self._xpay_func          = self._xpay_python
+
         # Constant arguments for inner product: total number of ghost cells
-        self._inner_consts = tuple(np.int64(p * s) for p, s in zip(self._pads, self._shifts))
+        # (and number of threads, if the multi-threaded kernel is used)
+        self._inner_consts = tuple(np.int64(p * s) for p, s in zip(self._pads, self._shifts)) + self._threads_args
 
         # TODO [YG, 06.09.2023]: print warning if pure Python functions are used
 
@@ -186,6 +260,26 @@ class StencilVectorSpace(VectorSpace):
         index = tuple(slice(ng, -ng) for ng in nghost)
         return np.vdot(v1[index].flat, v2[index].flat)
 
+    @staticmethod
+    def _axpy_norm_sqr_python(a, x, y, *nghost):
+        y += a * x
+        index = tuple(slice(ng, n - ng) for ng, n in zip(nghost, y.shape))
+        return np.vdot(y[index].flat, y[index].flat).real
+
+    @staticmethod
+    def _xpay_python(a, x, y):
+        y *= a
+        y += x
+
+    def _cast_scalar(self, a):
+        # Cast a scalar coefficient to the type expected by the kernels
+        if self.dtype == complex:
+            return complex(a)
+        elif isinstance(a, complex):
+            raise TypeError('A complex scalar was given in a real case')
+        else:
+            return float(a)
+
     #--------------------------------------
     # Abstract interface
     #--------------------------------------
@@ -237,20 +331,14 @@ class StencilVectorSpace(VectorSpace):
         assert x._space is self
         assert y._space is self
 
-        if self.dtype == complex:
-            a = complex(a)
-        else:
-            if isinstance(a, complex):
-                raise TypeError('A complex scalar was given in a real case')
-            else:
-                a = float(a)
+        a = self._cast_scalar(a)
 
-        self._axpy_func(a, x._data, y._data)
+        self._axpy_func(a, x._data, y._data, *self._threads_args)
 
         for axis, ext in self.interfaces:
-            self._axpy_func(a, x._interface_data[axis, ext], y._interface_data[axis, ext])
+            self._axpy_func(a, x._interface_data[axis, ext], y._interface_data[axis, ext], *self._threads_args)
 
-        x._sync = x._sync and y._sync
+        y._sync = x._sync and y._sync
 
     #--------------------------------------
     # Other properties/methods
@@ -259,6 +347,160 @@ class StencilVectorSpace(VectorSpace):
     def mpi_type(self):
         return self._mpi_type
 
+    # ...
+    @property
+    def reduction_comm(self):
+        """ MPI communicator over which the local inner products are summed. """
+        return self.cart.global_comm if self.parallel else None
+
+    # ...
+    @property
+    def num_threads(self):
+        """ Number of threads used by the linear algebra kernels on one MPI rank. """
+        return self._num_threads
+
+    @property
+    def shared_memory(self):
+        """
+        True if the ghost regions of the vectors are copied directly from the
+        processes on the same node, through MPI-3 shared memory windows which
+        must be released with `free`.
+        """
+        return self._shared_memory
+
+    @property
+    def neighborhood(self):
+        """
+        True if the ghost regions of the vectors are exchanged with all the
+        neighbors at once, by a single neighborhood collective.
+        """
+        return self._neighborhood
+
+    def free(self):
+        """
+        Free the MPI-3 shared memory windows used to update the ghost regions
+        of the vectors, if any. This is a collective operation on the
+        node-local communicator. The vectors of the space can still be used
+        afterwards, in which case new windows are allocated when needed.
+
+        The space can also be used as a context manager, which calls this
+        method on exit.
+        """
+        if self._shared_memory:
+            self._synchronizer.free()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.free()
+
+    # ...
+    def _get_multi_synchronizer(self, nvecs):
+        """
+        Get the data exchanger for the ghost regions of a StencilMultiVector
+        with nvecs vectors: all the vectors are sent in the same message.
+        """
+        if nvecs not in self._multi_synchronizers:
+            self._multi_synchronizers[nvecs] = get_data_exchanger(self.cart, self.dtype,
+                    coeff_shape=(nvecs,), blocking=False, neighborhood=self._neighborhood)
+        return self._multi_synchronizers[nvecs]
+
+    def widened(self, pads):
+        """
+        Get the space with the same decomposition as self, and ghost regions
+        of width max(pads, self.pads), or self if they are not wider.
+
+        Such spaces hold the matrices whose padding is larger than the ghost
+        regions of self (see `WideStencilMatrix`). They are cached, hence all
+        the spaces obtained by widening self, or a space widened from self, to
+        the same ghost regions are the same object. Use `extension` and
+        `restriction` to copy vectors between self and a widened space.
+
+        Parameters
+        ----------
+        pads : tuple of int
+            Minimum width of the ghost regions along each direction.
+
+        Returns
+        -------
+        StencilVectorSpace
+            Space with the wider ghost regions. Only available for spaces with
+            shifts equal to 1 and without interfaces.
+        """
+        pads = tuple(max(int(p), gp) for p, gp in zip(pads, self._pads))
+        if pads == tuple(self._pads):
+            return self
+        if pads in self._widened_spaces:
+            return self._widened_spaces[pads]
+
+        cart = self._cart
+        if isinstance(cart, InterfaceCartDecomposition) or self._interfaces:
+            raise NotImplementedError("The ghost regions of a space with interfaces cannot be widened.")
+        if any(m != 1 for m in self._shifts):
+            raise NotImplementedError("The ghost regions can only be widened for spaces with shifts equal to 1.")
+
+        # The ghost regions are copied from the nearest neighbours only
+        for d, (p, gp, gs, ge) in enumerate(zip(pads, self._pads, cart.global_starts, cart.global_ends)):
+            if p > gp and (len(gs) > 1 or self._periods[d]) and p > min(ge - gs + 1):
+                raise ValueError("The ghost regions of width {} are larger than the local domains along axis {}."
+                                 .format(p, d))
+
+        wide_cart = CartDecomposition(cart.domain_decomposition, cart.npts, cart.global_starts, cart.global_ends,
+                                      pads, cart.shifts)
+        wide_cart._parent_starts = cart.parent_starts
+        wide_cart._parent_ends   = cart.parent_ends
+
+        # All the widened spaces share the same dictionary, hence widening any
+        # of them to a given padding always returns the same space
+        V = StencilVectorSpace(wide_cart, dtype=self._dtype)
+        V._widened_spaces = self._widened_spaces
+        self._widened_spaces[tuple(self._pads)] = self
+        self._widened_spaces[pads] = V
+        return V
+
+    def extension(self, pads):
+        """
+        Get the operator which copies the vectors of self to the widened
+        space `self.widened(pads)`. The operators are cached.
+
+        Parameters
+        ----------
+        pads : tuple of int
+            Minimum width of the ghost regions of the widened space.
+
+        Returns
+        -------
+        StencilCopyOperator
+            Copy of the coefficients owned by each process, from self to the
+            widened space. Its transpose is `self.restriction(pads)`.
+        """
+        W = self.widened(pads)
+        if W not in self._extensions:
+            self._extensions[W] = StencilCopyOperator(self, W)
+        return self._extensions[W]
+
+    def restriction(self, pads):
+        """
+        Get the operator which copies the vectors of the widened space
+        `self.widened(pads)` back to self. The operators are cached.
+
+        Parameters
+        ----------
+        pads : tuple of int
+            Minimum width of the ghost regions of the widened space.
+
+        Returns
+        -------
+        StencilCopyOperator
+            Copy of the coefficients owned by each process, from the widened
+            space to self. Its transpose is `self.extension(pads)`.
+        """
+        W = self.widened(pads)
+        if W not in self._restrictions:
+            self._restrictions[W] = StencilCopyOperator(W, self)
+        return self._restrictions[W]
+
     @property
     def shape(self):
         return self._shape
@@ -393,7 +635,6 @@ class StencilVector(Vector):
         self._space          = V
         self._sizes          = V.shape
         self._ndim           = len(V.npts)
-        self._data           = np.zeros(V.shape, dtype=V.dtype)
         self._dot_send_data  = np.zeros((1,), dtype=V.dtype)
         self._dot_recv_data  = np.zeros((1,), dtype=V.dtype)
         self._interface_data = {}
@@ -404,6 +645,7 @@ class StencilVector(Vector):
             self._interface_data[axis, ext] = np.zeros(V.interfaces[axis, ext].shape, dtype=V.dtype)
 
         #prepare communications
+        self._data = np.zeros(V.shape, dtype=V.dtype)
         if V.cart.is_parallel and not V.cart.is_comm_null and isinstance(V.cart, CartDecomposition):
             self._requests = V._synchronizer.prepare_communications(self._data)
 
@@ -465,6 +707,105 @@ class StencilVector(Vector):
         else:
             return inner_func(*inner_args)
 
+    #...
+    def local_dot(self, v):
+        """
+        Return the contribution of the local process to the inner product
+        between self and v, without global reduction.
+
+        Parameters
+        ----------
+        v : StencilVector
+            Vector of the same space than self needed for the scalar product.
+
+        Returns
+        -------
+        null: self._space.dtype
+            Local contribution to the scalar product of v and self.
+
+        """
+        assert isinstance(v, StencilVector)
+        assert v._space is self._space
+
+        if self._data.shape[0] == 0:
+            return self._space.dtype(0)
+        return self._space._inner_func(self._data, v._data, *self._space._inner_consts)
+
+    #...
+    def mul_iadd_norm_sqr(self, a, v):
+        """
+        Compute self += a * v, and return the squared L2 norm of the result.
+        Both operations are performed with a single pass over the data, and a
+        single global reduction.
+
+        Parameters
+        ----------
+        a : scalar
+            Rescaling coefficient, which can be cast to the correct dtype.
+
+        v : StencilVector
+            Vector of the same space than self.
+
+        Returns
+        -------
+        float
+            Squared L2 norm of self after the update.
+        """
+        res = self.mul_iadd_local_norm_sqr(a, v)
+
+        if self._space.parallel:
+            self._dot_send_data[0] = res
+            self._space.cart.global_comm.Allreduce((self._dot_send_data, self._space.mpi_type),
+                                                   (self._dot_recv_data, self._space.mpi_type),
+                                                   op=MPI.SUM )
+            return self._dot_recv_data[0].real
+        else:
+            return res
+
+    #...
+    def mul_iadd_local_norm_sqr(self, a, v):
+        """
+        Compute self += a * v, and return the contribution of the local
+        process to the squared L2 norm of the result.
+        """
+        assert isinstance(v, StencilVector)
+        assert v._space is self._space
+
+        V = self._space
+        a = V._cast_scalar(a)
+        res = V._axpy_norm_sqr_func(a, v._data, self._data, *V._inner_consts)
+
+        for axis, ext in V.interfaces:
+            V._axpy_func(a, v._interface_data[axis, ext], self._interface_data[axis, ext], *V._threads_args)
+
+        self._sync = self._sync and v._sync
+        return res
+
+    #...
+    def xpay(self, a, v):
+        """
+        Compute self = v + a * self with a single pass over the data.
+
+        Parameters
+        ----------
+        a : scalar
+            Rescaling coefficient of self, which can be cast to the correct dtype.
+
+        v : StencilVector
+            Vector of the same space than self.
+        """
+        assert isinstance(v, StencilVector)
+        assert v._space is self._space
+
+        V = self._space
+        a = V._cast_scalar(a)
+        V._xpay_func(a, v._data, self._data, *V._threads_args)
+
+        for axis, ext in V.interfaces:
+            V._xpay_python(a, v._interface_data[axis, ext], self._interface_data[axis, ext])
+
+        self._sync = self._sync and v._sync
+
     #...
     def conjugate(self, out=None):
         if out is not None:
@@ -731,12 +1072,33 @@ class StencilVector(Vector):
 
         """
 
+        self.start_update_ghost_regions()
+        self.end_update_ghost_regions()
+
+    # ...
+    def start_update_ghost_regions(self):
+        """
+        Start the update of the ghost regions with non-blocking communications.
+        Until end_update_ghost_regions() is called, the entries owned by this
+        process may be read but not modified, and the ghost regions may not be
+        accessed. This allows overlapping the communication with computations
+        on the owned entries (e.g. in StencilMatrix.dot).
+        """
+        if self.space.parallel and not self.space.cart.is_comm_null:
+            # PARALLEL CASE: start receiving ghost regions from neighbors
+            self.space._synchronizer.start_update_ghost_regions(self._data, self._requests)
+
+    # ...
+    def end_update_ghost_regions(self):
+        """
+        Complete the update of the ghost regions started by
+        start_update_ghost_regions().
+        """
         # Update interior ghost regions
         if self.space.parallel:
             if not self.space.cart.is_comm_null:
-                # PARALLEL CASE: fill in ghost regions with data from neighbors
-                self.space._synchronizer.start_update_ghost_regions(self._data, self._requests)
-                self.space._synchronizer.  end_update_ghost_regions(self._data, self._requests)
+                # PARALLEL CASE: wait for the ghost regions from neighbors
+                self.space._synchronizer.end_update_ghost_regions(self._data, self._requests)
         else:
             # SERIAL CASE: fill in ghost regions along periodic directions, otherwise set to zero
             self._update_ghost_regions_serial()
@@ -856,126 +1218,427 @@ class StencilVector(Vector):
         return tuple(index)
 
 #===============================================================================
-class StencilMatrix(LinearOperator):
+class StencilMultiVector:
     """
-    Matrix in n-dimensional stencil format.
+    Block of vectors in n-dimensional stencil format, which belong to the
+    same StencilVectorSpace.
 
-    This is a linear operator that maps elements of stencil vector space V to
-    elements of stencil vector space W.
-
-    For now we only accept V==W.
+    The coefficients of all the vectors are stored in a single array with a
+    trailing batch axis. Hence a StencilMatrix is applied to all the vectors
+    while reading its data only once, and the ghost regions of all the vectors
+    are updated with a single message per neighbor process.
 
     Parameters
     ----------
     V : psydac.linalg.stencil.StencilVectorSpace
-        Domain of the new linear operator.
+        Space to which all the vectors belong.
 
-    W : psydac.linalg.stencil.StencilVectorSpace
-        Codomain of the new linear operator.
+    nvecs : int
+        Number of vectors.
     """
-    def __init__(self, V, W, pads=None, backend=None):
+    def __init__(self, V, nvecs):
 
         assert isinstance(V, StencilVectorSpace)
-        assert isinstance(W, StencilVectorSpace)
-        assert W.pads == V.pads
-        if not W.dtype==V.dtype:
-            raise NotImplementedError("The domain and the codomain should have the same data type.")
+        assert isinstance(nvecs, (int, np.integer))
+        assert nvecs > 0
 
-        if pads is not None:
-            for p,vp in zip(pads, V.pads):
-                assert p<=vp
+        if V.interfaces or isinstance(V.cart, InterfaceCartDecomposition):
+            raise NotImplementedError('StencilMultiVector is not available for spaces with interfaces')
 
-        self._pads     = pads or tuple(V.pads)
-        dims           = list(W.shape)
-        diags          = [compute_diag_len(p, md, mc) for p,md,mc in zip(self._pads, V.shifts, W.shifts)]
-        self._data     = np.zeros(dims+diags, dtype=W.dtype)
-        self._domain   = V
-        self._codomain = W
-        self._ndim     = len(dims)
-        self._backend  = backend
-        self._is_T     = False
-        self._diag_indices = None
+        self._space    = V
+        self._nvecs    = int(nvecs)
+        self._ndim     = len(V.npts)
+        self._data     = np.zeros(V.shape + (self._nvecs,), dtype=V.dtype)
         self._requests = None
 
-        # Parallel attributes
-        if W.parallel:
-            if W.cart.is_comm_null:return
-            # Create data exchanger for ghost regions
-            self._synchronizer = get_data_exchanger(
-                cart        = W.cart,
-                dtype       = W.dtype,
-                coeff_shape = diags,
-                assembly    = True
-            )
+        # Prepare communications (ghost regions of all vectors are exchanged together)
+        if V.parallel and not V.cart.is_comm_null:
+            self._synchronizer = V._get_multi_synchronizer(self._nvecs)
+            self._requests     = self._synchronizer.prepare_communications(self._data)
 
-        # Flag ghost regions as not up-to-date (conservative choice)
         self._sync = False
 
-        # Prepare the arguments for the dot product method
-        nd = [(ej-sj+2*gp*mj-mj*p-gp)//mj*mi+1 for sj,ej,mj,mi,p,gp in zip(V.starts, V.ends, V.shifts, W.shifts, self._pads, V.pads)]
-        nc = [ei-si+1 for si,ei,mj,p in zip(W.starts, W.ends, V.shifts, self._pads)]
-
-        # Number of rows in matrix (along each dimension)
-        nrows       = [min(ni, nj)   for ni,nj in zip(nc, nd)]
-        nrows_extra = [max(0, ni-nj) for ni,nj in zip(nc, nd)]
-
-        args                = {}
-        args['starts']      = tuple(V.starts)
-        args['nrows']       = tuple(nrows)
-        args['nrows_extra'] = tuple(nrows_extra)
-        args['gpads']       = tuple(V.pads)
-        args['pads']        = tuple(self._pads)
-        args['dm']          = tuple(V.shifts)
-        args['cm']          = tuple(W.shifts)
-        ndiags, _           = list(zip(*[compute_diag_len(p,mj,mi, return_padding=True) for p,mi,mj in zip(self._pads, W.shifts, V.shifts)]))
-        args['pad_imp']     = [gp*m+gp+1-n-s%m+p-gp for gp,m,n,s,p in zip(V.pads, V.shifts, ndiags, V.starts, self._pads)]
-        args['ndiags']      = ndiags
+    #...
+    def __del__(self):
+        # Release memory of persistent MPI communication channels
+        if self._requests:
+            for request in self._requests:
+                request.Free()
 
-        self._dotargs_null = args
-        self._dot          = kernels['matvec'][self._ndim]
+    #...
+    @classmethod
+    def from_vectors(cls, vectors):
+        """
+        Create a multi-vector from a list of StencilVector objects.
 
-        self._transpose_args = self._prepare_transpose_args()
-        self._transpose_func = kernels['transpose'][self._ndim]
+        Parameters
+        ----------
+        vectors : list of StencilVector
+            The vectors, which must belong to the same space.
 
-        self.set_backend(backend)
+        Returns
+        -------
+        StencilMultiVector
+            A new multi-vector, whose columns are copies of the given vectors.
+        """
+        vectors = tuple(vectors)
+        assert len(vectors) > 0
+        w = cls(vectors[0].space, len(vectors))
+        w._sync = True
+        for j, v in enumerate(vectors):
+            w.set_column(j, v)
+        return w
 
     #--------------------------------------
-    # Abstract interface
+    # Properties
     #--------------------------------------
     @property
-    def domain(self):
-        return self._domain
+    def space(self):
+        return self._space
 
     # ...
     @property
-    def codomain(self):
-        return self._codomain
+    def nvecs(self):
+        return self._nvecs
 
     # ...
     @property
     def dtype(self):
-        return self._domain.dtype
+        return self._space.dtype
 
     # ...
-    def dot(self, v, out=None):
+    @property
+    def starts(self):
+        return self._space.starts
+
+    # ...
+    @property
+    def ends(self):
+        return self._space.ends
+
+    # ...
+    @property
+    def pads(self):
+        return self._space.pads
+
+    # ...
+    @property
+    def ghost_regions_in_sync(self):
+        return self._sync
+
+    # ...
+    # NOTE: this property must be set collectively
+    @ghost_regions_in_sync.setter
+    def ghost_regions_in_sync(self, value):
+        assert isinstance(value, bool)
+        self._sync = value
+
+    #--------------------------------------
+    # Access to the vectors
+    #--------------------------------------
+    def column(self, j, out=None):
         """
-        Return the matrix/vector product between self and v.
-        This function optimized this product.
+        Copy the j-th vector into a StencilVector.
 
         Parameters
         ----------
-        v   : StencilVector
-            Vector of the domain of self needed for the Matrix/Vector product.
+        j : int
+            Index of the vector.
 
-        out : StencilVector
-            Vector of the codomain of self.
+        out : StencilVector, optional
+            Vector where the result is stored.
 
         Returns
         -------
-        out : StencilVector
-            Vector of the codomain of self, contain the result of the product.
+        StencilVector
+            A copy of the j-th vector.
         """
-
+        if out is not None:
+            assert isinstance(out, StencilVector)
+            assert out.space is self._space
+        else:
+            out = StencilVector(self._space)
+        out._data[...] = self._data[..., j]
+        out._sync = self._sync
+        return out
+
+    # ...
+    def set_column(self, j, v):
+        """
+        Copy the StencilVector v into the j-th vector.
+        """
+        assert isinstance(v, StencilVector)
+        assert v.space is self._space
+        self._data[..., j] = v._data
+        self._sync = self._sync and v._sync
+
+    # ...
+    def to_vectors(self):
+        """
+        Return a list with a copy of each vector as a StencilVector.
+        """
+        return [self.column(j) for j in range(self._nvecs)]
+
+    # ...
+    def copy(self, out=None):
+        if self is out:
+            return self
+        if out is not None:
+            assert isinstance(out, StencilMultiVector)
+            assert out.space is self._space and out.nvecs == self._nvecs
+        else:
+            out = StencilMultiVector(self._space, self._nvecs)
+        np.copyto(out._data, self._data, casting='no')
+        out._sync = self._sync
+        return out
+
+    # ...
+    def dot(self, w):
+        """
+        Compute the inner products between the vectors of self and the
+        vectors of w, with a single global reduction.
+
+        Parameters
+        ----------
+        w : StencilMultiVector | StencilVector
+            The vectors of the same space.
+
+        Returns
+        -------
+        numpy.ndarray
+            If w is a StencilMultiVector, the 2D array G such that G[i, j] is
+            the inner product of the i-th vector of self with the j-th vector
+            of w. If w is a StencilVector, the 1D array of the inner products
+            of the vectors of self with w.
+        """
+        assert isinstance(w, (StencilMultiVector, StencilVector))
+        assert w.space is self._space
+
+        ndim = self._ndim
+        idx  = tuple(slice(m*p, m*p+e-s+1) for s, e, m, p in
+                     zip(self.starts, self.ends, self._space.shifts, self.pads))
+        axes = tuple(range(ndim))
+        res  = np.tensordot(self._data[idx].conj(), w._data[idx], axes=(axes, axes))
+
+        if self._space.parallel:
+            self._space.cart.global_comm.Allreduce(MPI.IN_PLACE, res, op=MPI.SUM)
+
+        return res
+
+    # ...
+    def toarray(self, *, order='C'):
+        """
+        Return a 2D numpy array whose j-th column is the j-th vector
+        collapsed into one dimension (without pads).
+        """
+        return np.stack([v.toarray(order=order) for v in self.to_vectors()], axis=1)
+
+    # ...
+    def __getitem__(self, key):
+        index = self._getindex(key)
+        return self._data[index]
+
+    # ...
+    def __setitem__(self, key, value):
+        index = self._getindex(key)
+        self._data[index] = value
+
+    # ...
+    def update_ghost_regions(self):
+        """
+        Update the ghost regions of all the vectors, before performing
+        non-local access to their elements (e.g. in matrix-vector product).
+        """
+        if self._space.parallel:
+            if not self._space.cart.is_comm_null:
+                # PARALLEL CASE: fill in ghost regions with data from neighbors
+                self._synchronizer.start_update_ghost_regions(self._data, self._requests)
+                self._synchronizer.  end_update_ghost_regions(self._data, self._requests)
+        else:
+            # SERIAL CASE: fill in ghost regions along periodic directions, otherwise set to zero
+            self._update_ghost_regions_serial()
+
+        # Flag ghost regions as up-to-date
+        self._sync = True
+
+    # The trailing batch axis is not affected by the slicing of the ghost regions
+    _update_ghost_regions_serial = StencilVector._update_ghost_regions_serial
+
+    #--------------------------------------
+    # Private methods
+    #--------------------------------------
+    def _getindex(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+        return StencilVector._getindex(self, key[:self._ndim]) + key[self._ndim:]
+
+#===============================================================================
+class StencilMatrix(LinearOperator):
+    """
+    Matrix in n-dimensional stencil format.
+
+    This is a linear operator that maps elements of stencil vector space V to
+    elements of stencil vector space W.
+
+    For now we only accept V==W.
+
+    Parameters
+    ----------
+    V : psydac.linalg.stencil.StencilVectorSpace
+        Domain of the new linear operator.
+
+    W : psydac.linalg.stencil.StencilVectorSpace
+        Codomain of the new linear operator.
+
+    pads : tuple of int
+        Padding of the matrix, not larger than the padding of V (optional).
+
+    backend : dict
+        Backend used to accelerate the matrix-vector product (optional).
+
+    dtype : type | str | numpy.dtype
+        Data type of the stored coefficients (default: W.dtype). The only
+        other supported choice is float32 storage for float64 spaces: the
+        matrix-vector product then reads the coefficients in single precision
+        and accumulates in double precision, which halves the memory traffic
+        of this bandwidth-bound operation. See also `astype`.
+    """
+    def __init__(self, V, W, pads=None, backend=None, dtype=None):
+
+        assert isinstance(V, StencilVectorSpace)
+        assert isinstance(W, StencilVectorSpace)
+        assert W.pads == V.pads
+        if not W.dtype==V.dtype:
+            raise NotImplementedError("The domain and the codomain should have the same data type.")
+
+        dtype = np.dtype(W.dtype if dtype is None else dtype)
+        if dtype != np.dtype(W.dtype) and not (dtype == np.float32 and np.dtype(W.dtype) == np.float64):
+            raise NotImplementedError("Only float32 coefficients are supported in a matrix between float64 spaces.")
+
+        if pads is not None:
+            for p,vp in zip(pads, V.pads):
+                assert p<=vp
+
+        self._pads     = pads or tuple(V.pads)
+        dims           = list(W.shape)
+        diags          = self._stored_diags([compute_diag_len(p, md, mc) for p,md,mc in zip(self._pads, V.shifts, W.shifts)])
+        self._data     = np.zeros(dims+diags, dtype=dtype)
+        self._mixed    = dtype != np.dtype(W.dtype)
+        self._domain   = V
+        self._codomain = W
+        self._ndim     = len(dims)
+        self._backend  = backend
+        self._is_T     = False
+        self._diag_indices = None
+        self._requests = None
+        self._overlap_boxes = None
+        self._overlap_communication = True
+
+        # Parallel attributes
+        if W.parallel:
+            if W.cart.is_comm_null:return
+            # Create data exchanger for ghost regions
+            self._synchronizer = get_data_exchanger(
+                cart        = W.cart,
+                dtype       = dtype,
+                coeff_shape = diags,
+                assembly    = True
+            )
+
+        # Flag ghost regions as not up-to-date (conservative choice)
+        self._sync = False
+
+        # Prepare the arguments for the dot product method
+        nd = [(ej-sj+2*gp*mj-mj*p-gp)//mj*mi+1 for sj,ej,mj,mi,p,gp in zip(V.starts, V.ends, V.shifts, W.shifts, self._pads, V.pads)]
+        nc = [ei-si+1 for si,ei,mj,p in zip(W.starts, W.ends, V.shifts, self._pads)]
+
+        # Number of rows in matrix (along each dimension)
+        nrows       = [min(ni, nj)   for ni,nj in zip(nc, nd)]
+        nrows_extra = [max(0, ni-nj) for ni,nj in zip(nc, nd)]
+
+        args                = {}
+        args['starts']      = tuple(V.starts)
+        args['nrows']       = tuple(nrows)
+        args['nrows_extra'] = tuple(nrows_extra)
+        args['gpads']       = tuple(V.pads)
+        args['pads']        = tuple(self._pads)
+        args['dm']          = tuple(V.shifts)
+        args['cm']          = tuple(W.shifts)
+        ndiags, _           = list(zip(*[compute_diag_len(p,mj,mi, return_padding=True) for p,mi,mj in zip(self._pads, W.shifts, V.shifts)]))
+        args['pad_imp']     = [gp*m+gp+1-n-s%m+p-gp for gp,m,n,s,p in zip(V.pads, V.shifts, ndiags, V.starts, self._pads)]
+        args['ndiags']      = ndiags
+
+        # Use the multi-threaded kernels if more than one thread per MPI rank
+        self._num_threads = W.num_threads
+        threaded = self._num_threads > 1 and self._ndim in [1, 2, 3]
+
+        self._dotargs_null = args
+        if self._mixed:
+            # Single precision coefficients, double precision vectors
+            self._dot = kernels['matvec_mixed'][self._ndim]
+        else:
+            self._dot = kernels['matvec_omp' if threaded else 'matvec'][self._ndim]
+
+        self._transpose_args = self._prepare_transpose_args()
+        self._transpose_func = kernels['transpose_omp' if threaded else 'transpose'][self._ndim]
+        if threaded:
+            self._transpose_args['nthreads'] = np.int64(self._num_threads)
+
+        # Arguments for the product with a StencilMultiVector
+        self._multi_args = {key: np.int64(arg) for key, arg in args.items() if key != 'pads'}
+
+        self.set_backend(backend)
+
+    #--------------------------------------
+    # Abstract interface
+    #--------------------------------------
+    @property
+    def domain(self):
+        return self._domain
+
+    # ...
+    @property
+    def codomain(self):
+        return self._codomain
+
+    # ...
+    @property
+    def dtype(self):
+        return self._domain.dtype
+
+    # ...
+    def dot(self, v, out=None):
+        """
+        Return the matrix/vector product between self and v.
+        This function optimized this product.
+
+        Parameters
+        ----------
+        v   : StencilVector
+            Vector of the domain of self needed for the Matrix/Vector product.
+
+        out : StencilVector
+            Vector of the codomain of self.
+
+        Returns
+        -------
+        out : StencilVector
+            Vector of the codomain of self, contain the result of the product.
+
+        Notes
+        -----
+        If v is a StencilMultiVector, the matrix is applied to all its vectors
+        at once, and the result is a StencilMultiVector.
+
+        If the domain is distributed and the ghost regions of v are not up to
+        date, the halo exchange is overlapped with the product of the rows
+        which only read entries of v owned by this process (see the property
+        `overlap_communication`).
+        """
+
+        if isinstance(v, StencilMultiVector):
+            return self._dot_multi(v, out)
+
         assert isinstance(v, StencilVector)
         assert v.space is self.domain
 
@@ -987,6 +1650,18 @@ class StencilMatrix(LinearOperator):
 
         # Necessary if vector space is distributed across processes
         if not v.ghost_regions_in_sync:
+            boxes = self._get_overlap_boxes()
+            if boxes:
+                # Interior rows are computed while the ghost regions are exchanged
+                v.start_update_ghost_regions()
+                self._dot_boxes(v, out, boxes[:1])
+                v.end_update_ghost_regions()
+                self._dot_boxes(v, out, boxes[1:])
+
+                # IMPORTANT: flag that ghost regions are not up-to-date
+                out.ghost_regions_in_sync = False
+                return out
+
             v.update_ghost_regions()
 
         self._func(self._data, v._data, out._data, **self._args)
@@ -995,6 +1670,138 @@ class StencilMatrix(LinearOperator):
         out.ghost_regions_in_sync = False
         return out
 
+    # ...
+    def _dot_multi(self, v, out=None):
+        """
+        Matrix/vector product with all the vectors of a StencilMultiVector,
+        which reads the matrix data only once.
+        """
+        assert v.space is self.domain
+
+        if out is not None:
+            assert isinstance(out, StencilMultiVector)
+            assert out.space is self.codomain
+            assert out.nvecs == v.nvecs
+        else:
+            out = StencilMultiVector(self.codomain, v.nvecs)
+
+        # Ghost regions of all vectors are updated together
+        if not v.ghost_regions_in_sync:
+            v.update_ghost_regions()
+
+        if self._ndim in [1, 2, 3] and not self._mixed:
+            kernels['matvec_multi'][self._ndim](self._data, v._data, out._data, **self._multi_args)
+        else:
+            for j in range(v.nvecs):
+                out.set_column(j, self.dot(v.column(j)))
+
+        # IMPORTANT: flag that ghost regions are not up-to-date
+        out.ghost_regions_in_sync = False
+        return out
+
+    # ...
+    @property
+    def overlap_communication(self):
+        """
+        If True (default), the matrix-vector product on a distributed domain
+        starts the update of the ghost regions of the input vector, computes
+        the rows which only depend on the entries owned by this process, and
+        completes the update before computing the remaining boundary rows.
+        This hides the latency of the halo exchange. It is only effective
+        without an accelerated backend (see `set_backend`).
+        """
+        return self._overlap_communication
+
+    @overlap_communication.setter
+    def overlap_communication(self, value):
+        assert isinstance(value, bool)
+        self._overlap_communication = value
+
+    # ...
+    def _get_overlap_boxes(self):
+        """
+        Get the boxes of local rows used by the overlapped matrix-vector product
+        (see `_compute_overlap_boxes`), or an empty tuple if the product should
+        not be overlapped with the halo exchange.
+        """
+        if not (self._overlap_communication and self._domain.parallel and self._backend is None):
+            return ()
+        if self._overlap_boxes is None:
+            self._overlap_boxes = self._compute_overlap_boxes()
+        return self._overlap_boxes
+
+    # ...
+    def _compute_overlap_boxes(self):
+        """
+        Split the local rows of the matrix into an interior box, whose product
+        only reads the entries of the input vector owned by this process, and
+        at most 2*ndim boundary boxes which cover the remaining rows.
+
+        Each box is stored as the dictionary of arguments passed to the matvec
+        kernel in order to compute its rows. The first box is the interior one.
+        An empty tuple is returned if the interior box is empty.
+        """
+        V    = self._domain
+        W    = self._codomain
+        args = self._dotargs_null
+
+        interior = []
+        full     = []
+        for d in range(self._ndim):
+            n, ne  = args['nrows'][d], args['nrows_extra'][d]
+            dm, cm = V.shifts[d], W.shifts[d]
+
+            # First index in x read by each row, and range of owned indices in x
+            x_min = args['pad_imp'][d] + (np.arange(n) + V.starts[d] % dm) // cm * dm
+            x_beg = V.pads[d] * dm
+            x_end = x_beg + V.ends[d] - V.starts[d] + 1
+            rows  = np.flatnonzero((x_min >= x_beg) & (x_min + args['ndiags'][d] <= x_end))
+            if len(rows) == 0:
+                return ()
+
+            # Box limits must be multiples of the codomain shift, in order to
+            # have integer offsets in the kernel arguments
+            a = -(-rows[0] // cm) * cm
+            b = (rows[-1] + 1) // cm * cm
+            if a >= b:
+                return ()
+
+            interior.append((a, b))
+            full.append((0, n + ne))
+
+        def make_box(ranges):
+            # The kernel computes the rows starting at index lo along each
+            # axis if the padding (i.e. the row offset) and the offset in x
+            # are shifted accordingly
+            gpads       = [gp + lo // cm            for (lo, _), gp, cm     in zip(ranges, V.pads, W.shifts)]
+            pad_imp     = [pi + lo // cm * dm       for (lo, _), pi, dm, cm in zip(ranges, args['pad_imp'], V.shifts, W.shifts)]
+            nrows       = [(hi - lo if hi < f else args['nrows'][d] - lo) for d, ((lo, hi), (_, f)) in enumerate(zip(ranges, full))]
+            nrows_extra = [( 0      if hi < f else args['nrows_extra'][d]) for d, ((lo, hi), (_, f)) in enumerate(zip(ranges, full))]
+
+            box_args = dict(self._args)
+            box_args['gpads']       = np.int64(gpads)
+            box_args['pad_imp']     = np.int64(pad_imp)
+            box_args['nrows']       = np.int64(nrows)
+            box_args['nrows_extra'] = np.int64(nrows_extra)
+            return box_args
+
+        boxes = [make_box(interior)]
+        for d in range(self._ndim):
+            for lo, hi in [(full[d][0], interior[d][0]), (interior[d][1], full[d][1])]:
+                if lo < hi:
+                    boxes.append(make_box(interior[:d] + [(lo, hi)] + full[d+1:]))
+
+        return tuple(boxes)
+
+    # ...
+    def _dot_boxes(self, v, out, boxes):
+        """
+        Compute the rows of the matrix-vector product contained in the given
+        boxes of local rows (see `_compute_overlap_boxes`).
+        """
+        for args in boxes:
+            self._func(self._data, v._data, out._data, **args)
+
     # ...
     def vdot( self, v, out=None):
         """
@@ -1063,7 +1870,7 @@ class StencilMatrix(LinearOperator):
             assert out.domain == M.codomain
             
         else :
-            out = StencilMatrix(M.codomain, M.domain, pads=self._pads, backend=self._backend)
+            out = StencilMatrix(M.codomain, M.domain, pads=self._pads, backend=self._backend, dtype=M._data.dtype)
 
         # Call low-level '_transpose' function (works on Numpy arrays directly)
         if conjugate:
@@ -1073,24 +1880,170 @@ class StencilMatrix(LinearOperator):
         return out
 
     # ...
-    def toarray(self, **kwargs):
-        """ Convert to Numpy 2D array. """
+    def matmat(self, B, pads=None):
+        """
+        Compute the matrix product C = self @ B explicitly, in stencil format.
 
-        order     = kwargs.pop('order', 'C')
-        with_pads = kwargs.pop('with_pads', False)
+        Contrary to `self @ B`, which returns a ComposedLinearOperator that
+        applies the two matrices one after the other, the product is computed
+        once and stored in a StencilMatrix. Its band is the sum of the bands
+        of the factors, and the diagonals which are exactly zero are trimmed
+        from its ends.
 
-        if self.codomain.parallel and with_pads:
-            coo = self._tocoo_parallel_with_pads(order=order)
-        else:
-            coo = self._tocoo_no_pads(order=order)
+        Parameters
+        ----------
+        B : StencilMatrix | WideStencilMatrix
+            Right factor of the product, such that B.codomain is self.domain.
 
-        return coo.toarray()
+        pads : tuple of int
+            Padding of the result (optional). By default, the smallest padding
+            which holds all the non-zero diagonals of the product is used.
 
-    # ...
-    def tosparse(self, **kwargs):
-        """ Convert to any Scipy sparse matrix format. """
+        Returns
+        -------
+        StencilMatrix | WideStencilMatrix
+            Product from B.domain to self.codomain. If its padding is larger
+            than the ghost regions of these spaces, it is stored on the spaces
+            with wider ghost regions and returned as a WideStencilMatrix, which
+            is applied to the vectors of B.domain at the cost of one product.
+        """
+        return StencilMatrix._matmat_sum([(self, B)], pads=pads)
 
-        order     = kwargs.pop('order', 'C')
+    # ...
+    @staticmethod
+    def _matmat_sum(products, pads=None):
+        """
+        Compute the sum of the products A @ B of the given pairs of stencil
+        matrices, which all have the same domain and codomain, as a single
+        StencilMatrix or WideStencilMatrix. See `StencilMatrix.matmat`.
+        """
+        A, B = products[0]
+        U = B.domain
+        W = A.codomain
+        dtype = np.dtype(W.dtype)
+
+        for A, B in products:
+            assert isinstance(A, (StencilMatrix, WideStencilMatrix))
+            assert isinstance(B, (StencilMatrix, WideStencilMatrix))
+            assert A.domain is B.codomain
+            assert B.domain is U and A.codomain is W
+
+        # The factors stored on spaces with wider ghost regions are multiplied
+        # on these spaces, hence all the factors are widened to the same ones
+        wrapped = [M.matrix for pair in products for M in pair if isinstance(M, WideStencilMatrix)]
+        if wrapped:
+            spaces = [X for M in wrapped for X in (M.domain, M.codomain)]
+            gpads  = tuple(max(X.pads[d] for X in spaces) for d in range(U.ndim))
+
+            def widen(M):
+                M = M.matrix if isinstance(M, WideStencilMatrix) else M
+                return M._widened(M.pads, gpads)
+
+            products = [(widen(A), widen(B)) for A, B in products]
+
+        factors = []
+        for A, B in products:
+            if any(m != 1 for M in (A, B) for m in M.domain.shifts + M.codomain.shifts):
+                raise NotImplementedError("The matrix product is only available for spaces with shifts equal to 1.")
+            if np.dtype(A.domain.dtype) != dtype or np.dtype(U.dtype) != dtype:
+                raise NotImplementedError("The factors of a matrix product should have the same data type.")
+
+            # Work with all the diagonals, in the precision of the spaces
+            if isinstance(A, SymmetricStencilMatrix):
+                A = A.tostencil()
+            if isinstance(B, SymmetricStencilMatrix):
+                B = B.tostencil()
+            if A._mixed:
+                A = A.astype(dtype)
+            if B._mixed:
+                B = B.astype(dtype)
+
+            # The product reads the rows of B which are stored in its ghost regions
+            if not B.ghost_regions_in_sync:
+                B.update_ghost_regions()
+
+            factors.append((A, B))
+
+        # Space of the rows of the product, widened with the factors if needed
+        X = factors[0][0].codomain
+
+        ndim = W.ndim
+        wide = tuple(max(A.pads[d] + B.pads[d] for A, B in factors) for d in range(ndim))
+
+        if W.parallel and W.cart.is_comm_null:
+            return StencilMatrix(U, W, pads=pads)
+
+        nrows = [e-s+1 for s, e in zip(W.starts, W.ends)]
+        data  = np.zeros(tuple(X.shape) + tuple(2*q+1 for q in wide), dtype=dtype)
+
+        for A, B in factors:
+            V = A.domain
+
+            # Rows of B which may be read: the ghost rows beyond the boundary
+            # of a non-periodic direction are not part of the matrix
+            rows_lo = []
+            rows_hi = []
+            for d in range(ndim):
+                s, e, n, gp = V.starts[d], V.ends[d], V.npts[d], V.pads[d]
+                at_start = not V.periods[d] and s == 0
+                at_end   = not V.periods[d] and e == n-1
+                rows_lo.append(gp if at_start else 0)
+                rows_hi.append(gp+e-s+1 if at_end else B._data.shape[d])
+
+            kernels['matmat'][ndim](A._data, B._data, data,
+                                    np.int64(nrows), np.int64(rows_lo), np.int64(rows_hi),
+                                    np.int64(X.pads), np.int64(V.pads),
+                                    np.int64(A.pads), np.int64(B.pads), np.int64(wide))
+
+        # Smallest padding which holds all the non-zero diagonals of the owned rows
+        rows    = tuple(slice(gp, gp+n) for gp, n in zip(X.pads, nrows))
+        nonzero = data[rows] != 0
+        needed  = np.zeros(ndim, dtype=np.int64)
+        for d in range(ndim):
+            axes = tuple(i for i in range(2*ndim) if i != ndim+d)
+            k, = np.nonzero(np.any(nonzero, axis=axes))
+            if len(k) > 0:
+                needed[d] = np.max(abs(k - wide[d]))
+        if W.parallel:
+            W.cart.comm.Allreduce(MPI.IN_PLACE, needed, op=MPI.MAX)
+
+        if pads is None:
+            pads = tuple(int(q) for q in needed)
+        elif any(p < q for p, q in zip(pads, needed)):
+            raise ValueError("The padding {} is too small for the product, which needs {}.".format(tuple(pads), tuple(needed)))
+
+        # A product which does not fit in the ghost regions of the spaces is
+        # stored on spaces with wider ghost regions
+        C = StencilMatrix(U.widened(pads), W.widened(pads), pads=tuple(pads))
+
+        owned = tuple(slice(gp, gp+n) for gp, n in zip(C.codomain.pads, nrows))
+        mm    = [min(p, q) for p, q in zip(pads, wide)]
+        C._data[owned + tuple(slice(p-m, p+m+1) for p, m in zip(pads, mm))] = \
+            data[rows + tuple(slice(q-m, q+m+1) for q, m in zip(wide, mm))]
+
+        if C.domain is U and C.codomain is W:
+            return C
+        return WideStencilMatrix(U, W, C)
+
+    # ...
+    def toarray(self, **kwargs):
+        """ Convert to Numpy 2D array. """
+
+        order     = kwargs.pop('order', 'C')
+        with_pads = kwargs.pop('with_pads', False)
+
+        if self.codomain.parallel and with_pads:
+            coo = self._tocoo_parallel_with_pads(order=order)
+        else:
+            coo = self._tocoo_no_pads(order=order)
+
+        return coo.toarray()
+
+    # ...
+    def tosparse(self, **kwargs):
+        """ Convert to any Scipy sparse matrix format. """
+
+        order     = kwargs.pop('order', 'C')
         with_pads = kwargs.pop('with_pads', False)
 
         if self.codomain.parallel and with_pads:
@@ -1100,6 +2053,69 @@ class StencilMatrix(LinearOperator):
 
         return coo
 
+    # ...
+    def tocsr(self, order='C'):
+        """
+        Convert to a Scipy CSR matrix which stores all the entries of the
+        stencil pattern, including the zero ones, except the entries which
+        couple a row with a column outside of the domain along a non-periodic
+        direction.
+
+        Since the sparsity pattern does not depend on the values, it is
+        computed only once for all the matrices with the same domain,
+        codomain and pads. After the matrix is assembled again, the values of
+        the CSR matrix can be refreshed in place with `update_values`.
+
+        Parameters
+        ----------
+        order : str
+            Ordering of the multi-indices, 'C' (row-major) or 'F'
+            (column-major).
+
+        Returns
+        -------
+        scipy.sparse.csr_matrix
+            Local rows of the matrix (all the rows in a serial run), with
+            global row and column indices.
+        """
+        indices, indptr, _, shape = self._csr_structure(order)
+        data = self._csr_values(order)
+        return csr_matrix((data, indices.copy(), indptr.copy()), shape=shape)
+
+    # ...
+    def update_values(self, M, order='C'):
+        """
+        Copy the values of this matrix into the sparse matrix M, which was
+        created by `tocsr` or `topetsc` from a matrix with the same domain,
+        codomain and pads. The sparsity pattern of a CSR matrix is not
+        modified, while a PETSc matrix only gains the entries which were zero
+        when it was created (see `psydac.linalg.topetsc.mat_update_values`).
+
+        Parameters
+        ----------
+        M : scipy.sparse.csr_matrix | petsc4py.PETSc.Mat
+            Sparse matrix to be updated in place.
+
+        order : str
+            Ordering of the multi-indices used to create M (Scipy only).
+
+        Returns
+        -------
+        M : scipy.sparse.csr_matrix | petsc4py.PETSc.Mat
+            The same matrix, with the new values.
+        """
+        if issparse(M) and not isinstance(M, csr_matrix):
+            raise TypeError('Only the CSR matrices created by tocsr can be updated.')
+        elif isinstance(M, csr_matrix):
+            indices, indptr, _, shape = self._csr_structure(order)
+            if M.shape != shape or M.nnz != indices.size:
+                raise ValueError('The sparsity pattern of M does not match the one of the matrix.')
+            M.data[:] = self._csr_values(order)
+        else:
+            from psydac.linalg.topetsc import mat_update_values
+            mat_update_values(self, M)
+        return M
+
     #--------------------------------------
     # Overridden properties/methods
     #--------------------------------------
@@ -1108,7 +2124,7 @@ class StencilMatrix(LinearOperator):
 
     # ...
     def __mul__(self, a):
-        w = StencilMatrix(self._domain, self._codomain, self._pads, self._backend)
+        w = type(self)(self._domain, self._codomain, self._pads, self._backend, dtype=self._data.dtype)
         w._data = self._data * a
         w._func = self._func
         w._args = self._args
@@ -1117,43 +2133,57 @@ class StencilMatrix(LinearOperator):
 
     #...
     def __add__(self, m):
-        if isinstance(m, StencilMatrix):
+        if type(m) is type(self):
             #assert isinstance(m, StencilMatrix)
             assert m._domain   is self._domain
             assert m._codomain is self._codomain
-            assert m._pads     == self._pads
+            if m._pads != self._pads:
+                pads = tuple(max(p, q) for p, q in zip(self._pads, m._pads))
+                if self._domain.widened(pads) is not self._domain or self._codomain.widened(pads) is not self._codomain:
+                    raise ValueError("The sum of matrices with paddings {} and {} does not fit in the ghost regions "
+                                     "of their spaces.".format(self._pads, m._pads))
+                return self._widened(pads) + m._widened(pads)
 
             if m._backend is not self._backend:
                 msg = 'Adding two matrices with different backends is ambiguous - defaulting to backend of first addend'
                 warnings.warn(msg, category=RuntimeWarning)
             
-            w = StencilMatrix(self._domain, self._codomain, self._pads, self._backend)
-            w._data = self._data  +  m._data
+            w = type(self)(self._domain, self._codomain, self._pads, self._backend, dtype=self._data.dtype)
+            w._data = (self._data  +  m._data).astype(w._data.dtype, copy=False)
             w._func = self._func
             w._args = self._args
             w._sync = self._sync and m._sync
             return w
+        elif isinstance(m, WideStencilMatrix):
+            return m + self
         else:
             return LinearOperator.__add__(self, m)
 
     #...
     def __sub__(self, m):
-        if isinstance(m, StencilMatrix):
+        if type(m) is type(self):
             #assert isinstance(m, StencilMatrix)
             assert m._domain   is self._domain
             assert m._codomain is self._codomain
-            assert m._pads     == self._pads
+            if m._pads != self._pads:
+                pads = tuple(max(p, q) for p, q in zip(self._pads, m._pads))
+                if self._domain.widened(pads) is not self._domain or self._codomain.widened(pads) is not self._codomain:
+                    raise ValueError("The difference of matrices with paddings {} and {} does not fit in the ghost regions "
+                                     "of their spaces.".format(self._pads, m._pads))
+                return self._widened(pads) - m._widened(pads)
 
             if m._backend is not self._backend:
                 msg = 'Subtracting two matrices with different backends is ambiguous - defaulting to backend of the matrix we subtract from'
                 warnings.warn(msg, category=RuntimeWarning)
 
-            w = StencilMatrix(self._domain, self._codomain, self._pads, self._backend)
-            w._data = self._data  -  m._data
+            w = type(self)(self._domain, self._codomain, self._pads, self._backend, dtype=self._data.dtype)
+            w._data = (self._data  -  m._data).astype(w._data.dtype, copy=False)
             w._func = self._func
             w._args = self._args
             w._sync = self._sync and m._sync
             return w
+        elif isinstance(m, WideStencilMatrix):
+            return -m + self
         else:
             return LinearOperator.__sub__(self, m)
 
@@ -1168,7 +2198,7 @@ class StencilMatrix(LinearOperator):
             assert out.domain is self.domain
             assert out.codomain is self.codomain
         else:
-            out = StencilMatrix(self.domain, self.codomain, pads=self.pads)
+            out = type(self)(self.domain, self.codomain, pads=self.pads, dtype=self._data.dtype)
             out._func    = self._func
             out._args    = self._args
         np.conjugate(self._data, out=out._data, casting='no')
@@ -1218,10 +2248,37 @@ class StencilMatrix(LinearOperator):
             assert out.domain == self.domain
             assert out.codomain == self.codomain
         else :
-            out = StencilMatrix( self.domain, self.codomain, self._pads, self._backend )
+            out = type(self)( self.domain, self.codomain, self._pads, self._backend, dtype=self._data.dtype )
         out._data[:] = self._data[:]
-        out._func    = self._func
-        out._args    = self._args
+        if out._data.dtype == self._data.dtype:
+            out._func    = self._func
+            out._args    = self._args
+        return out
+
+    #...
+    def astype(self, dtype):
+        """
+        Create a copy of self whose coefficients are stored with the given
+        data type (see the `dtype` argument of StencilMatrix). For example,
+        A.astype(np.float32) is a mixed-precision copy of the float64 matrix A,
+        which can be used in the inner solver of an IterativeRefinement.
+
+        Parameters
+        ----------
+        dtype : type | str | numpy.dtype
+            Data type of the coefficients of the new matrix.
+
+        Returns
+        -------
+        StencilMatrix
+            Copy of self, with the same domain and codomain. The accelerated
+            backend of self is not kept if the new matrix is mixed-precision.
+        """
+        dtype   = np.dtype(dtype)
+        backend = self._backend if dtype == self.dtype else None
+        out = type(self)(self.domain, self.codomain, self._pads, backend, dtype=dtype)
+        out._data[:] = self._data
+        out._sync    = self._sync
         return out
 
     #...
@@ -1231,7 +2288,7 @@ class StencilMatrix(LinearOperator):
 
     #...
     def __iadd__(self, m):
-        if isinstance(m, StencilMatrix):
+        if type(m) is type(self):
             #assert isinstance(m, StencilMatrix)
             assert m._domain   is self._domain
             assert m._codomain is self._codomain
@@ -1244,7 +2301,7 @@ class StencilMatrix(LinearOperator):
 
     #...
     def __isub__(self, m):
-        if isinstance(m, StencilMatrix):
+        if type(m) is type(self):
             #assert isinstance(m, StencilMatrix)
             assert m._domain   is self._domain
             assert m._codomain is self._codomain
@@ -1255,9 +2312,35 @@ class StencilMatrix(LinearOperator):
         else:
             return LinearOperator.__sub__(self, m)
 
+    #...
+    def _widened(self, pads, gpads=None):
+        """
+        Return a copy of self with a larger padding, or self if the padding is
+        unchanged. If the padding, or the width `gpads` of the ghost regions
+        (default: pads), is larger than the ghost regions of the domain, the
+        copy maps between the widened spaces (see
+        StencilVectorSpace.widened). Only available for spaces with shifts
+        equal to 1.
+        """
+        pads  = tuple(pads)
+        gpads = pads if gpads is None else tuple(max(p, q) for p, q in zip(pads, gpads))
+        V = self._domain.widened(gpads)
+        W = self._codomain.widened(gpads)
+        if pads == tuple(self._pads) and V is self._domain and W is self._codomain:
+            return self
+        if any(m != 1 for m in tuple(self._domain.shifts) + tuple(self._codomain.shifts)):
+            raise NotImplementedError("The padding of a matrix can only be widened for spaces with shifts equal to 1.")
+
+        w = type(self)(V, W, pads, self._backend, dtype=self._data.dtype)
+        rows  = tuple(slice(q-g, q-g+n) for q, g, n in zip(W.pads, self._codomain.pads, self._codomain.shape))
+        index = tuple(slice(p-q, p+q+1) for p, q in zip(pads, self._pads))
+        w._data[rows + index] = self._data
+        w._sync = self._sync and W is self._codomain
+        return w
+
     #...
     def __abs__(self):
-        w = StencilMatrix( self._domain, self._codomain, self._pads, self._backend )
+        w = type(self)( self._domain, self._codomain, self._pads, self._backend, dtype=self._data.dtype )
         w._data = abs(self._data)
         w._func = self._func
         w._args = self._args
@@ -1410,6 +2493,10 @@ class StencilMatrix(LinearOperator):
         diag = self._data[diagonal_indices]
         data = out._data if out else None
 
+        # The diagonal of a mixed-precision matrix is returned in the precision of the spaces
+        if self._mixed:
+            diag = diag.astype(self.dtype)
+
         # Calculate entries of StencilDiagonalMatrix
         if inverse:
             data = np.divide(1, diag, out=data)
@@ -1465,6 +2552,37 @@ class StencilMatrix(LinearOperator):
 
     def tocoo_local(self, order='C'):
 
+        # Shortcuts
+        pc = self._codomain.pads
+        nd = self._ndim
+
+        rows, cols, shape = self._coo_local_structure(order)
+
+        local = tuple( [slice(p,-p) for p in pc] + [slice(None)] * nd )
+        data  = self._data[local].ravel()
+
+        M = coo_matrix(
+                (data,(rows,cols)),
+                shape = shape,
+                dtype = self._domain.dtype
+        )
+
+        M.eliminate_zeros()
+
+        return M
+
+    #...
+    def _coo_local_structure(self, order='C'):
+        """
+        Row and column indices, with respect to the local arrays including
+        the ghost regions, of all the entries in self._data[local] (see
+        `tocoo_local`). They are computed once and stored in the domain.
+        """
+        key = ('coo_local', self._codomain, tuple(self._pads), order)
+        structures = self._domain._sparse_structures
+        if key in structures:
+            return structures[key]
+
         # Shortcuts
         sc = self._codomain.starts
         ec = self._codomain.ends
@@ -1479,50 +2597,61 @@ class StencilMatrix(LinearOperator):
         nr = [e-s+1 +2*p for s,e,p in zip(sc, ec, pc)]
         nc = [e-s+1 +2*p for s,e,p in zip(sd, ed, pd)]
 
-        ravel_multi_index = np.ravel_multi_index
-
-        # COO storage
-        rows = []
-        cols = []
-        data = []
+        dd = [pdi-ppi for pdi,ppi in zip(pd, self._pads)]
 
+        # index = [i1-s1, i2-s2, ..., p1+j1-i1, p2+j2-i2, ...]
         local = tuple( [slice(p,-p) for p in pc] + [slice(None)] * nd )
+        index = np.indices(self._data[local].shape, dtype='int64').reshape(2*nd, -1)
+        xx = index[:nd]  # ii is local
+        ll = index[nd:]  # l=p+k
 
-        dd = [pdi-ppi for pdi,ppi in zip(pd, self._pads)]
+        ii = [x+p for x,p in zip(xx, pc)]
+        jj = [(l+x+d)%n for (x,l,d,n) in zip(xx,ll,dd,nc)]
 
-        for (index, value) in np.ndenumerate( self._data[local] ):
+        rows = np.ravel_multi_index( ii, dims=nr, order=order )
+        cols = np.ravel_multi_index( jj, dims=nc, order=order )
 
-            # index = [i1-s1, i2-s2, ..., p1+j1-i1, p2+j2-i2, ...]
+        structures[key] = (rows, cols, (np.prod(nr), np.prod(nc)))
+        return structures[key]
 
-            xx = index[:nd]  # ii is local
-            ll = index[nd:]  # l=p+k
+    #...
+    def _tocoo_no_pads(self , order='C'):
 
-            ii = [x+p for x,p in zip(xx, pc)]
-            jj = [(l+i+d)%n for (i,l,d,n) in zip(xx,ll,dd,nc)]
+        # Shortcuts
+        nd    = self._ndim
+        cpads = self._codomain.pads
+        cm    = self._codomain.shifts
 
-            I = ravel_multi_index( ii, dims=nr,  order=order )
-            J = ravel_multi_index( jj, dims=nc,  order=order )
+        rows, cols, shape = self._coo_structure(order)
 
-            rows.append( I )
-            cols.append( J )
-            data.append( value )
+        # Range of data owned by local process (no ghost regions)
+        local = tuple( [slice(mi*p,-mi*p) for p,mi in zip(cpads, cm)] + [slice(None)] * nd )
+        data  = self._data[local].ravel()
+        nz    = data != 0
 
         M = coo_matrix(
-                (data,(rows,cols)),
-                shape = [np.prod(nr),np.prod(nc)],
-                dtype = self._domain.dtype
-        )
-
-        M.eliminate_zeros()
-
+                (data[nz],(rows[nz],cols[nz])),
+                shape = shape,
+                dtype = self.dtype)
         return M
 
     #...
-    def _tocoo_no_pads(self , order='C'):
+    def _coo_structure(self, order='C'):
+        """
+        Global row and column indices of all the entries in the local part of
+        self._data (no ghost regions), in the order of the flattened array.
+        They only depend on the spaces and on the pads: hence they are
+        computed once, and stored in the domain for all the matrices with the
+        same codomain and pads.
+        """
+        nd  = self._ndim
+        key = ('coo', self._codomain, tuple(self._pads), self._data.shape[nd:], order)
+        structures = self._domain._sparse_structures
+        if key in structures:
+            return structures[key]
 
         # Shortcuts
         nr    = self._codomain.npts
-        nd    = self._ndim
         nc    = self._domain.npts
         ss    = self._codomain.starts
         cpads = self._codomain.pads
@@ -1535,10 +2664,12 @@ class StencilMatrix(LinearOperator):
         local = tuple( [slice(mi*p,-mi*p) for p,mi in zip(cpads, cm)] + [slice(None)] * nd )
         size  = self._data[local].size
 
-        # COO storage
+        # COO storage. The kernel skips the zero entries, hence it is called
+        # with an array of ones in order to get the indices of all the entries
+        ones = np.ones(self._data.shape)
         rows = np.zeros(size, dtype='int64')
         cols = np.zeros(size, dtype='int64')
-        data = np.zeros(size, dtype=self.dtype)
+        data = np.zeros(size)
         nrl = [np.int64(e-s+1) for s,e in zip(self.codomain.starts, self.codomain.ends)]
         ncl = [np.int64(i) for i in self._data.shape[nd:]]
         ss = [np.int64(i) for i in ss]
@@ -1551,12 +2682,101 @@ class StencilMatrix(LinearOperator):
 
         stencil2coo = kernels['stencil2coo'][order][nd]
 
-        ind = stencil2coo(self._data, data, rows, cols, *nrl, *ncl, *ss, *nr, *nc, *dm, *cm, *cpads, *pp)
-        M = coo_matrix(
-                (data[:ind],(rows[:ind],cols[:ind])),
-                shape = [np.prod(nr),np.prod(nc)],
-                dtype = self.dtype)
-        return M
+        ind = stencil2coo(ones, data, rows, cols, *nrl, *ncl, *ss, *nr, *nc, *dm, *cm, *cpads, *pp)
+        assert ind == size
+
+        structures[key] = (rows, cols, (np.prod(nr), np.prod(nc)))
+        return structures[key]
+
+    #...
+    def _domain_mask(self):
+        """
+        Boolean array with the shape of the local part of self._data (no
+        ghost regions), which is False for the entries coupling a row with a
+        column outside of the domain along a non-periodic direction. The
+        kernels wrap the column indices around, hence these entries must be
+        excluded from the sparsity patterns. The mask is stored in the domain.
+        """
+        nd  = self._ndim
+        key = ('mask', self._codomain, tuple(self._pads), self._data.shape[nd:])
+        structures = self._domain._sparse_structures
+        if key in structures:
+            return structures[key]
+
+        nrl  = [e-s+1 for s,e in zip(self._codomain.starts, self._codomain.ends)]
+        ncl  = list(self._data.shape[nd:])
+        mask = np.ones(nrl + ncl, dtype=bool)
+
+        for axis in range(nd):
+            if self._domain.periods[axis]:
+                continue
+
+            p  = self._pads[axis]
+            s  = self._codomain.starts[axis]
+            n  = self._domain.npts[axis]
+            mi = self._codomain.shifts[axis]
+            mj = self._domain.shifts[axis]
+            dp = compute_diag_len(p, mj, mi) - (p+1)
+
+            # Global column index (before wrapping) of each local entry, as in the kernels
+            ii = np.arange(s, s + nrl[axis])
+            jj = (ii // mi)[:, None] * mj + np.arange(ncl[axis])[None, :] - dp
+
+            shape = [1] * (2*nd)
+            shape[axis]    = nrl[axis]
+            shape[nd+axis] = ncl[axis]
+            mask &= ((jj >= 0) & (jj < n)).reshape(shape)
+
+        structures[key] = mask
+        return structures[key]
+
+    #...
+    def _csr_structure(self, order='C'):
+        """
+        CSR pattern of the matrix returned by `tocsr`: column indices, row
+        pointers, position in the CSR data array of each entry of the local
+        part of self._data (flattened), and shape. Duplicate (row, column)
+        pairs, which appear with periodic boundary conditions on coarse
+        grids, share the same position. The entries outside of the domain
+        (see `_domain_mask`) are given the position nnz, which is discarded.
+        The pattern is stored in the domain.
+        """
+        key = ('csr', self._codomain, tuple(self._pads), self._data.shape[self._ndim:], order)
+        structures = self._domain._sparse_structures
+        if key in structures:
+            return structures[key]
+
+        rows, cols, shape = self._coo_structure(order)
+        inside = self._domain_mask().ravel()
+        keys, position = np.unique(rows[inside] * shape[1] + cols[inside], return_inverse=True)
+        indices = keys % shape[1]
+        indptr  = np.zeros(shape[0] + 1, dtype='int64')
+        np.cumsum(np.bincount(keys // shape[1], minlength=shape[0]), out=indptr[1:])
+
+        positions = np.full(rows.size, keys.size, dtype='int64')
+        positions[inside] = position.ravel()
+
+        structures[key] = (indices, indptr, positions, shape)
+        return structures[key]
+
+    #...
+    def _csr_values(self, order='C'):
+        """ Data array of the CSR matrix returned by `tocsr`. """
+        _, indptr, position, _ = self._csr_structure(order)
+        nnz = indptr[-1]
+
+        # Range of data owned by local process (no ghost regions)
+        local = tuple( [slice(mi*p,-mi*p) for p,mi in zip(self._codomain.pads, self._codomain.shifts)]
+                       + [slice(None)] * self._ndim )
+        data  = self._data[local].ravel()
+
+        # Sum the values of duplicate entries, as in the COO format, and
+        # discard the entries outside of the domain (position nnz)
+        if np.iscomplexobj(data):
+            return np.bincount(position, weights=data.real, minlength=nnz+1)[:nnz] \
+                + 1j * np.bincount(position, weights=data.imag, minlength=nnz+1)[:nnz]
+        else:
+            return np.bincount(position, weights=data, minlength=nnz+1)[:nnz].astype(self.dtype, copy=False)
 
     #...
     def _tocoo_parallel_with_pads(self , order='C'):
@@ -1730,157 +2950,670 @@ class StencilMatrix(LinearOperator):
                  + (-p + mj * (p//mi) if mi == mj else 0)\
                  for mi, mj, n, p in zip(cm, dm, ndiagsT, pp)]
 
-        args={}
-        args['n']   = np.int64(nrows)
-        args['nc']  = np.int64(ncols)
-        args['gp']  = np.int64(gpads)
-        args['p']   = np.int64(pp)
-        args['dm']  = np.int64(dm)
-        args['cm']  = np.int64(cm)
-        args['nd']  = np.int64(ndiags)
-        args['ndT'] = np.int64(ndiagsT)
-        args['si']  = np.int64(si)
-        args['sk']  = np.int64(sk)
-        args['sl']  = np.int64(sl)
+        args={}
+        args['n']   = np.int64(nrows)
+        args['nc']  = np.int64(ncols)
+        args['gp']  = np.int64(gpads)
+        args['p']   = np.int64(pp)
+        args['dm']  = np.int64(dm)
+        args['cm']  = np.int64(cm)
+        args['nd']  = np.int64(ndiags)
+        args['ndT'] = np.int64(ndiagsT)
+        args['si']  = np.int64(si)
+        args['sk']  = np.int64(sk)
+        args['sl']  = np.int64(sl)
+
+        return args
+
+    # ...
+    def set_backend(self, backend):
+        from psydac.api.ast.linalg import LinearOperatorDot
+        if self._mixed and backend is not None:
+            raise NotImplementedError("Accelerated backends are not available for mixed-precision matrices.")
+
+        self._backend = backend
+        self._args    = self._dotargs_null.copy()
+        self._overlap_boxes = None
+
+        if self._backend is None:
+            for key, arg in self._args.items():
+                self._args[key] = np.int64(arg)
+            self._func = self._dot
+            self._args.pop('pads')
+            if self._num_threads > 1 and self._ndim in [1, 2, 3] and not self._mixed:
+                self._args['nthreads'] = np.int64(self._num_threads)
+        else:
+            if self.domain.parallel:
+                comm = self.codomain.cart.comm
+                if self.domain == self.codomain:
+                    # In this case nrows_extra[i] == 0 for all i
+                    dot = LinearOperatorDot(self._ndim,
+                                    block_shape = (1,1),
+                                    keys = ((0,0),),
+                                    comm = comm,
+                                    backend=frozenset(backend.items()),
+                                    nrows_extra = (self._args['nrows_extra'],),
+                                    gpads=(self._args['gpads'],),
+                                    pads=(self._args['pads'],),
+                                    dm = (self._args['dm'],),
+                                    cm = (self._args['cm'],),
+                                    dtype=self.dtype)
+
+                    starts = self._args.pop('starts')
+                    nrows  = self._args.pop('nrows')
+
+                    self._args.pop('nrows_extra')
+                    self._args.pop('gpads')
+                    self._args.pop('pads')
+                    self._args.pop('dm')
+                    self._args.pop('cm')
+
+                    for i in range(len(nrows)):
+                        self._args['s00_{i}'.format(i=i+1)] = np.int64(starts[i])
+
+                    for i in range(len(nrows)):
+                        self._args['n00_{i}'.format(i=i+1)] = np.int64(nrows[i])
+
+                else:
+                    dot = LinearOperatorDot(self._ndim,
+                                            block_shape = (1,1),
+                                            keys = ((0,0),),
+                                            comm = comm,
+                                            backend=frozenset(backend.items()),
+                                            gpads=(self._args['gpads'],),
+                                            pads=(self._args['pads'],),
+                                            dm = (self._args['dm'],),
+                                            cm = (self._args['cm'],),
+                                            dtype=self.dtype)
+
+                    starts      = self._args.pop('starts')
+                    nrows       = self._args.pop('nrows')
+                    nrows_extra = self._args.pop('nrows_extra')
+
+                    self._args.pop('gpads')
+                    self._args.pop('pads')
+                    self._args.pop('dm')
+                    self._args.pop('cm')
+
+                    for i in range(len(nrows)):
+                        self._args['s00_{i}'.format(i=i+1)] = np.int64(starts[i])
+
+                    for i in range(len(nrows)):
+                        self._args['n00_{i}'.format(i=i+1)] = np.int64(nrows[i])
+
+                    for i in range(len(nrows)):
+                        self._args['ne00_{i}'.format(i=i+1)] = np.int64(nrows_extra[i])
+
+            else:
+                dot = LinearOperatorDot(self._ndim,
+                                        block_shape = (1,1),
+                                        keys = ((0,0),),
+                                        comm = None,
+                                        backend=frozenset(backend.items()),
+                                        starts = (tuple(self._args['starts']),),
+                                        nrows=(tuple(self._args['nrows']),),
+                                        nrows_extra=(self._args['nrows_extra'],),
+                                        gpads=(self._args['gpads'],),
+                                        pads=(self._args['pads'],),
+                                        dm = (self._args['dm'],),
+                                        cm = (self._args['cm'],),
+                                        dtype=self.dtype)
+                self._args.pop('nrows')
+                self._args.pop('nrows_extra')
+                self._args.pop('gpads')
+                self._args.pop('pads')
+                self._args.pop('starts')
+                self._args.pop('dm')
+                self._args.pop('cm')
+
+            self._args.pop('pad_imp')
+            self._args.pop('ndiags')
+            self._func = dot.func
+
+    # ...
+    def _stored_diags(self, diags):
+        """
+        Number of stored diagonals along each direction, given the number
+        `diags` of diagonals in the band of the matrix.
+        """
+        return diags
+
+    # ...
+    def _get_diagonal_indices(self):
+        """
+        Compute the indices which should be applied to self._data in order to
+        get the matrix entries on the main diagonal. The result is also stored
+        in self._diag_indices, and retrieved from there on successive calls.
+
+        Returns
+        -------
+        tuple[numpy.ndarray, ndim]
+            The diagonal indices as a tuple of NumPy arrays of identical shape
+            (n1, n2, n3, ...).
+
+        """
+
+        if self._diag_indices is None:
+
+            dp    = self.domain.pads
+            dm    = self.domain.shifts
+            cm    = self.codomain.shifts
+            ss    = self.codomain.starts
+            pp    = [compute_diag_len(p, mj, mi) - p - 1 for p, mi, mj in zip(self._pads, cm, dm)]
+            nrows = [e - s + 1 for s, e in zip(self.codomain.starts, self.codomain.ends)]
+            ndim  = self.domain.ndim
+
+            indices = [np.zeros(np.prod(nrows), dtype=int) for _ in range(2 * ndim)]
+
+            for l, xx in enumerate(np.ndindex(*nrows)):
+                ii = [m * p + x for m, p, x in zip(dm, dp, xx)]
+                jj = [p + x + s - ((x+s) // mi) * mj for x, mi, mj, p, s in zip(xx, cm, dm, pp, ss)]
+                for k in range(ndim):
+                    indices[k][l] = ii[k]
+                    indices[k + ndim][l] = jj[k]
+
+            self._diag_indices = tuple(idx.reshape(nrows) for idx in indices)
+
+        return self._diag_indices
+
+#===============================================================================
+class SymmetricStencilMatrix(StencilMatrix):
+    """
+    Symmetric matrix (A = A^T) in n-dimensional stencil format, of which only
+    one half of the band is stored.
+
+    Only the diagonals with a non-negative offset along the first direction
+    (k1 >= 0) are stored, i.e. the entries A[i, i+k] with k1 >= 0. The other
+    entries are obtained by symmetry, A[i, i+k] = A[i+k, i], which roughly
+    halves the memory footprint and the memory traffic of the matrix-vector
+    product. The latter reads the stored entries of the neighboring rows in
+    the ghost regions of the matrix, which are updated automatically when
+    needed. The diagonals with k1 = 0 are stored for all the other offsets,
+    hence their entries must also be symmetric.
+
+    The entries are accessed with the same (i1, ..., in, k1, ..., kn) indices
+    as in a StencilMatrix, with the restriction k1 >= 0.
+
+    Parameters
+    ----------
+    V : psydac.linalg.stencil.StencilVectorSpace
+        Domain and codomain of the new linear operator.
+
+    W : psydac.linalg.stencil.StencilVectorSpace
+        Codomain of the new linear operator, which must be V (optional).
+
+    pads : tuple of int
+        Padding of the matrix, which must be equal to the padding of V
+        (optional).
+
+    backend : dict
+        Backend of the matrix (optional). It is stored, but the matrix-vector
+        product always uses the symmetric kernel.
+
+    dtype : type | str | numpy.dtype
+        Data type of the stored coefficients, which must be V.dtype (optional).
+    """
+    def __init__(self, V, W=None, pads=None, backend=None, dtype=None):
+
+        assert isinstance(V, StencilVectorSpace)
+        assert W is None or W is V
+
+        if any(m != 1 for m in V.shifts):
+            raise NotImplementedError("Symmetric storage is only available for spaces with shifts equal to 1.")
+        if pads is not None and tuple(pads) != tuple(V.pads):
+            raise NotImplementedError("The padding of a symmetric matrix must be equal to the padding of its space.")
+        if dtype is not None and np.dtype(dtype) != np.dtype(V.dtype):
+            raise NotImplementedError("The coefficients of a symmetric matrix must have the data type of its space.")
+
+        super().__init__(V, V, pads=pads, backend=backend)
+
+    #--------------------------------------
+    # Abstract interface
+    #--------------------------------------
+    def dot(self, v, out=None):
+        # The product reads the stored entries of the neighboring rows
+        if not self._sync:
+            self.update_ghost_regions()
+        return super().dot(v, out)
+
+    # ...
+    def vdot(self, v, out=None):
+        if not self._sync:
+            self.update_ghost_regions()
+        return super().vdot(v, out)
+
+    # ...
+    def _dot_multi(self, v, out=None):
+        assert v.space is self.domain
+
+        if out is not None:
+            assert isinstance(out, StencilMultiVector)
+            assert out.space is self.codomain
+            assert out.nvecs == v.nvecs
+        else:
+            out = StencilMultiVector(self.codomain, v.nvecs)
+
+        for j in range(v.nvecs):
+            out.set_column(j, self.dot(v.column(j)))
+
+        return out
+
+    # ...
+    def transpose(self, conjugate=False, out=None):
+        """
+        Return the transposed matrix, i.e. a copy of self, or the Hermitian
+        transpose if conjugate==True.
+
+        Parameters
+        ----------
+        conjugate : Bool(optional)
+            True to get the Hermitian adjoint.
+
+        out : SymmetricStencilMatrix(optional)
+            Optional out for the transpose to avoid temporaries
+        """
+        out = self.copy(out=out)
+        if conjugate:
+            np.conjugate(out._data, out=out._data)
+        return out
+
+    # ...
+    def toarray(self, **kwargs):
+        """ Convert to Numpy 2D array. """
+        return self.tostencil().toarray(**kwargs)
+
+    # ...
+    def tosparse(self, **kwargs):
+        """ Convert to any Scipy sparse matrix format. """
+        return self.tostencil().tosparse(**kwargs)
+
+    # ...
+    def tocsr(self, order='C'):
+        return self.tostencil().tocsr(order=order)
+
+    # ...
+    def update_values(self, M, order='C'):
+        return self.tostencil().update_values(M, order=order)
+
+    #--------------------------------------
+    # Overridden properties/methods
+    #--------------------------------------
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._sync = False
+
+    # ...
+    def tocoo_local(self, order='C'):
+        return self.tostencil().tocoo_local(order=order)
+
+    # ...
+    def topetsc(self):
+        """ Convert to PETSc data structure.
+        """
+        return self.tostencil().topetsc()
+
+    # ...
+    def remove_spurious_entries(self):
+        """
+        If any dimension is NOT periodic, make sure that the entries which
+        would couple a row with a column outside of the domain are set to zero.
+
+        """
+        V    = self._domain
+        ndim = self._ndim
+
+        for direction in range(ndim):
+
+            if V.periods[direction]:
+                continue
+
+            n = V.npts  [direction]
+            s = V.starts[direction]
+            e = V.ends  [direction]
+            p = self._pads[direction]
+
+            # Offsets of the stored diagonals, and their index in self._data
+            offsets = range(p+1) if direction == 0 else range(-p, p+1)
+            shift   = 0          if direction == 0 else p
+
+            for i in range(s, e+1):
+                for k in offsets:
+                    if 0 <= i+k < n:
+                        continue
+                    index = [slice(None)] * (2*ndim)
+                    index[direction]        = V.pads[direction] + i - s
+                    index[ndim + direction] = k + shift
+                    self._data[tuple(index)] = 0
+
+        self._sync = False
+
+    # ...
+    def update_ghost_regions(self):
+        """
+        Update ghost regions, which are read by the matrix-vector product.
+        """
+        super().update_ghost_regions()
+
+        # The ghost regions beyond a non-periodic boundary are not updated by
+        # the data exchanger, they must not contribute to the product
+        V = self._codomain
+        if V.parallel and not V.cart.is_comm_null:
+            ndim = self._ndim
+            for direction in range(ndim):
+                if V.periods[direction]:
+                    continue
+                p = V.pads[direction]
+                idx_front = [slice(None)]*direction
+                idx_back  = [slice(None)]*(ndim-direction-1 + ndim)
+                if V.starts[direction] == 0:
+                    self._data[tuple(idx_front + [slice(None, p)] + idx_back)] = 0
+                if V.ends[direction] == V.npts[direction]-1:
+                    self._data[tuple(idx_front + [slice(-p, None)] + idx_back)] = 0
+
+    # ...
+    def exchange_assembly_data(self):
+        super().exchange_assembly_data()
+        self._sync = False
+
+    # ...
+    def set_backend(self, backend):
+        self._backend = backend
+        self._args    = {key: np.int64(arg) for key, arg in self._dotargs_null.items() if key != 'pads'}
+        self._func    = kernels['matvec_symmetric'][self._ndim]
+        self._overlap_boxes = None
+
+    #--------------------------------------
+    # New properties/methods
+    #--------------------------------------
+    def tostencil(self):
+        """
+        Create a StencilMatrix which stores all the diagonals of self.
+
+        Returns
+        -------
+        StencilMatrix
+            Matrix with the same entries as self, and the same domain,
+            codomain and padding.
+        """
+        if not self._sync:
+            self.update_ghost_regions()
+
+        V    = self._domain
+        ndim = self._ndim
+        pp   = self._pads
+        M    = StencilMatrix(V, V, pads=pp)
+
+        # Upper half of the band: the stored diagonals (k1 >= 0)
+        M._data[(slice(None),)*ndim + (slice(pp[0], None),)] = self._data
+
+        # Lower half of the band: A[i, i+k] = A[i+k, i] for k1 < 0
+        for k in np.ndindex(*[p+1 if d == 0 else 2*p+1 for d, p in enumerate(pp)]):
+            kk = [-k[0]] + [l-p for l, p in zip(k[1:], pp[1:])]
+            if kk[0] == 0:
+                continue
+            rows = [slice(gp, gp+e-s+1)       for gp, s, e    in zip(V.pads, V.starts, V.ends)]
+            cols = [slice(gp+j, gp+j+e-s+1)   for gp, s, e, j in zip(V.pads, V.starts, V.ends, kk)]
+            M._data[tuple(rows) + tuple(p+j for p, j in zip(pp, kk))] = \
+                self._data[tuple(cols) + (-kk[0],) + tuple(p-j for p, j in zip(pp[1:], kk[1:]))]
+
+        return M
+
+    #--------------------------------------
+    # Private methods
+    #--------------------------------------
+    def _stored_diags(self, diags):
+        return [self._pads[0]+1] + list(diags[1:])
+
+    # ...
+    def _getindex(self, key):
+
+        nd = self._ndim
+        ii = key[:nd]
+        kk = key[nd:]
+
+        k1 = kk[0]
+        if isinstance(k1, slice):
+            negative = any(x is not None and x < 0 for x in (k1.start, k1.stop))
+        else:
+            negative = k1 < 0
+        if negative:
+            raise IndexError("Only the diagonals with k1 >= 0 are stored in a SymmetricStencilMatrix.")
+
+        index = [self._shift_index(i, p-s) for i, s, p in zip(ii, self._codomain.starts, self._codomain.pads)]
+        index.append(k1)
+        index.extend(self._shift_index(k, p) for k, p in zip(kk[1:], self._pads[1:]))
+        return tuple(index)
+
+    # ...
+    def _get_diagonal_indices(self):
+        if self._diag_indices is None:
+            indices = list(super()._get_diagonal_indices())
+            indices[self._ndim] = np.zeros_like(indices[self._ndim])
+            self._diag_indices = tuple(indices)
+        return self._diag_indices
+
+#===============================================================================
+class StencilCopyOperator(LinearOperator):
+    """
+    Linear operator which copies the stencil vectors of a space to a space
+    with the same decomposition and different ghost regions, such as the
+    spaces obtained with `StencilVectorSpace.widened`. It is the identity in
+    the global numbering, and it only copies the coefficients owned by each
+    process: as such it requires no data communication.
+
+    The copies between a space and its widened spaces are usually obtained
+    with `StencilVectorSpace.extension` and `StencilVectorSpace.restriction`,
+    which cache them.
+
+    Parameters
+    ----------
+    V : psydac.linalg.stencil.StencilVectorSpace
+        Domain of the new linear operator.
+
+    W : psydac.linalg.stencil.StencilVectorSpace
+        Codomain of the new linear operator, with the same decomposition as V.
+
+    """
+    def __init__(self, V, W):
+
+        assert isinstance(V, StencilVectorSpace)
+        assert isinstance(W, StencilVectorSpace)
+        assert V.npts   == W.npts
+        assert V.starts == W.starts
+        assert V.ends   == W.ends
+        assert V.shifts == W.shifts
+        assert V.dtype  == W.dtype
+
+        self._domain   = V
+        self._codomain = W
+
+        # Local indices of the owned coefficients in the data of each space
+        self._index_V = tuple(slice(m*p, m*p+e-s+1) for s, e, p, m in zip(V.starts, V.ends, V.pads, V.shifts))
+        self._index_W = tuple(slice(m*p, m*p+e-s+1) for s, e, p, m in zip(W.starts, W.ends, W.pads, W.shifts))
+
+    #--------------------------------------
+    # Abstract interface
+    #--------------------------------------
+    @property
+    def domain(self):
+        return self._domain
+
+    @property
+    def codomain(self):
+        return self._codomain
+
+    @property
+    def dtype(self):
+        return self._domain.dtype
+
+    def tosparse(self):
+        return sp_diags(np.ones(self._domain.dimension, dtype=self.dtype), format='csr')
+
+    def toarray(self):
+        return np.eye(self._domain.dimension, dtype=self.dtype)
+
+    def dot(self, v, out=None):
+
+        assert isinstance(v, StencilVector)
+        assert v.space is self._domain
+
+        if out is not None:
+            assert isinstance(out, StencilVector)
+            assert out.space is self._codomain
+        else:
+            out = self._codomain.zeros()
+
+        out._data[self._index_W] = v._data[self._index_V]
+        out.ghost_regions_in_sync = False
+
+        return out
+
+    def transpose(self, conjugate=False):
+        return StencilCopyOperator(self._codomain, self._domain)
+
+#===============================================================================
+class WideStencilMatrix(LinearOperator):
+    """
+    Matrix between two stencil vector spaces V and W, whose padding is larger
+    than the ghost regions of these spaces. Such matrices are obtained with
+    `StencilMatrix.matmat`, e.g. for the product of a mass matrix by itself.
+
+    The matrix is stored as a StencilMatrix M between the spaces with the same
+    decompositions as V and W and wider ghost regions (see
+    `StencilVectorSpace.widened`). It is applied as R @ M @ E, where E is the
+    extension from V and R the restriction to W: besides the product with M,
+    this only copies the owned coefficients to and from two work vectors,
+    which are allocated once.
+
+    Parameters
+    ----------
+    V : psydac.linalg.stencil.StencilVectorSpace
+        Domain of the new linear operator.
 
-        return args
+    W : psydac.linalg.stencil.StencilVectorSpace
+        Codomain of the new linear operator.
 
-    # ...
-    def set_backend(self, backend):
-        from psydac.api.ast.linalg import LinearOperatorDot
-        self._backend = backend
-        self._args    = self._dotargs_null.copy()
+    matrix : psydac.linalg.stencil.StencilMatrix
+        Matrix between spaces widened from V and W.
 
-        if self._backend is None:
-            for key, arg in self._args.items():
-                self._args[key] = np.int64(arg)
-            self._func = self._dot
-            self._args.pop('pads')
-        else:
-            if self.domain.parallel:
-                comm = self.codomain.cart.comm
-                if self.domain == self.codomain:
-                    # In this case nrows_extra[i] == 0 for all i
-                    dot = LinearOperatorDot(self._ndim,
-                                    block_shape = (1,1),
-                                    keys = ((0,0),),
-                                    comm = comm,
-                                    backend=frozenset(backend.items()),
-                                    nrows_extra = (self._args['nrows_extra'],),
-                                    gpads=(self._args['gpads'],),
-                                    pads=(self._args['pads'],),
-                                    dm = (self._args['dm'],),
-                                    cm = (self._args['cm'],),
-                                    dtype=self.dtype)
+    """
+    def __init__(self, V, W, matrix):
 
-                    starts = self._args.pop('starts')
-                    nrows  = self._args.pop('nrows')
+        assert isinstance(V, StencilVectorSpace)
+        assert isinstance(W, StencilVectorSpace)
+        assert isinstance(matrix, StencilMatrix)
+        assert matrix.domain   is V.widened(matrix.domain.pads)
+        assert matrix.codomain is W.widened(matrix.codomain.pads)
 
-                    self._args.pop('nrows_extra')
-                    self._args.pop('gpads')
-                    self._args.pop('pads')
-                    self._args.pop('dm')
-                    self._args.pop('cm')
+        self._domain      = V
+        self._codomain    = W
+        self._matrix      = matrix
+        self._extension   = V.extension(matrix.domain.pads)
+        self._restriction = W.restriction(matrix.codomain.pads)
+        self._work        = None
 
-                    for i in range(len(nrows)):
-                        self._args['s00_{i}'.format(i=i+1)] = np.int64(starts[i])
+    #--------------------------------------
+    # Abstract interface
+    #--------------------------------------
+    @property
+    def domain(self):
+        return self._domain
 
-                    for i in range(len(nrows)):
-                        self._args['n00_{i}'.format(i=i+1)] = np.int64(nrows[i])
+    @property
+    def codomain(self):
+        return self._codomain
 
-                else:
-                    dot = LinearOperatorDot(self._ndim,
-                                            block_shape = (1,1),
-                                            keys = ((0,0),),
-                                            comm = comm,
-                                            backend=frozenset(backend.items()),
-                                            gpads=(self._args['gpads'],),
-                                            pads=(self._args['pads'],),
-                                            dm = (self._args['dm'],),
-                                            cm = (self._args['cm'],),
-                                            dtype=self.dtype)
+    @property
+    def dtype(self):
+        return self._matrix.dtype
 
-                    starts      = self._args.pop('starts')
-                    nrows       = self._args.pop('nrows')
-                    nrows_extra = self._args.pop('nrows_extra')
+    def tosparse(self, **kwargs):
+        return self._matrix.tosparse(**kwargs)
 
-                    self._args.pop('gpads')
-                    self._args.pop('pads')
-                    self._args.pop('dm')
-                    self._args.pop('cm')
+    def toarray(self, **kwargs):
+        return self._matrix.toarray(**kwargs)
 
-                    for i in range(len(nrows)):
-                        self._args['s00_{i}'.format(i=i+1)] = np.int64(starts[i])
+    def dot(self, v, out=None):
 
-                    for i in range(len(nrows)):
-                        self._args['n00_{i}'.format(i=i+1)] = np.int64(nrows[i])
+        assert isinstance(v, StencilVector)
+        assert v.space is self._domain
 
-                    for i in range(len(nrows)):
-                        self._args['ne00_{i}'.format(i=i+1)] = np.int64(nrows_extra[i])
+        if self._work is None:
+            self._work = (self._matrix.domain.zeros(), self._matrix.codomain.zeros())
+        x, y = self._work
 
-            else:
-                dot = LinearOperatorDot(self._ndim,
-                                        block_shape = (1,1),
-                                        keys = ((0,0),),
-                                        comm = None,
-                                        backend=frozenset(backend.items()),
-                                        starts = (tuple(self._args['starts']),),
-                                        nrows=(tuple(self._args['nrows']),),
-                                        nrows_extra=(self._args['nrows_extra'],),
-                                        gpads=(self._args['gpads'],),
-                                        pads=(self._args['pads'],),
-                                        dm = (self._args['dm'],),
-                                        cm = (self._args['cm'],),
-                                        dtype=self.dtype)
-                self._args.pop('nrows')
-                self._args.pop('nrows_extra')
-                self._args.pop('gpads')
-                self._args.pop('pads')
-                self._args.pop('starts')
-                self._args.pop('dm')
-                self._args.pop('cm')
+        self._extension.dot(v, out=x)
+        self._matrix.dot(x, out=y)
+        return self._restriction.dot(y, out=out)
 
-            self._args.pop('pad_imp')
-            self._args.pop('ndiags')
-            self._func = dot.func
+    def transpose(self, conjugate=False):
+        return WideStencilMatrix(self._codomain, self._domain, self._matrix.transpose(conjugate=conjugate))
 
-    # ...
-    def _get_diagonal_indices(self):
-        """
-        Compute the indices which should be applied to self._data in order to
-        get the matrix entries on the main diagonal. The result is also stored
-        in self._diag_indices, and retrieved from there on successive calls.
+    #--------------------------------------
+    # Other properties/methods
+    #--------------------------------------
+    @property
+    def matrix(self):
+        """ The StencilMatrix between the widened spaces. """
+        return self._matrix
 
-        Returns
-        -------
-        tuple[numpy.ndarray, ndim]
-            The diagonal indices as a tuple of NumPy arrays of identical shape
-            (n1, n2, n3, ...).
+    @property
+    def pads(self):
+        return self._matrix.pads
 
-        """
+    def copy(self):
+        return WideStencilMatrix(self._domain, self._codomain, self._matrix.copy())
 
-        if self._diag_indices is None:
+    def matmat(self, B, pads=None):
+        """
+        Compute the matrix product C = self @ B explicitly, in stencil format.
+        See `StencilMatrix.matmat`.
+        """
+        return StencilMatrix._matmat_sum([(self, B)], pads=pads)
 
-            dp    = self.domain.pads
-            dm    = self.domain.shifts
-            cm    = self.codomain.shifts
-            ss    = self.codomain.starts
-            pp    = [compute_diag_len(p, mj, mi) - p - 1 for p, mi, mj in zip(self._pads, cm, dm)]
-            nrows = [e - s + 1 for s, e in zip(self.codomain.starts, self.codomain.ends)]
-            ndim  = self.domain.ndim
+    # ...
+    def _merged_with(self, m):
+        """
+        Get the matrices of self and of the StencilMatrix or WideStencilMatrix
+        m, with the same padding and on the same widened spaces.
+        """
+        A = self._matrix
+        B = m._matrix if isinstance(m, WideStencilMatrix) else m
+        if isinstance(B, SymmetricStencilMatrix):
+            B = B.tostencil()
+        pads  = tuple(max(p, q) for p, q in zip(A.pads, B.pads))
+        gpads = tuple(max(X.pads[d] for X in (A.domain, A.codomain, B.domain, B.codomain)) for d in range(len(pads)))
+        return A._widened(pads, gpads), B._widened(pads, gpads)
 
-            indices = [np.zeros(np.prod(nrows), dtype=int) for _ in range(2 * ndim)]
+    #--------------------------------------
+    # Overridden properties/methods
+    #--------------------------------------
+    def __neg__(self):
+        return WideStencilMatrix(self._domain, self._codomain, -self._matrix)
 
-            for l, xx in enumerate(np.ndindex(*nrows)):
-                ii = [m * p + x for m, p, x in zip(dm, dp, xx)]
-                jj = [p + x + s - ((x+s) // mi) * mj for x, mi, mj, p, s in zip(xx, cm, dm, pp, ss)]
-                for k in range(ndim):
-                    indices[k][l] = ii[k]
-                    indices[k + ndim][l] = jj[k]
+    # ...
+    def __mul__(self, a):
+        return WideStencilMatrix(self._domain, self._codomain, self._matrix * a)
 
-            self._diag_indices = tuple(idx.reshape(nrows) for idx in indices)
+    # ...
+    def __add__(self, m):
+        if isinstance(m, (StencilMatrix, WideStencilMatrix)):
+            assert m.domain   is self._domain
+            assert m.codomain is self._codomain
+            A, B = self._merged_with(m)
+            return WideStencilMatrix(self._domain, self._codomain, A + B)
+        else:
+            return LinearOperator.__add__(self, m)
 
-        return self._diag_indices
+    # ...
+    def __sub__(self, m):
+        if isinstance(m, (StencilMatrix, WideStencilMatrix)):
+            assert m.domain   is self._domain
+            assert m.codomain is self._codomain
+            A, B = self._merged_with(m)
+            return WideStencilMatrix(self._domain, self._codomain, A - B)
+        else:
+            return LinearOperator.__sub__(self, m)
 
 #===============================================================================
 class StencilDiagonalMatrix(LinearOperator):
@@ -2062,6 +3795,169 @@ class StencilDiagonalMatrix(LinearOperator):
 
         return out
 
+#===============================================================================
+class StencilILU0(LinearOperator):
+    """
+    Incomplete LU factorization without fill-in, ILU(0), of a square
+    StencilMatrix, used as a preconditioner.
+
+    The factors L (unit lower triangular) and U (upper triangular) have the
+    same sparsity pattern as the stencil, so they are stored together in an
+    array with the layout of the matrix data (restricted to the locally owned
+    rows), and their application consists of a forward and a backward sweep
+    with compiled kernels. The rows are ordered lexicographically.
+
+    The factorization is local to each process: the couplings with the
+    degrees of freedom owned by other processes, as well as the couplings
+    through periodic boundaries, are dropped (block-ILU). No communication
+    is needed to build or apply the preconditioner.
+
+    Parameters
+    ----------
+    A : psydac.linalg.stencil.StencilMatrix
+        Square matrix, whose domain and codomain have shifts equal to 1.
+
+    """
+    _factorize = 'ilu0'
+
+    def __init__(self, A):
+
+        assert isinstance(A, StencilMatrix)
+        assert A.domain is A.codomain
+
+        V = A.domain
+        if any(m != 1 for m in V.shifts):
+            raise NotImplementedError('The incomplete factorizations are only available for spaces with shifts equal to 1.')
+
+        if isinstance(A, SymmetricStencilMatrix):
+            A = A.tostencil()
+
+        # Locally owned rows, with the couplings outside of the local box set to zero
+        ndim  = V.ndim
+        pads  = A.pads
+        rows  = tuple(slice(gp, gp + e - s + 1) for gp, s, e in zip(V.pads, V.starts, V.ends))
+        shape = tuple(e - s + 1 for s, e in zip(V.starts, V.ends))
+        F     = np.array(A._data[rows], dtype=V.dtype)
+
+        for d in range(ndim):
+            i = np.arange(shape[d])
+            for k in range(-pads[d], pads[d] + 1):
+                index = [slice(None)] * (2 * ndim)
+                index[d] = (i + k < 0) | (i + k >= shape[d])
+                index[ndim + d] = pads[d] + k
+                F[tuple(index)] = 0
+
+        kernels[self._factorize][ndim](F, np.int64(pads))
+
+        diag = F[tuple(slice(None) for _ in range(ndim)) + tuple(pads)]
+        self._check_pivots(diag)
+
+        self._domain   = V
+        self._codomain = V
+        self._factors  = F
+        self._pads     = tuple(pads)
+        self._trans    = 'N'
+
+    #--------------------------------------
+    # Abstract interface
+    #--------------------------------------
+    @property
+    def domain(self):
+        return self._domain
+
+    @property
+    def codomain(self):
+        return self._codomain
+
+    @property
+    def dtype(self):
+        return self._domain.dtype
+
+    def toarray(self):
+        raise NotImplementedError('toarray() is not defined for {}.'.format(type(self).__name__))
+
+    def tosparse(self):
+        raise NotImplementedError('tosparse() is not defined for {}.'.format(type(self).__name__))
+
+    def transpose(self, conjugate=False):
+        trans = 'H' if conjugate else 'T'
+        if self._trans not in ('N', trans):
+            raise NotImplementedError('Cannot combine a transpose and a Hermitian transpose.')
+
+        # The transpose shares the factors
+        obj = type(self).__new__(type(self))
+        obj.__dict__.update(self.__dict__)
+        obj._trans = trans if self._trans == 'N' else 'N'
+        return obj
+
+    def dot(self, v, out=None):
+        """
+        Apply the preconditioner to the vector v, i.e. solve the triangular
+        systems L U x = v (or their transposes) on the locally owned part of v.
+        """
+        assert isinstance(v, StencilVector)
+        assert v.space is self.domain
+        if out is not None:
+            assert isinstance(out, StencilVector)
+            assert out.space is self.codomain
+            assert out is not v
+        else:
+            out = self.codomain.zeros()
+
+        V     = self.domain
+        ndim  = V.ndim
+        gpads = np.int64(V.pads)
+        pads  = np.int64(self._pads)
+
+        if self._trans == 'N':
+            kernels['ilu0_solve'][ndim](self._factors, v._data, out._data, gpads, pads)
+        else:
+            kernels['ilu0_solve_transpose'][ndim](self._factors, v._data, out._data, gpads, pads, self._trans == 'H')
+
+        out.ghost_regions_in_sync = False
+        return out
+
+    #--------------------------------------
+    # Private methods
+    #--------------------------------------
+    @staticmethod
+    def _check_pivots(diag):
+        if not np.all(np.isfinite(diag)) or np.any(diag == 0):
+            raise ValueError('Zero pivot in the incomplete LU factorization.')
+
+#===============================================================================
+class StencilIC0(StencilILU0):
+    """
+    Incomplete Cholesky factorization without fill-in, IC(0), of a square
+    Hermitian positive definite StencilMatrix, used as a preconditioner.
+
+    The factorization A ~ L D L^H only reads the lower triangular part of the
+    matrix, and the upper triangular factor U = D L^H is stored as in
+    StencilILU0 so that the same sweeps are used. The preconditioner is
+    Hermitian positive definite, and hence suited to PConjugateGradient.
+
+    As for StencilILU0, the factorization is local to each process, and the
+    couplings through periodic boundaries are dropped.
+
+    Parameters
+    ----------
+    A : psydac.linalg.stencil.StencilMatrix
+        Square Hermitian positive definite matrix, whose domain and codomain
+        have shifts equal to 1.
+
+    """
+    _factorize = 'ic0'
+
+    def transpose(self, conjugate=False):
+        if conjugate or self.dtype != complex:
+            return self
+        return super().transpose(conjugate=conjugate)
+
+    @staticmethod
+    def _check_pivots(diag):
+        if not np.all(np.isfinite(diag)) or np.any(diag.real <= 0):
+            raise ValueError('Non-positive pivot in the incomplete Cholesky factorization: the matrix is not positive definite.')
+
 #===============================================================================
 # TODO [YG, 28.01.2021]:
 # - Check if StencilMatrix should be subclassed
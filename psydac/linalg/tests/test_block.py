@@ -6,7 +6,7 @@ from scipy.sparse import csr_matrix
 from random import random, seed
 
 from psydac.linalg.direct_solvers import SparseSolver
-from psydac.linalg.stencil        import StencilVectorSpace, StencilVector, StencilMatrix
+from psydac.linalg.stencil        import StencilVectorSpace, StencilVector, StencilMatrix, WideStencilMatrix
 from psydac.linalg.block          import BlockVectorSpace, BlockVector
 from psydac.linalg.block          import BlockLinearOperator
 from psydac.linalg.utilities      import array_to_psydac, petsc_to_psydac
@@ -725,6 +725,70 @@ def test_block_linear_operator_serial_dot( dtype, n1, n2, p1, p2, P1, P2  ):
     assert np.allclose( Y.blocks[1].toarray(), y2.toarray(), rtol=1e-14, atol=1e-14 )
 #===============================================================================
 @pytest.mark.parametrize( 'dtype', [float, complex] )
+@pytest.mark.parametrize( 'n1', [8, 12] )
+@pytest.mark.parametrize( 'n2', [9] )
+@pytest.mark.parametrize( 'p1', [1, 2] )
+@pytest.mark.parametrize( 'p2', [1] )
+@pytest.mark.parametrize( 'P1', [True, False] )
+@pytest.mark.parametrize( 'P2', [True] )
+
+def test_block_linear_operator_serial_matmat( dtype, n1, n2, p1, p2, P1, P2 ):
+    # set seed for reproducibility
+    rng = np.random.default_rng(n1*n2*p1*p2)
+
+    D = DomainDecomposition([n1,n2], periods=[P1,P2])
+
+    # Partition the points, with ghost regions which only hold the band of the factors
+    npts = [n1,n2]
+    global_starts, global_ends = compute_global_starts_ends(D, npts)
+
+    cart = CartDecomposition(D, npts, global_starts, global_ends, pads=[p1,p2], shifts=[1,1])
+
+    # Create vector spaces and stencil matrices with random entries
+    V = StencilVectorSpace( cart, dtype=dtype )
+    M = [StencilMatrix( V, V ) for _ in range(4)]
+    for Mi in M:
+        Mi._data[...] = rng.random(Mi._data.shape)
+        if dtype==complex:
+            Mi._data[...] += 1j*rng.random(Mi._data.shape)
+        Mi.remove_spurious_entries()
+
+    W = BlockVectorSpace(V, V)
+
+    #     |M0  M1|       |M3  0 |
+    # L = |      |,  K = |      |
+    #     |M2  0 |       |M0  M1|
+
+    L = BlockLinearOperator( W, W, blocks={(0,0):M[0], (0,1):M[1], (1,0):M[2]} )
+    K = BlockLinearOperator( W, W, blocks={(0,0):M[3], (1,0):M[0], (1,1):M[1]} )
+
+    # The blocks of the product are stored on widened spaces
+    LK = L.matmat(K)
+    assert isinstance(LK, BlockLinearOperator)
+    assert LK.domain is W and LK.codomain is W
+    assert all(isinstance(LK[ij], WideStencilMatrix) for ij in LK.nonzero_block_indices)
+    assert np.allclose( LK.toarray(), L.toarray() @ K.toarray(), rtol=1e-14, atol=1e-14 )
+
+    # Same product as the composition, on the vectors of the factors
+    X = BlockVector(W, blocks=[StencilVector(V), StencilVector(V)])
+    for x in X.blocks:
+        x[0:n1, 0:n2] = rng.random((n1, n2))
+    assert np.allclose( LK.dot(X).toarray(), L.dot(K.dot(X)).toarray(), rtol=1e-14, atol=1e-14 )
+
+    # Products with a block product, whose blocks are wide
+    LKL = LK.matmat(L)
+    assert LKL.domain is W and LKL.codomain is W
+    assert np.allclose( LKL.toarray(), L.toarray() @ K.toarray() @ L.toarray(), rtol=1e-13, atol=1e-13 )
+
+    # Row times column of blocks gives a single block
+    R = BlockLinearOperator( W, V, blocks=[[M[0], M[1]]] )
+    S = BlockLinearOperator( V, W, blocks=[[M[2]], [M[3]]] )
+    RS = R.matmat(S)
+    assert isinstance(RS, WideStencilMatrix)
+    assert RS.domain is RS.codomain is V
+    assert np.allclose( RS.toarray(), R.toarray() @ S.toarray(), rtol=1e-14, atol=1e-14 )
+#===============================================================================
+@pytest.mark.parametrize( 'dtype', [float, complex] )
 @pytest.mark.parametrize( 'n1', [8, 16] )
 @pytest.mark.parametrize( 'n2', [8, 12] )
 @pytest.mark.parametrize( 'p1', [1, 2] )
@@ -1505,6 +1569,130 @@ def test_block_matrix_operator_parallel_dot_backend( dtype, n1, n2, p1, p2, P1,
     assert np.allclose( Y.blocks[0].toarray(), y1.toarray(), rtol=1e-13, atol=1e-13 )
     assert np.allclose( Y.blocks[1].toarray(), y2.toarray(), rtol=1e-13, atol=1e-13 )
 
+#===============================================================================
+@pytest.mark.parametrize( 'dtype', [float, complex] )
+@pytest.mark.parametrize( 'n1', [8, 15] )
+@pytest.mark.parametrize( 'n2', [9] )
+@pytest.mark.parametrize( 'p1', [1, 2] )
+@pytest.mark.parametrize( 'p2', [2] )
+@pytest.mark.parallel
+def test_block_vector_2d_parallel_fused_ops( dtype, n1, n2, p1, p2 ):
+    from mpi4py import MPI
+    from psydac.linalg.solvers import inverse
+
+    comm = MPI.COMM_WORLD
+    D = DomainDecomposition([n1,n2], periods=[True,False], comm=comm)
+
+    # Partition the points
+    npts = [n1,n2]
+    global_starts, global_ends = compute_global_starts_ends(D, npts)
+    cart = CartDecomposition(D, npts, global_starts, global_ends, pads=[p1,p2], shifts=[1,1])
+
+    # Create vector spaces and block vectors with random data
+    V = StencilVectorSpace( cart, dtype=dtype )
+    W = BlockVectorSpace(V, V)
+    assert W.reduction_comm == V.reduction_comm
+
+    rng = np.random.default_rng(comm.rank)
+    x, y = W.zeros(), W.zeros()
+    for v in (x, y):
+        for b in v.blocks:
+            b._data[...] = rng.random(b._data.shape)
+            if dtype == complex:
+                b._data[...] += 1j * rng.random(b._data.shape)
+
+    # The inner product uses a single reduction for all blocks
+    ref = x[0].dot(y[0]) + x[1].dot(y[1])
+    assert np.isclose(x.dot(y), ref, rtol=1e-13, atol=1e-13)
+    assert np.isclose(comm.allreduce(x.local_dot(y)), ref, rtol=1e-13, atol=1e-13)
+
+    # Fused vector updates
+    cst = 0.5 - 2j if dtype == complex else -1.5
+    z   = y + cst * x
+    res = y.mul_iadd_norm_sqr(cst, x)
+    assert np.allclose(y.toarray(), z.toarray(), rtol=1e-14, atol=1e-14)
+    assert np.isclose(res, z.dot(z).real, rtol=1e-13, atol=1e-13)
+
+    z = x + cst * y
+    y.xpay(cst, x)
+    assert np.allclose(y.toarray(), z.toarray(), rtol=1e-14, atol=1e-14)
+
+    # Pipelined CG with a block-diagonal hermitian positive definite matrix
+    M = StencilMatrix(V, V)
+    M[:, :, 0, 0] = 4
+    M[:, :, -1, 0] = -1
+    M[:, :, 1, 0] = -1
+    M[:, :, 0, -1] = -1
+    M[:, :, 0, 1] = -1
+    M.remove_spurious_entries()
+    A = BlockLinearOperator(W, W, blocks=[[M, None], [None, 2*M]])
+
+    b = A @ x
+    for kwargs in [{}, {'pc': A.diagonal(inverse=True)}]:
+        x1 = inverse(A, 'pipelined_cg', tol=1e-12, maxiter=1000, **kwargs) @ b
+        assert np.allclose(x1.toarray(), x.toarray(), rtol=1e-9, atol=1e-9)
+
+#===============================================================================
+@pytest.mark.parametrize( 'dtype', [float, complex] )
+@pytest.mark.parametrize( 'n1', [8, 15] )
+@pytest.mark.parametrize( 'n2', [9] )
+@pytest.mark.parametrize( 'p1', [1, 2] )
+@pytest.mark.parametrize( 'p2', [2] )
+@pytest.mark.parametrize( 'P1', [True, False] )
+@pytest.mark.parallel
+def test_block_linear_operator_2d_parallel_overlapped_dot( dtype, n1, n2, p1, p2, P1 ):
+    from mpi4py import MPI
+
+    comm = MPI.COMM_WORLD
+    D = DomainDecomposition([n1,n2], periods=[P1,False], comm=comm)
+
+    # Partition the points
+    npts = [n1,n2]
+    global_starts, global_ends = compute_global_starts_ends(D, npts)
+    cart = CartDecomposition(D, npts, global_starts, global_ends, pads=[p1,p2], shifts=[1,1])
+
+    V = StencilVectorSpace( cart, dtype=dtype )
+    W = BlockVectorSpace(V, V)
+
+    # Random block matrix with a missing block, and random block vector
+    rng = np.random.default_rng(comm.rank)
+    blocks = [StencilMatrix(V, V) for _ in range(3)]
+    for M in blocks:
+        M._data[...] = rng.random(M._data.shape)
+        if dtype == complex:
+            M._data[...] += 1j * rng.random(M._data.shape)
+        M.remove_spurious_entries()
+    L = BlockLinearOperator(W, W, blocks=[[blocks[0], blocks[1]], [None, blocks[2]]])
+
+    x = W.zeros()
+    for b in x.blocks:
+        b._data[...] = rng.random(b._data.shape)
+
+    # Reference result, obtained without overlapping the communication
+    for M in blocks:
+        M.overlap_communication = False
+    assert L._get_overlap_boxes() is None
+    y_ref = L.dot(x)
+
+    # Overlapped product, on a vector whose ghost regions are not up to date
+    for M in blocks:
+        M.overlap_communication = True
+    x.ghost_regions_in_sync = False
+    boxes = L._get_overlap_boxes()
+    y = L.dot(x)
+    assert x.ghost_regions_in_sync
+    if boxes is not None:
+        assert len(L._overlap_tmps) == 3
+
+    for yi, yi_ref in zip(y.blocks, y_ref.blocks):
+        assert np.allclose(yi.toarray(), yi_ref.toarray(), rtol=1e-14, atol=1e-14)
+
+    # Rectangular operator with a single block row
+    R = BlockLinearOperator(W, V, blocks=[[blocks[0], blocks[2]]])
+    x.ghost_regions_in_sync = False
+    y = R.dot(x)
+    assert np.allclose(y.toarray(), (blocks[0] @ x[0] + blocks[2] @ x[1]).toarray(), rtol=1e-14, atol=1e-14)
+
 #===============================================================================
 # SCRIPT FUNCTIONALITY
 #===============================================================================
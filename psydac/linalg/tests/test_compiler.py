@@ -0,0 +1,154 @@
+import pytest
+import numpy as np
+
+from psydac.linalg.basic    import IdentityOperator, ZeroOperator, ScaledLinearOperator
+from psydac.linalg.basic    import SumLinearOperator, ComposedLinearOperator
+from psydac.linalg.stencil  import StencilVectorSpace, StencilVector, StencilMatrix, WideStencilMatrix
+from psydac.linalg.block    import BlockVectorSpace, BlockVector, BlockLinearOperator
+from psydac.linalg.solvers  import inverse
+from psydac.linalg.compiler import simplify_operator, compile_operator, CompiledLinearOperator
+from psydac.ddm.cart        import DomainDecomposition, CartDecomposition
+
+#===============================================================================
+def get_StencilVectorSpace(npts, pads, periods):
+    D = DomainDecomposition(npts, periods=periods)
+    global_starts = []
+    global_ends   = []
+    for axis, n in enumerate(npts):
+        ee = D.global_element_ends[axis].copy()
+        ee[-1] = n - 1
+        global_ends  .append(ee)
+        global_starts.append(np.array([0] + (ee[:-1] + 1).tolist()))
+    C = CartDecomposition(D, npts, global_starts, global_ends, pads=pads, shifts=[1] * len(npts))
+    return StencilVectorSpace(C)
+
+def get_random_StencilMatrix(V, pads, rng):
+    M = StencilMatrix(V, V, pads=pads)
+    M._data[...] = rng.random(M._data.shape)
+    M.remove_spurious_entries()
+    return M
+
+def get_random_StencilVector(V, rng):
+    x = StencilVector(V)
+    x._data[...] = rng.random(x._data.shape)
+    x.update_ghost_regions()
+    return x
+
+#===============================================================================
+@pytest.mark.parametrize('periods', [[False, True], [True, False]])
+def test_simplify_stencil_expression(periods):
+
+    V   = get_StencilVectorSpace([8, 7], [2, 2], periods)
+    rng = np.random.default_rng(0)
+    A   = get_random_StencilMatrix(V, (1, 1), rng)
+    B   = get_random_StencilMatrix(V, (2, 2), rng)
+    C   = get_random_StencilMatrix(V, (1, 2), rng)
+    I   = IdentityOperator(V)
+    x   = get_random_StencilVector(V, rng)
+
+    # Sums of matrices with different paddings are merged into one matrix
+    E = 2 * A + B - 0.5 * C + 3 * B
+    S = simplify_operator(E)
+    assert isinstance(S, StencilMatrix)
+    assert S.pads == (2, 2)
+    assert np.allclose(S.toarray(), E.toarray(), rtol=1e-14, atol=1e-14)
+
+    # The input matrices are not modified
+    assert np.array_equal(S.toarray(), simplify_operator(E).toarray())
+
+    # Scalars are folded into the matrices of a composition, identities are dropped
+    E = 3 * ((I @ A) @ (2 * C))
+    S = simplify_operator(E)
+    assert isinstance(S, ComposedLinearOperator)
+    assert len(S.multiplicants) == 2
+    assert all(isinstance(M, StencilMatrix) for M in S.multiplicants)
+    assert np.allclose(S.dot(x).toarray(), E.dot(x).toarray(), rtol=1e-14, atol=1e-14)
+
+    # The same operator in a sum is applied once
+    D = get_random_StencilMatrix(V, (0, 0), rng)
+    D._data += 1
+    A_inv = inverse(D, 'cg', tol=1e-12)
+    E = 2 * A_inv + A - A_inv
+    S = simplify_operator(E)
+    assert isinstance(S, SumLinearOperator)
+    assert len(S.addends) == 2
+    assert any(a is A_inv for a in S.addends)
+    assert np.allclose(S.dot(x).toarray(), E.dot(x).toarray(), rtol=1e-10, atol=1e-10)
+
+    # Vanishing expressions
+    assert isinstance(simplify_operator(0.5 * ((2 * A_inv) @ ZeroOperator(V, V))), ZeroOperator)
+    assert isinstance(simplify_operator(A_inv - A_inv), ZeroOperator)
+
+    # Products which fit in the ghost regions are collapsed into a StencilMatrix
+    E = A @ A + B
+    S = simplify_operator(E, collapse=True)
+    assert isinstance(S, StencilMatrix)
+    assert np.allclose(S.toarray(), A.toarray() @ A.toarray() + B.toarray(), rtol=1e-14, atol=1e-14)
+
+    # The wider products are collapsed into a WideStencilMatrix on the same spaces
+    E = B.T @ A @ B - 2 * A
+    S = simplify_operator(E, collapse=True)
+    assert isinstance(S, WideStencilMatrix)
+    assert S.domain is V and S.codomain is V
+    Ba = B.toarray()
+    assert np.allclose(S.toarray(), Ba.T @ A.toarray() @ Ba - 2 * A.toarray(), rtol=1e-14, atol=1e-14)
+    K = compile_operator(E, collapse=True)
+    assert K.operator is not S and isinstance(K.operator, WideStencilMatrix)
+    assert np.allclose(K.dot(x).toarray(), E.dot(x).toarray(), rtol=1e-14, atol=1e-14)
+
+#===============================================================================
+def test_simplify_block_expression():
+
+    V   = get_StencilVectorSpace([6, 9], [2, 2], [False, False])
+    W   = BlockVectorSpace(V, V)
+    rng = np.random.default_rng(1)
+    A   = get_random_StencilMatrix(V, (2, 2), rng)
+    B   = get_random_StencilMatrix(V, (2, 2), rng)
+    C   = get_random_StencilMatrix(V, (2, 2), rng)
+
+    L = BlockLinearOperator(W, W, blocks={(0, 0): A, (0, 1): B, (1, 1): C})
+    M = BlockLinearOperator(W, W, blocks={(0, 0): C, (1, 0): A})
+    X = BlockVector(W, blocks=[get_random_StencilVector(V, rng), get_random_StencilVector(V, rng)])
+
+    E = L - 2 * M + 0.5 * L
+    S = simplify_operator(E)
+    assert isinstance(S, BlockLinearOperator)
+    assert set(S.nonzero_block_indices) == {(0, 0), (0, 1), (1, 0), (1, 1)}
+    assert all(isinstance(S[ij], StencilMatrix) for ij in S.nonzero_block_indices)
+    assert np.allclose(S.dot(X).toarray(), E.dot(X).toarray(), rtol=1e-14, atol=1e-14)
+
+#===============================================================================
+def test_compiled_operator():
+
+    V   = get_StencilVectorSpace([8, 7], [2, 2], [False, True])
+    rng = np.random.default_rng(2)
+    A   = get_random_StencilMatrix(V, (1, 1), rng)
+    B   = get_random_StencilMatrix(V, (2, 2), rng)
+    x   = get_random_StencilVector(V, rng)
+
+    E = 2 * A - (B @ (A @ B)) @ (A + B) + 0.5 * (A ** 3)
+    K = compile_operator(E)
+    assert isinstance(K, CompiledLinearOperator)
+    assert K.domain is V and K.codomain is V
+
+    y_ref = E.dot(x)
+    y = K.dot(x)
+    assert np.allclose(y.toarray(), y_ref.toarray(), rtol=1e-14, atol=1e-14)
+
+    # The temporaries are allocated once, and shared by the whole expression
+    n_tmp = K.n_tmp_vectors
+    assert 0 < n_tmp <= 3
+    K.dot(x, out=y)
+    assert K.n_tmp_vectors == n_tmp
+    assert np.allclose(y.toarray(), y_ref.toarray(), rtol=1e-14, atol=1e-14)
+
+    # Transpose
+    assert isinstance(K.T, CompiledLinearOperator)
+    assert np.allclose(K.T.dot(x).toarray(), E.T.dot(x).toarray(), rtol=1e-14, atol=1e-14)
+
+#===============================================================================
+# SCRIPT FUNCTIONALITY
+#===============================================================================
+if __name__ == "__main__":
+    import sys
+    pytest.main( sys.argv )
@@ -0,0 +1,169 @@
+import numpy as np
+import pytest
+from scipy.linalg import eigh
+
+from psydac.linalg.eigensolvers import eigsh, lobpcg
+from psydac.linalg.basic import IdentityOperator
+from psydac.linalg.solvers import inverse
+from psydac.linalg.stencil import StencilVectorSpace, StencilMatrix, StencilMultiVector, StencilIC0
+from psydac.linalg.utilities import _random_vector
+from psydac.ddm.cart import DomainDecomposition, CartDecomposition
+
+
+def define_data(n, dtype=float, comm=None):
+    """
+    Stiffness and mass matrices of 1D linear finite elements with homogeneous
+    Neumann boundary conditions (up to a scaling), perturbed by a Hermitian
+    imaginary part in the complex case.
+    """
+    domain_decomposition = DomainDecomposition([n - 1], [False], comm=comm)
+    if comm is None:
+        global_starts, global_ends = [np.array([0])], [np.array([n - 1])]
+    else:
+        from psydac.linalg.tests.test_stencil_matrix import compute_global_starts_ends
+        global_starts, global_ends = compute_global_starts_ends(domain_decomposition, [n], [1])
+    cart = CartDecomposition(domain_decomposition, [n], global_starts, global_ends, [1], [1])
+    V = StencilVectorSpace(cart, dtype=dtype)
+
+    c = 0.5j if dtype == complex else 0
+    A = StencilMatrix(V, V)
+    A[:, -1] = -1 - c
+    A[:, 0]  = 2
+    A[:, 1]  = -1 + c
+    A.remove_spurious_entries()
+
+    M = StencilMatrix(V, V)
+    M[:, -1] = 1 / 6
+    M[:, 0]  = 2 / 3
+    M[:, 1]  = 1 / 6
+    M.remove_spurious_entries()
+
+    return V, A, M
+
+def check_eigenpairs(A, M, w, v, tol):
+    """ Check the residuals and the M-orthonormality of the eigenpairs. """
+    for wi, vi in zip(w, v):
+        r  = A @ vi - wi * (M @ vi)
+        assert np.sqrt(r.dot(r).real) < tol * max(abs(wi), 1)
+    G = np.array([[vi.dot(M @ vj) for vj in v] for vi in v])
+    assert np.allclose(G, np.eye(len(v)), atol=1e-8)
+
+#===============================================================================
+@pytest.mark.parametrize('dtype', [float, complex])
+@pytest.mark.parametrize('which', ['LM', 'SA'])
+@pytest.mark.parametrize('generalized', [False, True])
+def test_eigsh(dtype, which, generalized):
+
+    n = 40
+    k = 4
+    V, A, M = define_data(n, dtype)
+    M  = M if generalized else None
+    Md = M.toarray() if generalized else None
+    w_exact = eigh(A.toarray(), Md, eigvals_only=True)
+    w_exact = w_exact[-k:] if which == 'LM' else w_exact[:k]
+
+    w, v = eigsh(A, k, M, which=which, tol=1e-10)
+    assert np.allclose(w, w_exact, rtol=1e-8, atol=1e-10)
+    check_eigenpairs(A, M if generalized else IdentityOperator(V), w, v, 1e-6)
+
+#===============================================================================
+@pytest.mark.parametrize('dtype', [float, complex])
+def test_eigsh_shift_invert(dtype):
+
+    n = 40
+    k = 3
+    V, A, M = define_data(n, dtype)
+    w_all = eigh(A.toarray(), M.toarray(), eigvals_only=True)
+
+    # Eigenvalues closest to sigma, with the default and a user-defined solver
+    sigma = 0.5 * (w_all[4] + w_all[5])
+    w_exact = np.sort(w_all[np.argsort(abs(w_all - sigma))[:k]])
+
+    w, v = eigsh(A, k, M, sigma=sigma)
+    assert np.allclose(w, w_exact, rtol=1e-8)
+    check_eigenpairs(A, M, w, v, 1e-6)
+
+    OPinv = inverse(A - sigma * M, 'gmres', tol=1e-13, maxiter=200)
+    w = eigsh(A, k, M, sigma=sigma, OPinv=OPinv, return_eigenvectors=False)
+    assert np.allclose(w, w_exact, rtol=1e-8)
+
+#===============================================================================
+def test_eigsh_restart():
+
+    # A small basis forces many thick restarts
+    n = 60
+    k = 3
+    V, A, M = define_data(n)
+    w_exact = eigh(A.toarray(), eigvals_only=True)[-k:]
+
+    w, v = eigsh(A, k, ncv=8, tol=1e-10, maxiter=500)
+    assert np.allclose(w, w_exact, rtol=1e-8)
+
+    with pytest.warns(RuntimeWarning):
+        eigsh(A, k, ncv=8, tol=1e-10, maxiter=1)
+
+#===============================================================================
+@pytest.mark.parametrize('dtype', [float, complex])
+@pytest.mark.parametrize('largest', [False, True])
+@pytest.mark.parametrize('multi', [False, True])
+def test_lobpcg(dtype, largest, multi):
+
+    n = 40
+    k = 3
+    V, A, M = define_data(n, dtype)
+    w_exact = eigh(A.toarray(), M.toarray(), eigvals_only=True)
+    w_exact = w_exact[-k:] if largest else w_exact[:k]
+
+    X = [_random_vector(V, seed=i) for i in range(k)]
+    if multi:
+        X = StencilMultiVector.from_vectors(X)
+
+    w, v = lobpcg(A, X, M, largest=largest, tol=1e-9, maxiter=500)
+    assert isinstance(v, StencilMultiVector) == multi
+    assert np.allclose(w, w_exact, rtol=1e-7)
+    check_eigenpairs(A, M, w, v.to_vectors() if multi else v, 1e-6)
+
+#===============================================================================
+def test_lobpcg_preconditioned():
+
+    n = 60
+    k = 3
+    V, A, M = define_data(n)
+    w_exact = eigh(A.toarray(), M.toarray(), eigvals_only=True)[:k]
+
+    # Incomplete Cholesky factorization of a shifted operator
+    pc = StencilIC0(A + 0.1 * M)
+    X  = [_random_vector(V, seed=i) for i in range(k)]
+
+    w, v = lobpcg(A, X, M, pc=pc, tol=1e-9, maxiter=30)
+    assert np.allclose(w, w_exact, rtol=1e-7)
+    check_eigenpairs(A, M, w, v, 1e-6)
+
+#===============================================================================
+@pytest.mark.parallel
+def test_eigensolvers_parallel():
+    from mpi4py import MPI
+
+    comm = MPI.COMM_WORLD
+    n = 32
+    k = 3
+    V, A, M = define_data(n, comm=comm)
+
+    # Reference eigenvalues, from the matrices on a single process
+    _, As, Ms = define_data(n)
+    w_exact = eigh(As.toarray(), Ms.toarray(), eigvals_only=True)
+
+    w, v = eigsh(A, k, M, which='SA', tol=1e-10)
+    assert np.allclose(w, w_exact[:k], rtol=1e-8, atol=1e-10)
+    check_eigenpairs(A, M, w, v, 1e-6)
+
+    X = StencilMultiVector.from_vectors([_random_vector(V, seed=i) for i in range(k)])
+    w, v = lobpcg(A, X, M, largest=True, tol=1e-9, maxiter=500)
+    assert np.allclose(w, w_exact[-k:], rtol=1e-7)
+    check_eigenpairs(A, M, w, v.to_vectors(), 1e-6)
+
+#===============================================================================
+
+if __name__ == "__main__":
+    import sys
+    pytest.main( sys.argv )
@@ -2,6 +2,7 @@
 
 import pytest
 import time
+from functools import reduce
 import numpy as np
 from mpi4py             import MPI
 
@@ -9,20 +10,24 @@ from mpi4py             import MPI
 from scipy.sparse               import csc_matrix, dia_matrix, kron
 from scipy.sparse.linalg        import splu
 
-from sympde.calculus import dot
+from sympde.calculus import dot, grad
 from sympde.expr     import BilinearForm, integral
 from sympde.topology import Line
+from sympde.topology import ScalarFunctionSpace
+from sympde.topology.analytical_mapping import CollelaMapping2D
 from sympde.topology import Cube, Square
 from sympde.topology import Derham
 from sympde.topology import elements_of
 
 from psydac.api.discretization     import discretize
+from psydac.api.settings           import PSYDAC_BACKEND_PYTHON
 from psydac.ddm.cart               import DomainDecomposition, CartDecomposition
 from psydac.linalg.block           import BlockLinearOperator
 from psydac.linalg.direct_solvers  import SparseSolver, BandedSolver
-from psydac.linalg.kron            import KroneckerLinearSolver
+from psydac.linalg.kron            import KroneckerLinearSolver, KroneckerSumSolver
 from psydac.linalg.solvers         import inverse
 from psydac.linalg.stencil         import StencilVectorSpace, StencilVector, StencilMatrix
+from psydac.linalg.stencil         import StencilMultiVector
 
 #===============================================================================
 def compute_global_starts_ends(domain_decomposition, npts):
@@ -192,6 +197,87 @@ def compare_solve(seed, comm, npts, pads, periods, direct_solver, dtype=float, t
     # compare for equality
     assert np.allclose( X[localslice], X_glob[localslice], rtol=1e-8, atol=1e-8 )
 
+def compare_solve_multi(comm, npts, pads, periods, nvecs, dtype=float):
+    # Solve for several right-hand sides at once, and compare with separate solves
+    D = DomainDecomposition(npts, periods=periods, comm=comm)
+    cart = CartDecomposition(D, npts, *compute_global_starts_ends(D, npts), pads=pads, shifts=[1]*len(pads))
+    V = StencilVectorSpace(cart, dtype=dtype)
+
+    Ds    = [DomainDecomposition([n], periods=[P]) for n,P in zip(npts, periods)]
+    carts = [CartDecomposition(Di, [n],  *compute_global_starts_ends(Di, [n]), pads=[p], shifts=[1]) for Di,n,p in zip(Ds, npts, pads)]
+    Vs    = [StencilVectorSpace(carti, dtype=dtype) for carti in carts]
+    localslice = tuple([slice(s, e+1) for s, e in zip(V.starts, V.ends)])
+
+    A = [random_matrix(i+1, Vi, Vi) for i, Vi in enumerate(Vs)]
+    solver = KroneckerLinearSolver(V, V, [matrix_to_bandsolver(Ai) for Ai in A])
+
+    Y = StencilMultiVector(V, nvecs)
+    for j in range(nvecs):
+        Y[localslice + (j,)] = random_vectordata(j, npts, dtype=dtype)[localslice]
+    Y.update_ghost_regions()
+
+    X = solver.solve(Y)
+    assert isinstance(X, StencilMultiVector)
+    assert X.nvecs == nvecs
+    assert X.ghost_regions_in_sync
+
+    for j in range(nvecs):
+        Xj = solver.solve(Y.column(j))
+        assert np.allclose(X.column(j).toarray(), Xj.toarray(), rtol=1e-12, atol=1e-12)
+
+def random_hermitian_matrices(seed, n, dtype):
+    """ Returns a random hermitian positive definite matrix M, and a random hermitian matrix K. """
+    rng = np.random.default_rng(seed)
+    B = rng.random((n, n)) - 0.5
+    C = rng.random((n, n)) - 0.5
+    if dtype == complex:
+        B = B + 1j * (rng.random((n, n)) - 0.5)
+        C = C + 1j * (rng.random((n, n)) - 0.5)
+    M = B @ B.conj().T + n * np.eye(n)
+    K = C + C.conj().T
+    return M, K
+
+def compare_sum_solve(seed, comm, npts, pads, periods, dtype=float, shift=1., nvecs=None, transposed=False):
+    # Solve with a Kronecker sum, and compare with a dense solve of the assembled matrix
+    D = DomainDecomposition(npts, periods=periods, comm=comm)
+    cart = CartDecomposition(D, npts, *compute_global_starts_ends(D, npts), pads=pads, shifts=[1]*len(pads))
+    V = StencilVectorSpace(cart, dtype=dtype)
+    localslice = tuple([slice(s, e+1) for s, e in zip(V.starts, V.ends)])
+
+    matrices = [random_hermitian_matrices(seed+i, n, dtype) for i, n in enumerate(npts)]
+    Ms = [M for M, K in matrices]
+    Ks = [K for M, K in matrices]
+
+    solver = KroneckerSumSolver(V, V, Ms, Ks, shift=shift)
+    if transposed:
+        solver = solver.T
+
+    # Reference: A = sum_i M_1 x ... x K_i x ... x M_d + shift * M_1 x ... x M_d
+    A = shift * reduce(np.kron, Ms)
+    for i in range(len(npts)):
+        A += reduce(np.kron, [K if j == i else M for j, (M, K) in enumerate(matrices)])
+    if transposed:
+        A = A.T
+
+    if nvecs is None:
+        Y_glob = random_vectordata(seed, npts, dtype=dtype)
+        Y = StencilVector(V)
+        Y[localslice] = Y_glob[localslice]
+        X_glob = np.linalg.solve(A, Y_glob.flatten()).reshape(npts)
+        X = StencilVector(V)
+        assert solver.solve(Y, out=X) is X
+        assert np.allclose(X[localslice], X_glob[localslice], rtol=1e-10, atol=1e-10)
+    else:
+        Y = StencilMultiVector(V, nvecs)
+        for j in range(nvecs):
+            Y[localslice + (j,)] = random_vectordata(seed+j, npts, dtype=dtype)[localslice]
+        X = solver.dot(Y)
+        assert isinstance(X, StencilMultiVector)
+        assert X.ghost_regions_in_sync
+        for j in range(nvecs):
+            X_glob = np.linalg.solve(A, random_vectordata(seed+j, npts, dtype=dtype).flatten()).reshape(npts)
+            assert np.allclose(X[localslice + (j,)], X_glob[localslice], rtol=1e-10, atol=1e-10)
+
 def get_M1_block_kron_solver(V1, ncells, degree, periodic):
     """
     Given a 3D DeRham sequenece (V0 = H(grad) --grad--> V1 = H(curl) --curl--> V2 = H(div) --div--> V3 = L2)
@@ -423,6 +509,12 @@ def test_kron_solver_nompi(seed, params, direct_solver, dtype):
 # SERIAL TESTS
 #===============================================================================
 
+@pytest.mark.parametrize( 'dtype', [float, complex] )
+@pytest.mark.parametrize( 'params', [([8], [2], [False]), ([8,9], [2,3], [False,True]), ([5,6,7], [1,2,3], [True,False,False])] )
+def test_kron_solver_multi_rhs_ser(params, dtype):
+    compare_solve_multi(None, *params, nvecs=3, dtype=dtype)
+
+
 # low-dimensional tests
 
 @pytest.mark.parametrize( 'dtype', [float, complex] )
@@ -485,6 +577,19 @@ def test_kron_solver_nd_ser(seed, dim, dtype):
     else:
         npts_base = 2
     compare_solve(seed, MPI.COMM_SELF, [npts_base]*dim, [1]*dim, [False]*dim, matrix_to_sparse,dtype=dtype, transposed=False, verbose=False)
+# Kronecker sum solver
+
+@pytest.mark.parametrize( 'dtype', [float, complex] )
+@pytest.mark.parametrize( 'params', [([9], [2], [False]), ([8,9], [2,3], [False,True]), ([5,6,7], [1,2,3], [True,False,False])] )
+@pytest.mark.parametrize( 'shift', [0., 2.] )
+@pytest.mark.parametrize( 'transposed', [False, True] )
+def test_kron_sum_solver_ser(params, dtype, shift, transposed):
+    compare_sum_solve(0, MPI.COMM_SELF, *params, dtype=dtype, shift=shift, transposed=transposed)
+
+@pytest.mark.parametrize( 'dtype', [float, complex] )
+def test_kron_sum_solver_multi_rhs_ser(dtype):
+    compare_sum_solve(1, MPI.COMM_SELF, [5,6,7], [1,2,3], [True,False,False], dtype=dtype, nvecs=3)
+
 #===============================================================================
 # PARALLEL TESTS
 #===============================================================================
@@ -555,6 +660,21 @@ def test_kron_solver_nd_par(seed, dim, dtype):
     npts_base = 4
     compare_solve(seed, MPI.COMM_WORLD, [npts_base]*dim, [1]*dim, [False]*dim, matrix_to_sparse, dtype=dtype, transposed=False, verbose=False)
 
+@pytest.mark.parametrize( 'dtype', [float, complex] )
+@pytest.mark.parametrize( 'params', [([8,9], [2,3], [False,True]), ([5,6,7], [1,2,3], [True,False,False])] )
+@pytest.mark.parallel
+def test_kron_solver_multi_rhs_par(params, dtype):
+    compare_solve_multi(MPI.COMM_WORLD, *params, nvecs=3, dtype=dtype)
+
+@pytest.mark.parametrize( 'dtype', [float, complex] )
+@pytest.mark.parametrize( 'params', [([12], [2], [False]), ([8,9], [2,3], [False,True]), ([5,6,7], [1,2,3], [True,False,False])] )
+@pytest.mark.parametrize( 'shift', [0., 2.] )
+@pytest.mark.parallel
+def test_kron_sum_solver_par(params, dtype, shift):
+    compare_sum_solve(0, MPI.COMM_WORLD, *params, dtype=dtype, shift=shift)
+    compare_sum_solve(1, MPI.COMM_WORLD, *params, dtype=dtype, shift=shift, nvecs=2)
+
+#===============================================================================
 #===============================================================================
 
 # test Kronecker solver of the M1 mass matrix of our 3D DeRham sequence, as described in the get_M1_block_kron_solver method
@@ -771,6 +891,86 @@ def test_2d_mass_solver(ncells, degree, bounds, periodic):
     
 #===============================================================================
 
+# test Kronecker sum solver of the 2D Helmholtz-type operator -Laplace(u) + u, as a
+# direct solver on a Cartesian domain and as a preconditioner on a mapped domain
+
+def run_laplace_kron_sum_solver(eps, ncells, degree, comm=None):
+
+    domain = CollelaMapping2D('M', k1=1, k2=1, eps=eps)(Square('Omega'))
+    V = ScalarFunctionSpace('V', domain)
+    u, v = elements_of(V, names='u, v')
+    a = BilinearForm((u, v), integral(domain, dot(grad(u), grad(v)) + u * v))
+
+    domain_h = discretize(domain, ncells=ncells, comm=comm)
+    Vh = discretize(V, domain_h, degree=degree)
+    A = discretize(a, domain_h, (Vh, Vh), backend=PSYDAC_BACKEND_PYTHON).assemble()
+
+    # 1D mass and stiffness matrices on the image [-1, 1] of the undeformed mapping
+    mass_matrices = []
+    stiffness_matrices = []
+    for n, p in zip(ncells, degree):
+        domain_1d = Line('L', bounds=(-1, 1))
+        V_1d = ScalarFunctionSpace('V_1d', domain_1d)
+        u_1d, v_1d = elements_of(V_1d, names='u_1d, v_1d')
+
+        domain_1d_h = discretize(domain_1d, ncells=[n])
+        V_1d_h = discretize(V_1d, domain_1d_h, degree=[p])
+
+        m_1d = BilinearForm((u_1d, v_1d), integral(domain_1d, u_1d * v_1d))
+        k_1d = BilinearForm((u_1d, v_1d), integral(domain_1d, dot(grad(u_1d), grad(v_1d))))
+
+        mass_matrices.append(discretize(m_1d, domain_1d_h, (V_1d_h, V_1d_h), backend=PSYDAC_BACKEND_PYTHON).assemble())
+        stiffness_matrices.append(discretize(k_1d, domain_1d_h, (V_1d_h, V_1d_h), backend=PSYDAC_BACKEND_PYTHON).assemble())
+
+    A_inv = KroneckerSumSolver(A.domain, A.codomain, mass_matrices, stiffness_matrices, shift=1.)
+
+    b = A.codomain.zeros()
+    b[tuple(slice(s, e+1) for s, e in zip(b.starts, b.ends))] = 1.
+
+    tol = 1e-10
+    niter = {}
+    for name, pc in [('jacobi', A.diagonal(inverse=True)), ('kron_sum', A_inv)]:
+        solver = inverse(A, 'pcg', pc=pc, tol=tol)
+        x = solver.dot(b)
+        assert solver.get_info()['success']
+        assert np.linalg.norm((A.dot(x) - b).toarray()) < tol
+        niter[name] = solver.get_info()['niter']
+
+    return A, A_inv, b, niter
+
+@pytest.mark.parametrize( 'eps', [0., 0.02] )
+def test_2d_laplace_kron_sum_solver(eps):
+
+    A, A_inv, b, niter = run_laplace_kron_sum_solver(eps, ncells=[16, 16], degree=[2, 2])
+
+    if eps == 0:
+        # Exact inverse on the Cartesian domain
+        x = A_inv.dot(b)
+        assert np.linalg.norm((A.dot(x) - b).toarray()) < 1e-10
+        assert niter['kron_sum'] <= 2
+    else:
+        assert 3 * niter['kron_sum'] < niter['jacobi']
+
+@pytest.mark.parametrize( 'eps', [0., 0.02] )
+@pytest.mark.parallel
+def test_2d_laplace_kron_sum_solver_par(eps):
+
+    comm = MPI.COMM_WORLD
+    A, A_inv, b, niter = run_laplace_kron_sum_solver(eps, ncells=[16, 16], degree=[2, 2], comm=comm)
+
+    x = A_inv.dot(b)
+    if eps == 0:
+        assert np.linalg.norm((A.dot(x) - b).toarray()) < 1e-10
+
+    # Same result and preconditioned iteration count as in serial
+    _, A_inv_ser, b_ser, niter_ser = run_laplace_kron_sum_solver(eps, ncells=[16, 16], degree=[2, 2])
+    x_ser = A_inv_ser.dot(b_ser)
+    localslice = tuple(slice(s, e+1) for s, e in zip(x.starts, x.ends))
+    assert np.allclose(x[localslice], x_ser[localslice], rtol=1e-12, atol=1e-12)
+    assert niter['kron_sum'] == niter_ser['kron_sum']
+
+#===============================================================================
+
 if __name__ == '__main__':
     # showcase testcase
     compare_solve(0, MPI.COMM_WORLD, [4,4,5], [1,2,3], [False,True,False], matrix_to_bandsolver, dtype=[float, complex], transposed=False, verbose=True)
@@ -8,7 +8,7 @@ from psydac.ddm.cart       import DomainDecomposition, CartDecomposition
 from psydac.linalg.stencil import StencilVectorSpace
 from psydac.linalg.stencil import StencilVector
 from psydac.linalg.stencil import StencilMatrix
-from psydac.linalg.kron    import KroneckerStencilMatrix
+from psydac.linalg.kron    import KroneckerStencilMatrix, KroneckerDenseMatrix
 #===============================================================================
 def compute_global_starts_ends(domain_decomposition, npts):
     ndims         = len(npts)
@@ -112,3 +112,73 @@ def test_KroneckerStencilMatrix(dtype, npts, pads, periodic):
 
     # Test dot product
     assert np.array_equal(M_sp.dot(w.toarray()), M.dot(w).toarray())
+
+#==============================================================================
+@pytest.mark.parametrize('dtype', [float, complex])
+@pytest.mark.parametrize('params', [([5], [9], [2]),
+                                    ([4, 6], [7, 6], [1, 2]),
+                                    ([3, 4, 5], [6, 7, 5], [1, 1, 2])])
+
+def test_KroneckerDenseMatrix(dtype, params):
+
+    npts_V, npts_W, pads = params
+    rng = np.random.default_rng(0)
+
+    spaces = []
+    for npts in (npts_V, npts_W):
+        D = DomainDecomposition([n-1 for n in npts], periods=[False]*len(npts))
+        global_starts, global_ends = compute_global_starts_ends(D, npts)
+        cart = CartDecomposition(D, npts, global_starts, global_ends, pads=pads, shifts=[1]*len(npts))
+        spaces.append(StencilVectorSpace(cart, dtype=dtype))
+    V, W = spaces
+
+    mats = [rng.random((nw, nv)) for nv, nw in zip(npts_V, npts_W)]
+    M    = KroneckerDenseMatrix(V, W, *mats)
+
+    x = StencilVector(V)
+    x._data[...] = rng.random(x._data.shape)
+    if dtype == complex:
+        x._data[...] += 1j * rng.random(x._data.shape)
+    x.update_ghost_regions()
+
+    M_arr = reduce(np.kron, mats)
+
+    # Test dot product
+    assert np.allclose(M.dot(x).toarray(), M_arr @ x.toarray(), rtol=1e-13, atol=1e-13)
+
+    # Test transpose
+    y = StencilVector(W)
+    y._data[...] = rng.random(y._data.shape)
+    y.update_ghost_regions()
+    assert np.allclose(M.T.dot(y).toarray(), M_arr.T @ y.toarray(), rtol=1e-13, atol=1e-13)
+
+#==============================================================================
+@pytest.mark.parametrize('params', [([5], [5], [0]),
+                                    ([4, 6], [7, 5], [0, 0])])
+def test_KroneckerDenseMatrix_zero_pads(params):
+
+    # Pads are 0 for degree 0 spline spaces: the local data has no ghost regions
+    npts_V, npts_W, pads = params
+    rng = np.random.default_rng(0)
+
+    spaces = []
+    for npts in (npts_V, npts_W):
+        D = DomainDecomposition([n-1 for n in npts], periods=[False]*len(npts))
+        global_starts, global_ends = compute_global_starts_ends(D, npts)
+        cart = CartDecomposition(D, npts, global_starts, global_ends, pads=pads, shifts=[1]*len(npts))
+        spaces.append(StencilVectorSpace(cart))
+    V, W = spaces
+
+    mats = [rng.random((nw, nv)) for nv, nw in zip(npts_V, npts_W)]
+    M    = KroneckerDenseMatrix(V, W, *mats)
+
+    x = StencilVector(V)
+    x._data[...] = rng.random(x._data.shape)
+
+    M_arr = reduce(np.kron, mats)
+    assert np.allclose(M.dot(x)._data.ravel(), M_arr @ x._data.ravel(), rtol=1e-13, atol=1e-13)
+
+    # Identity matrix
+    I = KroneckerDenseMatrix(V, V, *[np.eye(n) for n in npts_V])
+    assert np.array_equal(I.dot(x)._data, x._data)
+
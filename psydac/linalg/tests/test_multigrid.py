@@ -0,0 +1,151 @@
+# coding: utf-8
+
+import pytest
+import numpy as np
+
+from psydac.linalg.stencil   import StencilVectorSpace, StencilMatrix
+from psydac.linalg.kron      import KroneckerDenseMatrix
+from psydac.linalg.solvers   import inverse
+from psydac.linalg.multigrid import (galerkin_coarse_operator, MultigridPreconditioner,
+                                     DenseCoarseSolver)
+from psydac.ddm.cart         import DomainDecomposition, CartDecomposition
+
+# ===============================================================================
+def compute_global_starts_ends(domain_decomposition, npts):
+    ndims = len(npts)
+    global_starts = [None] * ndims
+    global_ends = [None] * ndims
+
+    for axis in range(ndims):
+        ee = domain_decomposition.global_element_ends[axis]
+
+        global_ends[axis] = ee.copy()
+        global_ends[axis][-1] = npts[axis] - 1
+        global_starts[axis] = np.array([0] + (global_ends[axis][:-1] + 1).tolist())
+
+    return global_starts, global_ends
+
+# ===============================================================================
+def create_space(npts, pads, dtype=float):
+    D = DomainDecomposition([n-1 for n in npts], periods=[False]*len(npts))
+    global_starts, global_ends = compute_global_starts_ends(D, npts)
+    C = CartDecomposition(D, npts, global_starts, global_ends, pads=pads, shifts=[1]*len(npts))
+    return StencilVectorSpace(C, dtype=dtype)
+
+def interpolation_matrix(nc, rng=None):
+    """ 1D linear interpolation from nc to 2*nc+1 interior points (random weights if rng is given). """
+    P = np.zeros((2*nc+1, nc))
+    for j in range(nc):
+        w = (0.5, 1., 0.5) if rng is None else rng.random(3)
+        P[2*j:2*j+3, j] = w
+    return P
+
+def laplacian(V):
+    """ Q1 finite-element Laplacian with homogeneous Dirichlet boundary conditions. """
+    ks = [np.array([-1., 2., -1.]) * (n+1) for n in V.npts]
+    ms = [np.array([1., 4., 1.]) / (6 * (n+1)) for n in V.npts]
+    if V.ndim == 1:
+        stencil = ks[0]
+    else:
+        stencil = np.multiply.outer(ks[0], ms[1]) + np.multiply.outer(ms[0], ks[1])
+    A = StencilMatrix(V, V)
+    A._data[...] = stencil
+    A.remove_spurious_entries()
+    return A
+
+def hierarchy(ncoarse, nlevels, ndim):
+    """ Nested spaces, Laplacians and linear interpolation operators. """
+    npts   = [ncoarse]
+    for _ in range(nlevels-1):
+        npts.append(2*npts[-1]+1)
+    spaces = [create_space([n]*ndim, [1]*ndim) for n in npts]
+    Ps     = [KroneckerDenseMatrix(Vc, Vf, *[interpolation_matrix(n)]*ndim)
+              for Vc, Vf, n in zip(spaces[:-1], spaces[1:], npts[:-1])]
+    return spaces, [laplacian(V) for V in spaces], Ps
+
+# ===============================================================================
+# SERIAL TESTS
+# ===============================================================================
+@pytest.mark.parametrize('dtype', [float, complex])
+@pytest.mark.parametrize('ncoarse', [[5], [4, 6], [2, 3]])
+def test_galerkin_coarse_operator(dtype, ncoarse):
+    rng   = np.random.default_rng(0)
+    ndim  = len(ncoarse)
+    pads  = [2] * ndim
+    Vc    = create_space(ncoarse, pads, dtype)
+    Vf    = create_space([2*n+1 for n in ncoarse], pads, dtype)
+
+    # Random stencil matrix on the fine space, random banded prolongation
+    A = StencilMatrix(Vf, Vf)
+    A._data[...] = rng.random(A._data.shape)
+    if dtype == complex:
+        A._data[...] += 1j * rng.random(A._data.shape)
+    A.remove_spurious_entries()
+    mats = [interpolation_matrix(n, rng) for n in ncoarse]
+    P = KroneckerDenseMatrix(Vc, Vf, *mats)
+
+    Ac = galerkin_coarse_operator(A, P)
+
+    Pa = np.kron(*mats) if ndim == 2 else mats[0]
+    assert isinstance(Ac, StencilMatrix)
+    assert Ac.domain is Vc
+    assert np.allclose(Ac.toarray(), Pa.T @ A.toarray() @ Pa, rtol=1e-13, atol=1e-13)
+
+# ===============================================================================
+@pytest.mark.parametrize('ndim', [1, 2])
+def test_dense_coarse_solver(ndim):
+    V = create_space([6]*ndim, [1]*ndim)
+    A = laplacian(V)
+    S = DenseCoarseSolver(A)
+    b = V.zeros()
+    b._data[...] = 1
+    x = S.dot(b)
+    assert np.allclose(A.dot(x).toarray(), b.toarray(), rtol=1e-12, atol=1e-12)
+
+# ===============================================================================
+@pytest.mark.parametrize('ndim', [1, 2])
+@pytest.mark.parametrize('smoother', ['jacobi', 'chebyshev'])
+@pytest.mark.parametrize('cycle', ['V', 'W'])
+def test_multigrid_preconditioner(ndim, smoother, cycle):
+    spaces, As, Ps = hierarchy(3, 4, ndim)
+    A = As[-1]
+    b = A.domain.zeros()
+    b._data[...] = 1
+
+    tol = 1e-10
+    cg  = inverse(A, 'cg', tol=tol, maxiter=1000)
+    cg.dot(b)
+    niter_cg = cg.get_info()['niter']
+
+    # Galerkin coarse operators coincide with the re-discretized ones
+    M = MultigridPreconditioner(A, Ps, smoother=smoother, cycle=cycle, presmoothing=2, postsmoothing=2)
+    assert M.nlevels == 4
+    for Al, Bl in zip(M.operators, As):
+        assert np.allclose(Al.toarray(), Bl.toarray(), rtol=1e-13, atol=1e-13)
+
+    M2 = MultigridPreconditioner(A, Ps, coarse_operators=As[:-1], smoother=smoother, cycle=cycle,
+                                 presmoothing=2, postsmoothing=2)
+
+    for pc in (M, M2):
+        pcg = inverse(A, 'pcg', pc=pc, tol=tol)
+        x   = pcg.dot(b)
+        info = pcg.get_info()
+        assert info['success']
+        assert info['niter'] < 10
+        assert info['niter'] < niter_cg
+        assert np.linalg.norm((A.dot(x) - b).toarray()) < tol
+
+    # Convergence of the stationary multigrid iteration
+    x = A.domain.zeros()
+    r = b.copy()
+    for _ in range(10):
+        x += M.dot(r)
+        r = b - A.dot(x)
+    assert np.linalg.norm(r.toarray()) < 1e-6 * np.linalg.norm(b.toarray())
+
+# ===============================================================================
+# SCRIPT FUNCTIONALITY
+# ===============================================================================
+if __name__ == "__main__":
+    import sys
+    pytest.main(sys.argv)
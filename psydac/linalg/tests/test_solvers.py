@@ -1,8 +1,9 @@
 
 import numpy as np
 import pytest
-from psydac.linalg.solvers import inverse
-from psydac.linalg.stencil import StencilVectorSpace, StencilMatrix, StencilVector
+from psydac.linalg.solvers import inverse, estimate_spectral_bounds, LocalBlockPreconditioner
+from psydac.linalg.stencil import StencilVectorSpace, StencilMatrix, StencilVector, StencilILU0, StencilIC0
+from psydac.linalg.block import BlockVectorSpace, BlockVector, BlockLinearOperator
 from psydac.linalg.basic import LinearSolver
 from psydac.ddm.cart import DomainDecomposition, CartDecomposition
 
@@ -59,7 +60,7 @@ def define_data(n, p, matrix_data, dtype=float):
 @pytest.mark.parametrize( 'n', [5, 10, 13] )
 @pytest.mark.parametrize('p', [2, 3])
 @pytest.mark.parametrize('dtype', [float, complex])
-@pytest.mark.parametrize('solver', ['cg', 'pcg', 'bicg', 'bicgstab', 'pbicgstab', 'minres', 'lsmr', 'gmres'])
+@pytest.mark.parametrize('solver', ['cg', 'pcg', 'pipelined_cg', 'bicg', 'bicgstab', 'pbicgstab', 'minres', 'lsmr', 'gmres', 'ca_cg', 'ca_gmres', 'chebyshev', 'dcg', 'gcrodr'])
 
 def test_solver_tridiagonal(n, p, dtype, solver, verbose=False):
 
@@ -76,13 +77,13 @@ def test_solver_tridiagonal(n, p, dtype, solver, verbose=False):
         if solver == 'pbicgstab' and dtype == complex:
             # pbicgstab only works for real matrices
             return
-    elif solver == 'gmres':
+    elif solver in ['gmres', 'ca_gmres', 'gcrodr']:
         if dtype==complex:
             diagonals = [-7-2j,-6-2j,-1-10j]
         else:
             diagonals = [-7,-1,-3]
 
-    if solver in ['cg', 'pcg', 'minres']:
+    if solver in ['cg', 'pcg', 'pipelined_cg', 'ca_cg', 'chebyshev', 'minres', 'dcg']:
         # pcg runs with Jacobi preconditioner
         V, A, xe = define_data_hermitian(n, p, dtype=dtype)
         if solver == 'minres' and dtype == complex:
@@ -204,6 +205,584 @@ def test_solver_tridiagonal(n, p, dtype, solver, verbose=False):
         assert errh_norm < tol
         assert solver == 'pcg' or errc_norm < tol
 
+#===============================================================================
+@pytest.mark.parametrize('n', [10, 13])
+@pytest.mark.parametrize('p', [2, 3])
+@pytest.mark.parametrize('dtype', [float, complex])
+def test_pipelined_cg(n, p, dtype):
+
+    V, A, xe = define_data_hermitian(n, p, dtype=dtype)
+    b = A @ xe
+
+    # The pipelined variants are mathematically equivalent to CG and PCG
+    pc = A.diagonal(inverse=True)
+    for kwargs in [{}, {'pc': pc}]:
+        ref  = inverse(A, 'pcg' if kwargs else 'cg', tol=1e-10, **kwargs)
+        solv = inverse(A, 'pipelined_cg', tol=1e-10, **kwargs)
+
+        x     = solv @ b
+        x_ref = ref @ b
+        info  = solv.get_info()
+
+        assert info['success']
+        assert abs(info['niter'] - ref.get_info()['niter']) <= 1
+        assert np.allclose(x.toarray(), x_ref.toarray(), rtol=1e-8, atol=1e-8)
+        assert np.linalg.norm((A @ x - b).toarray()) < 1e-8
+
+    # Stop after maxiter iterations
+    V, A, xe = define_data(n, 1, [1, 4, -1], dtype=dtype)
+    solv = inverse(A, 'pipelined_cg', tol=1e-14, maxiter=2)
+    solv @ (A @ xe)
+    assert solv.get_info()['niter'] == 2
+    assert not solv.get_info()['success']
+
+#===============================================================================
+@pytest.mark.parametrize('period', [7, 50])
+def test_pipelined_cg_residual_replacement(period):
+
+    # 1D Laplacian: CG needs n/2 iterations with a constant right-hand side,
+    # hence the residual is replaced several times
+    n = 400
+    V, A, xe = define_data(n, 1, [1, 2, -1])
+    b = StencilVector(V)
+    b[0:n] = 1.0
+
+    ref  = inverse(A, 'cg', tol=1e-9, maxiter=2000)
+    solv = inverse(A, 'pipelined_cg', tol=1e-9, maxiter=2000, replacement_period=period)
+
+    x    = solv @ b
+    info = solv.get_info()
+    ref @ b
+
+    assert info['success']
+    assert ref.get_info()['niter'] > 4 * period
+    assert abs(info['niter'] - ref.get_info()['niter']) <= 5
+    assert np.linalg.norm((A @ x - b).toarray()) < 1e-9
+
+#===============================================================================
+def define_data_laplacian_2d(n, dtype=float):
+    domain_decomposition = DomainDecomposition([n - 1, n - 1], [False, False])
+    cart = CartDecomposition(domain_decomposition, [n, n], [np.array([0])]*2, [np.array([n - 1])]*2, [1, 1], [1, 1])
+    V = StencilVectorSpace(cart, dtype=dtype)
+
+    # Five-point Laplacian with homogeneous Dirichlet boundary conditions
+    A = StencilMatrix(V, V)
+    A[:, :, 0, 0] = 4
+    A[:, :, -1, 0] = A[:, :, 1, 0] = A[:, :, 0, -1] = A[:, :, 0, 1] = -1
+    A.remove_spurious_entries()
+    return V, A
+
+def random_rhs(V, rng):
+    b = StencilVector(V)
+    b[0:V.npts[0], 0:V.npts[1]] = rng.random(V.npts)
+    if V.dtype == complex:
+        b[0:V.npts[0], 0:V.npts[1]] += 1j * rng.random(V.npts)
+    return b
+
+#===============================================================================
+@pytest.mark.parametrize('dtype', [float, complex])
+@pytest.mark.parametrize('with_pc', [False, True])
+def test_deflated_cg_recycling(dtype, with_pc):
+
+    V, A = define_data_laplacian_2d(14, dtype=dtype)
+    rng  = np.random.default_rng(0)
+    pc   = A.diagonal(inverse=True) if with_pc else None
+    tol  = 1e-10
+
+    ref  = inverse(A, 'pcg', tol=tol, pc=pc) if with_pc else inverse(A, 'cg', tol=tol)
+    solv = inverse(A, 'dcg', tol=tol, pc=pc, nrecycle=8)
+
+    niter, niter_ref = [], []
+    for i in range(5):
+        b = random_rhs(V, rng)
+        x = solv @ b
+        ref @ b
+        assert solv.get_info()['success']
+        assert np.linalg.norm((A @ x - b).toarray()) < tol
+        niter    .append(solv.get_info()['niter'])
+        niter_ref.append(ref .get_info()['niter'])
+
+    # Without a deflation space the first solve is a standard CG
+    assert abs(niter[0] - niter_ref[0]) <= 1
+    assert len(solv.recycled_space) == 8
+
+    # The recycled deflation space reduces the number of iterations
+    assert max(niter[2:]) < min(niter_ref)
+
+    # Without recycled space the solver is again a standard CG
+    solv.clear_recycled_space()
+    solv @ b
+    assert abs(solv.get_info()['niter'] - niter_ref[-1]) <= 1
+
+#===============================================================================
+@pytest.mark.parametrize('dtype', [float, complex])
+def test_gcrodr_recycling(dtype):
+
+    V, A = define_data_laplacian_2d(14, dtype=dtype)
+
+    # Non-symmetric perturbation (convection term)
+    A[:, :, 1, 0] += 0.8
+    A[:, :, -1, 0] -= 0.8
+    A.remove_spurious_entries()
+
+    rng  = np.random.default_rng(1)
+    tol  = 1e-10
+
+    ref  = inverse(A, 'gcrodr', tol=tol, maxiter=2000, restart=20, nrecycle=0)
+    solv = inverse(A, 'gcrodr', tol=tol, maxiter=2000, restart=20, nrecycle=8)
+
+    niter, niter_ref = [], []
+    for i in range(4):
+        b = random_rhs(V, rng)
+        x = solv @ b
+        ref @ b
+        assert solv.get_info()['success']
+        assert ref .get_info()['success']
+        assert np.linalg.norm((A @ x - b).toarray()) < tol
+        niter    .append(solv.get_info()['niter'])
+        niter_ref.append(ref .get_info()['niter'])
+
+    # The recycled space satisfies A U = C with orthonormal C
+    U, C = solv.recycled_space, solv._C
+    assert len(U) == 8
+    for i in range(8):
+        assert np.linalg.norm((A @ U[i] - C[i]).toarray()) < 1e-8
+        for j in range(8):
+            assert abs(C[i].dot(C[j]) - (i == j)) < 1e-8
+
+    assert sum(niter) < sum(niter_ref)
+    assert max(niter[1:]) < min(niter_ref)
+
+#===============================================================================
+@pytest.mark.parametrize('inner_solver', ['cg', 'gmres'])
+def test_mixed_precision_iterative_refinement(inner_solver):
+
+    V, A = define_data_laplacian_2d(14)
+    A32  = A.astype(np.float32)
+    rng  = np.random.default_rng(2)
+    tol  = 1e-12
+
+    # The inner solver only reduces the residual of the correction equation by 1e-4
+    inner = inverse(A32, inner_solver, tol=1e-4, maxiter=200)
+    solv  = inverse(A, 'ir', inner=inner, tol=tol, maxiter=20)
+
+    b = random_rhs(V, rng)
+    x = solv @ b
+    info = solv.get_info()
+
+    # The accuracy of the float64 operator is reached in a few outer iterations
+    assert info['success']
+    assert 1 < info['niter'] <= 6
+    assert info['niter_inner'] > 0
+    assert np.linalg.norm((A @ x - b).toarray()) < tol
+
+    # The transposed solver solves the transposed system
+    solvT = solv.T
+    x = solvT @ b
+    assert solvT.get_info()['success']
+    assert np.linalg.norm((A.T @ x - b).toarray()) < tol
+
+#===============================================================================
+@pytest.mark.parametrize('dtype', [float, complex])
+@pytest.mark.parametrize('basis', ['newton', 'chebyshev'])
+@pytest.mark.parametrize('s', [2, 4, 8])
+def test_ca_cg(dtype, basis, s):
+
+    V, A = define_data_laplacian_2d(16, dtype=dtype)
+    rng  = np.random.default_rng(5)
+    pc   = A.diagonal(inverse=True)
+    tol  = 1e-10
+
+    ref  = inverse(A, 'pcg', pc=pc, tol=tol)
+    solv = inverse(A, 'ca_cg', pc=pc, tol=tol, s=s, basis=basis)
+
+    for i in range(2):
+        b = random_rhs(V, rng)
+        x = solv @ b
+        ref @ b
+        assert solv.get_info()['success']
+        assert np.linalg.norm((A @ x - b).toarray()) < tol
+
+        # The s-step method is equivalent to CG, up to the granularity of the
+        # convergence check and to the loss of accuracy of the basis
+        assert solv.get_info()['niter'] <= ref.get_info()['niter'] + 2 * s
+
+    # The eigenvalue estimates of the first solve are reused
+    assert len(solv._ritz) == s
+
+#===============================================================================
+@pytest.mark.parametrize('dtype', [float, complex])
+@pytest.mark.parametrize('basis', ['newton', 'chebyshev'])
+@pytest.mark.parametrize('s', [4, 8])
+@pytest.mark.parametrize('restart', [None, 32])
+def test_ca_gmres(dtype, basis, s, restart):
+
+    V, A = define_data_laplacian_2d(14, dtype=dtype)
+
+    # Non-symmetric perturbation (convection term)
+    A[:, :, 1, 0] += 0.8
+    A[:, :, -1, 0] -= 0.8
+    A.remove_spurious_entries()
+
+    rng  = np.random.default_rng(6)
+    tol  = 1e-10
+
+    ref  = inverse(A, 'gmres', tol=tol, maxiter=400)
+    solv = inverse(A, 'ca_gmres', tol=tol, maxiter=400, s=s, basis=basis, restart=restart)
+
+    b = random_rhs(V, rng)
+    x = solv @ b
+    ref @ b
+    assert solv.get_info()['success']
+    assert np.linalg.norm((A @ x - b).toarray()) < tol
+    if restart is None:
+        assert solv.get_info()['niter'] <= ref.get_info()['niter'] + 2 * s
+
+    # Right preconditioning
+    pc   = A.diagonal(inverse=True)
+    solv = inverse(A, 'ca_gmres', pc=pc, tol=tol, maxiter=400, s=s, basis=basis, restart=restart)
+    x = solv @ b
+    assert solv.get_info()['success']
+    assert np.linalg.norm((A @ x - b).toarray()) < tol
+
+#===============================================================================
+@pytest.mark.parametrize('solver', ['ca_cg', 'ca_gmres'])
+@pytest.mark.parallel
+def test_ca_solvers_parallel(solver):
+    from mpi4py import MPI
+    from psydac.linalg.tests.test_stencil_matrix import compute_global_starts_ends
+
+    comm = MPI.COMM_WORLD
+    npts = [16, 12]
+    pads = [2, 2]
+    D = DomainDecomposition(npts, periods=[False, True], comm=comm)
+    global_starts, global_ends = compute_global_starts_ends(D, npts, pads)
+    cart = CartDecomposition(D, npts, global_starts, global_ends, pads=pads, shifts=[1, 1])
+    V = StencilVectorSpace(cart)
+
+    # Shifted five-point Laplacian, with a convection term for GMRES
+    c = 0.5 if solver == 'ca_gmres' else 0
+    A = StencilMatrix(V, V, pads=(1, 1))
+    s1, s2 = V.starts
+    e1, e2 = V.ends
+    A[s1:e1+1, s2:e2+1, 0, 0] = 4.05
+    A[s1:e1+1, s2:e2+1, -1, 0] = -1 - c
+    A[s1:e1+1, s2:e2+1,  1, 0] = -1 + c
+    A[s1:e1+1, s2:e2+1, 0, -1] = A[s1:e1+1, s2:e2+1, 0, 1] = -1
+    A.remove_spurious_entries()
+
+    rng = np.random.default_rng(comm.rank)
+    b = StencilVector(V)
+    b[s1:e1+1, s2:e2+1] = rng.random((e1 - s1 + 1, e2 - s2 + 1))
+
+    tol  = 1e-10
+    solv = inverse(A, solver, pc=A.diagonal(inverse=True), tol=tol, maxiter=400, s=4)
+    x = solv @ b
+    r = A @ x - b
+    assert solv.get_info()['success']
+    assert np.sqrt(r.dot(r).real) < tol
+
+#===============================================================================
+@pytest.mark.parametrize('dtype', [float, complex])
+def test_gmres_orthogonality(dtype):
+
+    n, p = 20, 3
+    diagonals = [-7-2j, -6-2j, -1-10j] if dtype == complex else [-7, -1, -3]
+    V, A, xe = define_data(n, p, diagonals, dtype=dtype)
+    b = A @ xe
+
+    solv = inverse(A, 'gmres', tol=1e-12, maxiter=n)
+    x = solv @ b
+    r = A @ x - b
+    assert solv.get_info()['success']
+    assert np.sqrt(r.dot(r).real) < 1e-11
+
+    # GMRES is exact after n iterations in exact arithmetic
+    assert solv.get_info()['niter'] <= n + 1
+
+    # The Krylov basis is orthonormal
+    k = solv.get_info()['niter'] - 1
+    Q = np.array([q.toarray() for q in solv._Q[:k]])
+    assert np.allclose(Q.conj() @ Q.T, np.eye(k), rtol=1e-12, atol=1e-12)
+
+    # Without convergence, all the iterations are reported
+    solv = inverse(A, 'gmres', tol=1e-12, maxiter=3)
+    solv @ b
+    assert not solv.get_info()['success']
+    assert solv.get_info()['niter'] == 3
+
+#===============================================================================
+@pytest.mark.parametrize('dtype', [float, complex])
+@pytest.mark.parametrize('with_pc', [False, True])
+def test_estimate_spectral_bounds(dtype, with_pc):
+
+    V, A = define_data_laplacian_2d(12, dtype=dtype)
+    pc   = A.diagonal(inverse=True) if with_pc else None
+    ev   = np.linalg.eigvalsh(A.toarray() / (4 if with_pc else 1))
+
+    # The Ritz values lie inside the spectrum, and converge to its ends
+    lmin, lmax = estimate_spectral_bounds(A, pc, maxiter=10)
+    assert ev[0] * (1 - 1e-12) <= lmin < lmax <= ev[-1] * (1 + 1e-12)
+    assert lmax > 0.9 * ev[-1]
+
+    lmin, lmax = estimate_spectral_bounds(A, pc, maxiter=100, tol=1e-10)
+    assert np.isclose(lmin, ev[ 0], rtol=1e-6)
+    assert np.isclose(lmax, ev[-1], rtol=1e-6)
+
+    # The power method only estimates the spectral radius
+    lmin, lmax = estimate_spectral_bounds(A, pc, method='power', maxiter=500, tol=1e-8)
+    assert lmin is None
+    assert np.isclose(lmax, ev[-1], rtol=1e-2)
+
+#===============================================================================
+@pytest.mark.parametrize('dtype', [float, complex])
+def test_chebyshev(dtype):
+
+    V, A = define_data_laplacian_2d(12, dtype=dtype)
+    rng  = np.random.default_rng(4)
+    b    = random_rhs(V, rng)
+    pc   = A.diagonal(inverse=True)
+    tol  = 1e-10
+
+    solv = inverse(A, 'chebyshev', pc=pc, tol=tol)
+    x    = solv @ b
+    info = solv.get_info()
+    r    = A @ x - b
+    assert info['success']
+    assert np.sqrt(r.dot(r).real) < tol
+
+    # Without tolerance, the same iterations are performed without computing any norm
+    a, c  = solv.interval
+    fixed = inverse(A, 'chebyshev', pc=pc, tol=None, maxiter=info['niter'], lmin=a, lmax=c, safety=1)
+    y     = fixed @ b
+    assert fixed.interval == (a, c)
+    assert fixed.get_info()['res_norm'] is None
+    assert np.allclose(y.toarray(), x.toarray(), rtol=1e-12, atol=1e-12)
+
+    # Smoother targeting the upper part of the spectrum
+    smoother = inverse(A, 'chebyshev', pc=pc, tol=None, maxiter=3, eig_ratio=10)
+    a, c = smoother.interval
+    assert np.isclose(c / a, 10)
+    e = smoother @ b
+    r = A @ e - b
+    assert np.sqrt(r.dot(r).real) < np.sqrt(b.dot(b).real)
+
+#===============================================================================
+@pytest.mark.parallel
+def test_chebyshev_parallel():
+    from mpi4py import MPI
+    from psydac.linalg.tests.test_stencil_matrix import compute_global_starts_ends
+
+    comm = MPI.COMM_WORLD
+    npts = [16, 12]
+    pads = [2, 2]
+    D = DomainDecomposition(npts, periods=[False, True], comm=comm)
+    global_starts, global_ends = compute_global_starts_ends(D, npts, pads)
+    cart = CartDecomposition(D, npts, global_starts, global_ends, pads=pads, shifts=[1, 1])
+    V = StencilVectorSpace(cart)
+
+    # Shifted five-point Laplacian
+    A = StencilMatrix(V, V, pads=(1, 1))
+    s1, s2 = V.starts
+    e1, e2 = V.ends
+    A[s1:e1+1, s2:e2+1, 0, 0] = 4.05
+    A[s1:e1+1, s2:e2+1, -1, 0] = A[s1:e1+1, s2:e2+1, 1, 0] = -1
+    A[s1:e1+1, s2:e2+1, 0, -1] = A[s1:e1+1, s2:e2+1, 0, 1] = -1
+    A.remove_spurious_entries()
+
+    rng = np.random.default_rng(comm.rank)
+    b = StencilVector(V)
+    b[s1:e1+1, s2:e2+1] = rng.random((e1 - s1 + 1, e2 - s2 + 1))
+
+    # The spectrum of the Jacobi-preconditioned operator is in [0.05, 8.05] / 4.05
+    pc = A.diagonal(inverse=True)
+    lmin, lmax = estimate_spectral_bounds(A, pc, maxiter=100, tol=1e-10)
+    assert 0.05 / 4.05 - 1e-12 <= lmin < lmax <= 8.05 / 4.05 + 1e-12
+
+    tol  = 1e-10
+    solv = inverse(A, 'chebyshev', pc=pc, tol=tol, lmin=lmin, lmax=lmax)
+    x = solv @ b
+    r = A @ x - b
+    assert solv.get_info()['success']
+    assert np.sqrt(r.dot(r).real) < tol
+
+#===============================================================================
+@pytest.mark.parametrize('dtype', [float, complex])
+@pytest.mark.parametrize('solver', ['lu', 'ilu'])
+def test_local_block_preconditioner(dtype, solver):
+
+    V, A = define_data_laplacian_2d(12, dtype=dtype)
+    rng  = np.random.default_rng(3)
+    b    = random_rhs(V, rng)
+
+    # On a single process the local block is the whole matrix
+    P = LocalBlockPreconditioner(A, solver=solver)
+    if solver == 'lu':
+        assert np.allclose((A @ (P @ b)).toarray(), b.toarray(), rtol=1e-12, atol=1e-12)
+        assert np.allclose((A.H @ (P.H @ b)).toarray(), b.toarray(), rtol=1e-12, atol=1e-12)
+
+    solv = inverse(A, 'pcg', pc=P, tol=1e-10)
+    x = solv @ b
+    assert solv.get_info()['niter'] <= (2 if solver == 'lu' else 8)
+    assert np.linalg.norm((A @ x - b).toarray()) < 1e-10
+
+    # Block system, with a coupling block
+    W = BlockVectorSpace(V, V)
+    B = BlockLinearOperator(W, W, blocks={(0, 0): A, (1, 1): A, (0, 1): 0.5 * A.copy()})
+    c = BlockVector(W, blocks=[b, random_rhs(V, rng)])
+    P = LocalBlockPreconditioner(B, solver=solver)
+    solv = inverse(B, 'pbicgstab', pc=P, tol=1e-10)
+    y = solv @ c
+    assert solv.get_info()['niter'] <= (2 if solver == 'lu' else 8)
+    assert np.linalg.norm((B @ y - c).toarray()) < 1e-10
+
+    with pytest.raises(ValueError):
+        LocalBlockPreconditioner(A, solver='cholesky')
+    with pytest.raises(ValueError):
+        LocalBlockPreconditioner(A, overlap=2)
+
+#===============================================================================
+@pytest.mark.parametrize('periods', [[False, False], [True, False]])
+@pytest.mark.parallel
+def test_local_block_preconditioner_parallel(periods):
+    from mpi4py import MPI
+    from psydac.linalg.tests.test_stencil_matrix import compute_global_starts_ends
+
+    comm = MPI.COMM_WORLD
+    npts = [16, 12]
+    pads = [2, 2]
+    D = DomainDecomposition(npts, periods=periods, comm=comm)
+    global_starts, global_ends = compute_global_starts_ends(D, npts, pads)
+    cart = CartDecomposition(D, npts, global_starts, global_ends, pads=pads, shifts=[1, 1])
+    V = StencilVectorSpace(cart)
+
+    # Shifted five-point Laplacian
+    A = StencilMatrix(V, V, pads=(1, 1))
+    s1, s2 = V.starts
+    e1, e2 = V.ends
+    A[s1:e1+1, s2:e2+1, 0, 0] = 4.05
+    A[s1:e1+1, s2:e2+1, -1, 0] = A[s1:e1+1, s2:e2+1, 1, 0] = -1
+    A[s1:e1+1, s2:e2+1, 0, -1] = A[s1:e1+1, s2:e2+1, 0, 1] = -1
+    A.remove_spurious_entries()
+
+    rng = np.random.default_rng(comm.rank)
+    b = StencilVector(V)
+    b[s1:e1+1, s2:e2+1] = rng.random((e1 - s1 + 1, e2 - s2 + 1))
+
+    tol  = 1e-10
+    ref  = inverse(A, 'pcg', pc=A.diagonal(inverse=True), tol=tol)
+    ref @ b
+
+    # Block-Jacobi preconditioner
+    solv = inverse(A, 'pcg', pc=LocalBlockPreconditioner(A), tol=tol)
+    x = solv @ b
+    r = A @ x - b
+    assert solv.get_info()['success']
+    assert np.sqrt(r.dot(r).real) < tol
+    assert solv.get_info()['niter'] <= ref.get_info()['niter']
+
+    # Restricted additive Schwarz preconditioner: the overlap reduces the number of iterations
+    niter = []
+    for overlap in [0, 1, 2]:
+        solv = inverse(A, 'pbicgstab', pc=LocalBlockPreconditioner(A, overlap=overlap), tol=tol)
+        x = solv @ b
+        r = A @ x - b
+        assert solv.get_info()['success']
+        assert np.sqrt(r.dot(r).real) < tol
+        niter.append(solv.get_info()['niter'])
+
+    assert niter[2] <= niter[1] <= niter[0]
+
+#===============================================================================
+@pytest.mark.parametrize('dtype', [float, complex])
+def test_stencil_ilu0_ic0(dtype):
+
+    # In 1D the band of the matrix is closed under LU factorization, hence ILU(0) is exact
+    n, p = 12, 3
+    V, A = define_data(n, p, [1, 6, 2], dtype=dtype)[:2]
+    b    = StencilVector(V)
+    b[0:n] = np.arange(1, n + 1)
+
+    P = StencilILU0(A)
+    assert np.allclose((A @ (P @ b)).toarray(), b.toarray(), rtol=1e-12, atol=1e-12)
+    assert np.allclose((A.T @ (P.T @ b)).toarray(), b.toarray(), rtol=1e-12, atol=1e-12)
+    assert np.allclose((A.H @ (P.H @ b)).toarray(), b.toarray(), rtol=1e-12, atol=1e-12)
+    H = A + A.H
+    P = StencilIC0(H)
+    assert P.H is P
+    assert np.allclose((H @ (P @ b)).toarray(), b.toarray(), rtol=1e-12, atol=1e-12)
+
+    # 2D Laplacian: IC(0) with PCG
+    V, A = define_data_laplacian_2d(16, dtype=dtype)
+    rng  = np.random.default_rng(4)
+    b    = random_rhs(V, rng)
+    tol  = 1e-10
+
+    ref  = inverse(A, 'pcg', pc=A.diagonal(inverse=True), tol=tol)
+    ref @ b
+    solv = inverse(A, 'pcg', pc=StencilIC0(A), tol=tol)
+    x = solv @ b
+    assert solv.get_info()['success']
+    assert np.linalg.norm((A @ x - b).toarray()) < tol
+    assert solv.get_info()['niter'] < ref.get_info()['niter']
+
+    # Non-symmetric perturbation (convection term): ILU(0) with PBiCGStab
+    A[:, :, 1, 0] += 0.8
+    A[:, :, -1, 0] -= 0.8
+    A.remove_spurious_entries()
+
+    ref  = inverse(A, 'pbicgstab', pc=A.diagonal(inverse=True), tol=tol)
+    ref @ b
+    solv = inverse(A, 'pbicgstab', pc=StencilILU0(A), tol=tol)
+    x = solv @ b
+    assert solv.get_info()['success']
+    assert np.linalg.norm((A @ x - b).toarray()) < tol
+    assert solv.get_info()['niter'] < ref.get_info()['niter']
+
+    # A matrix which is not positive definite
+    with pytest.raises(ValueError):
+        StencilIC0(-A)
+
+#===============================================================================
+@pytest.mark.parallel
+def test_stencil_ilu0_ic0_parallel():
+    from mpi4py import MPI
+    from psydac.linalg.tests.test_stencil_matrix import compute_global_starts_ends
+
+    comm = MPI.COMM_WORLD
+    npts = [16, 12]
+    pads = [2, 2]
+    D = DomainDecomposition(npts, periods=[False, False], comm=comm)
+    global_starts, global_ends = compute_global_starts_ends(D, npts, pads)
+    cart = CartDecomposition(D, npts, global_starts, global_ends, pads=pads, shifts=[1, 1])
+    V = StencilVectorSpace(cart)
+
+    # Shifted five-point Laplacian
+    A = StencilMatrix(V, V, pads=(1, 1))
+    s1, s2 = V.starts
+    e1, e2 = V.ends
+    A[s1:e1+1, s2:e2+1, 0, 0] = 4.05
+    A[s1:e1+1, s2:e2+1, -1, 0] = A[s1:e1+1, s2:e2+1, 1, 0] = -1
+    A[s1:e1+1, s2:e2+1, 0, -1] = A[s1:e1+1, s2:e2+1, 0, 1] = -1
+    A.remove_spurious_entries()
+
+    rng = np.random.default_rng(comm.rank)
+    b = StencilVector(V)
+    b[s1:e1+1, s2:e2+1] = rng.random((e1 - s1 + 1, e2 - s2 + 1))
+
+    tol = 1e-10
+    ref = inverse(A, 'pcg', pc=A.diagonal(inverse=True), tol=tol)
+    ref @ b
+
+    # The rank-local factorizations are block preconditioners
+    for solver, P in [('pcg', StencilIC0(A)), ('pbicgstab', StencilILU0(A))]:
+        solv = inverse(A, solver, pc=P, tol=tol)
+        x = solv @ b
+        r = A @ x - b
+        assert solv.get_info()['success']
+        assert np.sqrt(r.dot(r).real) < tol
+        assert solv.get_info()['niter'] < ref.get_info()['niter']
+
 # ===============================================================================
 # SCRIPT FUNCTIONALITY
 #===============================================================================
@@ -4,7 +4,7 @@ import pytest
 import numpy as np
 from random import random
 
-from psydac.linalg.stencil import StencilVectorSpace, StencilVector, StencilMatrix
+from psydac.linalg.stencil import StencilVectorSpace, StencilVector, StencilMatrix, SymmetricStencilMatrix, WideStencilMatrix
 from psydac.linalg.utilities import petsc_to_psydac
 from psydac.api.settings import PSYDAC_BACKENDS
 from psydac.ddm.cart import DomainDecomposition, CartDecomposition
@@ -605,6 +605,42 @@ def test_stencil_matrix_2d_serial_topetsc( dtype, n1, n2, p1, p2, s1, s2, P1, P2
     assert (indices == M.indices).all()
     assert np.array_equal(data, M.data)
 
+# ===============================================================================
+@pytest.mark.parametrize('dtype', [float, complex])
+@pytest.mark.parametrize('P1', [True, False])
+@pytest.mark.petsc
+
+def test_stencil_matrix_2d_serial_topetsc_update_values(dtype, P1):
+    n1, n2 = 6, 5
+    p1, p2 = 2, 1
+
+    D = DomainDecomposition([n1, n2], periods=[P1, True])
+    npts = [n1, n2]
+    global_starts, global_ends = compute_global_starts_ends(D, npts, [p1, p2])
+    cart = CartDecomposition(D, npts, global_starts, global_ends, pads=[p1, p2], shifts=[1, 1])
+
+    V = StencilVectorSpace(cart, dtype=dtype)
+    M = StencilMatrix(V, V)
+    rng = np.random.default_rng(0)
+    M._data[:] = rng.random(M._data.shape)
+    M.remove_spurious_entries()
+
+    Mp = M.topetsc()
+
+    # Assemble new values and refresh the PETSc matrix in place
+    M._data *= 2
+    M[:, :, 0, 0] = 0
+    assert M.update_values(Mp) is Mp
+
+    indptr, indices, data = Mp.getValuesCSR()
+    if dtype == float:
+        data = data.real #PETSc with installation complex configuration only handles complex dtype
+
+    Mc = M.tocsr()
+    assert (indptr == Mc.indptr).all()
+    assert (indices == Mc.indices).all()
+    assert np.allclose(data, Mc.data, rtol=1e-14, atol=1e-14)
+
 # ===============================================================================
     
 @pytest.mark.parametrize('n1', [5])
@@ -718,6 +754,121 @@ def test_stencil_matrix_2d_serial_tosparse( dtype, n1, n2, p1, p2, s1, s2, P1, P
     assert Ms.shape == M.shape
     assert np.array_equal(Ms.toarray(), Ms_exa.toarray())
 
+# ===============================================================================
+@pytest.mark.parametrize('dtype', [float, complex])
+@pytest.mark.parametrize('n1', [4, 7])
+@pytest.mark.parametrize('n2', [6])
+@pytest.mark.parametrize('p1', [1, 2])
+@pytest.mark.parametrize('p2', [1])
+@pytest.mark.parametrize('P1', [True, False])
+@pytest.mark.parametrize('P2', [True, False])
+@pytest.mark.parametrize('order', ['C', 'F'])
+def test_stencil_matrix_2d_serial_tocsr_update_values(dtype, n1, n2, p1, p2, P1, P2, order):
+    # Create domain decomposition
+    D = DomainDecomposition([n1, n2], periods=[P1, P2])
+
+    # Partition the points
+    npts = [n1, n2]
+    global_starts, global_ends = compute_global_starts_ends(D, npts, [p1, p2])
+    cart = CartDecomposition(D, npts, global_starts, global_ends, pads=[p1, p2], shifts=[1, 1])
+
+    # Create vector space and two stencil matrices with random values
+    V = StencilVectorSpace(cart, dtype=dtype)
+    M = StencilMatrix(V, V)
+    N = StencilMatrix(V, V)
+    rng = np.random.default_rng(0)
+    M._data[:] = rng.random(M._data.shape)
+    N._data[:] = rng.random(N._data.shape) * (rng.random(N._data.shape) > 0.5)
+    if dtype == complex:
+        M._data *= 1 - 2j
+        N._data *= 2 + 1j
+    M.remove_spurious_entries()
+    N.remove_spurious_entries()
+
+    # The CSR matrix stores the full stencil pattern, without the couplings
+    # outside of the domain in the non-periodic directions
+    Mc = M.tocsr(order=order)
+    assert Mc.shape == M.shape
+    assert Mc.has_sorted_indices
+    assert Mc.nnz == M.tosparse(order=order).tocsr().nnz
+    assert abs(Mc - M.tosparse(order=order).tocsr()).max() == 0
+
+    # The structure is computed once for all the matrices with the same spaces
+    assert N._csr_structure(order) is M._csr_structure(order)
+
+    # Refresh the values in place
+    indptr  = Mc.indptr.copy()
+    indices = Mc.indices.copy()
+    assert N.update_values(Mc, order=order) is Mc
+    assert np.array_equal(Mc.indptr, indptr)
+    assert np.array_equal(Mc.indices, indices)
+    assert abs(Mc - N.tosparse(order=order).tocsr()).max() == 0
+
+    # Only the matrices created by tocsr can be updated
+    with pytest.raises(TypeError):
+        N.update_values(N.tosparse(order=order))
+
+    # The local COO matrices use a cached structure as well
+    assert N._coo_local_structure(order) is M._coo_local_structure(order)
+    assert M.tocoo_local(order=order).nnz == np.count_nonzero(M._data[p1:-p1, p2:-p2])
+
+# ===============================================================================
+@pytest.mark.parametrize('n1', [8, 11])
+@pytest.mark.parametrize('p1', [1, 2, 3])
+@pytest.mark.parametrize('P1', [True, False])
+def test_stencil_matrix_1d_serial_tocsr_pattern(n1, p1, P1):
+    D = DomainDecomposition([n1], periods=[P1])
+    global_starts, global_ends = compute_global_starts_ends(D, [n1], [p1])
+    cart = CartDecomposition(D, [n1], global_starts, global_ends, pads=[p1], shifts=[1])
+
+    V = StencilVectorSpace(cart)
+    M = StencilMatrix(V, V)
+    M._data[...] = 1
+
+    # The pattern only couples the rows with the columns in the domain: the
+    # corners are not included in the non-periodic case
+    i, j = np.indices((n1, n1))
+    d = abs(i - j)
+    band = (d <= p1) | (P1 & (n1 - d <= p1))
+
+    Mc = M.tocsr()
+    assert np.array_equal(Mc.toarray() != 0, band)
+    assert Mc.nnz == np.count_nonzero(band)
+
+# ===============================================================================
+@pytest.mark.parametrize('dtype', [float, complex])
+@pytest.mark.parametrize('P1', [True, False])
+@pytest.mark.parallel
+def test_stencil_matrix_2d_parallel_tocsr_update_values(dtype, P1):
+    from mpi4py import MPI
+
+    comm = MPI.COMM_WORLD
+    n1, n2 = 12, 5
+    p1, p2 = 2, 1
+
+    D = DomainDecomposition([n1, n2], periods=[P1, True], comm=comm)
+    npts = [n1, n2]
+    global_starts, global_ends = compute_global_starts_ends(D, npts, [p1, p2])
+    cart = CartDecomposition(D, npts, global_starts, global_ends, pads=[p1, p2], shifts=[1, 1])
+
+    V = StencilVectorSpace(cart, dtype=dtype)
+    M = StencilMatrix(V, V)
+    rng = np.random.default_rng(comm.rank)
+    M._data[:] = rng.random(M._data.shape)
+    M.remove_spurious_entries()
+
+    # Each process stores its own rows, with global indices
+    Mc = M.tocsr()
+    assert abs(Mc - M.tosparse().tocsr()).max() == 0
+
+    M._data *= 3
+    M.update_values(Mc)
+    assert abs(Mc - M.tosparse().tocsr()).max() == 0
+
+    # Each row of the global matrix is stored by exactly one process
+    nrows = comm.allreduce(np.count_nonzero(np.diff(Mc.indptr)), op=MPI.SUM)
+    assert nrows == n1 * n2
+
 # TODO: verify for s>1
 # ===============================================================================
 @pytest.mark.parametrize('dtype', [float, complex])
@@ -2185,6 +2336,298 @@ def test_stencil_matrix_2d_serial_backend_switch(dtype, n1, n2, p1, p2, s1, s2,
     assert M.backend is backend2
     M.dot(x)
 
+# ===============================================================================
+@pytest.mark.parametrize('dtype', [float, complex])
+@pytest.mark.parametrize(('npts', 'pads', 'shifts', 'periods'),
+    [([11], [2], [1], [True]),
+     ([10, 9], [2, 3], [1, 2], [True, False]),
+     ([7, 8, 6], [2, 1, 2], [1, 1, 2], [False, True, False])])
+def test_stencil_matrix_serial_threaded_kernels(dtype, npts, pads, shifts, periods):
+    # Compare the multi-threaded kernels with the sequential ones
+    ncells = [n - 1 if not P else n for n, P in zip(npts, periods)]
+
+    results = []
+    for num_threads in (1, 2):
+        D = DomainDecomposition(ncells, periods=periods, num_threads=num_threads)
+        global_starts, global_ends = compute_global_starts_ends(D, npts, pads)
+        cart = CartDecomposition(D, npts, global_starts, global_ends, pads=pads, shifts=shifts)
+
+        V = StencilVectorSpace(cart, dtype=dtype)
+        M = StencilMatrix(V, V)
+        x = StencilVector(V)
+        y = StencilVector(V)
+
+        assert V.num_threads == num_threads
+        threaded = (num_threads > 1)
+        assert (M._func.__name__.endswith('_omp')) == threaded
+        assert (M._transpose_func.__name__.endswith('_omp')) == threaded
+        assert (V._axpy_func.__name__.endswith('_omp')) == threaded
+        assert (V._inner_func.__name__.endswith('_omp')) == threaded
+
+        # Same random data in both cases
+        rng = np.random.default_rng(0)
+        M._data[...] = rng.random(M._data.shape)
+        M.remove_spurious_entries()
+        x._data[...] = rng.random(x._data.shape)
+        y._data[...] = rng.random(y._data.shape)
+        x.update_ghost_regions()
+        y.update_ghost_regions()
+
+        z = M.dot(x)
+        V.axpy(2.0, x, y)
+        results.append((z.toarray(), M.T.toarray(), y.toarray(), x.dot(y)))
+
+    for r1, r2 in zip(*results):
+        assert np.allclose(r1, r2, rtol=1e-14, atol=1e-14)
+
+# ===============================================================================
+@pytest.mark.parametrize(('npts', 'pads', 'shifts', 'periods'),
+    [([11], [2], [1], [True]),
+     ([10, 9], [2, 3], [1, 2], [True, False]),
+     ([7, 8, 6], [2, 1, 2], [1, 1, 2], [False, True, False])])
+@pytest.mark.parametrize('num_threads', [1, 2])
+def test_stencil_matrix_serial_mixed_precision(npts, pads, shifts, periods, num_threads):
+    # Compare a float32 matrix with the float64 matrix which has the same (rounded) coefficients
+    ncells = [n - 1 if not P else n for n, P in zip(npts, periods)]
+
+    D = DomainDecomposition(ncells, periods=periods, num_threads=num_threads)
+    global_starts, global_ends = compute_global_starts_ends(D, npts, pads)
+    cart = CartDecomposition(D, npts, global_starts, global_ends, pads=pads, shifts=shifts)
+
+    V = StencilVectorSpace(cart, dtype=float)
+    M = StencilMatrix(V, V)
+
+    rng = np.random.default_rng(0)
+    M._data[...] = rng.random(M._data.shape)
+    M.remove_spurious_entries()
+
+    M32 = M.astype(np.float32)
+    M64 = M32.astype(np.float64)
+
+    assert M32.dtype == V.dtype
+    assert M32._data.dtype == np.float32
+    assert M32._func.__name__.endswith('_mixed')
+    assert M64._data.dtype == np.float64
+    assert np.array_equal(M32._data, M64._data)
+
+    x = StencilVector(V)
+    x._data[...] = rng.random(x._data.shape)
+    x.update_ghost_regions()
+
+    # Vectors and accumulation are in double precision
+    y = M32.dot(x)
+    assert y.dtype == V.dtype
+    assert np.allclose(y.toarray(), M64.dot(x).toarray(), rtol=1e-14, atol=1e-14)
+    assert np.allclose(y.toarray(), M.dot(x).toarray(), rtol=1e-6, atol=1e-6)
+
+    # Transpose, conversion to sparse format, diagonal and arithmetic keep the precision
+    assert M32.T._data.dtype == np.float32
+    assert np.array_equal(M32.T.toarray(), M64.T.toarray())
+    assert np.array_equal(M32.toarray(), M64.toarray())
+    assert np.array_equal(M32.diagonal().toarray(), M64.diagonal().toarray())
+    assert (2 * M32 - M32)._data.dtype == np.float32
+    assert np.allclose(M32.dot(x, out=y).toarray(), M32.copy().dot(x).toarray(), rtol=1e-14, atol=1e-14)
+
+    # Only float32 coefficients in float64 spaces are supported
+    W = StencilVectorSpace(cart, dtype=complex)
+    with pytest.raises(NotImplementedError):
+        StencilMatrix(W, W, dtype=np.complex64)
+    with pytest.raises(NotImplementedError):
+        StencilMatrix(V, V, dtype=np.float16)
+    with pytest.raises(NotImplementedError):
+        M32.set_backend(PSYDAC_BACKEND_GPYCCEL)
+
+# ===============================================================================
+@pytest.mark.parametrize('dtype', [float, complex])
+@pytest.mark.parametrize(('npts', 'pads', 'periods'),
+    [([11], [2], [True]),
+     ([12], [3], [False]),
+     ([10, 9], [2, 3], [True, False]),
+     ([7, 8, 6], [2, 1, 2], [False, True, False])])
+def test_symmetric_stencil_matrix_serial(dtype, npts, pads, periods):
+    ncells = [n - 1 if not P else n for n, P in zip(npts, periods)]
+
+    D = DomainDecomposition(ncells, periods=periods)
+    global_starts, global_ends = compute_global_starts_ends(D, npts, pads)
+    cart = CartDecomposition(D, npts, global_starts, global_ends, pads=pads, shifts=[1] * len(npts))
+
+    V = StencilVectorSpace(cart, dtype=dtype)
+    R = StencilMatrix(V, V)
+
+    rng = np.random.default_rng(0)
+    R._data[...] = rng.random(R._data.shape)
+    if dtype == complex:
+        R._data[...] += 1j * rng.random(R._data.shape)
+    R.remove_spurious_entries()
+
+    # Upper half of the band of a symmetric matrix
+    upper = (slice(None),) * len(npts) + (slice(pads[0], None),)
+    S = SymmetricStencilMatrix(V)
+    S._data[...] = (R + R.T)._data[upper]
+    S.remove_spurious_entries()
+
+    # Only the diagonals with k1 >= 0 are stored
+    assert S._data.shape[len(npts)] == pads[0] + 1
+    assert S._func.__name__.endswith('_symmetric')
+    with pytest.raises(IndexError):
+        S[(0,) * len(npts) + (-1,) + (0,) * (len(npts) - 1)]
+
+    # Full matrix with the same entries
+    M = S.tostencil()
+    A = M.toarray()
+    assert type(M) is StencilMatrix
+    assert np.array_equal(A, A.T)
+    assert np.array_equal(S.toarray(), A)
+    assert np.array_equal(S.tosparse().toarray(), A)
+    assert np.array_equal(S.diagonal().toarray(), M.diagonal().toarray())
+
+    x = StencilVector(V)
+    x._data[...] = rng.random(x._data.shape)
+    x.update_ghost_regions()
+
+    assert np.allclose(S.dot(x).toarray(), M.dot(x).toarray(), rtol=1e-14, atol=1e-14)
+    assert np.allclose(S.vdot(x).toarray(), M.vdot(x).toarray(), rtol=1e-14, atol=1e-14)
+
+    # Transpose and arithmetic keep the symmetric storage
+    assert isinstance(S.T, SymmetricStencilMatrix)
+    assert np.array_equal(S.T.toarray(), A)
+    assert np.array_equal(S.H.toarray(), A.conj())
+    assert isinstance(2 * S - S, SymmetricStencilMatrix)
+    assert np.allclose((2 * S - S).toarray(), A, rtol=1e-14, atol=1e-14)
+
+    # Setting an entry updates the transposed entry
+    index = tuple(n // 2 for n in npts)
+    S[index + (1,) + (0,) * (len(npts) - 1)] = 7
+    B = S.toarray()
+    i = np.ravel_multi_index(index, npts)
+    j = np.ravel_multi_index((index[0] + 1,) + index[1:], npts)
+    assert B[i, j] == 7 and B[j, i] == 7
+
+    # Only square matrices with the padding and data type of V
+    W = StencilVectorSpace(cart, dtype=dtype)
+    with pytest.raises(AssertionError):
+        SymmetricStencilMatrix(V, W)
+    with pytest.raises(NotImplementedError):
+        SymmetricStencilMatrix(V, dtype=np.float32)
+
+# ===============================================================================
+@pytest.mark.parametrize('dtype', [float, complex])
+@pytest.mark.parametrize(('npts', 'pads', 'pA', 'pB', 'periods'),
+    [([12], [3], [1], [2], [False]),
+     ([11], [3], [2], [1], [True]),
+     ([9, 10], [2, 3], [1, 1], [1, 2], [True, False]),
+     ([6, 7, 5], [2, 2, 2], [1, 1, 1], [1, 1, 1], [False, True, False])])
+def test_stencil_matrix_matmat_serial(dtype, npts, pads, pA, pB, periods):
+    ncells = [n - 1 if not P else n for n, P in zip(npts, periods)]
+
+    D = DomainDecomposition(ncells, periods=periods)
+    global_starts, global_ends = compute_global_starts_ends(D, npts, pads)
+    cart = CartDecomposition(D, npts, global_starts, global_ends, pads=pads, shifts=[1] * len(npts))
+
+    V = StencilVectorSpace(cart, dtype=dtype)
+    A = StencilMatrix(V, V, pads=pA)
+    B = StencilMatrix(V, V, pads=pB)
+
+    rng = np.random.default_rng(0)
+    for M in (A, B):
+        M._data[...] = rng.random(M._data.shape)
+        if dtype == complex:
+            M._data[...] += 1j * rng.random(M._data.shape)
+        M.remove_spurious_entries()
+
+    # The band of the product is the sum of the bands
+    C = A.matmat(B)
+    assert type(C) is StencilMatrix
+    assert C.domain is V and C.codomain is V
+    assert C.pads == tuple(a + b for a, b in zip(pA, pB))
+    assert np.allclose(C.toarray(), A.toarray() @ B.toarray(), rtol=1e-14, atol=1e-14)
+
+    x = StencilVector(V)
+    x._data[...] = rng.random(x._data.shape)
+    x.update_ghost_regions()
+    assert np.allclose(C.dot(x).toarray(), A.dot(B.dot(x)).toarray(), rtol=1e-14, atol=1e-14)
+
+    # Diagonals which are exactly zero are trimmed, unless a padding is given
+    I = StencilMatrix(V, V, pads=pA)
+    I._data[(slice(None),) * len(npts) + tuple(pA)] = 1
+    assert A.matmat(I).pads == tuple(pA)
+    assert np.array_equal(A.matmat(I).toarray(), A.toarray())
+    assert A.matmat(I, pads=pads).pads == tuple(pads)
+    assert np.array_equal(A.matmat(I, pads=pads).toarray(), A.toarray())
+    with pytest.raises(ValueError):
+        A.matmat(I, pads=[0] * len(npts))
+
+# ===============================================================================
+def assemble_mass_matrix(ncells, degree, periodic, comm=None):
+    from sympde.topology import Line, Square, ScalarFunctionSpace, element_of
+    from sympde.expr     import BilinearForm, integral
+    from psydac.api.discretization import discretize
+
+    domain = Line() if len(ncells) == 1 else Square()
+    V = ScalarFunctionSpace('V', domain)
+    u = element_of(V, name='u')
+    v = element_of(V, name='v')
+
+    a = BilinearForm((u, v), integral(domain, u * v))
+    domain_h = discretize(domain, ncells=ncells, periodic=periodic, comm=comm)
+    V_h = discretize(V, domain_h, degree=degree)
+    a_h = discretize(a, domain_h, [V_h, V_h], backend=PSYDAC_BACKENDS['python'])
+    return a_h.assemble()
+
+# ===============================================================================
+@pytest.mark.parametrize(('ncells', 'degree', 'periodic'),
+    [([10], [3], [False]),
+     ([8], [2], [True]),
+     ([6, 5], [2, 3], [True, False])])
+def test_stencil_matrix_matmat_mass(ncells, degree, periodic):
+
+    # The ghost regions of the spaces only hold the band of the mass matrix
+    M = assemble_mass_matrix(ncells, degree, periodic)
+    V = M.domain
+    assert M.pads == V.pads
+
+    # The product with twice the band is stored on widened spaces
+    C = M.matmat(M)
+    assert isinstance(C, WideStencilMatrix)
+    assert C.domain is V and C.codomain is V
+    assert C.pads == tuple(2 * p for p in degree)
+    assert C.matrix.domain is C.matrix.codomain is V.widened(C.pads)
+    assert C.matrix.domain.npts == V.npts and C.matrix.domain.pads == C.pads
+
+    Ms = M.tosparse()
+    assert abs(C.tosparse() - Ms @ Ms).max() < 1e-14
+
+    # Same product as the composition, on the vectors of V
+    rng = np.random.default_rng(0)
+    x = StencilVector(V)
+    x[tuple(slice(0, n) for n in V.npts)] = rng.random(V.npts)
+    y = C.dot(x)
+    assert y.space is V
+    assert np.allclose(y.toarray(), M.dot(M.dot(x)).toarray(), rtol=1e-14, atol=1e-14)
+    assert np.allclose(C.T.dot(x).toarray(), M.T.dot(M.T.dot(x)).toarray(), rtol=1e-14, atol=1e-14)
+
+    # Extension to the widened space and restriction back to V
+    E = V.extension(C.pads)
+    R = V.restriction(C.pads)
+    assert V.extension(C.pads) is E and V.restriction(C.pads) is R
+    assert E.codomain is R.domain is C.matrix.domain
+    assert np.array_equal(R.dot(C.matrix.dot(E.dot(x))).toarray(), y.toarray())
+
+    # The widened spaces are shared by the products with the same padding
+    assert M.matmat(M).matrix.domain is C.matrix.domain
+    assert C.matrix.domain.widened(V.pads) is C.matrix.domain
+
+    # Products and sums with the wide matrix stay on the spaces of M
+    D = C.matmat(M)
+    assert isinstance(D, WideStencilMatrix)
+    assert D.domain is V and D.codomain is V
+    assert abs(D.tosparse() - Ms @ Ms @ Ms).max() < 1e-13
+    assert abs(M.matmat(C).tosparse() - D.tosparse()).max() < 1e-13
+    S = M - 2 * C
+    assert isinstance(S, WideStencilMatrix)
+    assert S.domain is V and S.codomain is V
+    assert abs(S.tosparse() - (Ms - 2 * Ms @ Ms)).max() < 1e-14
+
 # ===============================================================================
 # PARALLEL TESTS
 # ===============================================================================
@@ -2388,6 +2831,234 @@ def test_stencil_matrix_2d_parallel_dot(dtype, n1, n2, p1, p2, sh1, sh2, P1, P2)
     # Check data in 1D array
     assert np.allclose(ya, ya_exact, rtol=1e-13, atol=1e-13)
 
+# ===============================================================================
+@pytest.mark.parametrize('dtype', [float, complex])
+@pytest.mark.parametrize(('npts', 'pads'), [([17], [2]), ([13, 16], [1, 3]), ([9, 8, 10], [2, 1, 2])])
+@pytest.mark.parametrize('shift', [1, 2])
+@pytest.mark.parametrize('periodic', [True, False])
+@pytest.mark.parallel
+def test_stencil_matrix_parallel_overlapped_dot(dtype, npts, pads, shift, periodic):
+    from mpi4py import MPI
+
+    comm = MPI.COMM_WORLD
+    ndim = len(npts)
+    rng  = np.random.default_rng(comm.rank)
+
+    # Create domain decomposition, vector space and stencil matrix
+    D = DomainDecomposition(npts, periods=[periodic] * ndim, comm=comm)
+    global_starts, global_ends = compute_global_starts_ends(D, npts, pads)
+    cart = CartDecomposition(D, npts, global_starts, global_ends, pads=pads, shifts=[shift] * ndim)
+
+    V = StencilVectorSpace(cart, dtype=dtype)
+    M = StencilMatrix(V, V)
+    M._data[...] = rng.random(M._data.shape)
+    if dtype == complex:
+        M._data[...] += 1j * rng.random(M._data.shape)
+    M.remove_spurious_entries()
+
+    x = StencilVector(V)
+    local = tuple(slice(s, e + 1) for s, e in zip(V.starts, V.ends))
+    x[local] = rng.random(x[local].shape)
+
+    # Reference product without overlap of communication and computation
+    M.overlap_communication = False
+    y_ref = M.dot(x)
+    assert x.ghost_regions_in_sync
+
+    # Overlapped product
+    M.overlap_communication = True
+    x.ghost_regions_in_sync = False
+    y = StencilVector(V)
+    y._data[...] = np.nan
+    M.dot(x, out=y)
+    assert x.ghost_regions_in_sync
+    assert not y.ghost_regions_in_sync
+    assert np.array_equal(y[local], y_ref[local])
+
+    # The interior box does not read the ghost regions of x, and the boxes cover all rows
+    boxes = M._compute_overlap_boxes()
+    if boxes:
+        x_nan = x.copy()
+        x_nan._data[...] = np.nan
+        x_nan[local] = x[local]
+        y._data[...] = np.nan
+        M._dot_boxes(x_nan, y, boxes[:1])
+        interior = ~np.isnan(y[local])
+        assert interior.any()
+        assert np.array_equal(y[local][interior], y_ref[local][interior])
+
+        M._dot_boxes(x, y, boxes[1:])
+        assert np.array_equal(y[local], y_ref[local])
+
+# ===============================================================================
+@pytest.mark.parametrize(('npts', 'pads'), [([17], [2]), ([13, 16], [1, 3]), ([9, 8, 10], [2, 1, 2])])
+@pytest.mark.parametrize('shift', [1, 2])
+@pytest.mark.parametrize('periodic', [True, False])
+@pytest.mark.parallel
+def test_stencil_matrix_parallel_mixed_precision(npts, pads, shift, periodic):
+    from mpi4py import MPI
+
+    comm = MPI.COMM_WORLD
+    ndim = len(npts)
+    rng  = np.random.default_rng(comm.rank)
+
+    D = DomainDecomposition(npts, periods=[periodic] * ndim, comm=comm)
+    global_starts, global_ends = compute_global_starts_ends(D, npts, pads)
+    cart = CartDecomposition(D, npts, global_starts, global_ends, pads=pads, shifts=[shift] * ndim)
+
+    V   = StencilVectorSpace(cart)
+    M32 = StencilMatrix(V, V, dtype=np.float32)
+    M32._data[...] = rng.random(M32._data.shape)
+    M32.remove_spurious_entries()
+    M64 = M32.astype(float)
+
+    x = StencilVector(V)
+    local = tuple(slice(s, e + 1) for s, e in zip(V.starts, V.ends))
+    x[local] = rng.random(x[local].shape)
+
+    # Overlapped and non-overlapped products in mixed precision
+    y_ref = M64.dot(x)
+    for overlap in [True, False]:
+        M32.overlap_communication = overlap
+        x.ghost_regions_in_sync = False
+        y = M32.dot(x)
+        assert np.allclose(y[local], y_ref[local], rtol=1e-14, atol=1e-14)
+
+    # Ghost regions of the matrix are exchanged in single precision
+    M32.update_ghost_regions()
+    M64.update_ghost_regions()
+    assert np.array_equal(M32._data, M64._data)
+    assert np.array_equal(M32.T.toarray(), M64.T.toarray())
+
+# ===============================================================================
+@pytest.mark.parametrize(('npts', 'pads'), [([17], [2]), ([13, 16], [1, 3]), ([9, 8, 10], [2, 1, 2])])
+@pytest.mark.parametrize('periodic', [True, False])
+@pytest.mark.parallel
+def test_symmetric_stencil_matrix_parallel(npts, pads, periodic):
+    from mpi4py import MPI
+
+    comm = MPI.COMM_WORLD
+    ndim = len(npts)
+    rng  = np.random.default_rng(comm.rank)
+
+    D = DomainDecomposition(npts, periods=[periodic] * ndim, comm=comm)
+    global_starts, global_ends = compute_global_starts_ends(D, npts, pads)
+    cart = CartDecomposition(D, npts, global_starts, global_ends, pads=pads, shifts=[1] * ndim)
+
+    V = StencilVectorSpace(cart)
+    R = StencilMatrix(V, V)
+    R._data[...] = rng.random(R._data.shape)
+    R.remove_spurious_entries()
+
+    # Upper half of the band of a symmetric matrix
+    upper = (slice(None),) * ndim + (slice(pads[0], None),)
+    S = SymmetricStencilMatrix(V)
+    S._data[...] = (R + R.T)._data[upper]
+    S.remove_spurious_entries()
+    M = S.tostencil()
+
+    x = StencilVector(V)
+    local = tuple(slice(s, e + 1) for s, e in zip(V.starts, V.ends))
+    x[local] = rng.random(x[local].shape)
+
+    # Overlapped and non-overlapped products
+    y_ref = M.dot(x)
+    for overlap in [True, False]:
+        S.overlap_communication = overlap
+        x.ghost_regions_in_sync = False
+        y = S.dot(x)
+        assert np.allclose(y[local], y_ref[local], rtol=1e-14, atol=1e-14)
+
+    # Each process converts its own rows
+    A = S.toarray()
+    assert np.array_equal(A, M.toarray())
+    A = comm.allreduce(A, op=MPI.SUM)
+    assert np.allclose(A, A.T, rtol=1e-14, atol=1e-14)
+
+# ===============================================================================
+@pytest.mark.parametrize(('npts', 'pads', 'pA', 'pB'),
+    [([17], [3], [2], [1]),
+     ([13, 16], [2, 3], [1, 1], [1, 2]),
+     ([9, 8, 10], [2, 2, 2], [1, 1, 1], [1, 1, 1])])
+@pytest.mark.parametrize('periodic', [True, False])
+@pytest.mark.parallel
+def test_stencil_matrix_matmat_parallel(npts, pads, pA, pB, periodic):
+    from mpi4py import MPI
+
+    comm = MPI.COMM_WORLD
+    ndim = len(npts)
+    rng  = np.random.default_rng(comm.rank)
+
+    D = DomainDecomposition(npts, periods=[periodic] * ndim, comm=comm)
+    global_starts, global_ends = compute_global_starts_ends(D, npts, pads)
+    cart = CartDecomposition(D, npts, global_starts, global_ends, pads=pads, shifts=[1] * ndim)
+
+    V = StencilVectorSpace(cart)
+    A = StencilMatrix(V, V, pads=pA)
+    B = StencilMatrix(V, V, pads=pB)
+
+    # Each process fills its own rows, the ghost rows of B are exchanged
+    local = tuple(slice(s, e + 1) for s, e in zip(V.starts, V.ends))
+    for M in (A, B):
+        M[local] = rng.random(M[local].shape)
+        M.remove_spurious_entries()
+
+    C = A.matmat(B)
+    assert C.pads == tuple(a + b for a, b in zip(pA, pB))
+
+    x = StencilVector(V)
+    x[local] = rng.random(x[local].shape)
+
+    y = C.dot(x)
+    y_ref = A.dot(B.dot(x))
+    assert np.allclose(y[local], y_ref[local], rtol=1e-14, atol=1e-14)
+
+    # Global matrices assembled from the rows owned by each process
+    AB = comm.allreduce(A.toarray(), op=MPI.SUM) @ comm.allreduce(B.toarray(), op=MPI.SUM)
+    assert np.allclose(comm.allreduce(C.toarray(), op=MPI.SUM), AB, rtol=1e-14, atol=1e-14)
+
+# ===============================================================================
+@pytest.mark.parametrize(('ncells', 'degree', 'periodic'),
+    [([28], [3], [False]),
+     ([20], [2], [True]),
+     ([10, 12], [2, 2], [True, False])])
+@pytest.mark.parallel
+def test_stencil_matrix_matmat_mass_parallel(ncells, degree, periodic):
+    from mpi4py import MPI
+
+    comm = MPI.COMM_WORLD
+    M = assemble_mass_matrix(ncells, degree, periodic, comm=comm)
+    V = M.domain
+
+    # The ghost rows of the product are exchanged on the widened spaces
+    C = M.matmat(M)
+    assert isinstance(C, WideStencilMatrix)
+    assert C.pads == tuple(2 * p for p in degree)
+    assert C.domain is C.codomain is V
+    assert C.matrix.domain is C.matrix.codomain is V.widened(C.pads)
+
+    # Global matrices assembled from the rows owned by each process
+    Ms = comm.allreduce(M.tosparse(), op=MPI.SUM)
+    Cs = comm.allreduce(C.tosparse(), op=MPI.SUM)
+    assert abs(Cs - Ms @ Ms).max() < 1e-14
+
+    local = tuple(slice(s, e + 1) for s, e in zip(V.starts, V.ends))
+    rng = np.random.default_rng(comm.rank)
+    x = StencilVector(V)
+    x[local] = rng.random(x[local].shape)
+
+    z     = C.dot(x)
+    z_ref = M.dot(M.dot(x))
+    assert np.allclose(z[local], z_ref[local], rtol=1e-14, atol=1e-14)
+
+    # Product of three factors, if its ghost regions fit in the local domains
+    sizes = [min(ge - gs + 1) for gs, ge in zip(V.cart.global_starts, V.cart.global_ends)]
+    if all(3 * p <= n for p, n in zip(degree, sizes)):
+        D = C.matmat(M)
+        Ds = comm.allreduce(D.tosparse(), op=MPI.SUM)
+        assert abs(Ds - Ms @ Ms @ Ms).max() < 1e-13
+        assert np.allclose(D.dot(x)[local], M.dot(z)[local], rtol=1e-14, atol=1e-14)
+
 # ===============================================================================
 @pytest.mark.parametrize('n1', [20, 67])
 @pytest.mark.parametrize('p1', [1, 2, 3])
@@ -0,0 +1,198 @@
+# coding: utf-8
+
+import pytest
+import numpy as np
+from mpi4py import MPI
+
+from psydac.linalg.stencil import StencilVectorSpace, StencilVector, StencilMatrix, StencilMultiVector
+from psydac.ddm.cart       import DomainDecomposition, CartDecomposition
+
+# ===============================================================================
+def compute_global_starts_ends(domain_decomposition, npts):
+    ndims = len(npts)
+    global_starts = [None] * ndims
+    global_ends = [None] * ndims
+
+    for axis in range(ndims):
+        es = domain_decomposition.global_element_starts[axis]
+        ee = domain_decomposition.global_element_ends[axis]
+
+        global_ends[axis] = ee.copy()
+        global_ends[axis][-1] = npts[axis] - 1
+        global_starts[axis] = np.array([0] + (global_ends[axis][:-1] + 1).tolist())
+
+    return global_starts, global_ends
+
+# ===============================================================================
+def create_space(npts, pads, shifts, periods, dtype, comm=None):
+    D = DomainDecomposition(npts, periods=periods, comm=comm)
+    global_starts, global_ends = compute_global_starts_ends(D, npts)
+    C = CartDecomposition(D, npts, global_starts, global_ends, pads=pads, shifts=shifts)
+    return StencilVectorSpace(C, dtype=dtype)
+
+def random_vector(V, rng):
+    x   = StencilVector(V)
+    idx = tuple(slice(s, e+1) for s, e in zip(V.starts, V.ends))
+    shp = tuple(e+1-s for s, e in zip(V.starts, V.ends))
+    x[idx] = rng.random(shp)
+    if V.dtype == complex:
+        x[idx] += 1j * rng.random(shp)
+    x.update_ghost_regions()
+    return x
+
+def random_matrix(V, rng):
+    M = StencilMatrix(V, V)
+    M._data[...] = rng.random(M._data.shape)
+    if V.dtype == complex:
+        M._data[...] += 1j * rng.random(M._data.shape)
+    M.remove_spurious_entries()
+    return M
+
+# ===============================================================================
+# SERIAL TESTS
+# ===============================================================================
+@pytest.mark.parametrize('dtype', [float, complex])
+@pytest.mark.parametrize('params', [([7], [2], [1], [True]),
+                                    ([7, 6], [2, 1], [1, 2], [True, False]),
+                                    ([5, 6, 4], [1, 2, 1], [1, 1, 2], [False, True, True])])
+def test_stencil_multi_vector_serial_init(dtype, params):
+    npts, pads, shifts, periods = params
+    V = create_space(npts, pads, shifts, periods, dtype)
+    rng = np.random.default_rng(0)
+    vectors = [random_vector(V, rng) for _ in range(3)]
+
+    X = StencilMultiVector.from_vectors(vectors)
+
+    assert X.space is V
+    assert X.nvecs == 3
+    assert X.dtype == dtype
+    assert X.ghost_regions_in_sync
+    assert X._data.shape == V.shape + (3,)
+
+    for j, v in enumerate(vectors):
+        assert np.array_equal(X.column(j)._data, v._data)
+        assert np.array_equal(X.toarray()[:, j], v.toarray())
+
+    Y = X.copy()
+    assert Y is not X
+    assert np.array_equal(Y._data, X._data)
+
+# ===============================================================================
+@pytest.mark.parametrize('dtype', [float, complex])
+@pytest.mark.parametrize('params', [([7], [2], [1], [True]),
+                                    ([7, 6], [2, 1], [1, 2], [True, False]),
+                                    ([5, 6, 4], [1, 2, 1], [1, 1, 2], [False, True, True])])
+def test_stencil_multi_vector_serial_update_ghost_regions(dtype, params):
+    npts, pads, shifts, periods = params
+    V = create_space(npts, pads, shifts, periods, dtype)
+    rng = np.random.default_rng(1)
+    vectors = [random_vector(V, rng) for _ in range(2)]
+
+    # Ghost regions are filled by the update, as for the single vectors
+    X = StencilMultiVector(V, 2)
+    idx = tuple(slice(s, e+1) for s, e in zip(V.starts, V.ends))
+    for j, v in enumerate(vectors):
+        X[idx + (j,)] = v[idx]
+    assert not X.ghost_regions_in_sync
+
+    X.update_ghost_regions()
+    assert X.ghost_regions_in_sync
+    for j, v in enumerate(vectors):
+        assert np.array_equal(X._data[..., j], v._data)
+
+# ===============================================================================
+@pytest.mark.parametrize('dtype', [float, complex])
+@pytest.mark.parametrize('params', [([7], [2], [1], [True]),
+                                    ([7, 6], [2, 1], [1, 2], [True, False])])
+def test_stencil_multi_vector_serial_dot(dtype, params):
+    npts, pads, shifts, periods = params
+    V = create_space(npts, pads, shifts, periods, dtype)
+    rng = np.random.default_rng(2)
+
+    X = StencilMultiVector.from_vectors([random_vector(V, rng) for _ in range(3)])
+    Y = StencilMultiVector.from_vectors([random_vector(V, rng) for _ in range(2)])
+    z = random_vector(V, rng)
+
+    G = X.dot(Y)
+    g = X.dot(z)
+    assert G.shape == (3, 2)
+    assert g.shape == (3,)
+
+    for i in range(3):
+        xi = X.column(i)
+        assert np.isclose(g[i], xi.dot(z), rtol=1e-13, atol=1e-13)
+        for j in range(2):
+            assert np.isclose(G[i, j], xi.dot(Y.column(j)), rtol=1e-13, atol=1e-13)
+
+# ===============================================================================
+@pytest.mark.parametrize('dtype', [float, complex])
+@pytest.mark.parametrize('nvecs', [1, 4])
+@pytest.mark.parametrize('params', [([7], [2], [1], [True]),
+                                    ([7], [1], [2], [False]),
+                                    ([7, 6], [2, 1], [1, 2], [True, False]),
+                                    ([5, 6, 4], [1, 2, 1], [1, 1, 2], [False, True, True])])
+def test_stencil_matrix_serial_dot_multi_vector(dtype, nvecs, params):
+    npts, pads, shifts, periods = params
+    V = create_space(npts, pads, shifts, periods, dtype)
+    rng = np.random.default_rng(3)
+
+    M = random_matrix(V, rng)
+    X = StencilMultiVector.from_vectors([random_vector(V, rng) for _ in range(nvecs)])
+
+    Y = M.dot(X)
+    assert isinstance(Y, StencilMultiVector)
+    assert Y.nvecs == nvecs
+    assert not Y.ghost_regions_in_sync
+
+    for j in range(nvecs):
+        yj = M.dot(X.column(j))
+        assert np.allclose(Y.column(j).toarray(), yj.toarray(), rtol=1e-13, atol=1e-13)
+
+    # The output multi-vector can be given
+    Z = StencilMultiVector(V, nvecs)
+    M.dot(X, out=Z)
+    assert np.array_equal(Z.toarray(), Y.toarray())
+
+# ===============================================================================
+# PARALLEL TESTS
+# ===============================================================================
+@pytest.mark.parametrize('dtype', [float, complex])
+@pytest.mark.parametrize('params', [([12], [2], [1], [True]),
+                                    ([10, 9], [2, 1], [1, 2], [True, False]),
+                                    ([6, 8, 5], [1, 2, 1], [1, 1, 2], [False, True, True])])
+@pytest.mark.parallel
+def test_stencil_multi_vector_parallel(dtype, params):
+    npts, pads, shifts, periods = params
+    comm = MPI.COMM_WORLD
+    V = create_space(npts, pads, shifts, periods, dtype, comm=comm)
+    rng = np.random.default_rng(4 + comm.rank)
+
+    vectors = [random_vector(V, rng) for _ in range(3)]
+    X = StencilMultiVector(V, 3)
+    idx = tuple(slice(s, e+1) for s, e in zip(V.starts, V.ends))
+    for j, v in enumerate(vectors):
+        X[idx + (j,)] = v[idx]
+
+    # A single exchange updates the ghost regions of all vectors
+    X.update_ghost_regions()
+    for j, v in enumerate(vectors):
+        assert np.array_equal(X._data[..., j], v._data)
+
+    # Gram matrix with a single reduction
+    G = X.dot(X)
+    for i in range(3):
+        for j in range(3):
+            assert np.isclose(G[i, j], vectors[i].dot(vectors[j]), rtol=1e-13, atol=1e-13)
+
+    # Batched matrix-vector product
+    M = random_matrix(V, np.random.default_rng(5 + comm.rank))
+    Y = M.dot(X)
+    for j, v in enumerate(vectors):
+        assert np.allclose(Y.column(j).toarray(), M.dot(v).toarray(), rtol=1e-13, atol=1e-13)
+
+# ===============================================================================
+# SCRIPT FUNCTIONALITY
+# ===============================================================================
+if __name__ == "__main__":
+    import sys
+    pytest.main(sys.argv)
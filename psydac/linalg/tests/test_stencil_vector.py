@@ -518,6 +518,51 @@ def test_stencil_vector_2d_serial_update_ghost_region_interior(dtype, n1, n2, p1
         assert np.array_equal(data[:, n2 + p2 * s2:n2 + 2 * p2 * s2],
                               np.zeros((n1 + 2 * p1 * s1, p2 * s2), dtype=dtype))
 
+# ===============================================================================
+@pytest.mark.parametrize('dtype', [float, complex])
+@pytest.mark.parametrize('npts, pads, shifts', [([7], [2], [1]),
+                                                ([7, 5], [1, 2], [2, 1]),
+                                                ([6, 5, 4], [1, 2, 1], [1, 1, 2])])
+def test_stencil_vector_serial_fused_ops(dtype, npts, pads, shifts):
+    # Create domain decomposition
+    D = DomainDecomposition(npts, periods=[True] + [False] * (len(npts) - 1))
+
+    # Partition the points
+    global_starts, global_ends = compute_global_starts_ends(D, npts)
+    C = CartDecomposition(D, npts, global_starts, global_ends, pads=pads, shifts=shifts)
+
+    # Create vector space and stencil vectors with random data
+    V = StencilVectorSpace(C, dtype=dtype)
+    rng = np.random.default_rng(0)
+    x, y = StencilVector(V), StencilVector(V)
+    for v in (x, y):
+        v._data[...] = rng.random(v._data.shape)
+        if dtype == complex:
+            v._data[...] += 1j * rng.random(v._data.shape)
+
+    cst = 0.5 - 2j if dtype == complex else -1.5
+
+    # Fused update and squared norm: y += cst * x, then (y, y)
+    z = y + cst * x
+    res = y.mul_iadd_norm_sqr(cst, x)
+    assert np.allclose(y._data, z._data, rtol=1e-14, atol=1e-14)
+    assert np.isclose(res, z.dot(z).real, rtol=1e-13, atol=1e-13)
+
+    # Local part of the inner product
+    assert np.isclose(x.local_dot(y), x.dot(y), rtol=1e-13, atol=1e-13)
+
+    # Batched inner products with a single reduction
+    w = x + y
+    res = V.inner_many([x, y, w], [y, w, x])
+    assert np.allclose(res, [x.dot(y), y.dot(w), w.dot(x)], rtol=1e-13, atol=1e-13)
+    res = V.dot_many([x, y, w], w)
+    assert np.allclose(res, [x.dot(w), y.dot(w), w.dot(w)], rtol=1e-13, atol=1e-13)
+
+    # Fused scaling and addition: y = x + cst * y
+    z = x + cst * y
+    y.xpay(cst, x)
+    assert np.allclose(y._data, z._data, rtol=1e-14, atol=1e-14)
+
 # ===============================================================================
 # PARALLEL TESTS
 # ===============================================================================
@@ -1034,6 +1079,249 @@ def test_stencil_vector_3d_parallel_dot(dtype, n1, n2, n3, p1, p2, p3, s1, s2, s
     assert res1 == res_ex1
     assert res2 == res_ex2
 
+# ===============================================================================
+@pytest.mark.parametrize('dtype', [float, complex])
+@pytest.mark.parametrize('npts, pads, shifts', [([12], [2], [1]),
+                                                ([10, 9], [1, 2], [2, 1]),
+                                                ([8, 6, 5], [1, 2, 1], [1, 1, 2])])
+@pytest.mark.parallel
+def test_stencil_vector_parallel_fused_ops(dtype, npts, pads, shifts):
+    from mpi4py import MPI
+
+    comm = MPI.COMM_WORLD
+    # Create domain decomposition
+    D = DomainDecomposition(npts, periods=[True] + [False] * (len(npts) - 1), comm=comm)
+
+    # Partition the points
+    global_starts, global_ends = compute_global_starts_ends(D, npts)
+    C = CartDecomposition(D, npts, global_starts, global_ends, pads=pads, shifts=shifts)
+
+    # Create vector space and stencil vectors with random data
+    V = StencilVectorSpace(C, dtype=dtype)
+    rng = np.random.default_rng(comm.rank)
+    x, y = StencilVector(V), StencilVector(V)
+    for v in (x, y):
+        v._data[...] = rng.random(v._data.shape)
+        if dtype == complex:
+            v._data[...] += 1j * rng.random(v._data.shape)
+
+    cst = 0.5 - 2j if dtype == complex else -1.5
+
+    # Fused update and squared norm: y += cst * x, then (y, y)
+    z = y + cst * x
+    res = y.mul_iadd_norm_sqr(cst, x)
+    assert np.allclose(y._data, z._data, rtol=1e-14, atol=1e-14)
+    assert np.isclose(res, z.dot(z).real, rtol=1e-13, atol=1e-13)
+
+    # Local part of the inner product
+    assert np.isclose(comm.allreduce(x.local_dot(y)), x.dot(y), rtol=1e-13, atol=1e-13)
+
+    # Batched inner products with a single reduction
+    w = x + y
+    res = V.inner_many([x, y, w], [y, w, x])
+    assert np.allclose(res, [x.dot(y), y.dot(w), w.dot(x)], rtol=1e-13, atol=1e-13)
+    res = V.dot_many([x, y, w], w)
+    assert np.allclose(res, [x.dot(w), y.dot(w), w.dot(w)], rtol=1e-13, atol=1e-13)
+
+    # Fused scaling and addition: y = x + cst * y
+    z = x + cst * y
+    y.xpay(cst, x)
+    assert np.allclose(y._data, z._data, rtol=1e-14, atol=1e-14)
+
+# ===============================================================================
+def run_shared_memory_comparison(V, W, pads, shifts, comm):
+
+    # Vectors with the same random values in the owned region
+    rng = np.random.default_rng(comm.rank)
+    x, y = V.zeros(), W.zeros()
+    assert np.all(y._data == 0)
+
+    owned = tuple(slice(m*p, -m*p) for p, m in zip(pads, shifts))
+    x._data[owned] = rng.random(x._data[owned].shape)
+    if V.dtype == complex:
+        x._data[owned] += 1j * rng.random(x._data[owned].shape)
+    y._data[owned] = x._data[owned]
+
+    # Identical ghost regions
+    x.update_ghost_regions()
+    y.update_ghost_regions()
+    assert np.array_equal(x._data, y._data)
+
+    # The update can be repeated after modifying the data
+    x *= 2
+    y *= 2
+    x.ghost_regions_in_sync = False
+    y.ghost_regions_in_sync = False
+    x.update_ghost_regions()
+    y.update_ghost_regions()
+    assert np.array_equal(x._data, y._data)
+
+    # Matrix-vector product (with the overlapped halo exchange)
+    A = StencilMatrix(V, V)
+    B = StencilMatrix(W, W)
+    A._data[...] = rng.random(A._data.shape)
+    A.remove_spurious_entries()
+    B._data[...] = A._data
+    x.ghost_regions_in_sync = False
+    y.ghost_regions_in_sync = False
+    assert np.array_equal(A.dot(x)._data, B.dot(y)._data)
+
+    assert np.isclose(x.dot(x), y.dot(y), rtol=1e-14, atol=1e-14)
+
+    # Assembly data are exchanged as without shared memory
+    x._data[...] = 1
+    y._data[...] = 1
+    x.exchange_assembly_data()
+    y.exchange_assembly_data()
+    assert np.array_equal(x._data, y._data)
+
+    # The vectors do not allocate any window: all the updates share the pool
+    # of the space, which only grows if several updates are in progress
+    exchanger = W._synchronizer
+    assert exchanger.nwindows == 1
+    z = y.copy()
+    z.update_ghost_regions()
+    assert exchanger.nwindows == 1
+
+    x._data[owned] = rng.random(x._data[owned].shape)
+    y._data[owned] = z._data[owned] = x._data[owned]
+    for v in (x, y, z):
+        v.start_update_ghost_regions()
+    for v in (x, y, z):
+        v.end_update_ghost_regions()
+    assert exchanger.nwindows == 2
+    assert np.array_equal(x._data, y._data) and np.array_equal(x._data, z._data)
+
+    # The windows are freed explicitly, and allocated again when needed
+    with W:
+        y.update_ghost_regions()
+        assert exchanger.nwindows == 2
+    assert exchanger.nwindows == 0
+    y.update_ghost_regions()
+    assert exchanger.nwindows == 1
+    assert np.array_equal(x._data, y._data)
+    W.free()
+    assert exchanger.nwindows == 0
+
+# ===============================================================================
+@pytest.mark.parametrize('dtype', [float, complex])
+@pytest.mark.parametrize('npts, pads, shifts', [([12], [2], [1]),
+                                                ([10, 9], [1, 2], [2, 1]),
+                                                ([8, 6, 5], [1, 2, 1], [1, 1, 2])])
+@pytest.mark.parametrize('periodic', [True, False])
+@pytest.mark.parallel
+def test_stencil_vector_parallel_shared_memory(dtype, npts, pads, shifts, periodic):
+    from mpi4py import MPI
+
+    comm    = MPI.COMM_WORLD
+    periods = [periodic] + [False] * (len(npts) - 1)
+
+    # Same decomposition, without and with shared memory windows. In the last
+    # case, several nodes are emulated by splitting the node-local communicator
+    # so that some neighbors are reached with MPI messages.
+    spaces = []
+    for shared_memory, split in [(False, False), (True, False), (True, True)]:
+        D = DomainDecomposition(npts, periods=periods, comm=comm, shared_memory=shared_memory)
+        if split:
+            D._comm_shared = D.comm_shared.Split(D.comm_shared.rank % 2)
+        global_starts, global_ends = compute_global_starts_ends(D, npts)
+        C = CartDecomposition(D, npts, global_starts, global_ends, pads=pads, shifts=shifts)
+        spaces.append(StencilVectorSpace(C, dtype=dtype))
+
+    V = spaces[0]
+    assert not V.shared_memory
+    assert all(W.shared_memory for W in spaces[1:])
+
+    for W in spaces[1:]:
+        run_shared_memory_comparison(V, W, pads, shifts, comm)
+
+# ===============================================================================
+@pytest.mark.parametrize('dtype', [float, complex])
+@pytest.mark.parametrize('npts, pads, shifts', [([12], [2], [1]),
+                                                ([10, 9], [1, 2], [2, 1]),
+                                                ([8, 6, 5], [1, 2, 1], [1, 1, 2])])
+@pytest.mark.parametrize('periodic', [True, False])
+@pytest.mark.parallel
+def test_stencil_vector_parallel_neighborhood(dtype, npts, pads, shifts, periodic):
+    from mpi4py import MPI
+    from psydac.linalg.stencil import StencilMultiVector
+    from psydac.linalg.solvers import inverse
+    from psydac.ddm.neighborhood_data_exchanger import NeighborhoodCartDataExchanger
+
+    comm    = MPI.COMM_WORLD
+    ndim    = len(npts)
+    periods = [periodic] + [False] * (ndim - 1)
+
+    # Same decomposition, with persistent point-to-point communications and
+    # with a single neighborhood collective
+    spaces = []
+    for neighborhood in [False, True]:
+        D = DomainDecomposition(npts, periods=periods, comm=comm, neighborhood=neighborhood)
+        global_starts, global_ends = compute_global_starts_ends(D, npts)
+        C = CartDecomposition(D, npts, global_starts, global_ends, pads=pads, shifts=shifts)
+        spaces.append(StencilVectorSpace(C, dtype=dtype))
+    V, W = spaces
+
+    assert not V.neighborhood
+    assert W.neighborhood
+    assert isinstance(W._synchronizer, NeighborhoodCartDataExchanger)
+
+    # Vectors with the same random values in the owned region
+    rng = np.random.default_rng(comm.rank)
+    x, y = V.zeros(), W.zeros()
+    owned = tuple(slice(m*p, -m*p) for p, m in zip(pads, shifts))
+    x._data[owned] = rng.random(x._data[owned].shape)
+    if dtype == complex:
+        x._data[owned] += 1j * rng.random(x._data[owned].shape)
+    y._data[owned] = x._data[owned]
+
+    x.update_ghost_regions()
+    y.update_ghost_regions()
+    assert np.array_equal(x._data, y._data)
+
+    # Several updates in progress at the same time
+    z = y.copy()
+    z *= 2
+    y.ghost_regions_in_sync = False
+    for v in (y, z):
+        v.start_update_ghost_regions()
+    for v in (y, z):
+        v.end_update_ghost_regions()
+    assert np.array_equal(x._data, y._data)
+    assert np.array_equal(2 * x._data, z._data)
+
+    # Multi-vectors use the same kind of exchange
+    X = StencilMultiVector.from_vectors([x, 2 * x])
+    Y = StencilMultiVector.from_vectors([y, z])
+    assert isinstance(W._get_multi_synchronizer(2), NeighborhoodCartDataExchanger)
+    for M in (X, Y):
+        data = M._data[owned].copy()
+        M._data[...] = 0
+        M._data[owned] = data
+        M.ghost_regions_in_sync = False
+    X.update_ghost_regions()
+    Y.update_ghost_regions()
+    assert np.array_equal(X._data, Y._data)
+
+    # Same iterates in CG, for a matrix with 2*ndim+1 on the diagonal and -1
+    # for the neighbors along each axis
+    A = StencilMatrix(V, V)
+    B = StencilMatrix(W, W)
+    center = tuple(pads)
+    A._data[(slice(None),) * ndim + center] = 2 * ndim + 1
+    for axis in range(ndim):
+        for k in (-1, 1):
+            offset = list(center)
+            offset[axis] += k
+            A._data[(slice(None),) * ndim + tuple(offset)] = -1
+    A.remove_spurious_entries()
+    B._data[...] = A._data
+
+    solvers   = [inverse(M, 'cg', tol=1e-12, maxiter=50) for M in (A, B)]
+    solutions = [solver.dot(b) for solver, b in zip(solvers, (x, y))]
+    assert solvers[0].get_info()['niter'] == solvers[1].get_info()['niter']
+    assert np.allclose(solutions[0].toarray(), solutions[1].toarray(), rtol=1e-12, atol=1e-12)
+
 #===============================================================================
 # SCRIPT FUNCTIONALITY
 #===============================================================================
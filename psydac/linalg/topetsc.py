@@ -5,7 +5,7 @@ from psydac.linalg.stencil import StencilVectorSpace, StencilVector, StencilMatr
 from psydac.linalg.basic import VectorSpace
 from itertools import product as cartesian_prod
 
-__all__ = ('petsc_local_to_psydac', 'psydac_to_petsc_global', 'get_npts_local', 'get_npts_per_block', 'vec_topetsc', 'mat_topetsc')
+__all__ = ('petsc_local_to_psydac', 'psydac_to_petsc_global', 'get_npts_local', 'get_npts_per_block', 'vec_topetsc', 'mat_topetsc', 'mat_update_values')
 
 from .kernels.stencil2IJV_kernels import stencil2IJV_1d_C, stencil2IJV_2d_C, stencil2IJV_3d_C
 # Dictionary used to select correct kernel functions based on dimensionality
@@ -24,7 +24,7 @@ def get_index_shift_per_block_per_process(V):
 
     return index_shift_per_block_per_process #Global variable indexed as [b][k] fo block b, process k
 
-def toIJVrowmap(mat_block, bd, bc, I, J, V, rowmap, dspace, cspace, dnpts_block, cnpts_block, dshift_block, cshift_block, order='C'):
+def toIJVrowmap(data, bd, bc, I, J, V, rowmap, dspace, cspace, dnpts_block, cnpts_block, dshift_block, cshift_block, order='C'):
     # Extract Cartesian decomposition of the Block where the node is:
     dspace_block = dspace if isinstance(dspace, StencilVectorSpace) else dspace.spaces[bd]
     cspace_block = cspace if isinstance(cspace, StencilVectorSpace) else cspace.spaces[bc]       
@@ -48,7 +48,7 @@ def toIJVrowmap(mat_block, bd, bc, I, J, V, rowmap, dspace, cspace, dnpts_block,
 
     # Range of data owned by local process (no ghost regions)
     local = tuple( [slice(m*p,-m*p) for p,m in zip(cp, cm)] + [slice(None)] * dspace_block.cart.ndim )
-    shape  = mat_block._data[local].shape
+    shape  = data[local].shape
     nrows = np.prod(shape[0:dspace_block.cart.ndim])
     nentries = np.prod(shape)
 
@@ -56,13 +56,13 @@ def toIJVrowmap(mat_block, bd, bc, I, J, V, rowmap, dspace, cspace, dnpts_block,
     Ib = np.zeros(nrows + 1, dtype='int64')
     Jb = np.zeros(nentries, dtype='int64')
     rowmapb = np.zeros(nrows, dtype='int64')
-    Vb = np.zeros(nentries, dtype=mat_block._data.dtype)
+    Vb = np.zeros(nentries, dtype=data.dtype)
 
     Ib[0] += I[-1]
 
     stencil2IJV = kernels['stencil2IJV'][order][dspace_block.cart.ndim]
 
-    nnz_rows, nnz = stencil2IJV(mat_block._data, Ib, Jb, Vb, rowmapb,
+    nnz_rows, nnz = stencil2IJV(data, Ib, Jb, Vb, rowmapb,
                       *cnl, *dng, *cs, *cp, *cm,
                       dsh, csh, *dgs, *dge, *cgs, *cge, *dnlb, *cnlb
                       )
@@ -74,6 +74,71 @@ def toIJVrowmap(mat_block, bd, bc, I, J, V, rowmap, dspace, cspace, dnpts_block,
 
     return I, J, V, rowmap
 
+def _nonzero_blocks(mat):
+    """ List of the tuples (bc, bd, block) of the non-zero blocks of mat. """
+    if isinstance(mat, StencilMatrix):
+        return [(0, 0, mat)]
+    return [(bc, bd, mat.blocks[bc][bd]) for bc, bd in mat.nonzero_block_indices]
+
+def _local_data_view(mat_block, data):
+    """ Rows of data (with the shape of mat_block._data) owned by the local process (no ghost regions). """
+    cart  = mat_block.codomain.cart
+    local = tuple( [slice(m*p,-m*p) for p,m in zip(cart.pads, cart.shifts)] + [slice(None)] * cart.ndim )
+    return data[local]
+
+def _local_data(mat_block):
+    """ Coefficients of the rows owned by the local process (no ghost regions). """
+    return _local_data_view(mat_block, mat_block._data)
+
+def _petsc_structure(mat):
+    """
+    Row pointers, column indices and row map of the IJV format used to
+    create the PETSc matrix, for all the entries of the stencil pattern of
+    the non-zero blocks of mat (in the order of their flattened arrays of
+    local coefficients), except the entries which couple a row with a column
+    outside of the domain along a non-periodic direction (see
+    StencilMatrix._domain_mask). They do not depend on the values: hence they are
+    computed once, and stored in the domain for all the operators with the
+    same codomain and block structure.
+    """
+    blocks = _nonzero_blocks(mat)
+    key = ('petsc', mat.codomain, tuple((bc, bd, mat_block._data.shape) for bc, bd, mat_block in blocks))
+    structures = mat.domain._sparse_structures
+    if key in structures:
+        return structures[key]
+
+    # Get the number of points per block, per process and per dimension:
+    dnpts_per_block_per_process = np.array(get_npts_per_block(mat.domain)) # global variable, indexed as [block, process, dimension]
+    cnpts_per_block_per_process = np.array(get_npts_per_block(mat.codomain)) # global variable, indexed as [block, process, dimension]
+
+    # Get the index shift for each block and each process:
+    dindex_shift = get_index_shift_per_block_per_process(mat.domain) # global variable, indexed as [block, process, dimension]
+    cindex_shift = get_index_shift_per_block_per_process(mat.codomain) # global variable, indexed as [block, process, dimension]
+
+    I = [0] # Row pointers
+    J = [] # Column indices
+    V = [] # Values
+    rowmap = [] # Row indices of rows containing non-zeros
+
+    for bc, bd, mat_block in blocks:
+        dnpts_block = dnpts_per_block_per_process[bd]
+        cnpts_block = cnpts_per_block_per_process[bc]
+        dshift_block = dindex_shift[bd]
+        cshift_block = cindex_shift[bc]
+
+        # The kernel skips the zero entries, hence it is called with an array
+        # of ones in order to get the indices of all the entries in the domain
+        ones = np.zeros(mat_block._data.shape)
+        _local_data_view(mat_block, ones)[...] = mat_block._domain_mask()
+        I,J,V,rowmap = toIJVrowmap(ones, bd, bc, I, J, V, rowmap, mat.domain, mat.codomain, dnpts_block, cnpts_block, dshift_block, cshift_block)
+
+    structures[key] = (np.array(I, dtype='int64'), np.array(J, dtype='int64'), np.array(rowmap, dtype='int64'))
+    return structures[key]
+
+def _petsc_values(mat):
+    """ Values of the IJV format, in the order given by _petsc_structure. """
+    return np.concatenate([_local_data(mat_block)[mat_block._domain_mask()] for _, _, mat_block in _nonzero_blocks(mat)])
+
 def petsc_local_to_psydac(
     V : VectorSpace,
     petsc_index : int):
@@ -427,6 +492,12 @@ def mat_topetsc( mat ):
     -------
     gmat : PETSc.Mat
         PETSc Matrix
+
+    Notes
+    -----
+    The index structure of the stencil pattern is computed once and reused
+    by `mat_update_values`. As in the COO format, the zero entries are not
+    stored.
     """
 
     from petsc4py import PETSc
@@ -442,8 +513,6 @@ def mat_topetsc( mat ):
     elif isinstance(mat.domain, BlockVectorSpace):
         comm = mat.domain.spaces[0].cart.global_comm
 
-    nonzero_block_indices = ((0,0),) if isinstance(mat, StencilMatrix) else mat.nonzero_block_indices
-
     mat.update_ghost_regions()
     mat.remove_spurious_entries()
 
@@ -451,14 +520,6 @@ def mat_topetsc( mat ):
     dnpts_local = get_npts_local(mat.domain) # indexed [block, dimension]. Different for each process.
     cnpts_local = get_npts_local(mat.codomain) # indexed [block, dimension]. Different for each process. 
 
-    # Get the number of points per block, per process and per dimension:
-    dnpts_per_block_per_process = np.array(get_npts_per_block(mat.domain)) # global variable, indexed as [block, process, dimension]
-    cnpts_per_block_per_process = np.array(get_npts_per_block(mat.codomain)) # global variable, indexed as [block, process, dimension]
-
-    # Get the index shift for each block and each process:
-    dindex_shift = get_index_shift_per_block_per_process(mat.domain) # global variable, indexed as [block, process, dimension]
-    cindex_shift = get_index_shift_per_block_per_process(mat.codomain) # global variable, indexed as [block, process, dimension]
-
     globalsize = mat.shape
 
     # Sum over the blocks to get the total local size
@@ -478,23 +539,11 @@ def mat_topetsc( mat ):
 
     gmat.setFromOptions()
     gmat.setUp()
+    gmat.setOption(PETSc.Mat.Option.IGNORE_ZERO_ENTRIES, True)
 
-    I = [0] # Row pointers
-    J = [] # Column indices
-    V = [] # Values
-    rowmap = [] # Row indices of rows containing non-zeros
-
-    mat_block = mat
-
-    for bc, bd in nonzero_block_indices:
-        if isinstance(mat, BlockLinearOperator):
-            mat_block = mat.blocks[bc][bd]
-        dnpts_block = dnpts_per_block_per_process[bd]
-        cnpts_block = cnpts_per_block_per_process[bc]
-        dshift_block = dindex_shift[bd]
-        cshift_block = cindex_shift[bc]
-
-        I,J,V,rowmap = toIJVrowmap(mat_block, bd, bc, I, J, V, rowmap, mat.domain, mat.codomain, dnpts_block, cnpts_block, dshift_block, cshift_block)
+    # Row pointers, column indices and row indices of rows containing non-zeros
+    I, J, rowmap = _petsc_structure(mat)
+    V = _petsc_values(mat)
 
     # Set the values using IJV&rowmap format. The values are stored in a cache memory.
     gmat.setValuesIJV(I, J, V, rowmap=rowmap, addv=PETSc.InsertMode.ADD_VALUES) # The addition mode is necessary when periodic BC
@@ -503,3 +552,45 @@ def mat_topetsc( mat ):
     gmat.assemble()
       
     return gmat
+
+def mat_update_values( mat, gmat ):
+    """ Copy the values of a Psydac operator into a PETSc.Mat object created by
+    mat_topetsc, e.g. after the operator is assembled again. The sparsity
+    pattern of the PETSc matrix is kept, and the index structure of the
+    stencil pattern is reused. The entries which were zero when gmat was
+    created are only inserted if they are now non-zero.
+
+    Parameters
+    ----------
+    mat : psydac.linalg.stencil.StencilMatrix | psydac.linalg.block.BlockLinearOperator
+      Psydac operator, with the same spaces and block structure as the one
+      used to create gmat.
+
+    gmat : PETSc.Mat
+        PETSc Matrix, updated in place.
+
+    Returns
+    -------
+    gmat : PETSc.Mat
+        PETSc Matrix
+    """
+
+    from petsc4py import PETSc
+
+    assert isinstance(gmat, PETSc.Mat)
+    assert isinstance(mat, StencilMatrix) or isinstance(mat, BlockLinearOperator), 'Conversion only implemented for StencilMatrix and BlockLinearOperator.'
+    assert gmat.getSize() == mat.shape
+
+    mat.update_ghost_regions()
+    mat.remove_spurious_entries()
+
+    I, J, rowmap = _petsc_structure(mat)
+    V = _petsc_values(mat)
+
+    # The values of duplicate entries are added, hence the old ones are removed first
+    gmat.zeroEntries()
+    gmat.setOption(PETSc.Mat.Option.NEW_NONZERO_ALLOCATION_ERR, False)
+    gmat.setValuesIJV(I, J, V, rowmap=rowmap, addv=PETSc.InsertMode.ADD_VALUES)
+    gmat.assemble()
+
+    return gmat
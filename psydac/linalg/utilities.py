@@ -11,6 +11,7 @@ from psydac.linalg.topetsc import petsc_local_to_psydac, get_npts_per_block
 __all__ = (
     'array_to_psydac',
     'petsc_to_psydac',
+    '_random_vector',
     '_sym_ortho'
 )
 
@@ -145,6 +146,27 @@ def petsc_to_psydac(x, Xh):
 
     return u
 
+#==============================================================================
+def _random_vector(V, seed=0):
+    """ Vector of the space V with random local entries (without ghost regions). """
+    if isinstance(V, StencilVectorSpace):
+        rank = V.cart.global_comm.rank if V.parallel else 0
+        rng  = np.random.default_rng(seed + rank)
+        x    = V.zeros()
+        idx  = tuple(slice(p*m, -p*m) for p, m in zip(V.pads, V.shifts))
+        x._data[idx] = rng.random(x._data[idx].shape)
+        x.ghost_regions_in_sync = False
+        return x
+
+    elif isinstance(V, BlockVectorSpace):
+        x = V.zeros()
+        for i, Vi in enumerate(V.spaces):
+            x[i] = _random_vector(Vi, seed + i)
+        return x
+
+    else:
+        raise NotImplementedError('Random vectors are only implemented on StencilVectorSpace and BlockVectorSpace')
+
 #==============================================================================
 def _sym_ortho(a, b):
     """